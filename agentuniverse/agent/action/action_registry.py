@@ -0,0 +1,192 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 18:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: action_registry.py
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain.tools import Tool as LangchainTool
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
+from agentuniverse.agent.action.tool.tool import Tool
+from agentuniverse.agent.action.tool.tool_manager import ToolManager
+from agentuniverse.agent.agent_manager import AgentManager
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+MAX_RENDERED_ACTIONS = 1024
+
+
+class RenderedActions:
+    """The rendered langchain tool names and descriptions of one agent action
+    configuration, shared by all requests.
+
+    Only strings are kept: they are computed once from the registered
+    instances and stay valid until a tool, knowledge or agent component is
+    registered or unregistered again.
+
+    Attributes:
+        versions (tuple): Registration versions of the component managers
+            the actions were rendered from.
+    """
+
+    def __init__(self, versions: tuple, render: Callable[[], List[Tuple[str, str]]]):
+        self.versions = versions
+        self._render = render
+        self._lc_tool_specs: Optional[List[Tuple[str, str]]] = None
+        self._tool_names: Optional[str] = None
+        self._descriptions: Dict[str, str] = {}
+
+    @property
+    def lc_tool_specs(self) -> List[Tuple[str, str]]:
+        """Name and description of every langchain tool."""
+        if self._lc_tool_specs is None:
+            self._lc_tool_specs = self._render()
+        return self._lc_tool_specs
+
+    @property
+    def tool_names(self) -> str:
+        if self._tool_names is None:
+            self._tool_names = "|".join([name for name, _ in self.lc_tool_specs])
+        return self._tool_names
+
+    def tools_description(self, line_format: str) -> str:
+        description = self._descriptions.get(line_format)
+        if description is None:
+            description = ''.join([line_format.format(name=name, description=text)
+                                   for name, text in self.lc_tool_specs])
+            self._descriptions[line_format] = description
+        return description
+
+
+class CompiledActions:
+    """The tools, knowledge and sub agents of one agent action configuration
+    for one request.
+
+    Components are copied per request on first access, as agents and tools
+    may change their own state while running, while tool names and
+    descriptions come from the `RenderedActions` shared by all requests.
+
+    Attributes:
+        tools (Dict[str, Tool]): Tool instances by the configured tool name.
+        knowledge (Dict[str, Knowledge]): Knowledge instances by the configured name.
+        agents (Dict[str, Agent]): Sub agent instances by the configured name.
+        lc_tools (List[LangchainTool]): Langchain tools of the tools, knowledge
+            and sub agents, in this order.
+        tool_names (str): Names of the langchain tools joined by `|`.
+    """
+
+    def __init__(self, key: tuple, rendered: RenderedActions):
+        self.key = key
+        self.rendered = rendered
+        self._tools: Optional[Dict[str, Tool]] = None
+        self._knowledge: Optional[Dict[str, Knowledge]] = None
+        self._agents: Optional[dict] = None
+        self._lc_tools: Optional[List[LangchainTool]] = None
+
+    @property
+    def tools(self) -> Dict[str, Tool]:
+        if self._tools is None:
+            self._tools = _get_instances(ToolManager(), 'tool', self.key[0])
+        return self._tools
+
+    @property
+    def knowledge(self) -> Dict[str, Knowledge]:
+        if self._knowledge is None:
+            self._knowledge = _get_instances(KnowledgeManager(), 'knowledge', self.key[1])
+        return self._knowledge
+
+    @property
+    def agents(self) -> dict:
+        if self._agents is None:
+            self._agents = _get_instances(AgentManager(), 'agent', self.key[2])
+        return self._agents
+
+    @property
+    def lc_tools(self) -> List[LangchainTool]:
+        if self._lc_tools is None:
+            self._lc_tools = _as_lc_tools(self.tools, self.knowledge, self.agents)
+        return self._lc_tools
+
+    @property
+    def tool_names(self) -> str:
+        return self.rendered.tool_names
+
+    def tools_description(self, line_format: str) -> str:
+        """Render one line per langchain tool, cached per line format.
+
+        Args:
+            line_format (str): Format of a line with the `name` and
+                `description` fields, e.g. "tool name: {name}, tool description: {description}\\n".
+        """
+        return self.rendered.tools_description(line_format)
+
+
+_rendered_actions: "OrderedDict[tuple, RenderedActions]" = OrderedDict()
+_rendered_actions_lock = threading.Lock()
+
+
+def _get_manager_versions() -> tuple:
+    return ToolManager().version, KnowledgeManager().version, AgentManager().version
+
+
+def _get_instances(manager, component_type: str, names: Tuple[str, ...], new_instance: bool = True) -> dict:
+    instances = {}
+    for name in names:
+        instance = manager.get_instance_obj(name, new_instance=new_instance)
+        if instance is None:
+            LOGGER.warning(f"The {component_type} {name} configured in the agent action is not found.")
+            continue
+        instances[name] = instance
+    return instances
+
+
+def _as_lc_tools(tools: dict, knowledge: dict, agents: dict) -> List[LangchainTool]:
+    return ([tool.as_langchain() for tool in tools.values()]
+            + [knowledge.as_langchain_tool() for knowledge in knowledge.values()]
+            + [agent.as_langchain_tool() for agent in agents.values()])
+
+
+def _render(key: tuple) -> List[Tuple[str, str]]:
+    """Render the langchain tool names and descriptions from the registered
+    instances, which are only read."""
+    lc_tools = _as_lc_tools(_get_instances(ToolManager(), 'tool', key[0], new_instance=False),
+                            _get_instances(KnowledgeManager(), 'knowledge', key[1], new_instance=False),
+                            _get_instances(AgentManager(), 'agent', key[2], new_instance=False))
+    return [(lc_tool.name, lc_tool.description) for lc_tool in lc_tools]
+
+
+def get_compiled_actions(tool_names: Optional[List[str]] = None,
+                         knowledge_names: Optional[List[str]] = None,
+                         agent_names: Optional[List[str]] = None) -> CompiledActions:
+    """Return the actions of the given tool, knowledge and agent names for
+    one request.
+
+    The rendered tool names and descriptions are shared by all callers, kept
+    for the most recently used `MAX_RENDERED_ACTIONS` configurations and
+    rendered again after the registration of tool, knowledge or agent
+    components changes.
+    """
+    key = (tuple(tool_names or ()), tuple(knowledge_names or ()), tuple(agent_names or ()))
+    # Versions are read before rendering, a component lazily registered while
+    # rendering makes the next call render again instead of hiding a change.
+    versions = _get_manager_versions()
+    with _rendered_actions_lock:
+        rendered = _rendered_actions.get(key)
+        if rendered is None or rendered.versions != versions:
+            rendered = RenderedActions(versions, lambda: _render(key))
+            _rendered_actions[key] = rendered
+        _rendered_actions.move_to_end(key)
+        while len(_rendered_actions) > MAX_RENDERED_ACTIONS:
+            _rendered_actions.popitem(last=False)
+    return CompiledActions(key, rendered)
+
+
+def clear_compiled_actions():
+    """Drop all rendered actions."""
+    with _rendered_actions_lock:
+        _rendered_actions.clear()
@@ -13,6 +13,7 @@ from openai import AzureOpenAI, AsyncAzureOpenAI
 
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
 
@@ -35,6 +36,7 @@ class AzureOpenAIEmbedding(Embedding):
     async_client: Any = None
 
 
+    @cached_embeddings
     def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Retrieve text embeddings for a list of input texts using Azure OpenAI API.
@@ -65,6 +67,7 @@ class AzureOpenAIEmbedding(Embedding):
             raise Exception(f"Failed to get embeddings: {e}")
 
 
+    @cached_embeddings
     async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Retrieve text embeddings for a list of input texts using Azure OpenAI API asynchronously.
@@ -13,6 +13,7 @@ import json
 
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
 
 # Dashscope support max 25 string in one batch, each string max tokens is 2048.
 DASHSCOPE_MAX_BATCH_SIZE = 25
@@ -32,6 +33,7 @@ class DashscopeEmbedding(Embedding):
         default_factory=lambda: get_from_env("DASHSCOPE_API_KEY")
     )
 
+    @cached_embeddings
     def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Retrieve text embeddings for a list of input texts.
@@ -96,6 +98,7 @@ class DashscopeEmbedding(Embedding):
                                 f"error message:{error_message}")
         return result
 
+    @cached_embeddings
     async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Async version of get_embeddings.
@@ -10,6 +10,7 @@ from typing import Any, List, Optional
 from pydantic import Field
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
 SUPPORTED_DIMENSIONS = {512, 1024, 2048}
@@ -25,6 +26,7 @@ class DoubaoEmbedding(Embedding):
     client: Optional[Any] = None
     embedding_dims: Optional[int] = None
 
+    @cached_embeddings
     def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Retrieve text embeddings for a list of input texts using Doubao API.
@@ -71,6 +73,10 @@ class DoubaoEmbedding(Embedding):
             raise Exception(
                 f"Failed to get embedding from Doubao API: {str(e)}")
 
+    def get_cache_model_name(self) -> str:
+        """Doubao models are addressed by the endpoint id."""
+        return self.endpoint_id or super().get_cache_model_name()
+
     async def async_get_embeddings(self, texts: List[str],
                                    **kwargs) -> List[List[float]]:
         return self.get_embeddings(texts)
@@ -10,6 +10,8 @@ from typing import List, Optional
 
 from langchain_core.embeddings import Embeddings as LCEmbeddings
 
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import \
+    EmbeddingCache, get_embedding_cache, DEFAULT_CACHE_MAX_SIZE
 from agentuniverse.base.component.component_base import ComponentEnum
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.config.component_configer.component_configer import \
@@ -21,6 +23,12 @@ class Embedding(ComponentBase):
 
     Attributes:
         embedding_model_name (Optional[str]): The name of the embedding model.
+        embedding_cache (Optional[dict]): The embedding cache config, with keys
+            `activate`, `max_size` and `persist_path`. Subclass methods decorated
+            with `cached_embeddings` only embed texts missing from the cache.
+        single_flight (Optional[dict]): The request coalescing config, with keys
+            `activate` and `timeout`. Identical requests of the decorated methods
+            in flight at the same time share one upstream call.
     """
 
     component_type: ComponentEnum = ComponentEnum.EMBEDDING
@@ -28,6 +36,8 @@ class Embedding(ComponentBase):
     description: Optional[str] = None
     embedding_model_name: Optional[str] = None
     embedding_dims: Optional[int] = None
+    embedding_cache: Optional[dict] = None
+    single_flight: Optional[dict] = None
 
     @abstractmethod
     def get_embeddings(self, text: List[str], **kwargs) -> List[List[float]]:
@@ -38,6 +48,27 @@ class Embedding(ComponentBase):
         List[float]]:
         """Asynchronously get embeddings."""
 
+    def get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Return the shared embedding cache, or None if caching is off."""
+        if not self.embedding_cache or not self.embedding_cache.get('activate', True):
+            return None
+        return get_embedding_cache(
+            max_size=self.embedding_cache.get('max_size', DEFAULT_CACHE_MAX_SIZE),
+            persist_path=self.embedding_cache.get('persist_path'))
+
+    def is_single_flight(self) -> bool:
+        """Whether identical requests in flight at the same time share one upstream call."""
+        return bool(self.single_flight) and self.single_flight.get('activate', True)
+
+    def get_cache_model_name(self) -> str:
+        """Return the model identity used in embedding cache keys."""
+        return self.embedding_model_name or self.name or self.__class__.__name__
+
+    def get_cache_namespace(self, **kwargs) -> str:
+        """Return the cache key prefix of the model, dims and request options."""
+        options = ','.join(f'{key}={kwargs[key]}' for key in sorted(kwargs))
+        return f'{self.get_cache_model_name()}:{self.embedding_dims}:{options}'
+
     def as_langchain(self) -> LCEmbeddings:
         """Convert the agentUniverse(aU) embedding class to the langchain embedding class."""
         pass
@@ -61,4 +92,8 @@ class Embedding(ComponentBase):
             self.embedding_dims = embedding_configer.embedding_dims
         if hasattr(embedding_configer, "embedding_model_name"):
             self.embedding_model_name = embedding_configer.embedding_model_name
+        if hasattr(embedding_configer, "embedding_cache"):
+            self.embedding_cache = embedding_configer.embedding_cache
+        if hasattr(embedding_configer, "single_flight"):
+            self.single_flight = embedding_configer.single_flight
         return self
@@ -0,0 +1,130 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 11:20
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: embedding_batcher.py
+from concurrent.futures import FIRST_EXCEPTION, wait
+from typing import Callable, List, Optional
+
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text without a tokenizer.
+
+    Ascii text averages about four characters per token, while each CJK or
+    other non-ascii character usually takes at least one token.
+    """
+    if not text:
+        return 0
+    ascii_count = sum(1 for char in text if ord(char) < 128)
+    return (ascii_count + 3) // 4 + len(text) - ascii_count
+
+
+class EmbeddingBatcher:
+    """Embed documents in batches and hand each batch to a store writer.
+
+    Documents are grouped into batches limited both by count and by an
+    estimated token budget, every batch is embedded with a single
+    `get_embeddings` call, several batches are embedded concurrently and
+    the writer is called once per batch from the calling thread, so stores
+    can issue one bulk write per batch without extra locking.
+
+    Attributes:
+        embedding_model (Optional[str]): Name of the embedding component. When
+            it is None, documents without embeddings are passed through
+            unchanged and the store decides how to embed them.
+        batch_size (int): Max number of documents in one batch.
+        batch_token_limit (Optional[int]): Max estimated tokens in one batch.
+        max_workers (int): Number of batches embedded concurrently.
+        token_counter (Callable[[str], int]): Token estimator for the budget.
+    """
+
+    def __init__(self, embedding_model: Optional[str] = None,
+                 batch_size: int = 32,
+                 batch_token_limit: Optional[int] = None,
+                 max_workers: int = 4,
+                 token_counter: Callable[[str], int] = estimate_tokens):
+        self.embedding_model = embedding_model
+        self.batch_size = max(batch_size or 1, 1)
+        self.batch_token_limit = batch_token_limit
+        self.max_workers = max(max_workers or 1, 1)
+        self.token_counter = token_counter
+
+    def split(self, documents: List[Document]) -> List[List[Document]]:
+        """Split documents into batches, keeping their original order."""
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for document in documents:
+            tokens = self.token_counter(document.text) \
+                if self.batch_token_limit else 0
+            if batch and (len(batch) >= self.batch_size or (
+                    self.batch_token_limit
+                    and batch_tokens + tokens > self.batch_token_limit)):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(document)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def embed_batch(self, batch: List[Document]) -> List[List[float]]:
+        """Return embeddings of the batch, embedding missing ones in one call.
+
+        Documents that already carry an embedding are not sent to the
+        embedding model; documents left without one get an empty list.
+        """
+        embeddings = [document.embedding or [] for document in batch]
+        missing = [i for i, embedding in enumerate(embeddings)
+                   if len(embedding) == 0]
+        if self.embedding_model is None or not missing:
+            return embeddings
+        new_embeddings = EmbeddingManager().get_instance_obj(
+            self.embedding_model
+        ).get_embeddings([batch[i].text for i in missing])
+        for i, embedding in zip(missing, new_embeddings):
+            embeddings[i] = embedding
+        return embeddings
+
+    def run(self, documents: List[Document],
+            write_batch: Callable[[List[Document], List[List[float]]], None]):
+        """Embed documents batch by batch and write every finished batch.
+
+        Args:
+            documents (List[Document]): The documents to embed and write.
+            write_batch (Callable): Called as `write_batch(batch, embeddings)`
+                once per batch, in the order batches finish embedding.
+
+        Raises:
+            Exception: The first error raised by embedding or writing a
+                batch; batches not yet started are cancelled.
+        """
+        batches = self.split(documents)
+        if not batches:
+            return
+        if len(batches) == 1 or self.max_workers == 1:
+            for batch in batches:
+                write_batch(batch, self.embed_batch(batch))
+            return
+
+        with ThreadPoolExecutorWithReturnValue(
+                max_workers=min(self.max_workers, len(batches)),
+                thread_name_prefix="Embedding batch") as executor:
+            pending = {executor.submit(self.embed_batch, batch): batch
+                       for batch in batches}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        batch = pending.pop(future)
+                        write_batch(batch, future.result())
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,226 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: embedding_cache.py
+import asyncio
+import functools
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agentuniverse.base.util.single_flight import SingleFlight
+
+DEFAULT_CACHE_MAX_SIZE = 10000
+# Identical embedding requests in flight at the same time, across all embeddings of the process.
+EMBEDDING_SINGLE_FLIGHT = SingleFlight()
+
+
+class EmbeddingCache:
+    """A content addressed cache of embedding vectors.
+
+    Vectors are keyed by the embedding model, its dimensions, the request
+    options and the sha256 of the text. The first tier is an in-process LRU,
+    the optional second tier is a SQLite file holding float32 vectors, which
+    survives restarts and can be shared by processes on the same host.
+
+    Attributes:
+        max_size (int): Max number of vectors kept in the LRU tier.
+        persist_path (Optional[str]): Path of the SQLite file of the
+            persistent tier, None to disable it.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE,
+                 persist_path: Optional[str] = None):
+        self.max_size = max_size
+        self.persist_path = persist_path
+        self._lru: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if persist_path:
+            self._conn = sqlite3.connect(persist_path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute('''
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        key TEXT PRIMARY KEY,
+                        vector BLOB
+                    ) WITHOUT ROWID
+                ''')
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        return f"{namespace}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors of the keys, missing keys are omitted."""
+        result = {}
+        with self._lock:
+            for key in keys:
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    result[key] = vector
+            missing = [key for key in dict.fromkeys(keys) if key not in result]
+            if self._conn is None or not missing:
+                return result
+            placeholders = ','.join('?' * len(missing))
+            rows = self._conn.execute(
+                f'SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})',
+                missing).fetchall()
+            for key, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                result[key] = vector
+                self._put_lru(key, vector)
+        return result
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """Cache vectors in both tiers."""
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._put_lru(key, vector)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO embedding_cache (key, vector) VALUES (?, ?)',
+                        [(key, np.asarray(vector, dtype=np.float32).tobytes())
+                         for key, vector in items.items()])
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('DELETE FROM embedding_cache')
+
+    def _put_lru(self, key: str, vector: List[float]):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+
+_cache_registry: Dict[tuple, EmbeddingCache] = {}
+_cache_registry_lock = threading.Lock()
+
+
+def get_embedding_cache(max_size: int = DEFAULT_CACHE_MAX_SIZE,
+                        persist_path: Optional[str] = None) -> EmbeddingCache:
+    """Return the process wide cache for the given configuration.
+
+    Embedding components are copied on every lookup from the manager, so
+    the cache lives here instead of on the component, and embedding
+    components configured alike share one cache.
+    """
+    cache_key = (max_size, persist_path)
+    with _cache_registry_lock:
+        cache = _cache_registry.get(cache_key)
+        if cache is None:
+            cache = EmbeddingCache(max_size=max_size, persist_path=persist_path)
+            _cache_registry[cache_key] = cache
+        return cache
+
+
+def _split_cached(embedding, texts: List[str], kwargs: dict):
+    """Look the texts up in the cache of the embedding component.
+
+    Returns:
+        The cache (None when caching is off), the cache keys of the texts,
+        the cached vectors and the distinct texts still to be embedded.
+    """
+    cache = embedding.get_embedding_cache()
+    if cache is None or not texts:
+        return None, None, None, None
+    namespace = embedding.get_cache_namespace(**kwargs)
+    keys = [EmbeddingCache.make_key(namespace, text) for text in texts]
+    cached = cache.get_many(keys)
+    missing_texts = list(dict.fromkeys(
+        text for text, key in zip(texts, keys) if key not in cached))
+    return cache, keys, cached, missing_texts
+
+
+def _merge_cached(cache: EmbeddingCache, keys: List[str],
+                  cached: Dict[str, List[float]], namespace: str,
+                  missing_texts: List[str],
+                  new_embeddings: List[List[float]]) -> List[List[float]]:
+    if len(new_embeddings) != len(missing_texts):
+        raise Exception(f"Embedding model returned {len(new_embeddings)} "
+                        f"embeddings for {len(missing_texts)} texts.")
+    new_items = {EmbeddingCache.make_key(namespace, text): embedding
+                 for text, embedding in zip(missing_texts, new_embeddings)}
+    cache.put_many(new_items)
+    cached.update(new_items)
+    return [cached[key] for key in keys]
+
+
+def _copy_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    return [list(embedding) for embedding in embeddings]
+
+
+def _single_flight_key(embedding, texts: List[str], kwargs: dict) -> tuple:
+    digest = hashlib.sha256('\x00'.join(texts).encode('utf-8')).hexdigest()
+    return embedding.name, embedding.get_cache_namespace(**kwargs), len(texts), digest
+
+
+def _fetch(embedding, func, texts: List[str], kwargs: dict) -> List[List[float]]:
+    """Embed the texts, sharing the upstream call with identical requests in
+    flight when single flight is on."""
+    if not embedding.is_single_flight():
+        return func(embedding, texts, **kwargs)
+    return EMBEDDING_SINGLE_FLIGHT.do(_single_flight_key(embedding, texts, kwargs),
+                                      partial(func, embedding, texts, **kwargs),
+                                      timeout=embedding.single_flight.get('timeout'),
+                                      copy_result=_copy_embeddings)
+
+
+async def _async_fetch(embedding, func, texts: List[str], kwargs: dict) -> List[List[float]]:
+    if not embedding.is_single_flight():
+        return await func(embedding, texts, **kwargs)
+    return await EMBEDDING_SINGLE_FLIGHT.async_do(_single_flight_key(embedding, texts, kwargs),
+                                                  partial(func, embedding, texts, **kwargs),
+                                                  timeout=embedding.single_flight.get('timeout'),
+                                                  copy_result=_copy_embeddings)
+
+
+def cached_embeddings(func):
+    """Serve `get_embeddings`/`async_get_embeddings` from the embedding cache.
+
+    Only texts missing from the cache are sent to the wrapped method, in one
+    call and without duplicates; the result keeps the order of the input.
+    With single flight on, identical requests in flight at the same time
+    share that call.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, texts: List[str], **kwargs):
+            cache, keys, cached, missing_texts = _split_cached(self, texts, kwargs)
+            if cache is None:
+                return await _async_fetch(self, func, texts, kwargs)
+            new_embeddings = await _async_fetch(self, func, missing_texts, kwargs) \
+                if missing_texts else []
+            return _merge_cached(cache, keys, cached,
+                                 self.get_cache_namespace(**kwargs),
+                                 missing_texts, new_embeddings)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, texts: List[str], **kwargs):
+        cache, keys, cached, missing_texts = _split_cached(self, texts, kwargs)
+        if cache is None:
+            return _fetch(self, func, texts, kwargs)
+        new_embeddings = _fetch(self, func, missing_texts, kwargs) \
+            if missing_texts else []
+        return _merge_cached(cache, keys, cached,
+                             self.get_cache_namespace(**kwargs),
+                             missing_texts, new_embeddings)
+
+    return wrapper
@@ -7,6 +7,7 @@ from pydantic import Field
 from typing_extensions import Optional
 
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
@@ -22,6 +23,7 @@ class GeminiEmbedding(Embedding):
     client: Any = None
     gemini_api_key: Optional[str] = Field(default_factory=lambda: get_from_env("GOOGLE_API_KEY"))
 
+    @cached_embeddings
     def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """Get embeddings for a list of texts using the Gemini API."""
         if not self.client:
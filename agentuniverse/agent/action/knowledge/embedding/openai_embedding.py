@@ -13,6 +13,7 @@ from openai import OpenAI, AsyncOpenAI, BadRequestError
 from pydantic import Field
 
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
@@ -27,6 +28,7 @@ class OpenAIEmbedding(Embedding):
     async_client: Any = None
     dimensions: Optional[int] = None
 
+    @cached_embeddings
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Get the OpenAI embeddings.
 
@@ -43,7 +45,8 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.client = OpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        if self.client is None:
+            self.client = OpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
         try:
@@ -61,6 +64,7 @@ class OpenAIEmbedding(Embedding):
         except BadRequestError as e:
             raise ValueError(e.message)
 
+    @cached_embeddings
     async def async_get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Asynchronously get the OpenAI embeddings.
 
@@ -76,7 +80,8 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.async_client = AsyncOpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        if self.async_client is None:
+            self.async_client = AsyncOpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
         try:
@@ -93,6 +98,10 @@ class OpenAIEmbedding(Embedding):
         except BadRequestError as e:
             raise ValueError(e.message)
 
+    def get_cache_namespace(self, **kwargs) -> str:
+        """Key the embedding cache by `dimensions`, which is sent to the api."""
+        return f'{super().get_cache_namespace(**kwargs)}:{self.dimensions}'
+
     def as_langchain(self) -> OpenAIEmbeddings:
         """Convert the agentUniverse(aU) openai embedding class to the langchain openai embedding class."""
         return OpenAIEmbeddings(openai_api_key=self.openai_api_key,
@@ -14,6 +14,7 @@ from chromadb import QueryResult
 from chromadb.config import Settings
 from chromadb.api.models.Collection import Collection
 
+from agentuniverse.agent.action.knowledge.embedding.embedding_batcher import EmbeddingBatcher
 from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
@@ -31,6 +32,9 @@ class ChromaStore(Store):
         collection_name (str): The name of the chroma collection to use.
         collection (Collection): A chroma collection object.
         persist_path (Optional[str]): Path to save the chroma database.
+        embedding_batch_size (int): Max number of documents embedded and written in one batch.
+        embedding_batch_token_limit (Optional[int]): Max estimated tokens of one embedding batch.
+        embedding_concurrency (int): Number of batches embedded concurrently.
     """
 
     collection_name: Optional[str] = 'chroma_db'
@@ -38,6 +42,9 @@ class ChromaStore(Store):
     persist_path: Optional[str] = None
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
+    embedding_batch_size: int = 32
+    embedding_batch_token_limit: Optional[int] = None
+    embedding_concurrency: int = 4
 
     def _new_client(self) -> Any:
         """Initialize the chroma client."""
@@ -97,6 +104,33 @@ class ChromaStore(Store):
         # convert to the agentUniverse(aU) document format
         return self.to_documents(query_result)
 
+    def _get_embedding_batcher(self) -> EmbeddingBatcher:
+        return EmbeddingBatcher(embedding_model=self.embedding_model,
+                                batch_size=self.embedding_batch_size,
+                                batch_token_limit=self.embedding_batch_token_limit,
+                                max_workers=self.embedding_concurrency)
+
+    @staticmethod
+    def _write_batch(write_func, batch: List[Document],
+                     embeddings: List[List[float]]):
+        """Write one batch with a single collection call.
+
+        Chroma requires embeddings for either all or none of the records in
+        one call, so documents without embeddings are written separately and
+        embedded by the collection's embedding function.
+        """
+        embedded = [i for i, embedding in enumerate(embeddings) if len(embedding) > 0]
+        not_embedded = [i for i, embedding in enumerate(embeddings) if len(embedding) == 0]
+        for indices, with_embedding in ((embedded, True), (not_embedded, False)):
+            if not indices:
+                continue
+            write_func(
+                documents=[batch[i].text for i in indices],
+                metadatas=[batch[i].metadata for i in indices],
+                embeddings=[embeddings[i] for i in indices] if with_embedding else None,
+                ids=[batch[i].id for i in indices]
+            )
+
     def insert_document(self, documents: List[Document], **kwargs: Any):
         """Insert documents to the chroma collection.
 
@@ -107,50 +141,26 @@ class ChromaStore(Store):
         Note:
             If there is no embedding in the specific document, but the embedding model is configured in the store,
             the embedding data of the document is automatically obtained by the embedding model.
+            Documents are embedded and written in batches, see `EmbeddingBatcher`.
         """
-
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.add(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if len(embedding) > 0 else None,
-                ids=[document.id]
-            )
+        self._get_embedding_batcher().run(
+            documents,
+            lambda batch, embeddings: self._write_batch(self.collection.add, batch, embeddings)
+        )
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.upsert(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._get_embedding_batcher().run(
+            documents,
+            lambda batch, embeddings: self._write_batch(self.collection.upsert, batch, embeddings)
+        )
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.update(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._get_embedding_batcher().run(
+            documents,
+            lambda batch, embeddings: self._write_batch(self.collection.update, batch, embeddings)
+        )
 
     @staticmethod
     def to_documents(query_result: QueryResult) -> List[Document]:
@@ -182,4 +192,10 @@ class ChromaStore(Store):
             self.embedding_model = chroma_store_configer.embedding_model
         if hasattr(chroma_store_configer, "similarity_top_k"):
             self.similarity_top_k = chroma_store_configer.similarity_top_k
+        if hasattr(chroma_store_configer, "embedding_batch_size"):
+            self.embedding_batch_size = chroma_store_configer.embedding_batch_size
+        if hasattr(chroma_store_configer, "embedding_batch_token_limit"):
+            self.embedding_batch_token_limit = chroma_store_configer.embedding_batch_token_limit
+        if hasattr(chroma_store_configer, "embedding_concurrency"):
+            self.embedding_concurrency = chroma_store_configer.embedding_concurrency
         return self
@@ -5,6 +5,7 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: milvus_store.py
+import json
 from typing import List, Optional, Any
 
 try:
@@ -17,6 +18,7 @@ except ImportError as e:
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.agent.action.knowledge.embedding.embedding_batcher import EmbeddingBatcher
 from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
@@ -48,6 +50,9 @@ class MilvusStore(Store):
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
     query_embedding: bool = False
+    embedding_batch_size: int = 32
+    embedding_batch_token_limit: Optional[int] = None
+    embedding_concurrency: int = 4
 
 
     def _connect_to_milvus(self, connection_args: dict):
@@ -93,6 +98,12 @@ class MilvusStore(Store):
             self.similarity_top_k = milvus_store_configer.similarity_top_k
         if hasattr(milvus_store_configer, "query_embedding"):
             self.similarity_top_k = milvus_store_configer.query_embedding
+        if hasattr(milvus_store_configer, "embedding_batch_size"):
+            self.embedding_batch_size = milvus_store_configer.embedding_batch_size
+        if hasattr(milvus_store_configer, "embedding_batch_token_limit"):
+            self.embedding_batch_token_limit = milvus_store_configer.embedding_batch_token_limit
+        if hasattr(milvus_store_configer, "embedding_concurrency"):
+            self.embedding_concurrency = milvus_store_configer.embedding_concurrency
         return self
 
     def _create_or_load_collection(self,
@@ -203,39 +214,38 @@ class MilvusStore(Store):
         - index_params (dict, optional): Additional parameters for indexing. This dictionary
           can include specific configurations for the index creation or updating.
 
+        Documents are embedded and written in batches, see `EmbeddingBatcher`.
+
         Returns:
         None
         """
-        for document in documents:
-            embedding = document.embedding
-            if len(embedding) == 0:
-                if not self.embedding_model:
-                    raise Exception("Milvus store can only save vector, "
-                                    "you should provide embedding in your document or specify an embedding model.")
-                else:
-                    embedding = EmbeddingManager().get_instance_obj(
-                        self.embedding_model
-                    ).get_embeddings([document.text])[0]
+        if not self.embedding_model and any(
+                len(document.embedding) == 0 for document in documents):
+            raise Exception("Milvus store can only save vector, "
+                            "you should provide embedding in your document or specify an embedding model.")
 
+        def write_batch(batch: List[Document], embeddings: List[List[float]]):
             if not self.collection:
                 self._create_or_load_collection(
-                    dim=len(embedding),
+                    dim=len(embeddings[0]),
                     max_length=max_length,
                     index_params=index_params
                 )
-            expr = f'id == "{document.id}"'
-            existing_docs = self.collection.query(expr)
-            entities = [
-                [document.id],
-                [embedding],
-                [document.text],
-                [document.metadata]
-            ]
-            if existing_docs:
-                self.collection.delete(expr)
-                self.collection.insert(entities)
-            else:
-                self.collection.insert(entities)
+            ids = [document.id for document in batch]
+            self.collection.delete(f'id in {json.dumps(ids)}')
+            self.collection.insert([
+                ids,
+                embeddings,
+                [document.text for document in batch],
+                [document.metadata for document in batch]
+            ])
+
+        EmbeddingBatcher(embedding_model=self.embedding_model,
+                         batch_size=self.embedding_batch_size,
+                         batch_token_limit=self.embedding_batch_token_limit,
+                         max_workers=self.embedding_concurrency
+                         ).run(documents, write_batch)
+        if self.collection:
             self.collection.load()
 
     def insert_document(self,
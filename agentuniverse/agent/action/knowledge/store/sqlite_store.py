@@ -7,11 +7,11 @@
 # @FileName: sqlite_store.py
 import sqlite3
 import json
-import math
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Dict, Tuple
 from collections import Counter
 
 import jieba
+import numpy as np
 
 from agentuniverse.agent.action.knowledge.store.store import Store
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -22,6 +22,13 @@ from agentuniverse.base.config.component_configer.component_configer import \
 
 
 class SQLiteStore(Store):
+    """Keyword store backed by an on-disk BM25 inverted index.
+
+    The inverted index keeps one posting per (term, doc_id) together with the
+    term frequency of the term in the document, and the corpus statistics
+    (document count and total word count) are maintained incrementally on
+    every write, so a query only needs the postings of its own keywords.
+    """
     db_path: str = 'sqlite_store.db'
     conn: Optional[sqlite3.Connection] = None
     k1: float = 1.5
@@ -43,13 +50,62 @@ class SQLiteStore(Store):
                     metadata TEXT
                 )
             ''')
+            legacy_index = self._is_legacy_index()
+            if legacy_index:
+                self.conn.execute(
+                    'ALTER TABLE inverted_index RENAME TO inverted_index_legacy')
             self.conn.execute('''
                 CREATE TABLE IF NOT EXISTS inverted_index (
                     term TEXT,
                     doc_id TEXT,
+                    tf INT,
+                    PRIMARY KEY (term, doc_id),
                     FOREIGN KEY (doc_id) REFERENCES documents (id)
+                ) WITHOUT ROWID
+            ''')
+            self.conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inverted_index_doc_id
+                ON inverted_index (doc_id)
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS corpus_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    doc_count INT,
+                    total_word_count INT
                 )
             ''')
+            if legacy_index:
+                self._migrate_legacy_index()
+            self.conn.execute('''
+                INSERT OR IGNORE INTO corpus_stats (id, doc_count, total_word_count)
+                SELECT 0, COUNT(*), COALESCE(SUM(word_count), 0) FROM documents
+            ''')
+
+    def _is_legacy_index(self) -> bool:
+        """Whether the inverted index was created without term frequencies."""
+        columns = [row[1] for row in self.conn.execute(
+            'PRAGMA table_info(inverted_index)').fetchall()]
+        return len(columns) > 0 and 'tf' not in columns
+
+    def _migrate_legacy_index(self):
+        """Rebuild postings of a store created by an older version, whose
+        inverted index only recorded (term, doc_id) pairs."""
+        rows = self.conn.execute('''
+            SELECT DISTINCT l.doc_id, l.term, d.text
+            FROM inverted_index_legacy l JOIN documents d ON d.id = l.doc_id
+            ORDER BY l.doc_id
+        ''').fetchall()
+        postings = []
+        counter_doc_id, doc_counter = None, Counter()
+        for doc_id, term, text in rows:
+            if doc_id != counter_doc_id:
+                counter_doc_id, doc_counter = doc_id, Counter(
+                    jieba.lcut(text or ''))
+            postings.append((term, doc_id, doc_counter[term]))
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO inverted_index (term, doc_id, tf) VALUES (?, ?, ?)',
+            postings)
+        self.conn.execute('DROP TABLE inverted_index_legacy')
 
     def _initialize_by_component_configer(self,
                                           sqlite_store_configer: ComponentConfiger) -> 'DocProcessor':
@@ -66,48 +122,18 @@ class SQLiteStore(Store):
             self.similarity_top_k = sqlite_store_configer.similarity_top_k
         return self
 
+    def _get_corpus_stats(self) -> Tuple[int, int]:
+        """Return the cached (document count, total word count) of the corpus."""
+        row = self.conn.execute(
+            'SELECT doc_count, total_word_count FROM corpus_stats WHERE id = 0'
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
 
     def _get_all_docs_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM documents')
-            count = cursor.fetchone()[0]
-            cursor.close()
-        return count
+        return self._get_corpus_stats()[0]
 
     def _get_all_docs_words_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT SUM(word_count) FROM documents')
-            total_word_count = cursor.fetchone()[0]
-            cursor.close()
-        return total_word_count if total_word_count is not None else 0
-
-    def compute_bm25(self, query_text, doc_text, inverted_index,
-                     total_doc_count, total_word_count):
-        k1 = self.k1
-        b = self.b
-        query_words = jieba.lcut(query_text)
-        doc_words = jieba.lcut(doc_text)
-        doc_length = len(doc_words)
-        avg_doc_length = total_word_count / total_doc_count
-        bm25_score = 0
-
-        doc_counter = Counter(doc_words)
-
-        for term in query_words:
-            if term in inverted_index:
-                term_freq = doc_counter[term]
-                num_docs_with_term = len(inverted_index[term])
-                idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (
-                        num_docs_with_term + 0.5) + 1)
-                bm25_term_score = idf * (term_freq * (k1 + 1)) / (
-                        term_freq + k1 * (
-                        1 - b + b * (doc_length / avg_doc_length)))
-                bm25_score += bm25_term_score
-
-        return bm25_score
-
+        return self._get_corpus_stats()[1]
 
     def _get_document_keyword(self, document: Document) -> Set[str]:
         if not self.keyword_extractor:
@@ -119,54 +145,126 @@ class SQLiteStore(Store):
                 .process_docs([document])
             return _doc[0].keywords
 
-    def insert_document(self, documents: List[Document], **kwargs):
-        with self.conn:
-            for document in documents:
-                metadata = json.dumps(
-                    document.metadata) if document.metadata else None
-                self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (document.id, document.text, len(jieba.lcut(document.text)), metadata)
-                )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
-
-    def delete_document(self, document_id: int):
-        with self.conn:
-            self.conn.execute(
-                'DELETE FROM documents WHERE id = ?',
-                (document_id,)
-            )
-            self.conn.execute(
-                'DELETE FROM inverted_index WHERE doc_id = ?',
-                (document_id,)
-            )
+    def _write_documents(self, documents: List[Document]):
+        """Write documents and their postings, replacing any existing ones.
 
-    def upsert_document(self, documents: List[Document], **kwargs):
+        Postings and corpus statistics of a replaced document are removed
+        before the new version is indexed, all within one transaction.
+        """
         with self.conn:
             for document in documents:
+                doc_counter = Counter(jieba.lcut(document.text))
+                word_count = sum(doc_counter.values())
+                keywords = self._get_document_keyword(document)
+                self._remove_document(document.id)
                 metadata = json.dumps(
                     document.metadata) if document.metadata else None
                 self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (
-                    document.id, document.text, len(jieba.lcut(document.text)),
-                    metadata)
+                    'INSERT INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
+                    (document.id, document.text, word_count, metadata)
+                )
+                self.conn.executemany(
+                    'INSERT INTO inverted_index (term, doc_id, tf) VALUES (?, ?, ?)',
+                    [(term, document.id, doc_counter[term]) for term in
+                     set(keywords)]
                 )
                 self.conn.execute(
-                    'DELETE FROM inverted_index WHERE doc_id = ?',
-                    (document.id,)
+                    'UPDATE corpus_stats SET doc_count = doc_count + 1, '
+                    'total_word_count = total_word_count + ? WHERE id = 0',
+                    (word_count,)
                 )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
+
+    def _remove_document(self, document_id: str):
+        """Remove a document, its postings and its share of the corpus
+        statistics. Must be called inside a transaction."""
+        row = self.conn.execute(
+            'SELECT word_count FROM documents WHERE id = ?',
+            (document_id,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute('DELETE FROM documents WHERE id = ?',
+                          (document_id,))
+        self.conn.execute('DELETE FROM inverted_index WHERE doc_id = ?',
+                          (document_id,))
+        self.conn.execute(
+            'UPDATE corpus_stats SET doc_count = doc_count - 1, '
+            'total_word_count = total_word_count - ? WHERE id = 0',
+            (row[0] or 0,)
+        )
+
+    def insert_document(self, documents: List[Document], **kwargs):
+        self._write_documents(documents)
+
+    def delete_document(self, document_id: str, **kwargs):
+        with self.conn:
+            self._remove_document(document_id)
+
+    def upsert_document(self, documents: List[Document], **kwargs):
+        self._write_documents(documents)
+
+    def _get_postings(self, terms: List[str]) -> List[Tuple[str, str, int, int]]:
+        """Fetch (term, doc_id, tf, doc_length) postings of the given terms."""
+        placeholders = ','.join('?' * len(terms))
+        return self.conn.execute(
+            f'SELECT i.term, i.doc_id, i.tf, d.word_count '
+            f'FROM inverted_index i JOIN documents d ON d.id = i.doc_id '
+            f'WHERE i.term IN ({placeholders})',
+            terms).fetchall()
+
+    def _score_postings(self, postings: List[Tuple[str, str, int, int]],
+                        term_weights: Dict[str, int]) -> Tuple[List[str], np.ndarray]:
+        """Score all candidate documents of the postings with BM25 at once.
+
+        Args:
+            postings: (term, doc_id, tf, doc_length) tuples.
+            term_weights: How many times each term occurs in the query.
+
+        Returns:
+            The candidate doc ids and their BM25 scores.
+        """
+        total_doc_count, total_word_count = self._get_corpus_stats()
+        avg_doc_length = total_word_count / total_doc_count \
+            if total_doc_count and total_word_count else 1.0
+
+        doc_index: Dict[str, int] = {}
+        doc_ids: List[str] = []
+        term_df = Counter(posting[0] for posting in postings)
+        rows = np.empty(len(postings), dtype=np.int64)
+        tf = np.empty(len(postings), dtype=np.float64)
+        doc_length = np.empty(len(postings), dtype=np.float64)
+        df = np.empty(len(postings), dtype=np.float64)
+        weight = np.empty(len(postings), dtype=np.float64)
+        for i, (term, doc_id, term_freq, word_count) in enumerate(postings):
+            if doc_id not in doc_index:
+                doc_index[doc_id] = len(doc_ids)
+                doc_ids.append(doc_id)
+            rows[i] = doc_index[doc_id]
+            tf[i] = term_freq or 0
+            doc_length[i] = word_count or 0
+            df[i] = term_df[term]
+            weight[i] = term_weights.get(term, 0)
+
+        idf = np.log((total_doc_count - df + 0.5) / (df + 0.5) + 1)
+        term_scores = weight * idf * (tf * (self.k1 + 1)) / (
+                tf + self.k1 * (1 - self.b + self.b * doc_length / avg_doc_length))
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+        np.add.at(scores, rows, term_scores)
+        return doc_ids, scores
+
+    def _get_documents_by_ids(self, doc_ids: List[str]) -> List[Document]:
+        """Load documents in one statement, keeping the order of doc_ids."""
+        placeholders = ','.join('?' * len(doc_ids))
+        doc_rows = {row[0]: row for row in self.conn.execute(
+            f'SELECT id, text, word_count, metadata FROM documents WHERE id IN ({placeholders})',
+            doc_ids).fetchall()}
+        results = []
+        for doc_id in doc_ids:
+            doc_row = doc_rows.get(doc_id)
+            if doc_row is None:
+                continue
+            results.append(Document(id=doc_row[0], text=doc_row[1],
+                                    metadata=json.loads(doc_row[3]) if doc_row[3] else None))
+        return results
 
     def query(self, query: Query, **kwargs) -> List[Document]:
         if len(query.keywords) > 0:
@@ -174,53 +272,28 @@ class SQLiteStore(Store):
         else:
             query_terms = self._get_document_keyword(Document(text=query.query_str))
             query.keywords = query_terms
+        query_terms = list(query_terms)
+        if not query_terms:
+            return []
 
-        # Get doc_id from inverted index.
-        relevant_docs = set()
-        inverted_index = {}
-        with self.conn:
-            for keyword in query_terms:
-                cursor = self.conn.cursor()
-                cursor.execute(
-                    'SELECT doc_id FROM inverted_index WHERE term = ?',
-                    (keyword,))
-                docs_with_keyword = [row[0] for row in cursor.fetchall()]
-                inverted_index[keyword] = docs_with_keyword
-                relevant_docs.update(docs_with_keyword)
-                cursor.close()
-
-        # Count every document's bm25.
-        doc_scores = []
-        total_doc_count = self._get_all_docs_count()
-        total_word_count = self._get_all_docs_words_count()
-        for doc_id in relevant_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT text FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_text = cursor.fetchone()[0]
-            cursor.close()
-
-            bm25_score = self.compute_bm25(query.query_str, doc_text,
-                                           inverted_index, total_doc_count, total_word_count)
-            doc_scores.append((doc_id, bm25_score))
+        # Query terms are weighted by their occurrences in the query text.
+        query_counter = Counter(jieba.lcut(query.query_str)) \
+            if query.query_str else Counter(query_terms)
+        term_weights = {term: query_counter[term] for term in query_terms}
 
-        # Order the docs with bm25, and return top k.
-        doc_scores.sort(key=lambda x: x[1], reverse=True)
-        top_docs = doc_scores[:self.similarity_top_k]
-        results = []
-        for doc_id, score in top_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_row = cursor.fetchone()
-            cursor.close()
-
-            document = Document(id=doc_row[0], text=doc_row[1],
-                                word_count=doc_row[2],
-                                metadata=json.loads(doc_row[3]))
-            results.append(document)
+        postings = self._get_postings(query_terms)
+        if not postings:
+            return []
 
-        return results
+        # Order the docs with bm25, and return top k.
+        doc_ids, scores = self._score_postings(postings, term_weights)
+        top_k = query.similarity_top_k or self.similarity_top_k
+        if top_k < len(doc_ids):
+            top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_indices = np.arange(len(doc_ids))
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind='stable')]
+        return self._get_documents_by_ids([doc_ids[i] for i in top_indices])
 
     @staticmethod
     def to_documents(query_result) -> List[Document]:
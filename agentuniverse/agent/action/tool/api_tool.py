@@ -6,14 +6,49 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: api_tool.py
 import json
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 from urllib.parse import urlencode
 import httpx
+from pydantic import PrivateAttr
 
 from agentuniverse.agent.action.tool.tool import Tool, ToolInput
 from agentuniverse.agent.action.tool.utils import ssrf_proxy
 from agentuniverse.base.config.component_configer.configers.tool_configer import ToolConfiger
 
+HTTP_METHODS = ('get', 'head', 'post', 'put', 'delete', 'patch')
+
+
+class CompiledOperation:
+    """The parts of an openapi spec a request is built from, parsed once per
+    spec instead of on every call.
+
+    Attributes:
+        spec (dict): The openapi spec the operation was compiled from.
+        parameters (List[dict]): The parameters of the operation.
+        content_type (Optional[str]): Content type of the request body.
+        body_properties (List[Tuple[str, dict]]): Name and schema of the body
+            properties.
+        body_required (set): Names of the required body properties.
+        operation_id (str): Id of the operation.
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        operation = spec.get('operation') or {}
+        self.parameters: List[dict] = list(operation.get('parameters', []))
+        self.operation_id = operation.get('operationId', '')
+        self.content_type: Optional[str] = None
+        self.body_properties: List[Tuple[str, dict]] = []
+        self.body_required = set()
+        request_body = spec.get('requestBody')
+        if request_body is not None and 'content' in request_body:
+            for content_type, content in request_body['content'].items():
+                self.content_type = content_type
+                body_schema = content['schema']
+                self.body_required = set(body_schema.get('required', []))
+                self.body_properties = list(body_schema.get('properties', {}).items())
+                break
+
 
 class APITool(Tool):
     """The basic class for api tool model.
@@ -22,6 +57,7 @@ class APITool(Tool):
         openapi_spec(str): The openapi schema of the api tool.
     """
     openapi_spec: Optional[dict] = None
+    _compiled_operation: Optional[CompiledOperation] = PrivateAttr(default=None)
 
     def execute(self, tool_input: ToolInput):
         res = self.do_http_request(self.openapi_spec.get('url'), self.openapi_spec.get('method'), {},
@@ -32,8 +68,19 @@ class APITool(Tool):
         super().initialize_by_component_configer(component_configer)
         if component_configer.__dict__['openapi_spec']:
             self.openapi_spec = component_configer.__dict__['openapi_spec']
+        if self.openapi_spec:
+            self.compiled_operation()
         return self
 
+    def compiled_operation(self) -> CompiledOperation:
+        """The compiled operation of the openapi spec, compiled again only if
+        the spec is replaced."""
+        compiled = self._compiled_operation
+        if compiled is None or compiled.spec is not self.openapi_spec:
+            compiled = CompiledOperation(self.openapi_spec)
+            self._compiled_operation = compiled
+        return compiled
+
     def convert_body_property_any_of(self, property: dict[str, Any], value: Any, any_of: list[dict[str, Any]],
                                      max_recursive=10) -> Any:
         """Convert a property value based on its anyOf type."""
@@ -124,12 +171,16 @@ class APITool(Tool):
             httpx.Response: The response from the request.
         """
         method = method.lower()
+        if method not in HTTP_METHODS:
+            raise ValueError('Invalid http method')
+        operation = self.compiled_operation()
+        headers = dict(headers)
         params = {}
         path_params = {}
         body = {}
         cookies = {}
         # check parameters
-        for parameter in self.openapi_spec.get('operation').get('parameters', []):
+        for parameter in operation.parameters:
             value = self.get_parameter_value(parameter, parameters)
             if value is not None:
                 if parameter['in'] == 'path':
@@ -145,29 +196,21 @@ class APITool(Tool):
                     headers[parameter['name']] = value
 
         # check if there is a request body and handle it
-        if 'requestBody' in self.openapi_spec and self.openapi_spec['requestBody'] is not None:
-            # handle json request body
-            if 'content' in self.openapi_spec['requestBody']:
-                for content_type in self.openapi_spec['requestBody']['content']:
-                    headers['Content-Type'] = content_type
-                    body_schema = self.openapi_spec[
-                        'requestBody']['content'][content_type]['schema']
-                    required = body_schema.get('required', [])
-                    properties = body_schema.get('properties', {})
-                    for name, property in properties.items():
-                        if name in parameters:
-                            # convert type
-                            body[name] = self.convert_body_property_type(
-                                property, parameters[name])
-                        elif name in required:
-                            raise Exception(
-                                f"Missing required parameter {name} in operation {self.plugin_api_model.operation_id}"
-                            )
-                        elif 'default' in property:
-                            body[name] = property['default']
-                        else:
-                            body[name] = None
-                    break
+        if operation.content_type is not None:
+            headers['Content-Type'] = operation.content_type
+            for name, property in operation.body_properties:
+                if name in parameters:
+                    # convert type
+                    body[name] = self.convert_body_property_type(
+                        property, parameters[name])
+                elif name in operation.body_required:
+                    raise Exception(
+                        f"Missing required parameter {name} in operation {operation.operation_id}"
+                    )
+                elif 'default' in property:
+                    body[name] = property['default']
+                else:
+                    body[name] = None
 
         # replace path parameters
         for name, value in path_params.items():
@@ -179,14 +222,8 @@ class APITool(Tool):
                 body = json.dumps(body)
             elif headers['Content-Type'] == 'application/x-www-form-urlencoded':
                 body = urlencode(body)
-            else:
-                body = body
-        if method in ('get', 'head', 'post', 'put', 'delete', 'patch'):
-            response = getattr(ssrf_proxy, method)(url, params=params, headers=headers, data=body,
-                                                   follow_redirects=True)
-            return response
-        else:
-            raise ValueError(f'Invalid http method')
+        return getattr(ssrf_proxy, method)(url, params=params, headers=headers, data=body,
+                                           follow_redirects=True)
 
     @staticmethod
     def get_parameter_value(parameter, parameters):
@@ -30,7 +30,7 @@ class ToolManager(ComponentManagerBase):
             return self.get_default_instance(new_instance)
         appname = appname or ApplicationConfigManager().app_configer.base_info_appname
         instance_code = f'{appname}.{self._component_type.value.lower()}.{component_instance_name}'
-        instance_obj = self._instance_obj_map.get(instance_code)
+        instance_obj = self._get_instance(instance_code)
         # If the instance does not exist, try to create it using the configuration
         if instance_obj is None:
             # Retrieve the tool configuration map
@@ -5,26 +5,159 @@
 # @Author  : sunshinesmilelk
 # @Email   : ximo.lk@antgroup.com
 # @FileName: ssrf_proxy.py
+import asyncio
+import importlib.util
 import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
 import httpx
 
 SSRF_PROXY_ALL_URL = os.getenv('SSRF_PROXY_ALL_URL', '')
 SSRF_PROXY_HTTP_URL = os.getenv('SSRF_PROXY_HTTP_URL', '')
 SSRF_PROXY_HTTPS_URL = os.getenv('SSRF_PROXY_HTTPS_URL', '')
 
+# Pool sizing of the shared clients.
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv('HTTP_CLIENT_MAX_CONNECTIONS', 100))
+HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS', 20))
+HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_CLIENT_KEEPALIVE_EXPIRY', 30))
+# Max concurrent requests to one host, 0 for no cap.
+HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST', 20))
+DEFAULT_TIMEOUT = 20
+
 proxies = {
     'http://': SSRF_PROXY_HTTP_URL,
     'https://': SSRF_PROXY_HTTPS_URL
 } if SSRF_PROXY_HTTP_URL and SSRF_PROXY_HTTPS_URL else None
 
+# HTTP/2 needs the optional h2 package.
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
 
-def make_request(method, url, **kwargs):
+_lock = threading.Lock()
+_clients_pid = os.getpid()
+_clients: Dict[Tuple, httpx.Client] = {}
+# Async clients are bound to the event loop they are used in.
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, httpx.AsyncClient]]' = \
+    weakref.WeakKeyDictionary()
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_async_host_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = \
+    weakref.WeakKeyDictionary()
+
+
+def _proxy_config() -> Tuple:
+    """The key of the proxy configuration the clients are shared by."""
     if SSRF_PROXY_ALL_URL:
-        return httpx.request(method=method, url=url, proxy=SSRF_PROXY_ALL_URL, timeout=20, **kwargs)
-    elif proxies:
-        return httpx.request(method=method, url=url, proxies=proxies, timeout=20, **kwargs)
-    else:
-        return httpx.request(method=method, url=url, timeout=20, **kwargs)
+        return ('all', SSRF_PROXY_ALL_URL)
+    if proxies:
+        return ('scheme', proxies['http://'], proxies['https://'])
+    return ('none',)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY)
+
+
+def _client_kwargs(proxy_config: Tuple, transport_class) -> dict:
+    kwargs = dict(timeout=DEFAULT_TIMEOUT, limits=_limits(), http2=HTTP2_AVAILABLE)
+    if proxy_config[0] == 'all':
+        kwargs['proxy'] = proxy_config[1]
+    elif proxy_config[0] == 'scheme':
+        kwargs['mounts'] = {
+            'http://': transport_class(proxy=proxy_config[1], limits=_limits(), http2=HTTP2_AVAILABLE),
+            'https://': transport_class(proxy=proxy_config[2], limits=_limits(), http2=HTTP2_AVAILABLE),
+        }
+    return kwargs
+
+
+def _reset_after_fork():
+    """Clients inherited from a parent process share its sockets, so every
+    process builds its own."""
+    global _clients_pid
+    if _clients_pid != os.getpid():
+        _clients.clear()
+        _async_clients.clear()
+        _host_semaphores.clear()
+        _async_host_semaphores.clear()
+        _clients_pid = os.getpid()
+
+
+def get_client() -> httpx.Client:
+    """Return the shared keep-alive client of current proxy configuration."""
+    proxy_config = _proxy_config()
+    with _lock:
+        _reset_after_fork()
+        client = _clients.get(proxy_config)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_kwargs(proxy_config, httpx.HTTPTransport))
+            _clients[proxy_config] = client
+        return client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive async client of current proxy
+    configuration and running event loop."""
+    proxy_config = _proxy_config()
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _reset_after_fork()
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(proxy_config)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_kwargs(proxy_config, httpx.AsyncHTTPTransport))
+            loop_clients[proxy_config] = client
+        return client
+
+
+def _host_semaphore(url) -> Optional[threading.BoundedSemaphore]:
+    if HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST <= 0:
+        return None
+    host = httpx.URL(url).host
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        with _lock:
+            semaphore = _host_semaphores.setdefault(
+                host, threading.BoundedSemaphore(HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST))
+    return semaphore
+
+
+def _async_host_semaphore(url) -> Optional[asyncio.Semaphore]:
+    if HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST <= 0:
+        return None
+    host = httpx.URL(url).host
+    loop_semaphores = _async_host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = loop_semaphores.get(host)
+    if semaphore is None:
+        semaphore = loop_semaphores[host] = asyncio.Semaphore(HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST)
+    return semaphore
+
+
+def make_request(method, url, **kwargs):
+    semaphore = _host_semaphore(url)
+    if semaphore is None:
+        return get_client().request(method=method, url=url, **kwargs)
+    if not semaphore.acquire(timeout=DEFAULT_TIMEOUT):
+        raise httpx.PoolTimeout(f"Too many concurrent requests to {httpx.URL(url).host}.")
+    try:
+        return get_client().request(method=method, url=url, **kwargs)
+    finally:
+        semaphore.release()
+
+
+async def async_make_request(method, url, **kwargs):
+    semaphore = _async_host_semaphore(url)
+    if semaphore is None:
+        return await get_async_client().request(method=method, url=url, **kwargs)
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=DEFAULT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise httpx.PoolTimeout(f"Too many concurrent requests to {httpx.URL(url).host}.")
+    try:
+        return await get_async_client().request(method=method, url=url, **kwargs)
+    finally:
+        semaphore.release()
 
 
 def get(url, **kwargs):
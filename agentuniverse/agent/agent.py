@@ -5,21 +5,25 @@
 # @Author  : heji
 # @Email   : lc299034@antgroup.com
 # @FileName: agent.py
+import asyncio
+import functools
 import json
+import threading
+import time
 import uuid
 from abc import abstractmethod, ABC
+from concurrent.futures import wait
 from datetime import datetime
 from threading import Thread
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Callable
 
 from langchain_core.runnables import RunnableSerializable, RunnableConfig
 from langchain_core.utils.json import parse_json_markdown
 
+from agentuniverse.agent.action.action_registry import get_compiled_actions
 from agentuniverse.agent.action.knowledge.knowledge import Knowledge
-from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.tool.tool import Tool
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
 from agentuniverse.agent.agent_model import AgentModel
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.memory.memory import Memory
@@ -38,6 +42,7 @@ from agentuniverse.base.config.component_configer.configers.agent_configer \
     import AgentConfiger
 from agentuniverse.base.util.agent_util import process_agent_llm_config
 from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.concurrency_util import get_shared_executor
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.memory_util import generate_messages, get_memory_string
@@ -49,6 +54,34 @@ from agentuniverse.prompt.prompt import Prompt
 from agentuniverse.prompt.prompt_manager import PromptManager
 from agentuniverse.prompt.prompt_model import AgentPromptModel
 
+ACTION_EXECUTOR_NAME = 'agent_action'
+# The sync methods of an agent and their async counterparts, outer first.
+ASYNC_METHOD_PAIRS = (('run', 'async_run'),
+                      ('execute', 'async_execute'),
+                      ('customized_execute', 'customized_async_execute'))
+
+
+class _ActionCall:
+    """An action call remembering when it started on a worker, so that its
+    timeout leaves out the time it waited for one."""
+
+    def __init__(self, action_func: Callable, on_start: Optional[Callable] = None):
+        self.action_func = action_func
+        self.on_start = on_start
+        self.started = threading.Event()
+        self.start_time: Optional[float] = None
+
+    def __call__(self):
+        self.start_time = time.monotonic()
+        self.started.set()
+        if self.on_start:
+            self.on_start()
+        return self.action_func()
+
+    def remaining(self, timeout: float) -> float:
+        """Seconds left of the timeout, counted from the start of the call."""
+        return max(self.start_time + timeout - time.monotonic(), 0)
+
 
 class Agent(ComponentBase, ABC):
     """The parent class of all agent models, containing only attributes."""
@@ -144,6 +177,12 @@ class Agent(ComponentBase, ABC):
     async def async_execute(self, input_object: InputObject, agent_input: dict) -> dict:
         pass
 
+    def has_native_async(self) -> bool:
+        """Whether `async_run` of the agent runs its own logic on the event
+        loop, so async servers can await it instead of running `run` in a
+        worker thread."""
+        return _has_native_async(type(self))
+
     def pre_parse_input(self, input_object) -> dict:
         """Agent execution parameter pre-parsing.
 
@@ -245,6 +284,9 @@ class Agent(ComponentBase, ABC):
         if is_system_builtin(llm):
             LOGGER.warn("The system built-in LLM configuration YAML will be removed in the next version. "
                         "Please configure your own LLM model in the application's YAML file.")
+        llm_cache = self.agent_model.profile.get('llm_model', {}).get('llm_cache')
+        if llm and llm_cache is not None:
+            llm.llm_cache = llm.merge_llm_cache(llm_cache)
         return llm
 
     def process_memory(self, agent_input: dict, **kwargs) -> Memory | None:
@@ -317,34 +359,132 @@ class Agent(ComponentBase, ABC):
         tool_names = kwargs.get('tool_names') or self.agent_model.action.get('tool', [])
         if not tool_names:
             return ''
+        tools = get_compiled_actions(tool_names=tool_names).tools
+        tool_calls = [(tool_name, functools.partial(self._run_tool, tools[tool_name], input_object))
+                      for tool_name in tool_names if tool_name in tools]
+        return "\n\n".join(self._run_actions(tool_calls, self._get_action_timeout(**kwargs)))
 
-        tool_results: list = list()
-
-        for tool_name in tool_names:
-            tool: Tool = ToolManager().get_instance_obj(tool_name)
-            if tool is None:
-                continue
-            tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
-            tool_results.append(str(tool.run(**tool_input)))
-        return "\n\n".join(tool_results)
+    async def async_invoke_tools(self, input_object: InputObject, **kwargs) -> str:
+        tool_names = kwargs.get('tool_names') or self.agent_model.action.get('tool', [])
+        if not tool_names:
+            return ''
+        tools = get_compiled_actions(tool_names=tool_names).tools
+        tool_calls = [(tool_name, functools.partial(self._run_tool, tools[tool_name], input_object))
+                      for tool_name in tool_names if tool_name in tools]
+        return "\n\n".join(await self._async_run_actions(tool_calls, self._get_action_timeout(**kwargs)))
 
     def invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
         knowledge_names = kwargs.get('knowledge_names') or self.agent_model.action.get('knowledge', [])
         if not knowledge_names or not query_str:
             return ''
+        knowledge = get_compiled_actions(knowledge_names=knowledge_names).knowledge
+        knowledge_calls = [(knowledge_name, functools.partial(self._run_knowledge, knowledge[knowledge_name],
+                                                              query_str, input_object))
+                           for knowledge_name in knowledge_names if knowledge_name in knowledge]
+        return "\n\n".join(self._run_actions(knowledge_calls, self._get_action_timeout(**kwargs)))
+
+    async def async_invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
+        knowledge_names = kwargs.get('knowledge_names') or self.agent_model.action.get('knowledge', [])
+        if not knowledge_names or not query_str:
+            return ''
+        knowledge = get_compiled_actions(knowledge_names=knowledge_names).knowledge
+        knowledge_calls = [(knowledge_name, functools.partial(self._run_knowledge, knowledge[knowledge_name],
+                                                              query_str, input_object))
+                           for knowledge_name in knowledge_names if knowledge_name in knowledge]
+        return "\n\n".join(await self._async_run_actions(knowledge_calls, self._get_action_timeout(**kwargs)))
+
+    @staticmethod
+    def _run_tool(tool: Tool, input_object: InputObject) -> str:
+        tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
+        return str(tool.run(**tool_input))
+
+    @staticmethod
+    def _run_knowledge(knowledge: Knowledge, query_str: str, input_object: InputObject) -> str:
+        knowledge_res: List[Document] = knowledge.query_knowledge(
+            query_str=query_str,
+            **input_object.to_dict()
+        )
+        return knowledge.to_llm(knowledge_res)
 
-        knowledge_results: list = list()
+    def _get_action_timeout(self, **kwargs) -> Optional[float]:
+        """Per call timeout of tools and knowledge, in seconds.
 
-        for knowledge_name in knowledge_names:
-            knowledge: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
-            if knowledge is None:
+        Configured by `action.timeout` in the agent yaml, None means no limit.
+        """
+        timeout = kwargs.get('timeout')
+        if timeout is None and self.agent_model.action:
+            timeout = self.agent_model.action.get('timeout')
+        return timeout
+
+    @staticmethod
+    def _run_actions(action_calls: List[tuple], timeout: Optional[float] = None) -> List[str]:
+        """Run independent tool or knowledge calls concurrently.
+
+        Results keep the configured order of the calls; a call that fails or
+        exceeds the timeout is logged and left out of the results. The timeout
+        of a call counts from its start, not from the time it was queued for a
+        worker of the shared pool.
+        """
+        if (len(action_calls) == 1 and timeout is None) \
+                or threading.current_thread().name.startswith(ACTION_EXECUTOR_NAME):
+            # run inline, nested calls must not wait on the pool they are running in.
+            results = []
+            for action_name, action_func in action_calls:
+                try:
+                    results.append(action_func())
+                except Exception as e:
+                    LOGGER.warn(f"Agent action {action_name} failed: {e}")
+            return [res for res in results if res is not None]
+
+        executor = get_shared_executor(ACTION_EXECUTOR_NAME)
+        calls = [_ActionCall(action_func) for _, action_func in action_calls]
+        futures = [executor.submit(call) for call in calls]
+        if timeout is None:
+            wait(futures)
+            in_time = [True] * len(futures)
+        else:
+            in_time = []
+            for call, future in zip(calls, futures):
+                call.started.wait()
+                in_time.append(bool(wait([future], timeout=call.remaining(timeout)).done))
+        results = []
+        for (action_name, _), future, done in zip(action_calls, futures, in_time):
+            if not done:
+                LOGGER.warn(f"Agent action {action_name} timed out after {timeout}s.")
+                continue
+            try:
+                res = future.result()
+            except Exception as e:
+                LOGGER.warn(f"Agent action {action_name} failed: {e}")
                 continue
-            knowledge_res: List[Document] = knowledge.query_knowledge(
-                query_str=query_str,
-                **input_object.to_dict()
-            )
-            knowledge_results.append(knowledge.to_llm(knowledge_res))
-        return "\n\n".join(knowledge_results)
+            if res is not None:
+                results.append(res)
+        return results
+
+    @staticmethod
+    async def _async_run_actions(action_calls: List[tuple], timeout: Optional[float] = None) -> List[str]:
+        """Async version of `_run_actions`, awaiting the calls with asyncio.gather."""
+        loop = asyncio.get_running_loop()
+        executor = get_shared_executor(ACTION_EXECUTOR_NAME)
+
+        async def run_action(action_name: str, action_func) -> Optional[str]:
+            started = asyncio.Event()
+            call = _ActionCall(action_func, on_start=lambda: loop.call_soon_threadsafe(started.set))
+            future = loop.run_in_executor(executor, call)
+            try:
+                if timeout is None:
+                    return await future
+                await started.wait()
+                return await asyncio.wait_for(future, call.remaining(timeout))
+            except asyncio.TimeoutError:
+                LOGGER.warn(f"Agent action {action_name} timed out after {timeout}s.")
+            except Exception as e:
+                LOGGER.warn(f"Agent action {action_name} failed: {e}")
+            return None
+
+        results = await asyncio.gather(*(run_action(action_name, action_func)
+                                         for action_name, action_func in action_calls))
+        return [res for res in results if res is not None]
 
     def process_prompt(self, agent_input: dict, **kwargs) -> ChatPrompt:
         expert_framework = agent_input.pop('expert_framework', '') or ''
@@ -483,7 +623,42 @@ class Agent(ComponentBase, ABC):
         return "Up to Now, No Summarize Memory"
 
     def create_copy(self):
-        copied = self.model_copy()
-        if self.agent_model is not None:
-            copied.agent_model = self.agent_model.model_copy(deep=True)
-        return copied
+        return self.model_copy(update=self._get_copy_update())
+
+    def _get_copy_update(self) -> dict:
+        """Return the fields the copy must not share with this agent.
+
+        The configuration is copied structurally instead of deeply, and all
+        fields are set in one go, which keeps per-request lookups cheap.
+        """
+        if self.agent_model is None:
+            return {}
+        return {'agent_model': self.agent_model.create_copy()}
+
+
+@functools.lru_cache(maxsize=None)
+def _has_native_async(agent_class: type) -> bool:
+    """An agent class runs natively async when, for each of its sync methods,
+    the async counterpart is overridden in the same class or a subclass of
+    it, e.g. a template overriding `customized_execute` only keeps the
+    generic async path of its parent and is not native async."""
+    mro = agent_class.__mro__
+
+    def defined_at(name: str) -> Optional[int]:
+        return next((index for index, cls in enumerate(mro) if name in cls.__dict__), None)
+
+    for sync_name, async_name in ASYNC_METHOD_PAIRS:
+        sync_index, async_index = defined_at(sync_name), defined_at(async_name)
+        if async_index is None:
+            if sync_index is None:
+                continue
+            return False
+        if sync_index is not None and sync_index < async_index:
+            return False
+        if mro[async_index] is not Agent and async_name == 'async_run':
+            # A customized async run owns the whole async path.
+            return True
+        if mro[async_index] is Agent and async_name == 'async_execute':
+            # The default async execute does nothing.
+            return False
+    return True
@@ -5,9 +5,25 @@
 # @Email   : lc299034@antgroup.com
 # @FileName: agent_model.py
 """Agent model class."""
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel
 
+_CONTAINER_TYPES = (dict, list)
+
+
+def _copy_containers(value: Any) -> Any:
+    """Copy the dict and list containers of a config value, sharing the leaves.
+
+    Agent configs are plain yaml data, so this gives every copy its own
+    mutable structure at a fraction of the cost of a deep copy.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _copy_containers(v) if type(v) in _CONTAINER_TYPES else v for k, v in value.items()}
+    if value_type is list:
+        return [_copy_containers(v) if type(v) in _CONTAINER_TYPES else v for v in value]
+    return value
+
 
 class AgentModel(BaseModel):
     """The parent class of all agent models, containing only attributes."""
@@ -26,10 +42,14 @@ class AgentModel(BaseModel):
         """
         params = {}
         for key, value in self.profile.get('llm_model').items():
-            if key == 'name' or key == 'prompt_processor':
+            if key == 'name' or key == 'prompt_processor' or key == 'llm_cache':
                 continue
             if key == 'model_name':
                 params['model'] = value
             else:
                 params[key] = value
         return params
+
+    def create_copy(self) -> 'AgentModel':
+        """Return a copy which can be changed without affecting this model."""
+        return self.model_copy(update={name: _copy_containers(value) for name, value in self.__dict__.items()})
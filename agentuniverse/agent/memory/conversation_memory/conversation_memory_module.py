@@ -8,16 +8,14 @@
 
 import datetime
 import json
-import queue
-import traceback
 import uuid
-from concurrent.futures.thread import ThreadPoolExecutor
-from threading import Thread
 from typing import List, Optional
 
 from agentuniverse.agent.agent_manager import AgentManager
 
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_writer import ConversationMemoryWriter, \
+    MemoryWrite, BACKPRESSURE_DROP_OLDEST
 from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
 from agentuniverse.agent.memory.conversation_memory.enum import ConversationMessageSourceType
 from agentuniverse.agent.memory.memory_manager import MemoryManager
@@ -96,24 +94,33 @@ def generate_relation_str_en(source: str, target: str, source_type: str, target_
     return None
 
 
-def sync_to_sub_agent_memory(message: ConversationMessage, session_id: str, memory_name: str):
-    def add_message(agent_name: str, memory_names: list, collect_type: str):
-        agent_instance = AgentManager().get_instance_obj(agent_name)
-        agent_memory = agent_instance.agent_model.memory.get('conversation_memory')
+def get_sub_agent_memories(message: ConversationMessage) -> List[str]:
+    """Return the memories of the agents on either end of the message which collect it."""
+
+    def agent_memory(agent_name: str, collect_type: str) -> Optional[str]:
+        agent_instance = AgentManager().get_instance_obj(agent_name, new_instance=False)
+        if agent_instance is None:
+            return None
         collection_types = agent_instance.agent_model.memory.get('collection_types')
         if collection_types and collect_type not in collection_types:
-            return
-        if agent_memory:
-            memory_instance = MemoryManager().get_instance_obj(agent_memory)
-            memory_instance.add([message], session_id=session_id)
-            memory_names.append(agent_memory)
+            return None
+        return agent_instance.agent_model.memory.get('conversation_memory')
 
-    memory_names = [memory_name]
+    memory_names = []
     if message.source_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.source, memory_names, message.target_type)
-
+        memory_names.append(agent_memory(message.source, message.target_type))
     if message.target_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.target, memory_names, message.source_type)
+        memory_names.append(agent_memory(message.target, message.source_type))
+    return [memory_name for memory_name in memory_names if memory_name]
+
+
+def sync_to_sub_agent_memory(message: ConversationMessage, session_id: str, memory_name: str):
+    for agent_memory in get_sub_agent_memories(message):
+        if agent_memory == memory_name:
+            continue
+        memory_instance = MemoryManager().get_instance_obj(agent_memory)
+        if memory_instance:
+            memory_instance.add([message], session_id=session_id)
 
 
 @singleton
@@ -127,38 +134,47 @@ class ConversationMemoryModule:
         self.collection_types = conversation_memory_configer.get('collection_types', ['agent', 'user'])
         self.conversation_format = conversation_memory_configer.get('conversation_format', 'cn')
         self.max_content_length = conversation_memory_configer.get('max_content_length', 8000)
-        self.queue = queue.Queue(1000)
-        self.thread_pool = ThreadPoolExecutor(max_workers=conversation_memory_configer.get('thread_pool', 4))
-        Thread(target=self._consume_queue, daemon=True).start()
-
-    def _consume_queue(self):
-        while True:
-            func = self.queue.get()
-            try:
-                self.thread_pool.submit(func)
-            except Exception as e:
-                LOGGER.error(f"Failed to process trace info: {e}")
-                # 打印详细堆栈信息
-                traceback.print_exc()
-            finally:
-                self.queue.task_done()
-
-    def _add_trace_info(self, source: str,
-                        source_type: str,
-                        target: str,
-                        target_type: str,
-                        type: str,
-                        params: dict, **kwargs) -> None:
+        self.writer = ConversationMemoryWriter(
+            write=self._write_messages,
+            max_queue_size=conversation_memory_configer.get('max_queue_size', 1000),
+            batch_size=conversation_memory_configer.get('batch_size', 100),
+            flush_interval=conversation_memory_configer.get('flush_interval', 0.05),
+            backpressure=conversation_memory_configer.get('backpressure', BACKPRESSURE_DROP_OLDEST),
+            sample_rate=conversation_memory_configer.get('sample_rate', 0.1),
+            block_timeout=conversation_memory_configer.get('block_timeout', 0.1),
+            max_workers=conversation_memory_configer.get('thread_pool', 4))
+
+    @staticmethod
+    def _write_messages(memory_name: str, session_id: str, messages: List[ConversationMessage]) -> None:
+        memory = MemoryManager().get_instance_obj(memory_name, new_instance=False)
+        if memory:
+            memory.add(messages, session_id=session_id)
+
+    def get_writer_metrics(self) -> dict:
+        """Return the queue depth, event counts and flush latencies of the memory writer."""
+        return self.writer.get_metrics()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until the captured memory is written, return False on timeout."""
+        return self.writer.flush(timeout)
+
+    def _build_trace_writes(self, source: str,
+                            source_type: str,
+                            target: str,
+                            target_type: str,
+                            type: str,
+                            params: dict, **kwargs) -> List[MemoryWrite]:
+        """Build the message of the trace and the memory writes it causes."""
         if not self.activate:
-            return
+            return []
         content = None
         if type == "input" and target_type == 'agent':
-            agent_instance = AgentManager().get_instance_obj(target)
+            agent_instance = AgentManager().get_instance_obj(target, new_instance=False)
             input_field = agent_instance.agent_model.memory.get('input_field')
             if input_field and input_field in params:
                 content = params.get(input_field)
         elif type == "output" and source_type == 'agent':
-            agent_instance = AgentManager().get_instance_obj(source)
+            agent_instance = AgentManager().get_instance_obj(source, new_instance=False)
             output_field = agent_instance.agent_model.memory.get('output_field')
             if output_field and output_field in params:
                 content = params.get(output_field)
@@ -181,7 +197,7 @@ class ConversationMemoryModule:
         else:
             prefix = generate_relation_str_en(source, target, source_type, target_type, type)
         if not prefix:
-            return
+            return []
         if isinstance(content, str) and len(content) > self.max_content_length:
             content = content[:self.max_content_length]
         if len(params_json) > self.max_content_length:
@@ -207,14 +223,15 @@ class ConversationMemoryModule:
             },
             content=f"{content}"
         )
-        if self.instance_name:
-            memory = MemoryManager().get_instance_obj(self.instance_name)
-            if memory:
-                memory.add([message], session_id=kwargs.get('session_id'))
-        sync_to_sub_agent_memory(message, kwargs.get('session_id'), self.instance_name)
-
-    def _add_trace(self, start_info, target_info: dict, type: str, params: dict, session_id: str, trace_id: str,
-                   pair_id: str):
+        # every memory gets the message once, also when it is the memory of an agent on either end
+        memory_names = [self.instance_name] if self.instance_name else []
+        for agent_memory in get_sub_agent_memories(message):
+            if agent_memory not in memory_names:
+                memory_names.append(agent_memory)
+        return [(memory_name, kwargs.get('session_id'), message) for memory_name in memory_names]
+
+    def _build_trace(self, start_info, target_info: dict, type: str, params: dict, session_id: str, trace_id: str,
+                     pair_id: str) -> List[MemoryWrite]:
         if "kwargs" in params:
             params = params['kwargs']
         if params is str:
@@ -226,7 +243,7 @@ class ConversationMemoryModule:
                   'target_type': target_info['type'], 'type': type, 'params': params, 'trace_id': trace_id,
                   'session_id': session_id,
                   "pair_id": pair_id}
-        self._add_trace_info(**kwargs)
+        return self._build_trace_writes(**kwargs)
 
     def add_trace_info(self, start_info: dict, target_info: dict, type: str, params: dict, pair_id: str):
         """Add trace info to the memory."""
@@ -240,10 +257,10 @@ class ConversationMemoryModule:
             session_id = str(uuid.uuid4())
             FrameworkContextManager().set_context('session_id', session_id)
         def add_trace():
-            self._add_trace(start_info, target_info, type, params, session_id,
-                            trace_id, pair_id)
+            return self._build_trace(start_info, target_info, type, params, session_id,
+                                     trace_id, pair_id)
 
-        self.queue.put_nowait(add_trace)
+        self.writer.submit(add_trace)
 
     def add_tool_input_info(self, start_info: dict, target: str, params: dict, pair_id: str, auto: bool = True):
         """Add trace info to the memory."""
@@ -328,8 +345,8 @@ class ConversationMemoryModule:
                 "source": agent_instance.agent_model.info.get('name'),
                 "type": "agent"
             }
-            self._add_trace(target_info, start_info, 'output', params, session_id, trace_id, pair_id)
-        self.queue.put_nowait(add_trace)
+            return self._build_trace(target_info, start_info, 'output', params, session_id, trace_id, pair_id)
+        self.writer.submit(add_trace)
 
     def add_llm_input_info(self, start_info: dict, target: str, prompt: str, pair_id: str, auto=True):
         if not self.collection_current_agent_memory(start_info, 'llm', auto):
@@ -353,7 +370,7 @@ class ConversationMemoryModule:
             return False
         if info.get('type') == 'agent':
             agent_id = info.get('source')
-            agent_instance = AgentManager().get_instance_obj(agent_id)
+            agent_instance = AgentManager().get_instance_obj(agent_id, new_instance=False)
             if agent_instance:
                 collection_types = agent_instance.agent_model.memory.get('collection_types')
                 res = agent_instance.collect_current_memory(collection_type)
@@ -0,0 +1,170 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 18:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: conversation_memory_writer.py
+import random
+import threading
+import time
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+BACKPRESSURE_DROP_OLDEST = 'drop_oldest'
+BACKPRESSURE_SAMPLE = 'sample'
+BACKPRESSURE_BLOCK = 'block'
+
+# A captured event turns into the writes it causes: (memory name, session id, message).
+MemoryWrite = Tuple[str, str, object]
+MemoryEvent = Callable[[], List[MemoryWrite]]
+
+
+class ConversationMemoryWriter:
+    """Write captured conversation memory events in micro batches.
+
+    Request threads only append the event to a bounded in-process queue. One
+    writer thread drains up to `batch_size` events at a time, turns them into
+    messages, groups the messages by target memory and session and stores each
+    group with a single `add` call, the groups of a batch in parallel.
+
+    When the queue is full the backpressure policy decides what happens:
+
+    - drop_oldest: the oldest queued event is dropped for the new one.
+    - sample: once the queue is half full, new events are kept with the
+      probability `sample_rate`; when it is full they are dropped.
+    - block: the request thread waits up to `block_timeout` seconds for room,
+      then drops the event. This is the only policy adding request latency.
+
+    Attributes:
+        write (Callable): Stores the messages of one group, called with the
+            memory name, the session id and the messages.
+        max_queue_size (int): Max events waiting to be written.
+        batch_size (int): Max events written in one batch.
+        flush_interval (float): Seconds the writer waits for a batch to fill
+            after its first event.
+        backpressure (str): The policy when the queue is full.
+        sample_rate (float): The share of events kept by the `sample` policy.
+        block_timeout (float): Max seconds the `block` policy waits.
+    """
+
+    def __init__(self, write: Callable[[str, str, list], None], max_queue_size: int = 1000, batch_size: int = 100,
+                 flush_interval: float = 0.05, backpressure: str = BACKPRESSURE_DROP_OLDEST,
+                 sample_rate: float = 0.1, block_timeout: float = 0.1, max_workers: int = 4):
+        if backpressure not in (BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_SAMPLE, BACKPRESSURE_BLOCK):
+            raise ValueError(f"Unknown conversation memory backpressure policy: {backpressure}")
+        self.write = write
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout
+        self._events: deque = deque()
+        self._condition = threading.Condition()
+        # events queued or in the batch being written
+        self._pending = 0
+        self._metrics = {'submitted': 0, 'dropped': 0, 'written': 0, 'failed': 0, 'batches': 0,
+                         'last_flush_latency': 0.0, 'max_flush_latency': 0.0, 'total_flush_latency': 0.0}
+        self._thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='conversation_memory')
+        threading.Thread(target=self._run, name='conversation_memory_writer', daemon=True).start()
+
+    def submit(self, event: MemoryEvent) -> bool:
+        """Queue the event, return whether it was accepted."""
+        with self._condition:
+            self._metrics['submitted'] += 1
+            if len(self._events) >= self.max_queue_size:
+                if self.backpressure == BACKPRESSURE_DROP_OLDEST:
+                    self._events.popleft()
+                    self._pending -= 1
+                    self._metrics['dropped'] += 1
+                elif self.backpressure == BACKPRESSURE_BLOCK:
+                    if not self._condition.wait_for(lambda: len(self._events) < self.max_queue_size,
+                                                    self.block_timeout):
+                        self._metrics['dropped'] += 1
+                        return False
+                else:
+                    self._metrics['dropped'] += 1
+                    return False
+            elif (self.backpressure == BACKPRESSURE_SAMPLE and len(self._events) >= self.max_queue_size / 2
+                  and random.random() >= self.sample_rate):
+                self._metrics['dropped'] += 1
+                return False
+            self._events.append(event)
+            self._pending += 1
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the events queued so far are written, return False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def get_metrics(self) -> dict:
+        """Return the queue depth, event counts and flush latencies in seconds."""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics['queue_depth'] = len(self._events)
+        metrics['avg_flush_latency'] = metrics['total_flush_latency'] / metrics['batches'] \
+            if metrics['batches'] else 0.0
+        return metrics
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                LOGGER.error(f"Failed to write conversation memory: {e}")
+            finally:
+                with self._condition:
+                    self._pending -= len(batch)
+                    self._condition.notify_all()
+
+    def _next_batch(self) -> list:
+        with self._condition:
+            self._condition.wait_for(lambda: self._events)
+            if self.flush_interval and len(self._events) < self.batch_size:
+                deadline = time.monotonic() + self.flush_interval
+                self._condition.wait_for(lambda: len(self._events) >= self.batch_size
+                                         or time.monotonic() >= deadline, self.flush_interval)
+            batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+            # room was made for blocked producers
+            self._condition.notify_all()
+            return batch
+
+    def _write_batch(self, batch: List[MemoryEvent]):
+        start = time.perf_counter()
+        # messages grouped by memory and session, in the order they were captured
+        groups: Dict[Tuple[str, str], list] = OrderedDict()
+        for event in batch:
+            try:
+                writes = event()
+            except Exception as e:
+                LOGGER.error(f"Failed to process trace info: {e}")
+                continue
+            for memory_name, session_id, message in writes or []:
+                groups.setdefault((memory_name, session_id), []).append(message)
+
+        futures = {self._thread_pool.submit(self.write, memory_name, session_id, messages): len(messages)
+                   for (memory_name, session_id), messages in groups.items()}
+        wait(futures)
+        written = failed = 0
+        for future, count in futures.items():
+            if future.exception() is not None:
+                LOGGER.error(f"Failed to write conversation memory: {future.exception()}")
+                failed += count
+            else:
+                written += count
+
+        latency = time.perf_counter() - start
+        with self._condition:
+            self._metrics['written'] += written
+            self._metrics['failed'] += failed
+            self._metrics['batches'] += 1
+            self._metrics['last_flush_latency'] = latency
+            self._metrics['max_flush_latency'] = max(self._metrics['max_flush_latency'], latency)
+            self._metrics['total_flush_latency'] += latency
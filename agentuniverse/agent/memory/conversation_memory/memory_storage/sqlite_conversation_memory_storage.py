@@ -13,7 +13,10 @@ from typing import Optional, List, Any
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func, or_, create_engine, Engine, insert
+from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func, or_, create_engine, Engine, insert, \
+    inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
 from agentuniverse.agent.memory.conversation_memory.enum import ConversationMessageEnum, ConversationMessageSourceType
@@ -85,6 +88,9 @@ def create_memory_model(table_name: str, DynamicBase: Any) -> Any:
             Index(f"idx_{table_name}_session_id_source", 'session_id', 'source', 'source_type'),
             Index(f"idx_{table_name}_session_id_source_type", 'session_id', 'target', 'target_type'),
             Index(f"idx_{table_name}_session_id_gmt_created", 'session_id', 'timestamp'),
+            # serve the latest `top_k` messages of a session and agent without a sort
+            Index(f"idx_{table_name}_session_id_target_gmt_created", 'session_id', 'target', 'timestamp'),
+            Index(f"idx_{table_name}_session_id_source_gmt_created", 'session_id', 'source', 'timestamp'),
             Index(f"idx_{table_name}_message_id_unique", 'message_id', unique=True)
         )
 
@@ -194,9 +200,16 @@ class SqliteMemoryStorage(MemoryStorage):
 
     def _create_table_if_not_exists(self) -> None:
         """Create the db table if it does not exist."""
-        with self.engine.connect() as conn:
+        with self.engine.begin() as conn:
+            table = self.memory_converter.get_sql_model_class().__table__
             if not conn.dialect.has_table(conn, self.sqldb_table_name):
-                self.memory_converter.get_sql_model_class().__table__.create(conn)
+                table.create(conn)
+            else:
+                # tables created by earlier versions get the indexes added since
+                existing = {index['name'] for index in inspect(conn).get_indexes(self.sqldb_table_name)}
+                for index in table.indexes:
+                    if index.name not in existing:
+                        index.create(conn)
 
     def delete(self, session_id: str = None, agent_id: str = None, trace_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -254,16 +267,42 @@ class SqliteMemoryStorage(MemoryStorage):
         if message_list is None:
             return
 
+        model_class = self.memory_converter.get_sql_model_class()
+        rows = []
+        for message in message_list:
+            record = self.memory_converter.to_sql_model(message=message, session_id=session_id if session_id else None,
+                                                        agent_id=agent_id, **kwargs)
+            # unset columns are left out, so that their defaults apply as they do for orm objects
+            rows.append({attr.key: getattr(record, attr.key) for attr in inspect(record).mapper.column_attrs
+                         if getattr(record, attr.key) is not None})
         with self.session() as session:
-            for message in message_list:
-                existing_message = session.query(self.memory_converter.get_sql_model_class()).filter_by(
-                    message_id=message.id).first()
-                if not existing_message:
-                    session.add(self.memory_converter.to_sql_model(message=message,
-                                                                   session_id=session_id if session_id else None,
-                                                                   agent_id=agent_id, **kwargs))
+            # one bulk upsert in one transaction, messages stored before are kept as they are
+            statement = self._insert_ignoring_existing(session, model_class, rows)
+            if rows:
+                session.execute(statement, rows)
             session.commit()
 
+    def _insert_ignoring_existing(self, session: Session, model_class: Any, rows: List[dict]) -> Any:
+        """Build the insert of the rows which skips messages already stored."""
+        dialect = self.engine.dialect.name
+        if dialect == 'sqlite':
+            return sqlite_insert(model_class).on_conflict_do_nothing(index_elements=['message_id'])
+        if dialect == 'postgresql':
+            return postgresql_insert(model_class).on_conflict_do_nothing(index_elements=['message_id'])
+        # other databases look the existing messages up in one query and
+        # keep the first of the rows repeating a message id, as the
+        # conflict clauses above do.
+        message_ids = [row['message_id'] for row in rows]
+        seen = {message_id for (message_id,) in session.query(model_class.message_id).filter(
+            model_class.message_id.in_(message_ids))}
+        unique_rows = []
+        for row in rows:
+            if row['message_id'] not in seen:
+                seen.add(row['message_id'])
+                unique_rows.append(row)
+        rows[:] = unique_rows
+        return insert(model_class)
+
     def get(self, session_id: str = None, agent_id: str = None, top_k=20, trace_id: str = None, **kwargs) -> List[
         ConversationMessage]:
         """Get messages from the memory db.
@@ -321,12 +360,14 @@ class SqliteMemoryStorage(MemoryStorage):
             query = session.query(self.memory_converter.model_class)
             if conditions:
                 query = query.where(and_(*conditions))
-            query = query.order_by(model_class.timestamp.asc())
+            # the database keeps the latest `top_k` rows
+            query = query.order_by(model_class.timestamp.desc(), model_class.id.desc())
+            if top_k:
+                query = query.limit(top_k)
 
-            # Execute the query and fetch the results
+            # Execute the query and restore the chronological order
             records = query.all()
-
-            records = records[-top_k:]
+            records.reverse()
 
             messages = []
             for record in records:
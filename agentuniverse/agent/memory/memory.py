@@ -21,7 +21,7 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.memory_configer import MemoryConfiger
-from agentuniverse.base.util.memory_util import get_memory_tokens, get_memory_string
+from agentuniverse.base.util.memory_util import get_memory_string, get_message_tokens, get_separator_tokens
 
 
 class Memory(ComponentBase):
@@ -99,16 +99,28 @@ class Memory(ComponentBase):
         new_memories = memories[:]
 
         agent_llm_name = self.agent_llm_name if hasattr(self, 'agent_llm_name') else None
-        tokens = get_memory_tokens(new_memories, agent_llm_name)
+        # Every message is tokenized once, the counts are cached on the messages,
+        # and the tokens of the memories left are kept as a running total.
+        message_tokens = get_message_tokens(new_memories, agent_llm_name)
+        counted = [count for count in message_tokens if count is not None]
+        separator_tokens = get_separator_tokens(agent_llm_name) if len(counted) > 1 else 0
+        total = sum(counted)
+        remaining = len(counted)
+        tokens = total + separator_tokens * max(remaining - 1, 0)
 
         if tokens <= self.max_tokens:
             return new_memories
 
-        pruned_memories = []
-        while tokens > self.max_tokens:
-            pruned_memory = new_memories.pop(0)
-            pruned_memories.append(pruned_memory)
-            tokens = get_memory_tokens(new_memories, agent_llm_name)
+        cut = 0
+        while tokens > self.max_tokens and cut < len(new_memories):
+            count = message_tokens[cut]
+            cut += 1
+            if count is not None:
+                total -= count
+                remaining -= 1
+            tokens = total + separator_tokens * max(remaining - 1, 0)
+        pruned_memories = new_memories[:cut]
+        new_memories = new_memories[cut:]
 
         if pruned_memories:
             memory_compressor: MemoryCompressor = MemoryCompressorManager().get_instance_obj(self.memory_compressor)
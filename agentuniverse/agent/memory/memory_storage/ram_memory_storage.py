@@ -5,20 +5,81 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: ram_memory_storage.py
-from typing import Optional, List, Dict
+import datetime
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Deque
+
+from pydantic import PrivateAttr
 
 from agentuniverse.agent.memory.memory_storage.memory_storage import MemoryStorage
 from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+
+
+def _spill_default(obj):
+    """Encode the message metadata json can not, like the timestamp added by agents."""
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    return str(obj)
 
 
 class RamMemoryStorage(MemoryStorage):
     """The ram memory storage class.
 
+    Sessions are kept in least recently used order, so that the capacity
+    limits below evict the sessions which have been idle the longest.
+
     Attributes:
-        messages (dict[str, dict[str, list[Message]]]): The messages in the ram memory.
+        messages (dict[str, dict[str, deque[Message]]]): The messages in the ram memory.
+        max_messages_per_session (Optional[int]): Max messages kept per session and agent, the oldest
+            are dropped first. None for no limit.
+        max_sessions (Optional[int]): Max sessions kept, the least recently used one is evicted first.
+            None for no limit.
+        session_ttl (Optional[float]): Seconds a session is kept after its last use, None to keep it.
+        spill_path (Optional[str]): Path of the SQLite file evicted sessions are written to, and restored
+            from on their next use. None to drop evicted sessions.
     """
 
-    messages: Optional[Dict[str, Dict[str, List[Message]]]] = dict()
+    messages: Optional[Dict[str, Dict[str, Deque[Message]]]] = None
+    max_messages_per_session: Optional[int] = None
+    max_sessions: Optional[int] = None
+    session_ttl: Optional[float] = None
+    spill_path: Optional[str] = None
+    _last_used: Dict[str, float] = PrivateAttr(default_factory=dict)
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    _spill_conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # pydantic validates the field into a plain dict, build the lru order here.
+        self.messages = OrderedDict(
+            (session_id, {agent_id: deque(agent_messages, maxlen=self.max_messages_per_session)
+                          for agent_id, agent_messages in session.items()})
+            for session_id, session in (self.messages or {}).items())
+
+    def _initialize_by_component_configer(self, memory_storage_config: ComponentConfiger) -> 'RamMemoryStorage':
+        """Initialize the RamMemoryStorage by the ComponentConfiger object.
+
+        Args:
+            memory_storage_config(ComponentConfiger): A configer contains ram_memory_storage basic info.
+        Returns:
+            RamMemoryStorage: A RamMemoryStorage instance.
+        """
+        super()._initialize_by_component_configer(memory_storage_config)
+        if getattr(memory_storage_config, 'max_messages_per_session', None):
+            self.max_messages_per_session = memory_storage_config.max_messages_per_session
+        if getattr(memory_storage_config, 'max_sessions', None):
+            self.max_sessions = memory_storage_config.max_sessions
+        if getattr(memory_storage_config, 'session_ttl', None):
+            self.session_ttl = memory_storage_config.session_ttl
+        if getattr(memory_storage_config, 'spill_path', None):
+            self.spill_path = memory_storage_config.spill_path
+        return self
 
     def add(self, message_list: List[Message], session_id: str = '', agent_id: str = '', **kwargs) -> None:
         """Add messages to the memory db.
@@ -30,9 +91,13 @@ class RamMemoryStorage(MemoryStorage):
         """
         if not message_list:
             return
-        session = self.messages.setdefault(session_id, {})
-        agent_messages = session.setdefault(agent_id, [])
-        agent_messages.extend(message_list)
+        with self._lock:
+            session = self._use_session(session_id, create=True)
+            agent_messages = session.get(agent_id)
+            if agent_messages is None:
+                agent_messages = deque(maxlen=self.max_messages_per_session)
+                session[agent_id] = agent_messages
+            agent_messages.extend(message_list)
 
     def delete(self, session_id: str = None, agent_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -41,11 +106,17 @@ class RamMemoryStorage(MemoryStorage):
             session_id (str): The session id of the memory to delete.
             agent_id (str): The agent id of the memory to delete.
         """
-        if session_id is not None:
+        if session_id is None:
+            return
+        with self._lock:
             if agent_id is None:
                 self.messages.pop(session_id, None)
+                self._last_used.pop(session_id, None)
+                self._delete_spilled(session_id)
             else:
-                self.messages.get(session_id, {}).pop(agent_id, None)
+                session = self._use_session(session_id, create=False)
+                if session is not None:
+                    session.pop(agent_id, None)
 
     def get(self, session_id: str = '', agent_id: str = '', top_k=10, **kwargs) -> \
             List[Message]:
@@ -59,5 +130,86 @@ class RamMemoryStorage(MemoryStorage):
         Returns:
             List[Message]: The list of aU messages.
         """
-        memories = self.messages.get(session_id, {}).get(agent_id, [])
-        return memories[-top_k:]
+        with self._lock:
+            session = self._use_session(session_id, create=False)
+            memories = session.get(agent_id) if session is not None else None
+            if not memories:
+                return []
+            if not top_k or top_k < 0:
+                return list(memories)[-top_k:]
+            # walk from the newest message, the cost does not grow with the session
+            recent = list(itertools.islice(reversed(memories), top_k))
+            recent.reverse()
+            return recent
+
+    def _use_session(self, session_id: str, create: bool) -> Optional[Dict[str, Deque[Message]]]:
+        """Return the session and mark it as the most recently used one, restoring it
+        from the spill file if it was evicted. Expired and surplus sessions are evicted."""
+        now = time.time()
+        self._evict_expired(now)
+        session = self.messages.get(session_id)
+        if session is None:
+            session = self._restore_spilled(session_id)
+            if session is None:
+                if not create:
+                    return None
+                session = {}
+            self.messages[session_id] = session
+        self.messages.move_to_end(session_id)
+        self._last_used[session_id] = now
+        while self.max_sessions and len(self.messages) > self.max_sessions:
+            self._evict(next(iter(self.messages)))
+        return session
+
+    def _evict_expired(self, now: float) -> None:
+        if not self.session_ttl:
+            return
+        # sessions are in least recently used order, the expired ones are in front
+        while self.messages:
+            session_id = next(iter(self.messages))
+            if now - self._last_used.get(session_id, now) <= self.session_ttl:
+                break
+            self._evict(session_id)
+
+    def _evict(self, session_id: str) -> None:
+        session = self.messages[session_id]
+        if self.spill_path and session:
+            data = json.dumps({agent_id: [{'id': message.id, **message.to_dict()} for message in agent_messages]
+                               for agent_id, agent_messages in session.items()},
+                              ensure_ascii=False, default=_spill_default)
+            with self._get_spill_conn() as conn:
+                conn.execute('INSERT OR REPLACE INTO ram_memory_spill (session_id, messages) VALUES (?, ?)',
+                             (session_id, data))
+        # the session is only dropped once it is safely spilled.
+        del self.messages[session_id]
+        self._last_used.pop(session_id, None)
+
+    def _restore_spilled(self, session_id: str) -> Optional[Dict[str, Deque[Message]]]:
+        if not self.spill_path:
+            return None
+        conn = self._get_spill_conn()
+        row = conn.execute('SELECT messages FROM ram_memory_spill WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute('DELETE FROM ram_memory_spill WHERE session_id = ?', (session_id,))
+        return {agent_id: deque((Message.from_dict(message) for message in agent_messages),
+                                maxlen=self.max_messages_per_session)
+                for agent_id, agent_messages in json.loads(row[0]).items()}
+
+    def _delete_spilled(self, session_id: str) -> None:
+        if self.spill_path:
+            with self._get_spill_conn() as conn:
+                conn.execute('DELETE FROM ram_memory_spill WHERE session_id = ?', (session_id,))
+
+    def _get_spill_conn(self) -> sqlite3.Connection:
+        if self._spill_conn is None:
+            self._spill_conn = sqlite3.connect(self.spill_path, check_same_thread=False)
+            with self._spill_conn:
+                self._spill_conn.execute('''
+                    CREATE TABLE IF NOT EXISTS ram_memory_spill (
+                        session_id TEXT PRIMARY KEY,
+                        messages TEXT
+                    )
+                ''')
+        return self._spill_conn
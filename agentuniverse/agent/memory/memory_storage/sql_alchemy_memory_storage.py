@@ -11,7 +11,7 @@ from typing import Optional, List, Any
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func
+from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func, inspect
 
 from agentuniverse.agent.memory.memory_storage.memory_storage import MemoryStorage
 from agentuniverse.agent.memory.message import Message
@@ -73,6 +73,8 @@ def create_memory_model(table_name: str, DynamicBase: Any) -> Any:
             Index('idx_session_id_source', 'session_id', 'agent_id', 'source'),
             Index('idx_agent_id_source', 'agent_id', 'source'),
             Index('idx_gmt_created', 'gmt_created'),
+            # serves the latest `top_k` messages of a session without a sort
+            Index(f'idx_{table_name}_session_agent_created', 'session_id', 'agent_id', 'gmt_created'),
         )
 
     return MemoryModel
@@ -147,9 +149,16 @@ class SqlAlchemyMemoryStorage(MemoryStorage):
 
     def _create_table_if_not_exists(self) -> None:
         """Create the db table if it does not exist."""
-        with self._sqldb_wrapper.sql_database._engine.connect() as conn:
+        with self._sqldb_wrapper.sql_database._engine.begin() as conn:
+            table = self.memory_converter.get_sql_model_class().__table__
             if not conn.dialect.has_table(conn, self.sqldb_table_name):
-                self.memory_converter.get_sql_model_class().__table__.create(conn)
+                table.create(conn)
+            else:
+                # tables created by earlier versions get the indexes added since
+                existing = {index['name'] for index in inspect(conn).get_indexes(self.sqldb_table_name)}
+                for index in table.indexes:
+                    if index.name not in existing:
+                        index.create(conn)
 
     def delete(self, session_id: str = None, agent_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -187,12 +196,13 @@ class SqlAlchemyMemoryStorage(MemoryStorage):
             self._init_db()
         if message_list is None:
             return
+        records = [self.memory_converter.to_sql_model(message=message, session_id=session_id if session_id else None,
+                                                      agent_id=agent_id if agent_id else None,
+                                                      source=message.source if message.source else None)
+                   for message in message_list]
         with self._sqldb_wrapper.get_session()() as session:
-            for message in message_list:
-                session.add(
-                    self.memory_converter.to_sql_model(message=message, session_id=session_id if session_id else None,
-                                                       agent_id=agent_id if agent_id else None,
-                                                       source=message.source if message.source else None))
+            # one executemany in one transaction, the ids of the rows are not needed afterwards
+            session.bulk_save_objects(records)
             session.commit()
 
     def get(self, session_id: str = None, agent_id: str = None, top_k=10, source: str = None, **kwargs) -> List[
@@ -230,23 +240,24 @@ class SqlAlchemyMemoryStorage(MemoryStorage):
                 source_col = getattr(model_class, 'source')
                 conditions.append(source_col == source)
             if kwargs.get('type'):
-                if isinstance(kwargs['type'], list):
-                    types = kwargs['type']
-                if not isinstance(kwargs['type'], str):
-                    types = [kwargs['type']]
+                types = kwargs['type'] if isinstance(kwargs['type'], list) else [kwargs['type']]
                 type_col = getattr(model_class, 'type')
-                conditions.append(conditions.append(type_col.in_(types)))
+                conditions.append(type_col.in_(types))
 
-            # build the query with dynamic conditions
+            # build the query with dynamic conditions, the database keeps the latest `top_k` rows
             query = session.query(self.memory_converter.model_class)
             if conditions:
                 query = query.where(and_(*conditions))
-            query = query.order_by(model_class.gmt_created.asc())
-
-            # Execute the query and fetch the results
+            order_by = [model_class.gmt_created.desc()]
+            if hasattr(model_class, 'id'):
+                order_by.append(model_class.id.desc())
+            query = query.order_by(*order_by)
+            if top_k:
+                query = query.limit(top_k)
+
+            # Execute the query and restore the chronological order
             records = query.all()
-
-            records = records[-top_k:]
+            records.reverse()
 
             messages = []
             for record in records:
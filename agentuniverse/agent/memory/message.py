@@ -10,7 +10,7 @@ from typing import Optional, List, Union, Dict
 from langchain_core.messages import HumanMessage
 from langchain_core.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate, AIMessagePromptTemplate
 from langchain_core.prompts.chat import BaseStringMessagePromptTemplate
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from agentuniverse.agent.memory.enum import ChatMessageEnum
 
@@ -30,6 +30,20 @@ class Message(BaseModel):
     content: Optional[Union[str, List[Union[str, Dict]]]] = None
     source: Optional[str] = None
     metadata: Optional[dict] = None
+    # Token counts of the message text per tokenizer, see `get_cached_tokens`.
+    _token_counts: Dict[str, tuple] = PrivateAttr(default_factory=dict)
+
+    def get_cached_tokens(self, tokenizer_key: str, text: str) -> Optional[int]:
+        """Return the token count of the text of this message stored for the
+        tokenizer, None if it was not counted or the text has changed since."""
+        cached = self._token_counts.get(tokenizer_key)
+        if cached is not None and cached[0] == hash(text):
+            return cached[1]
+        return None
+
+    def set_cached_tokens(self, tokenizer_key: str, text: str, tokens: int) -> None:
+        """Store the token count of the text of this message for the tokenizer."""
+        self._token_counts[tokenizer_key] = (hash(text), tokens)
 
     def as_langchain(self):
         """Convert the agentUniverse(aU) message class to the langchain message class."""
@@ -8,8 +8,7 @@
 from langchain.tools import Tool as LangchainTool
 from langchain_core.output_parsers import StrOutputParser
 
-from agentuniverse.agent.action.tool.tool import Tool
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
+from agentuniverse.agent.action.action_registry import get_compiled_actions
 from agentuniverse.agent.agent_model import AgentModel
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.memory.memory import Memory
@@ -55,12 +54,7 @@ class Nl2ApiPlanner(Planner):
 
     @staticmethod
     def acquire_tools(action) -> list[LangchainTool]:
-        tool_names: list = action.get('tool') or list()
-        lc_tools: list[LangchainTool] = list()
-        for tool_name in tool_names:
-            tool: Tool = ToolManager().get_instance_obj(tool_name)
-            lc_tools.append(tool.as_langchain())
-        return lc_tools
+        return get_compiled_actions(tool_names=action.get('tool')).lc_tools
 
     def handle_prompt(self, agent_model: AgentModel, planner_input: dict) -> Prompt:
         """
@@ -72,13 +66,9 @@ class Nl2ApiPlanner(Planner):
         Returns:
             ChatPrompt: The chat prompt instance.
         """
-        tools = self.acquire_tools(action=agent_model.action)
-        lc_tools_str: str = ''
-        for lc_tool in tools:
-            lc_tools_str += "tool name:" + lc_tool.name + " " + "tool description:" + lc_tool.description + '\n'
-        lc_tool_names = "|".join([lc_tool.name for lc_tool in tools])
-        planner_input['tool_names'] = lc_tool_names
-        planner_input['tools'] = lc_tools_str
+        compiled_actions = get_compiled_actions(tool_names=agent_model.action.get('tool'))
+        planner_input['tool_names'] = compiled_actions.tool_names
+        planner_input['tools'] = compiled_actions.tools_description("tool name:{name} tool description:{description}\n")
         planner_input['agent_scratchpad'] = ''
         #
         profile: dict = agent_model.profile
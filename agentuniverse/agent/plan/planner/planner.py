@@ -158,6 +158,9 @@ class Planner(ComponentBase):
         """
         llm_name = agent_model.profile.get('llm_model').get('name')
         llm: LLM = LLMManager().get_instance_obj(component_instance_name=llm_name)
+        llm_cache = agent_model.profile.get('llm_model').get('llm_cache')
+        if llm and llm_cache is not None:
+            llm.llm_cache = llm.merge_llm_cache(llm_cache)
         return llm
 
     def initialize_by_component_configer(self, component_configer: PlannerConfiger) -> 'Planner':
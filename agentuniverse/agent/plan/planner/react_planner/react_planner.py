@@ -17,12 +17,7 @@ from langchain_core.prompts import BasePromptTemplate
 from langchain_core.runnables import RunnableConfig, RunnablePassthrough, Runnable
 from langchain_core.tools import BaseTool, ToolsRenderer, render_text_description
 
-from agentuniverse.agent.action.knowledge.knowledge import Knowledge
-from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
-from agentuniverse.agent.action.tool.tool import Tool
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
-from agentuniverse.agent.agent import Agent
-from agentuniverse.agent.agent_manager import AgentManager
+from agentuniverse.agent.action.action_registry import get_compiled_actions
 from agentuniverse.agent.agent_model import AgentModel
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.memory.memory import Memory
@@ -89,21 +84,9 @@ class ReActPlanner(Planner):
 
     @staticmethod
     def acquire_tools(action) -> list[LangchainTool]:
-        tool_names: list = action.get('tool') or list()
-        lc_tools: list[LangchainTool] = list()
-        for tool_name in tool_names:
-            tool: Tool = ToolManager().get_instance_obj(tool_name)
-            lc_tools.append(tool.as_langchain())
-        knowledge: list = action.get('knowledge') or list()
-        for knowledge_name in knowledge:
-            knowledge_tool: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
-            lc_tools.append(knowledge_tool.as_langchain_tool())
-
-        agents: list = action.get('agent') or list()
-        for agent_name in agents:
-            agent_tool: Agent = AgentManager().get_instance_obj(agent_name)
-            lc_tools.append(agent_tool.as_langchain_tool())
-        return lc_tools
+        return get_compiled_actions(tool_names=action.get('tool'),
+                                    knowledge_names=action.get('knowledge'),
+                                    agent_names=action.get('agent')).lc_tools
 
     def handle_prompt(self, agent_model: AgentModel, planner_input: dict) -> Prompt:
         """Prompt module processing.
@@ -114,13 +97,12 @@ class ReActPlanner(Planner):
         Returns:
             ChatPrompt: The chat prompt instance.
         """
-        lc_tools_str: str = ''
-        tools = self.acquire_tools(agent_model.action)
-        for lc_tool in self.acquire_tools(agent_model.action):
-            lc_tools_str += "tool name:" + lc_tool.name + " " + "tool description:" + lc_tool.description + '\n'
-        lc_tool_names = "|".join([lc_tool.name for lc_tool in tools])
-        planner_input['tool_names'] = lc_tool_names
-        planner_input['tools'] = lc_tools_str
+        action = agent_model.action
+        compiled_actions = get_compiled_actions(tool_names=action.get('tool'),
+                                                knowledge_names=action.get('knowledge'),
+                                                agent_names=action.get('agent'))
+        planner_input['tool_names'] = compiled_actions.tool_names
+        planner_input['tools'] = compiled_actions.tools_description("tool name:{name} tool description:{description}\n")
         planner_input['agent_scratchpad'] = ''
 
         profile: dict = agent_model.profile
@@ -95,15 +95,18 @@ class AgentTemplate(Agent, ABC):
         return super().invoke_knowledge(query_str=query_str, input_object=input_object,
                                         knowledge_names=self.knowledge_names)
 
+    async def async_invoke_tools(self, input_object: InputObject, **kwargs) -> str:
+        return await super().async_invoke_tools(input_object=input_object, tool_names=self.tool_names)
+
+    async def async_invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
+        return await super().async_invoke_knowledge(query_str=query_str, input_object=input_object,
+                                                    knowledge_names=self.knowledge_names)
+
     def process_prompt(self, agent_input: dict, **kwargs) -> ChatPrompt:
         return super().process_prompt(agent_input=agent_input, prompt_version=self.prompt_version)
 
-    def create_copy(self) -> 'AgentTemplate':
-        copied = super().create_copy()
-        copied.llm_name = self.llm_name
-        copied.memory_name = self.memory_name
-        copied.tool_names = self.tool_names.copy() if self.tool_names is not None else None
-        copied.knowledge_names = self.knowledge_names.copy() if self.knowledge_names is not None else None
-        copied.prompt_version = self.prompt_version
-        copied.conversation_memory_name = self.conversation_memory_name
-        return copied
+    def _get_copy_update(self) -> dict:
+        update = super()._get_copy_update()
+        update['tool_names'] = self.tool_names.copy() if self.tool_names is not None else None
+        update['knowledge_names'] = self.knowledge_names.copy() if self.knowledge_names is not None else None
+        return update
@@ -7,13 +7,12 @@
 # @FileName: executing_agent_template.py
 import asyncio
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from concurrent.futures import wait, as_completed
 from typing import Optional
 
 from langchain_core.output_parsers import StrOutputParser
 
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
+from agentuniverse.agent.action.action_registry import get_compiled_actions
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.memory.conversation_memory.conversation_memory_module import ConversationMemoryModule
 from agentuniverse.agent.memory.memory import Memory
@@ -23,12 +22,33 @@ from agentuniverse.base.config.component_configer.configers.agent_configer impor
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.agent_util import assemble_memory_input, assemble_memory_output
 from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.concurrency_util import get_shared_executor
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.prompt_util import process_llm_token
 from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_rate_limiter import get_llm_rate_limiter
 from agentuniverse.prompt.prompt import Prompt
 
 
+class _StartedOutputStream:
+    """Forward to the output stream and remember whether anything was sent."""
+
+    def __init__(self, output_stream):
+        self.output_stream = output_stream
+        self.started = False
+
+    def put_nowait(self, item) -> None:
+        self.started = True
+        self.output_stream.put_nowait(item)
+
+    def put(self, item, *args, **kwargs) -> None:
+        self.started = True
+        self.output_stream.put(item, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.output_stream, name)
+
+
 class ExecutingAgentTemplate(AgentTemplate):
     _context_values: Optional[dict] = {}
 
@@ -67,21 +87,36 @@ class ExecutingAgentTemplate(AgentTemplate):
             return {'executing_result': [],
                     'output_stream': input_object.get_data('output_stream', None)}
 
-        with ThreadPoolExecutor(max_workers=min(len(framework), 10),
-                                thread_name_prefix="executing_agent_template") as thread_executor:
-            futures = []
-            for i, subtask in enumerate(framework):
-                future = thread_executor.submit(self._execute_subtask, subtask, input_object, agent_input, i, memory,
-                                                llm, prompt, context_values=_context_values)
-                futures.append(future)
-                time.sleep(1)
-
-            executing_result = [future.result() for future in as_completed(futures)]
+        # Subtasks share one bounded executor across requests, the pace of
+        # llm calls is controlled by the rate limiter of the llm.
+        thread_executor = get_shared_executor("executing_agent_template")
+        # subtasks not started yet are skipped once the `subtask_cancel` event
+        # is set, when the caller no longer needs the remaining results.
+        subtask_cancel = input_object.get_data('subtask_cancel')
+        futures = [thread_executor.submit(self._execute_subtask_unless_cancelled, subtask_cancel, subtask,
+                                          input_object, agent_input, i, memory, llm, prompt,
+                                          context_values=_context_values)
+                   for i, subtask in enumerate(framework)]
+        # `subtask_callback` receives every subtask result as soon as it is
+        # finished, so the caller can consume them before all are done.
+        subtask_callback = input_object.get_data('subtask_callback')
+        if subtask_callback:
+            for future in as_completed(futures):
+                if future.exception() is None and future.result() is not None:
+                    subtask_callback(future.result())
+        else:
+            wait(futures)
+        executing_result = [future.result() for future in futures if future.result() is not None]
 
         executing_result.sort(key=lambda x: x['index'])
         return {'executing_result': [result for result in executing_result],
                 'output_stream': input_object.get_data('output_stream', None)}
 
+    def _execute_subtask_unless_cancelled(self, subtask_cancel, *args, **kwargs) -> Optional[dict]:
+        if subtask_cancel is not None and subtask_cancel.is_set():
+            return None
+        return self._execute_subtask(*args, **kwargs)
+
     def _execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs) -> dict:
         context_tokens = {}
         FrameworkContextManager().set_all_contexts(kwargs.get('context_values', {}))
@@ -94,7 +129,7 @@ class ExecutingAgentTemplate(AgentTemplate):
                 pair_id=pair_id,
                 auto=False
             )
-            input_object_copy = InputObject(input_object.to_dict())
+            input_object_copy = InputObject(dict(input_object.to_dict()))
             agent_input_copy = dict(agent_input)
 
             self._process_tool_inputs(input_object_copy, subtask)
@@ -108,7 +143,12 @@ class ExecutingAgentTemplate(AgentTemplate):
             self.load_memory(memory, agent_input_copy)
             chain = prompt.as_langchain() | llm.as_langchain_runnable(
                 self.agent_model.llm_params()) | StrOutputParser()
-            res = self.invoke_chain(chain, agent_input_copy, input_object_copy)
+            # a streamed call is only retried before its first chunk was sent.
+            output_stream = _StartedOutputStream(input_object_copy.get_data('output_stream'))
+            chain_input_object = InputObject({**input_object_copy.to_dict(), 'output_stream': output_stream}) \
+                if output_stream.output_stream is not None else input_object_copy
+            res = get_llm_rate_limiter(llm).call(self.invoke_chain, chain, agent_input_copy, chain_input_object,
+                                                 can_retry=lambda: not output_stream.started)
             self.add_memory(memory, f"Human: {agent_input.get('input')}, AI: {res}", agent_input=agent_input)
             ConversationMemoryModule().add_agent_result_info(
                 agent_instance=self,
@@ -149,11 +189,9 @@ class ExecutingAgentTemplate(AgentTemplate):
     def _process_tool_inputs(self, input_object: InputObject, subtask: str) -> None:
         if not self.tool_names:
             return
-        for tool_name in self.tool_names:
-            tool = ToolManager().get_instance_obj(tool_name)
-            if tool is not None:
-                # note: only insert the first key of tool input.
-                input_object.add_data(tool.input_keys[0], subtask)
+        for tool in get_compiled_actions(tool_names=self.tool_names).tools.values():
+            # note: only insert the first key of tool input.
+            input_object.add_data(tool.input_keys[0], subtask)
 
     def initialize_by_component_configer(self, component_configer: AgentConfiger) -> 'ExecutingAgentTemplate':
         super().initialize_by_component_configer(component_configer)
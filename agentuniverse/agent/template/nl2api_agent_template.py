@@ -5,8 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: nl2api_agent_template.py
-from agentuniverse.agent.action.tool.tool import Tool
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
+from agentuniverse.agent.action.action_registry import get_compiled_actions
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.template.agent_template import AgentTemplate
 from agentuniverse.base.config.component_configer.configers.agent_configer import AgentConfiger
@@ -29,12 +28,8 @@ class Nl2ApiAgentTemplate(AgentTemplate):
         return {**agent_result, 'output': agent_result['output']}
 
     def build_tools_context(self) -> str:
-        tools_context = ''
-        if self.tool_names:
-            for tool_name in self.tool_names:
-                tool: Tool = ToolManager().get_instance_obj(tool_name)
-                tools_context += f"tool name: {tool.name}, tool description: {tool.description}\n"
-        return tools_context
+        return get_compiled_actions(tool_names=self.tool_names).tools_description(
+            "tool name: {name}, tool description: {description}\n")
 
     def initialize_by_component_configer(self, component_configer: AgentConfiger) -> 'Nl2ApiAgentTemplate':
         super().initialize_by_component_configer(component_configer)
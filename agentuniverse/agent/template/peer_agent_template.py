@@ -30,6 +30,8 @@ class PeerAgentTemplate(AgentTemplate):
     eval_threshold: int = 60
     retry_count: int = 2
     jump_step: str = 'expressing'
+    pipeline: bool = False
+    pipeline_subtask_ratio: float = 0.5
     expert_framework: Optional[dict[str, Union[str, dict]]] = None
 
     def input_keys(self) -> list[str]:
@@ -42,7 +44,9 @@ class PeerAgentTemplate(AgentTemplate):
         agent_input['input'] = input_object.get_data('input')
         agent_input.update({'eval_threshold': self.eval_threshold,
                             'retry_count': self.retry_count,
-                            'jump_step': self.jump_step})
+                            'jump_step': self.jump_step,
+                            'pipeline': self.pipeline,
+                            'pipeline_subtask_ratio': self.pipeline_subtask_ratio})
         return agent_input
 
     def execute(self, input_object: InputObject, agent_input: dict, **kwargs) -> dict:
@@ -190,6 +194,12 @@ class PeerAgentTemplate(AgentTemplate):
             self.retry_count = self.agent_model.profile.get('retry_count') or planner_config.get('retry_count')
         if self.agent_model.profile.get('jump_step') or planner_config.get('jump_step'):
             self.jump_step = self.agent_model.profile.get('jump_step') or planner_config.get('jump_step')
+        if self.agent_model.profile.get('pipeline') is not None or planner_config.get('pipeline') is not None:
+            self.pipeline = self.agent_model.profile.get('pipeline') \
+                if self.agent_model.profile.get('pipeline') is not None else planner_config.get('pipeline')
+        if self.agent_model.profile.get('pipeline_subtask_ratio') or planner_config.get('pipeline_subtask_ratio'):
+            self.pipeline_subtask_ratio = \
+                self.agent_model.profile.get('pipeline_subtask_ratio') or planner_config.get('pipeline_subtask_ratio')
         if self.agent_model.profile.get('expert_framework') or planner_config.get('expert_framework'):
             self.expert_framework = \
                 self.agent_model.profile.get('expert_framework') or planner_config.get('expert_framework')
@@ -19,12 +19,7 @@ from langchain_core.tools import BaseTool, ToolsRenderer, render_text_descriptio
 from agentuniverse.agent.template.agent_template import AgentTemplate
 from agentuniverse.base.config.component_configer.configers.agent_configer import AgentConfiger
 from agentuniverse.base.util.agent_util import assemble_memory_input, assemble_memory_output
-from agentuniverse.agent.action.knowledge.knowledge import Knowledge
-from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
-from agentuniverse.agent.action.tool.tool import Tool
-from agentuniverse.agent.action.tool.tool_manager import ToolManager
-from agentuniverse.agent.agent import Agent
-from agentuniverse.agent.agent_manager import AgentManager
+from agentuniverse.agent.action.action_registry import CompiledActions, get_compiled_actions
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.memory.memory import Memory
 from agentuniverse.agent.plan.planner.react_planner.stream_callback import StreamOutPutCallbackHandler, \
@@ -133,31 +128,17 @@ class ReActAgentTemplate(AgentTemplate):
         return agent
 
     def build_tools_context(self) -> tuple[str, str]:
-        lc_tools: [LangchainTool] = self._convert_to_langchain_tool()
-        tools_context = ''
-        if not lc_tools:
-            return '', ''
-        tool_names = []
-        for lc_tool in lc_tools:
-            tools_context += f"tool name: {lc_tool.name}, tool description: {lc_tool.description}\n"
-            tool_names.append(lc_tool.name)
-        return tools_context, "|".join(tool_names)
+        compiled_actions = self._get_compiled_actions()
+        return (compiled_actions.tools_description("tool name: {name}, tool description: {description}\n"),
+                compiled_actions.tool_names)
 
     def _convert_to_langchain_tool(self) -> list[LangchainTool]:
-        lc_tools = []
-        if self.tool_names:
-            for tool_name in self.tool_names:
-                tool: Tool = ToolManager().get_instance_obj(tool_name)
-                lc_tools.append(tool.as_langchain())
-        if self.knowledge_names:
-            for knowledge_name in self.knowledge_names:
-                knowledge: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
-                lc_tools.append(knowledge.as_langchain_tool())
-        if self.agent_names:
-            for agent_name in self.agent_names:
-                agent: Agent = AgentManager().get_instance_obj(agent_name)
-                lc_tools.append(agent.as_langchain_tool())
-        return lc_tools
+        return self._get_compiled_actions().lc_tools
+
+    def _get_compiled_actions(self) -> CompiledActions:
+        return get_compiled_actions(tool_names=self.tool_names,
+                                    knowledge_names=self.knowledge_names,
+                                    agent_names=self.agent_names)
 
     def _get_run_config(self, input_object: InputObject) -> RunnableConfig:
         config = RunnableConfig()
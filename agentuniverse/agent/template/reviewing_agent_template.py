@@ -15,6 +15,8 @@ from agentuniverse.base.config.component_configer.configers.agent_configer impor
 from agentuniverse.base.util.common_util import stream_output
 from agentuniverse.base.util.logging.logging_util import LOGGER
 
+RETRY_STAGES = ('planning', 'executing', 'expressing')
+
 
 class ReviewingAgentTemplate(AgentTemplate):
 
@@ -48,10 +50,15 @@ class ReviewingAgentTemplate(AgentTemplate):
         final_result['output'] = output
         final_result['score'] = score
         final_result['suggestion'] = output.get('suggestion')
+        # the stage the peer work pattern should rerun, suggested by the reviewer.
+        retry_stage = output.get('retry_stage')
+        final_result['retry_stage'] = retry_stage if retry_stage in RETRY_STAGES else None
         # add reviewing agent log info.
         logger_info = f"\nReviewing agent execution result is :\n"
         reviewing_info_str = f"review suggestion: {final_result.get('suggestion')} \n"
         reviewing_info_str += f"review score: {final_result.get('score')} \n"
+        if final_result.get('retry_stage'):
+            reviewing_info_str += f"review retry stage: {final_result.get('retry_stage')} \n"
         LOGGER.info(logger_info + reviewing_info_str)
 
         return final_result
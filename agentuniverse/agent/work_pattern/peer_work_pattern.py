@@ -5,6 +5,12 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: peer_work_pattern.py
+import asyncio
+import math
+import threading
+import time
+from typing import Optional
+
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.output_object import OutputObject
 from agentuniverse.agent.template.executing_agent_template import ExecutingAgentTemplate
@@ -12,6 +18,66 @@ from agentuniverse.agent.template.expressing_agent_template import ExpressingAge
 from agentuniverse.agent.template.planning_agent_template import PlanningAgentTemplate
 from agentuniverse.agent.template.reviewing_agent_template import ReviewingAgentTemplate
 from agentuniverse.agent.work_pattern.work_pattern import WorkPattern
+from agentuniverse.base.util.concurrency_util import get_shared_executor
+
+STAGES = ['planning', 'executing', 'expressing', 'reviewing']
+
+# executing tasks left running after a pipelined round exited early.
+_background_tasks: set = set()
+
+
+class _SubtaskProgress:
+    """The executing subtask results of a pipelined round, ready once
+    `required` of them are finished or the executing stage is done."""
+
+    def __init__(self, required: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.required = required
+        self.results = []
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.loop = loop
+        self.async_ready = asyncio.Event() if loop else None
+
+    def add(self, result: dict) -> None:
+        with self.lock:
+            self.results.append(result)
+            if len(self.results) < self.required:
+                return
+        self.set_ready()
+
+    def set_ready(self, *args) -> None:
+        self.ready.set()
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.async_ready.set)
+
+    def partial_result(self) -> OutputObject:
+        with self.lock:
+            results = sorted(self.results, key=lambda x: x['index'])
+        return OutputObject({'executing_result': results})
+
+
+class _DetachableOutputStream:
+    """Forward to the output stream of the request until detached, so the
+    executing stage left running after an early exit streams nothing more."""
+
+    def __init__(self, output_stream):
+        self.output_stream = output_stream
+
+    def detach(self) -> None:
+        self.output_stream = None
+
+    def put_nowait(self, item) -> None:
+        output_stream = self.output_stream
+        if output_stream is not None:
+            output_stream.put_nowait(item)
+
+    def put(self, item, *args, **kwargs) -> None:
+        output_stream = self.output_stream
+        if output_stream is not None:
+            output_stream.put(item, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.output_stream, name)
 
 
 class PeerWorkPattern(WorkPattern):
@@ -24,34 +90,29 @@ class PeerWorkPattern(WorkPattern):
         self._validate_work_pattern_members()
 
         peer_results = list()
-        planning_result = dict()
-        executing_result = dict()
-        expressing_result = dict()
-        reviewing_result = dict()
-
+        stage_results = dict()
         retry_count = work_pattern_input.get('retry_count')
-        jump_step = work_pattern_input.get('jump_step')
         eval_threshold = work_pattern_input.get('eval_threshold')
 
         for _ in range(retry_count):
-            peer_round_results = {}
-
-            if not planning_result or jump_step == "planning":
-                planning_result = self._invoke_planning(input_object, work_pattern_input, peer_round_results)
-
-            if not executing_result or jump_step in ["planning", "executing"]:
-                executing_result = self._invoke_executing(input_object, peer_round_results)
-
-            if not expressing_result or jump_step in ["planning", "executing", "expressing"]:
-                expressing_result = self._invoke_expressing(input_object, peer_round_results)
-
-            if not reviewing_result or jump_step in ["planning", "executing", "expressing", "reviewing"]:
-                reviewing_result = self._invoke_reviewing(input_object, peer_round_results)
+            peer_round_results = {'stage_latency': {}}
+            start_index = self._start_stage_index(stage_results, work_pattern_input)
+            for index, stage in enumerate(STAGES):
+                if stage_results.get(stage) and index < start_index:
+                    continue
+                if stage == 'executing' and self._pipeline_subtask_count(input_object, work_pattern_input):
+                    if self._invoke_pipelined_executing(input_object, work_pattern_input, peer_round_results,
+                                                        stage_results):
+                        break
+                    continue
+                start = time.perf_counter()
+                stage_results[stage] = self._invoke_stage(stage, input_object, work_pattern_input,
+                                                          peer_round_results)
+                peer_round_results['stage_latency'][stage] = time.perf_counter() - start
 
             peer_results.append(peer_round_results)
 
-            if not reviewing_result or (
-                    reviewing_result.get('score') and reviewing_result.get('score') >= eval_threshold):
+            if self._review_passed(stage_results.get('reviewing'), eval_threshold):
                 break
 
         return {'result': peer_results}
@@ -60,37 +121,179 @@ class PeerWorkPattern(WorkPattern):
         self._validate_work_pattern_members()
 
         peer_results = list()
-        planning_result = dict()
-        executing_result = dict()
-        expressing_result = dict()
-        reviewing_result = dict()
-
+        stage_results = dict()
         retry_count = work_pattern_input.get('retry_count')
-        jump_step = work_pattern_input.get('jump_step')
         eval_threshold = work_pattern_input.get('eval_threshold')
 
         for _ in range(retry_count):
-            peer_round_results = {}
-            if not planning_result or jump_step == "planning":
-                planning_result = await self._async_invoke_planning(input_object, work_pattern_input,
-                                                                    peer_round_results)
-
-            if not executing_result or jump_step in ["planning", "executing"]:
-                executing_result = await self._async_invoke_executing(input_object, peer_round_results)
-
-            if not expressing_result or jump_step in ["planning", "executing", "expressing"]:
-                expressing_result = await self._async_invoke_expressing(input_object, peer_round_results)
-
-            if not reviewing_result or jump_step in ["planning", "executing", "expressing", "reviewing"]:
-                reviewing_result = await self._async_invoke_reviewing(input_object, peer_round_results)
+            peer_round_results = {'stage_latency': {}}
+            start_index = self._start_stage_index(stage_results, work_pattern_input)
+            for index, stage in enumerate(STAGES):
+                if stage_results.get(stage) and index < start_index:
+                    continue
+                if stage == 'executing' and self._pipeline_subtask_count(input_object, work_pattern_input):
+                    if await self._async_invoke_pipelined_executing(input_object, work_pattern_input,
+                                                                    peer_round_results, stage_results):
+                        break
+                    continue
+                start = time.perf_counter()
+                stage_results[stage] = await self._async_invoke_stage(stage, input_object, work_pattern_input,
+                                                                      peer_round_results)
+                peer_round_results['stage_latency'][stage] = time.perf_counter() - start
 
             peer_results.append(peer_round_results)
 
-            if not reviewing_result or (
-                    reviewing_result.get('score') and reviewing_result.get('score') >= eval_threshold):
+            if self._review_passed(stage_results.get('reviewing'), eval_threshold):
                 break
         return {'result': peer_results}
 
+    @staticmethod
+    def _start_stage_index(stage_results: dict, work_pattern_input: dict) -> int:
+        """The index of the first stage to rerun in the round.
+
+        The `retry_stage` suggested by the reviewing agent takes precedence
+        over the configured `jump_step`, stages without a result always run.
+        """
+        retry_stage = (stage_results.get('reviewing') or {}).get('retry_stage')
+        if retry_stage not in STAGES:
+            retry_stage = work_pattern_input.get('jump_step')
+        return STAGES.index(retry_stage) if retry_stage in STAGES else len(STAGES)
+
+    @staticmethod
+    def _review_passed(reviewing_result: Optional[dict], eval_threshold) -> bool:
+        return not reviewing_result or (
+                reviewing_result.get('score') and reviewing_result.get('score') >= eval_threshold)
+
+    def _invoke_stage(self, stage: str, input_object: InputObject, work_pattern_input: dict,
+                      peer_round_results: dict) -> dict:
+        if stage == 'planning':
+            return self._invoke_planning(input_object, work_pattern_input, peer_round_results)
+        return getattr(self, f'_invoke_{stage}')(input_object, peer_round_results)
+
+    async def _async_invoke_stage(self, stage: str, input_object: InputObject, work_pattern_input: dict,
+                                  peer_round_results: dict) -> dict:
+        if stage == 'planning':
+            return await self._async_invoke_planning(input_object, work_pattern_input, peer_round_results)
+        return await getattr(self, f'_async_invoke_{stage}')(input_object, peer_round_results)
+
+    def _pipeline_subtask_count(self, input_object: InputObject, work_pattern_input: dict) -> int:
+        """The number of executing subtasks to wait for before expressing a
+        draft, 0 when the round is not pipelined."""
+        if not work_pattern_input.get('pipeline') or not (self.executing and self.expressing and self.reviewing):
+            return 0
+        framework = input_object.get_data('planning_result').get_data('framework') or []
+        required = math.ceil(len(framework) * work_pattern_input.get('pipeline_subtask_ratio', 0.5))
+        return required if 0 < required < len(framework) else 0
+
+    def _invoke_pipelined_executing(self, input_object: InputObject, work_pattern_input: dict,
+                                    peer_round_results: dict, stage_results: dict) -> bool:
+        """Run the executing stage and review a draft expressed from the first
+        finished subtasks, return True if the draft passed the review."""
+        executing_start = time.perf_counter()
+        progress = _SubtaskProgress(self._pipeline_subtask_count(input_object, work_pattern_input))
+        executing_input = self._pipelined_executing_input(input_object, progress)
+        executing_round_results = {}
+        future = get_shared_executor('peer_work_pattern').submit(self._invoke_executing, executing_input,
+                                                                 executing_round_results)
+        future.add_done_callback(progress.set_ready)
+        progress.ready.wait()
+
+        if not future.done():
+            peer_round_results['stage_latency']['executing'] = time.perf_counter() - executing_start
+            draft_input = InputObject(dict(input_object.to_dict()))
+            draft_input.add_data('executing_result', progress.partial_result())
+            draft_round_results = {}
+            start = time.perf_counter()
+            self._invoke_expressing(draft_input, draft_round_results)
+            peer_round_results['stage_latency']['draft_expressing'] = time.perf_counter() - start
+            start = time.perf_counter()
+            reviewing_result = self._invoke_reviewing(draft_input, draft_round_results)
+            peer_round_results['stage_latency']['draft_reviewing'] = time.perf_counter() - start
+            if self._accept_draft(input_object, work_pattern_input, peer_round_results, stage_results,
+                                  draft_input, draft_round_results, reviewing_result):
+                self._stop_executing(executing_input)
+                return True
+
+        stage_results['executing'] = future.result()
+        self._accept_executing(input_object, peer_round_results, executing_input, executing_round_results)
+        peer_round_results['stage_latency']['executing'] = time.perf_counter() - executing_start
+        return False
+
+    async def _async_invoke_pipelined_executing(self, input_object: InputObject, work_pattern_input: dict,
+                                                peer_round_results: dict, stage_results: dict) -> bool:
+        executing_start = time.perf_counter()
+        progress = _SubtaskProgress(self._pipeline_subtask_count(input_object, work_pattern_input),
+                                    loop=asyncio.get_running_loop())
+        executing_input = self._pipelined_executing_input(input_object, progress)
+        executing_round_results = {}
+        task = asyncio.ensure_future(self._async_invoke_executing(executing_input, executing_round_results))
+        task.add_done_callback(progress.set_ready)
+        await progress.async_ready.wait()
+
+        if not task.done():
+            peer_round_results['stage_latency']['executing'] = time.perf_counter() - executing_start
+            draft_input = InputObject(dict(input_object.to_dict()))
+            draft_input.add_data('executing_result', progress.partial_result())
+            draft_round_results = {}
+            start = time.perf_counter()
+            await self._async_invoke_expressing(draft_input, draft_round_results)
+            peer_round_results['stage_latency']['draft_expressing'] = time.perf_counter() - start
+            start = time.perf_counter()
+            reviewing_result = await self._async_invoke_reviewing(draft_input, draft_round_results)
+            peer_round_results['stage_latency']['draft_reviewing'] = time.perf_counter() - start
+            if self._accept_draft(input_object, work_pattern_input, peer_round_results, stage_results,
+                                  draft_input, draft_round_results, reviewing_result):
+                self._stop_executing(executing_input)
+                # keep a reference to the executing task left running.
+                _background_tasks.add(task)
+                task.add_done_callback(_discard_background_task)
+                return True
+
+        stage_results['executing'] = await task
+        self._accept_executing(input_object, peer_round_results, executing_input, executing_round_results)
+        peer_round_results['stage_latency']['executing'] = time.perf_counter() - executing_start
+        return False
+
+    @staticmethod
+    def _pipelined_executing_input(input_object: InputObject, progress: _SubtaskProgress) -> InputObject:
+        output_stream = input_object.get_data('output_stream')
+        return InputObject({**input_object.to_dict(), 'subtask_callback': progress.add,
+                            'subtask_cancel': threading.Event(),
+                            'output_stream': _DetachableOutputStream(output_stream)
+                            if output_stream is not None else None})
+
+    @staticmethod
+    def _stop_executing(executing_input: InputObject) -> None:
+        """Skip the subtasks not started yet after the draft was accepted, and
+        keep the results of the running ones out of the output stream."""
+        executing_input.get_data('subtask_cancel').set()
+        output_stream = executing_input.get_data('output_stream')
+        if output_stream is not None:
+            output_stream.detach()
+
+    def _accept_draft(self, input_object: InputObject, work_pattern_input: dict, peer_round_results: dict,
+                      stage_results: dict, draft_input: InputObject, draft_round_results: dict,
+                      reviewing_result: dict) -> bool:
+        """Take over the draft results if the draft passed the review,
+        otherwise record them as the draft of the round."""
+        if not self._review_passed(reviewing_result, work_pattern_input.get('eval_threshold')):
+            peer_round_results['draft_expressing_result'] = draft_round_results.get('expressing_result')
+            peer_round_results['draft_reviewing_result'] = draft_round_results.get('reviewing_result')
+            return False
+        for stage in ['executing', 'expressing', 'reviewing']:
+            stage_result: OutputObject = draft_input.get_data(f'{stage}_result')
+            input_object.add_data(f'{stage}_result', stage_result)
+            peer_round_results[f'{stage}_result'] = stage_result.to_dict()
+            stage_results[stage] = stage_result.to_dict()
+        peer_round_results['pipeline_early_exit'] = True
+        return True
+
+    @staticmethod
+    def _accept_executing(input_object: InputObject, peer_round_results: dict, executing_input: InputObject,
+                          executing_round_results: dict) -> None:
+        input_object.add_data('executing_result', executing_input.get_data('executing_result'))
+        peer_round_results.update(executing_round_results)
+
     def _invoke_planning(self, input_object: InputObject, agent_input: dict, peer_round_results: dict) -> dict:
         if not self.planning:
             planning_result = OutputObject({"framework": [agent_input.get('input')]})
@@ -178,7 +381,14 @@ class PeerWorkPattern(WorkPattern):
         peer_work_pattern_instance = self.__class__()
         peer_work_pattern_instance.name = self.name
         peer_work_pattern_instance.description = self.description
-        for key in ['planning', 'executing', 'expressing', 'reviewing']:
+        for key in STAGES:
             if key in kwargs:
                 setattr(peer_work_pattern_instance, key, kwargs[key])
         return peer_work_pattern_instance
+
+
+def _discard_background_task(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled():
+        # retrieve the exception of the ignored executing result.
+        task.exception()
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 from typing import Optional
 
 from .service_configer import ServiceConfiger
@@ -7,6 +9,9 @@ from ..base.config.application_configer.application_config_manager import (
 )
 from ..base.component.component_base import ComponentBase
 from ..base.component.component_enum import ComponentEnum
+from ..base.util.concurrency_util import get_shared_executor
+
+SYNC_SERVICE_EXECUTOR_NAME = 'sync_service'
 
 
 class Service(ComponentBase):
@@ -48,6 +53,19 @@ class Service(ComponentBase):
         """The executed function when the service is called."""
         return self.agent.run(**kwargs).to_json_str()
 
+    async def async_run(self, **kwargs) -> str:
+        """The executed function when the service is called in an event loop.
+
+        Agents with a native async path run on the loop, others run in the
+        shared sync service executor.
+        """
+        if self.agent.has_native_async():
+            return (await self.agent.async_run(**kwargs)).to_json_str()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_shared_executor(SYNC_SERVICE_EXECUTOR_NAME),
+            functools.partial(self.run, **kwargs))
+
     @property
     def service_code(self):
         """The unique code of each service, generate from service name."""
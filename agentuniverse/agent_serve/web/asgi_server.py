@@ -0,0 +1,230 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: asgi_server.py
+import asyncio
+import inspect
+import json
+import time
+import traceback
+
+from loguru import logger
+
+try:
+    from starlette.applications import Starlette
+    from starlette.exceptions import HTTPException
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+except ImportError as e:
+    raise ImportError(
+        "starlette is not installed. Please install it with 'pip install starlette uvicorn'") from e
+
+from ..service_instance import ServiceNotFoundError
+from .request_task import RequestTask
+from .web_util import async_service_run_queue, service_run_queue, FlaskServerManager
+from ...base.util.logging.logging_util import LOGGER
+from agentuniverse.base.util.logging.log_type_enum import LogTypeEnum
+from agentuniverse.base.util.logging.general_logger import get_context_prefix
+from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
+
+
+def make_asgi_response(success: bool,
+                       result=None,
+                       message: str = None,
+                       request_id: str = None,
+                       status_code=200) -> JSONResponse:
+    """Construct a standard response, the same as the flask server one."""
+    response_data = {
+        "success": success,
+        "result": result,
+        "message": message,
+        "request_id": request_id
+    }
+    LOGGER.info(f"AU_ASGI_RESPONSE: {response_data}")
+    return JSONResponse(response_data, status_code=status_code)
+
+
+async def read_request_data(request: Request) -> dict:
+    """Get the request params from query string or body according to the
+    request method and content type."""
+    if request.method == "GET":
+        return dict(request.query_params)
+    if "application/json" in request.headers.get("Content-Type", ""):
+        body = await request.body()
+        return json.loads(body.decode('utf-8')) if body else {}
+    return dict(await request.form())
+
+
+def asgi_route(func):
+    """An annotation turning an async handler into an ASGI endpoint, which
+    parses the request params like `request_param` of the flask server, logs
+    the request and handles exceptions like the flask error handlers."""
+    sig = inspect.signature(func)
+
+    async def endpoint(request: Request):
+        start_time = time.time()
+        logger.bind(
+            log_type=LogTypeEnum.flask_request,
+            flask_request=f"<AsgiRequest method={request.method} path={request.url.path}>",
+            context_prefix=get_context_prefix()
+        ).info("Before request.")
+        AuTraceManager().set_log_context()
+        try:
+            req_data = await read_request_data(request)
+            kwargs = {}
+            for name, param in sig.parameters.items():
+                if name == "session_id":
+                    kwargs[name] = request.headers.get("X-Session-Id")
+                elif name == "start_time":
+                    kwargs[name] = start_time
+                else:
+                    kwargs[name] = req_data.get(name, param.default)
+            response = await func(**kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            LOGGER.error(traceback.format_exc())
+            if isinstance(e, ServiceNotFoundError):
+                response = make_asgi_response(success=False, message=str(e), status_code=404)
+            else:
+                response = make_asgi_response(success=False, message="Internal Server Error",
+                                              status_code=500)
+        if not isinstance(response, StreamingResponse):
+            logger.bind(
+                log_type=LogTypeEnum.flask_response,
+                flask_response=response,
+                elapsed_time=time.time() - start_time,
+                context_prefix=get_context_prefix()
+            ).info("After request.")
+        return response
+
+    endpoint.__name__ = func.__name__
+    return endpoint
+
+
+# log stream response
+async def timed_async_generator(generator, start_time):
+    try:
+        async for data in generator:
+            yield data
+    finally:
+        elapsed_time = time.time() - start_time
+        logger.bind(
+            log_type=LogTypeEnum.flask_response,
+            flask_response="Stream finished",
+            elapsed_time=elapsed_time,
+            context_prefix=get_context_prefix()
+        ).info("Stream finished.")
+
+
+async def echo(request: Request):
+    return PlainTextResponse('Welcome to agentUniverse!!!')
+
+
+@asgi_route
+async def liveness():
+    return make_asgi_response(success=True,
+                              result="liveness health check pass!")
+
+
+@asgi_route
+async def service_run(service_id: str, params: dict, saved: bool = False):
+    """Synchronous invocation of an agent service, the agent runs on the
+    event loop if it implements the async path.
+
+    Request Args:
+        service_id(`str`): The id of the agent service.
+        params(`dict`): Json style params passed to service.
+        saved(`bool`): Save the request and result into database.
+
+    Return:
+        Returns a dict containing two keys: success and result.
+    """
+    params = {} if params is None else params
+    params['service_id'] = service_id
+    request_task = await RequestTask.async_create(async_service_run_queue, saved, **params)
+    try:
+        result = await asyncio.wait_for(request_task.async_call(),
+                                        timeout=FlaskServerManager().sync_service_timeout)
+    except asyncio.TimeoutError:
+        return make_asgi_response(success=False,
+                                  message="AU sync service timeout",
+                                  status_code=504)
+    return make_asgi_response(success=True, result=result,
+                              request_id=request_task.request_id)
+
+
+@asgi_route
+async def service_run_stream(service_id: str, params: dict, saved: bool = False, start_time: float = None):
+    """Synchronous invocation of an agent service, return in stream form.
+
+    Request Args:
+        service_id(`str`): The id of the agent service.
+        params(`dict`): Json style params passed to service.
+        saved(`bool`): Save the request and result into database.
+
+    Return:
+        A SSE(Server-Sent Event) stream.
+    """
+    params = {} if params is None else params
+    params['service_id'] = service_id
+    task = await RequestTask.async_create(async_service_run_queue, saved, **params)
+    return StreamingResponse(timed_async_generator(task.async_stream_run(), start_time),
+                             media_type="text/event-stream",
+                             headers={'X-Request-ID': task.request_id})
+
+
+@asgi_route
+async def service_run_async(service_id: str, params: dict, saved: bool = True):
+    """Async invocation of an agent service, return the request id used to
+    get result later.
+
+    Request Args:
+        service_id(`str`): The id of the agent service.
+        params(`dict`): Json style params passed to service.
+        saved(`bool`): Save the request and result into database.
+
+    Return:
+        Returns a dict containing two keys: success and request_id.
+    """
+    params = {} if params is None else params
+    params['service_id'] = service_id
+    task = await RequestTask.async_create(service_run_queue, saved, **params)
+    task.async_run()
+    return make_asgi_response(success=True,
+                              request_id=task.request_id)
+
+
+@asgi_route
+async def service_run_result(request_id: str):
+    """Get the async service result.
+
+    Request Args:
+        request_id(`str`): Request id returned by async run api.
+
+    Return:
+        Returns a dict containing two keys: success and result if request_id
+        exists in database.
+    """
+    data = await asyncio.to_thread(RequestTask.query_request_state, request_id)
+    if data is None:
+        return make_asgi_response(
+            success=False,
+            message=f"request {request_id} not found"
+        )
+    return make_asgi_response(success=True, result=data,
+                              request_id=request_id)
+
+
+app = Starlette(routes=[
+    Route("/echo", echo),
+    Route("/liveness", liveness),
+    Route("/service_run", service_run, methods=['POST']),
+    Route("/service_run_stream", service_run_stream, methods=['POST']),
+    Route("/service_run_async", service_run_async, methods=['POST']),
+    Route("/service_run_result", service_run_result, methods=['GET']),
+])
@@ -5,10 +5,14 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: request_library.py
+import atexit
 import datetime
+import threading
+import time
+from typing import Dict, List
 
 from sqlalchemy import JSON, Integer, String, DateTime, Text, Column
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import declarative_base
 
 from .entity.request_do import RequestDO
@@ -18,8 +22,17 @@ from agentuniverse.base.config.component_configer.configers.sqldb_wrapper_config
 from agentuniverse.base.annotation.singleton import singleton
 from agentuniverse.database.sqldb_wrapper import SQLDBWrapper
 from agentuniverse.database.sqldb_wrapper_manager import SQLDBWrapperManager
+from agentuniverse.base.util.logging.logging_util import LOGGER
 
 REQUEST_TABLE_NAME = 'request_task'
+# Seconds a buffered request update waits before being flushed.
+DEFAULT_FLUSH_INTERVAL = 1
+# Number of buffered requests that triggers a flush before the interval ends.
+DEFAULT_FLUSH_MAX_PENDING = 100
+# Seconds between two purges of the request rows out of retention.
+PURGE_INTERVAL = 3600
+# Max rows deleted in one purge transaction.
+PURGE_BATCH_SIZE = 1000
 Base = declarative_base()
 
 
@@ -27,7 +40,7 @@ class RequestORM(Base):
     """SQLAlchemy ORM Model for RequestDO."""
     __tablename__ = REQUEST_TABLE_NAME
     id = Column(Integer, primary_key=True, autoincrement=True)
-    request_id = Column(String(20), nullable=False)
+    request_id = Column(String(20), nullable=False, index=True)
     query = Column(Text)
     session_id = Column(String(50))
     state = Column(String(20))
@@ -41,14 +54,26 @@ class RequestORM(Base):
 
 @singleton
 class RequestLibrary:
+    """The request task storage.
+
+    Updates of running requests can be buffered with
+    `update_request_buffered`, the latest state of each request is kept and
+    written in one transaction by a background thread on the flush interval
+    or once enough requests are pending. `update_request` writes at once and
+    supersedes the buffered state of the request, so it is used for the final
+    state of a request.
+    """
+
     def __init__(self, configer: Configer = None):
         """Init the database connection. Use uri in config file or use sqlite
         as default database."""
         system_db_uri = None
-        if Configer:
-            system_db_uri = configer.get('DB', {}).get('system_db_uri')
+        db_config = {}
+        if configer:
+            db_config = configer.get('DB', {})
+            system_db_uri = db_config.get('system_db_uri')
             if not system_db_uri:
-                system_db_uri = configer.get('DB', {}).get('mysql_uri')
+                system_db_uri = db_config.get('mysql_uri')
         if system_db_uri and system_db_uri.strip():
             pass
         else:
@@ -67,10 +92,26 @@ class RequestLibrary:
         SQLDBWrapperManager().register(self.sqldb_wrapper.get_instance_code(),
                                        self.sqldb_wrapper)
 
+        self.flush_interval = db_config.get('request_flush_interval', DEFAULT_FLUSH_INTERVAL)
+        self.flush_max_pending = db_config.get('request_flush_max_pending', DEFAULT_FLUSH_MAX_PENDING)
+        # Request rows not modified for more days are purged, kept forever if None.
+        self.retention_days = db_config.get('request_retention_days')
+        self.__pending: Dict[str, RequestDO] = {}
+        self.__pending_condition = threading.Condition()
+        # Serializes the writes, so a flush never overwrites a newer state.
+        self.__write_lock = threading.Lock()
+        self.__flush_thread = None
+        self.__last_purge_time = None
+
     def __init_request_table(self):
-        with self.sqldb_wrapper.sql_database._engine.connect() as conn:
+        engine = self.sqldb_wrapper.sql_database._engine
+        with engine.connect() as conn:
             if not conn.dialect.has_table(conn, REQUEST_TABLE_NAME):
-                Base.metadata.create_all(self.sqldb_wrapper.sql_database._engine)
+                Base.metadata.create_all(engine)
+                return
+        # Tables created by former versions lack the request_id index.
+        for index in RequestORM.__table__.indexes:
+            index.create(engine, checkfirst=True)
 
     def get_session(self):
         if not self.session:
@@ -87,6 +128,10 @@ class RequestLibrary:
         Return:
             The target RequestDO or none when no such data.
         """
+        with self.__pending_condition:
+            pending_request_do = self.__pending.get(request_id)
+        if pending_request_do is not None:
+            return pending_request_do.model_copy(deep=True)
         session = self.get_session()
         try:
             result = session.execute(
@@ -115,23 +160,122 @@ class RequestLibrary:
             return request_orm.id
         finally:
             session.close()
+            self.__ensure_flush_thread()
 
     def update_request(self, request_do: RequestDO):
         """Update the request data with same request id as the given
-        RequestDO."""
+        RequestDO at once, dropping its buffered update."""
+        with self.__write_lock:
+            with self.__pending_condition:
+                self.__pending.pop(request_do.request_id, None)
+            self.__write_requests([request_do])
+
+    def update_request_buffered(self, request_do: RequestDO):
+        """Buffer the update of the request, merged with its former buffered
+        updates and written later by the flush thread."""
+        with self.__pending_condition:
+            self.__pending[request_do.request_id] = request_do
+            if len(self.__pending) >= self.flush_max_pending:
+                self.__pending_condition.notify()
+        self.__ensure_flush_thread()
+
+    def flush(self):
+        """Write all buffered request updates in one transaction."""
+        with self.__write_lock:
+            with self.__pending_condition:
+                pending, self.__pending = self.__pending, {}
+            if not pending:
+                return
+            try:
+                self.__write_requests(list(pending.values()))
+            except Exception:
+                # Keep the updates for the next flush unless buffered again.
+                with self.__pending_condition:
+                    for request_id, request_do in pending.items():
+                        self.__pending.setdefault(request_id, request_do)
+                raise
+
+    def purge_requests(self, before: datetime.datetime) -> int:
+        """Delete the request rows not modified since the given time, in
+        transactions of at most `PURGE_BATCH_SIZE` rows.
+
+        Return:
+            The number of deleted rows.
+        """
+        deleted = 0
         session = self.get_session()
         try:
-            db_request_do = session.query(RequestORM).filter(
-                RequestORM.request_id == request_do.request_id).first()
-            if db_request_do:
-                update_data = request_do.model_dump(exclude_unset=True)
+            while True:
+                ids = session.execute(
+                    select(RequestORM.id).where(RequestORM.gmt_modified < before)
+                    .limit(PURGE_BATCH_SIZE)
+                ).scalars().all()
+                if not ids:
+                    return deleted
+                session.execute(delete(RequestORM).where(RequestORM.id.in_(ids)))
+                session.commit()
+                deleted += len(ids)
+                if len(ids) < PURGE_BATCH_SIZE:
+                    return deleted
+        finally:
+            session.close()
+
+    def __write_requests(self, request_dos: List[RequestDO]):
+        """Update the rows of the given requests in one transaction."""
+        request_dos = {request_do.request_id: request_do for request_do in request_dos}
+        session = self.get_session()
+        try:
+            db_request_dos = session.execute(
+                select(RequestORM).where(RequestORM.request_id.in_(list(request_dos.keys())))
+            ).scalars().all()
+            if not db_request_dos:
+                return
+            for db_request_do in db_request_dos:
+                update_data = request_dos[db_request_do.request_id].model_dump(exclude_unset=True)
                 for key, value in update_data.items():
                     setattr(db_request_do, key, value)
-                session.commit()
-                session.refresh(db_request_do)
+            session.commit()
         finally:
             session.close()
 
+    def __ensure_flush_thread(self):
+        """Start the flush thread in current process if it is not running."""
+        if self.__flush_thread is not None and self.__flush_thread.is_alive():
+            return
+        with self.__pending_condition:
+            if self.__flush_thread is not None and self.__flush_thread.is_alive():
+                return
+            if self.__flush_thread is None:
+                atexit.register(self.flush)
+            self.__flush_thread = threading.Thread(target=self.__flush_loop,
+                                                   name='request_library_flush',
+                                                   daemon=True)
+            self.__flush_thread.start()
+
+    def __flush_loop(self):
+        while True:
+            with self.__pending_condition:
+                self.__pending_condition.wait_for(
+                    lambda: len(self.__pending) >= self.flush_max_pending,
+                    timeout=self.flush_interval)
+            try:
+                self.flush()
+                self.__purge_expired_requests()
+            except Exception as e:
+                LOGGER.error(f"request library flush fail: {e}")
+
+    def __purge_expired_requests(self):
+        """Purge the request rows out of retention once per purge interval."""
+        if not self.retention_days:
+            return
+        if self.__last_purge_time is not None and time.monotonic() - self.__last_purge_time < PURGE_INTERVAL:
+            return
+        self.__last_purge_time = time.monotonic()
+        before = datetime.datetime.now() - datetime.timedelta(days=self.retention_days)
+        deleted = self.purge_requests(before)
+        if deleted:
+            LOGGER.info(f"purged {deleted} request rows modified before {before}")
+
     def update_gmt_modified(self, request_id: str):
         """Update the request task latest active time."""
         session = self.get_session()
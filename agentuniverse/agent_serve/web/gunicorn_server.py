@@ -10,7 +10,8 @@ import tomli
 from gunicorn.app.base import BaseApplication
 
 from .flask_server import app
-from .post_fork_queue import POST_FORK_QUEUE
+from .post_fork_queue import execute_post_fork_queue
+from .web_booster import ACTIVATE_OPTIONS
 from ...base.annotation.singleton import singleton
 
 
@@ -24,16 +25,20 @@ DEFAULT_GUNICORN_CONFIG = {
     'keepalive': 10
 }
 
+# Worker running the ASGI app, each worker serves all its requests on one
+# event loop.
+ASGI_WORKER_CLASS = 'uvicorn.workers.UvicornWorker'
+
 
 # Execute all func in the queue after fork chile process.
 def post_fork(server, worker):
-    for _func, args, kwargs in POST_FORK_QUEUE:
-        _func(*args, **kwargs)
+    execute_post_fork_queue()
 
 
 @singleton
 class GunicornApplication(BaseApplication):
-    """Use gunicorn to wrap the flask web server."""
+    """Use gunicorn to wrap the flask web server, or the ASGI server with
+    uvicorn workers when it is activated."""
     def __init__(self, config_path: str = None):
         self.options = {}
         if config_path:
@@ -62,11 +67,17 @@ class GunicornApplication(BaseApplication):
         # Set post fork.
         self.cfg.set('post_fork', post_fork)
 
+        if ACTIVATE_OPTIONS["asgi"]:
+            self.cfg.set('worker_class', ASGI_WORKER_CLASS)
+
     def update_config(self, options: dict):
         self.options = options
         self.load_config()
 
     def load(self):
+        if ACTIVATE_OPTIONS["asgi"]:
+            from .asgi_server import app as asgi_app
+            return asgi_app
         return self.application
 
     def __load_config_from_file(self, config_path: str):
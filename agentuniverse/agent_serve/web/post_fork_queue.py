@@ -10,6 +10,8 @@ from typing import List, Tuple, Callable, Any
 
 FunctionWithArgs = Tuple[Callable, Tuple[Any, ...], dict]
 POST_FORK_QUEUE: List[FunctionWithArgs] = []
+# Whether the queue has been executed in the current process.
+_POST_FORK_EXECUTED = False
 
 
 def add_post_fork(func: Callable, *args: Any, **kwargs: Any) -> None:
@@ -17,8 +19,24 @@ def add_post_fork(func: Callable, *args: Any, **kwargs: Any) -> None:
     Add funcs and parameters into a waiting list, all of them will be executed
     after gunicorn worker child processes have been forked, or before flask
     main app start if you work without gunicorn.
+
+    Funcs added after the queue has been executed in the current process, for
+    example by components built lazily on their first use, run immediately.
     """
 
     POST_FORK_QUEUE.append((func, args, kwargs))
+    if _POST_FORK_EXECUTED:
+        func(*args, **kwargs)
+
+
+def execute_post_fork_queue() -> None:
+    """Execute all funcs in the post fork queue."""
+    global _POST_FORK_EXECUTED
+    for _func, args, kwargs in POST_FORK_QUEUE:
+        _func(*args, **kwargs)
+    _POST_FORK_EXECUTED = True
 
 
+def is_post_fork_queue_executed() -> bool:
+    """Whether the post fork queue has been executed in the current process."""
+    return _POST_FORK_EXECUTED
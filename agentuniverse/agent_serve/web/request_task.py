@@ -9,18 +9,19 @@ import asyncio
 import enum
 import traceback
 from enum import Enum
-import json
 import queue
 import time
 import uuid
 from datetime import datetime, timedelta
 from threading import Thread
-from typing import Optional, AsyncIterator
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
 from loguru import logger
 
 from .dal.request_library import RequestLibrary
 from .dal.entity.request_do import RequestDO
+from .stream_framer import AsyncOutputStream, StreamFramer, encode_frame
 from .thread_with_result import ThreadWithReturnValue
+from .web_util import FlaskServerManager
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from ...agent.output_object import OutputObject
 from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
@@ -69,15 +70,34 @@ class RequestTask:
         # Whether save to Database.
         self.saved = saved
         self.__request_do__ = self.add_request_do()
-        self.async_queue = asyncio.Queue(maxsize=2000)
+        self.async_queue: Optional[AsyncOutputStream] = None
         self.async_task = None
 
+    @classmethod
+    async def async_create(cls, func, saved=True, **kwargs) -> 'RequestTask':
+        """Init a RequestTask in an event loop, the request is added to the
+        database in a worker thread instead of blocking the loop."""
+        task = cls(func, False, **kwargs)
+        task.saved = saved
+        if saved:
+            await asyncio.to_thread(RequestLibrary().add_request, task.__request_do__)
+        return task
+
     def receive_steps(self):
         """Yield the stream data by getting data from the queue."""
         first_chunk = True
         start_time = time.time()
+        framer = self.new_stream_framer()
         while True:
-            output: str = self.queue.get()
+            if framer.has_pending():
+                try:
+                    timeout = framer.remaining_window()
+                    output = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    yield framer.flush()
+                    continue
+            else:
+                output: str = self.queue.get()
             if output is None:
                 break
             if output == EOF_SIGNAL:
@@ -90,30 +110,36 @@ class RequestTask:
                     cost_time=cost_time,
                     context_prefix=get_context_prefix()
                 ).info("Agent first token generated.")
-            yield "data:" + json.dumps({"process": output},
-                                       ensure_ascii=False) + "\n\n"
+            for frame in self.frame_output(framer, output):
+                yield frame
+        if framer.has_pending():
+            yield framer.flush()
         if self.canceled():
             return
         try:
             result = self.thread.result()
             if isinstance(result, OutputObject):
                 result = result.to_dict()
-            yield "data:" + json.dumps({"result": result},
-                                       ensure_ascii=False) + "\n\n "
+            yield encode_frame("result", result, "\n\n ")
         except Exception as e:
             LOGGER.error("request task execute Fail: " + str(e)+traceback.format_exc())
-            yield "data:" + json.dumps({"error": {"error_msg": str(e)}}) + "\n\n "
+            yield encode_frame("error", {"error_msg": str(e)}, "\n\n ")
 
     async def async_receive_steps(self) -> AsyncIterator[str]:
         first_chunk = True
         start_time = time.time()
+        framer = self.new_stream_framer()
         while True:
-            try:
-                output: str = await asyncio.wait_for(self.async_queue.get(), timeout=0.5)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(1)
-                print("Waiting for data timed out. Retrying...")
-                continue
+            if framer.has_pending():
+                try:
+                    timeout = framer.remaining_window()
+                    output = await asyncio.wait_for(self.async_queue.get(), timeout=timeout) \
+                        if timeout > 0 else self.async_queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    yield framer.flush()
+                    continue
+            else:
+                output: str = await self.async_queue.get()
             if output is None:
                 break
             if output == EOF_SIGNAL:
@@ -126,19 +152,41 @@ class RequestTask:
                     cost_time=cost_time,
                     context_prefix=get_context_prefix()
                 ).info("LLM first token generated.")
-            yield "data:" + json.dumps({"process": output},
-                                       ensure_ascii=False) + "\n\n"
+            for frame in self.frame_output(framer, output):
+                yield frame
+        if framer.has_pending():
+            yield framer.flush()
         if self.canceled():
             return
         try:
             result = await self.async_task
             if isinstance(result, OutputObject):
                 result = result.to_dict()
-            yield "data:" + json.dumps({"result": result},
-                                       ensure_ascii=False) + "\n\n"
+            yield encode_frame("result", result)
         except Exception as e:
             LOGGER.error("request task execute Fail: " + str(e))
-            yield "data:" + json.dumps({"error": {"error_msg": str(e)}}) + "\n\n"
+            yield encode_frame("error", {"error_msg": str(e)})
+
+    @staticmethod
+    def new_stream_framer() -> StreamFramer:
+        """Create the framer of a stream with the configured token coalescing."""
+        return StreamFramer(coalesce_window=FlaskServerManager().stream_coalesce_window,
+                            coalesce_max_bytes=FlaskServerManager().stream_coalesce_max_bytes)
+
+    @staticmethod
+    def frame_output(framer: StreamFramer, output) -> List[str]:
+        """Buffer a token output or encode the output, returning the frames
+        ready to be sent."""
+        frames = []
+        if not framer.add(output):
+            if framer.has_pending():
+                frames.append(framer.flush())
+            if not framer.add(output):
+                frames.append(framer.frame(output))
+                return frames
+        if framer.is_full():
+            frames.append(framer.flush())
+        return frames
 
     def append_steps(self):
         """Tracing async service running state and update it to database."""
@@ -153,7 +201,7 @@ class RequestTask:
                 if output != "" and output != " ":
                     self.__request_do__.steps.append(output)
                 if self.saved:
-                    RequestLibrary().update_request(self.__request_do__)
+                    RequestLibrary().update_request_buffered(self.__request_do__)
             if self.canceled():
                 self.__request_do__.result['result'] = {
                     "result": "The task's tracking status has been canceled."}
@@ -188,12 +236,60 @@ class RequestTask:
         return self.receive_steps()
 
     async def async_stream_run(self) -> AsyncIterator[str]:
+        self.async_queue = AsyncOutputStream()
         self.kwargs['output_stream'] = self.async_queue
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         self.async_task = loop.create_task(self.func(**self.kwargs))
+        # Ends the stream even if the service func does not send the EOF.
+        self.async_task.add_done_callback(lambda _: self.async_queue.put_nowait(EOF_SIGNAL))
         async for item in self.async_receive_steps():
             yield item
 
+    def stream_outputs(self) -> Iterator[Tuple[str, Any]]:
+        """Run the service in a separate thread and yield its raw outputs as
+        (kind, value) pairs, used by the streams not encoded as SSE."""
+        self.kwargs['output_stream'] = self.queue
+        self.thread = ThreadWithReturnValue(target=self.func,
+                                            kwargs=self.kwargs)
+        self.thread.start()
+        while True:
+            output = self.queue.get()
+            if output is None or output == EOF_SIGNAL:
+                break
+            yield "process", output
+        if self.canceled():
+            return
+        try:
+            result = self.thread.result()
+            if isinstance(result, OutputObject):
+                result = result.to_dict()
+            yield "result", result
+        except Exception as e:
+            LOGGER.error("request task execute Fail: " + str(e) + traceback.format_exc())
+            yield "error", str(e)
+
+    async def async_stream_outputs(self) -> AsyncIterator[Tuple[str, Any]]:
+        """The event loop version of `stream_outputs`."""
+        self.async_queue = AsyncOutputStream()
+        self.kwargs['output_stream'] = self.async_queue
+        self.async_task = asyncio.get_running_loop().create_task(self.func(**self.kwargs))
+        self.async_task.add_done_callback(lambda _: self.async_queue.put_nowait(EOF_SIGNAL))
+        while True:
+            output = await self.async_queue.get()
+            if output is None or output == EOF_SIGNAL:
+                break
+            yield "process", output
+        if self.canceled():
+            return
+        try:
+            result = await self.async_task
+            if isinstance(result, OutputObject):
+                result = result.to_dict()
+            yield "result", result
+        except Exception as e:
+            LOGGER.error("request task execute Fail: " + str(e))
+            yield "error", str(e)
+
     def run(self):
         """Run the service synchronous and return the result."""
         self.next_state(TaskStateEnum.RUNNING)
@@ -210,6 +306,22 @@ class RequestTask:
             if self.saved:
                 RequestLibrary().update_request(self.__request_do__)
 
+    async def async_call(self):
+        """Await the service coroutine and return the result."""
+        self.next_state(TaskStateEnum.RUNNING)
+        try:
+            result = await self.func(**self.kwargs)
+            self.next_state(TaskStateEnum.FINISHED)
+            self.__request_do__.result = {"result": result}
+            return result
+        except Exception as e:
+            self.next_state(TaskStateEnum.FAIL)
+            self.__request_do__.additional_args['error_msg'] = str(e)
+            raise e
+        finally:
+            if self.saved:
+                await asyncio.to_thread(RequestLibrary().update_request, self.__request_do__)
+
     def next_state(self, next_state: TaskStateEnum):
         """Update request task state if the transition is valid."""
         if ((TaskStateEnum[self.__request_do__.state.upper()], next_state)
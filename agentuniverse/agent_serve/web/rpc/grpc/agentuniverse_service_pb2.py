@@ -11,9 +11,10 @@ from google.protobuf.internal import builder as _builder
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1b\x61gentuniverse_service.proto\x12\ragentuniverse\"H\n\x13\x41gentServiceRequest\x12\x12\n\nservice_id\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\x12\r\n\x05saved\x18\x03 \x01(\x08\"\\\n\x14\x41gentServiceResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\x0e\n\x06result\x18\x04 \x01(\t\"(\n\x12\x41gentResultRequest\x12\x12\n\nrequest_id\x18\x01 \x01(\t2\xaa\x02\n\x14\x41gentUniverseService\x12V\n\x0bservice_run\x12\".agentuniverse.AgentServiceRequest\x1a#.agentuniverse.AgentServiceResponse\x12\\\n\x11service_run_async\x12\".agentuniverse.AgentServiceRequest\x1a#.agentuniverse.AgentServiceResponse\x12\\\n\x12service_run_result\x12!.agentuniverse.AgentResultRequest\x1a#.agentuniverse.AgentServiceResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1b\x61gentuniverse_service.proto\x12\ragentuniverse\x1a\x1cgoogle/protobuf/struct.proto\"x\n\x13\x41gentServiceRequest\x12\x12\n\nservice_id\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\x12\r\n\x05saved\x18\x03 \x01(\x08\x12.\n\rstruct_params\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\"\\\n\x14\x41gentServiceResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\x0e\n\x06result\x18\x04 \x01(\t\"(\n\x12\x41gentResultRequest\x12\x12\n\nrequest_id\x18\x01 \x01(\t\"4\n\x0f\x41gentTokenChunk\x12\r\n\x05\x63hunk\x18\x01 \x01(\t\x12\x12\n\nagent_name\x18\x02 \x01(\t\"\xb3\x01\n\x13\x41gentStreamResponse\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12/\n\x05token\x18\x02 \x01(\x0b\x32\x1e.agentuniverse.AgentTokenChunkH\x00\x12)\n\x07process\x18\x03 \x01(\x0b\x32\x16.google.protobuf.ValueH\x00\x12\x10\n\x06result\x18\x04 \x01(\tH\x00\x12\x0f\n\x05\x65rror\x18\x05 \x01(\tH\x00\x42\t\n\x07payload2\x8a\x03\n\x14\x41gentUniverseService\x12V\n\x0bservice_run\x12\".agentuniverse.AgentServiceRequest\x1a#.agentuniverse.AgentServiceResponse\x12\\\n\x11service_run_async\x12\".agentuniverse.AgentServiceRequest\x1a#.agentuniverse.AgentServiceResponse\x12\\\n\x12service_run_result\x12!.agentuniverse.AgentResultRequest\x1a#.agentuniverse.AgentServiceResponse\x12^\n\x12service_run_stream\x12\".agentuniverse.AgentServiceRequest\x1a\".agentuniverse.AgentStreamResponse0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -21,12 +22,16 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'agentuniverse_service_pb2',
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  _globals['_AGENTSERVICEREQUEST']._serialized_start=46
-  _globals['_AGENTSERVICEREQUEST']._serialized_end=118
-  _globals['_AGENTSERVICERESPONSE']._serialized_start=120
-  _globals['_AGENTSERVICERESPONSE']._serialized_end=212
-  _globals['_AGENTRESULTREQUEST']._serialized_start=214
-  _globals['_AGENTRESULTREQUEST']._serialized_end=254
-  _globals['_AGENTUNIVERSESERVICE']._serialized_start=257
-  _globals['_AGENTUNIVERSESERVICE']._serialized_end=555
+  _globals['_AGENTSERVICEREQUEST']._serialized_start=76
+  _globals['_AGENTSERVICEREQUEST']._serialized_end=196
+  _globals['_AGENTSERVICERESPONSE']._serialized_start=198
+  _globals['_AGENTSERVICERESPONSE']._serialized_end=290
+  _globals['_AGENTRESULTREQUEST']._serialized_start=292
+  _globals['_AGENTRESULTREQUEST']._serialized_end=332
+  _globals['_AGENTTOKENCHUNK']._serialized_start=334
+  _globals['_AGENTTOKENCHUNK']._serialized_end=386
+  _globals['_AGENTSTREAMRESPONSE']._serialized_start=389
+  _globals['_AGENTSTREAMRESPONSE']._serialized_end=568
+  _globals['_AGENTUNIVERSESERVICE']._serialized_start=571
+  _globals['_AGENTUNIVERSESERVICE']._serialized_end=965
 # @@protoc_insertion_point(module_scope)
@@ -31,6 +31,11 @@ class AgentUniverseServiceStub(object):
                 request_serializer=agentuniverse__service__pb2.AgentResultRequest.SerializeToString,
                 response_deserializer=agentuniverse__service__pb2.AgentServiceResponse.FromString,
                 )
+        self.service_run_stream = channel.unary_stream(
+                '/agentuniverse.AgentUniverseService/service_run_stream',
+                request_serializer=agentuniverse__service__pb2.AgentServiceRequest.SerializeToString,
+                response_deserializer=agentuniverse__service__pb2.AgentStreamResponse.FromString,
+                )
 
 
 class AgentUniverseServiceServicer(object):
@@ -56,6 +61,13 @@ class AgentUniverseServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def service_run_stream(self, request, context):
+        """流式返回智能体服务的输出
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AgentUniverseServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +86,11 @@ def add_AgentUniverseServiceServicer_to_server(servicer, server):
                     request_deserializer=agentuniverse__service__pb2.AgentResultRequest.FromString,
                     response_serializer=agentuniverse__service__pb2.AgentServiceResponse.SerializeToString,
             ),
+            'service_run_stream': grpc.unary_stream_rpc_method_handler(
+                    servicer.service_run_stream,
+                    request_deserializer=agentuniverse__service__pb2.AgentServiceRequest.FromString,
+                    response_serializer=agentuniverse__service__pb2.AgentStreamResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'agentuniverse.AgentUniverseService', rpc_method_handlers)
@@ -135,3 +152,20 @@ class AgentUniverseService(object):
             agentuniverse__service__pb2.AgentServiceResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def service_run_stream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/agentuniverse.AgentUniverseService/service_run_stream',
+            agentuniverse__service__pb2.AgentServiceRequest.SerializeToString,
+            agentuniverse__service__pb2.AgentStreamResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
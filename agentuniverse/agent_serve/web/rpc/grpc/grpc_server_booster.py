@@ -6,15 +6,60 @@
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: grpc_server_booster.py
 
+import asyncio
+import json
 from concurrent import futures
 import grpc
+from google.protobuf import json_format, struct_pb2
 
 from agentuniverse.agent_serve.web.rpc.grpc import agentuniverse_service_pb2, \
     agentuniverse_service_pb2_grpc
-from agentuniverse.agent_serve.web.rpc.rpc_server import service_run, service_run_async, service_run_result
+from agentuniverse.agent_serve.web.rpc.rpc_server import service_run, service_run_async, service_run_result, \
+    async_service_run, service_run_stream, async_service_run_stream
+from agentuniverse.agent_serve.web.stream_framer import is_token_output
 
 GRPC_CONFIG = {}
 
+
+def request_params(request) -> str | dict:
+    """The typed struct params of the request if set, or the json string
+    params."""
+    if request.HasField('struct_params'):
+        return json_format.MessageToDict(request.struct_params)
+    return request.params
+
+
+def make_service_response(service_result: dict) -> agentuniverse_service_pb2.AgentServiceResponse:
+    return agentuniverse_service_pb2.AgentServiceResponse(
+        result=service_result.get('result'),
+        request_id=service_result.get('request_id'),
+        success=service_result['success'],
+        message=service_result.get('message')
+    )
+
+
+def make_stream_response(request_id: str, kind: str, value) -> agentuniverse_service_pb2.AgentStreamResponse:
+    """Convert an output of the service stream to a typed stream response."""
+    if kind == "process":
+        if is_token_output(value):
+            agent_info = value['data'].get('agent_info')
+            return agentuniverse_service_pb2.AgentStreamResponse(
+                request_id=request_id,
+                token=agentuniverse_service_pb2.AgentTokenChunk(
+                    chunk=value['data']['chunk'],
+                    agent_name=agent_info.get('name', '') if isinstance(agent_info, dict) else ''))
+        process = struct_pb2.Value()
+        try:
+            json_format.ParseDict(value, process)
+        except (json_format.ParseError, TypeError):
+            process.string_value = str(value)
+        return agentuniverse_service_pb2.AgentStreamResponse(request_id=request_id, process=process)
+    if kind == "result":
+        result = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        return agentuniverse_service_pb2.AgentStreamResponse(request_id=request_id, result=result)
+    return agentuniverse_service_pb2.AgentStreamResponse(request_id=request_id, error=str(value))
+
+
 class AgentUniverseService(agentuniverse_service_pb2_grpc.AgentUniverseService):
     """Implementation class of grpc service."""
     def service_run(self, request, context):
@@ -37,16 +82,10 @@ class AgentUniverseService(agentuniverse_service_pb2_grpc.AgentUniverseService):
         """
         service_result = service_run(
             saved=request.saved,
-            params=request.params,
+            params=request_params(request),
             service_id=request.service_id
         )
-
-        return agentuniverse_service_pb2.AgentServiceResponse(
-            result=service_result['result'],
-            request_id=service_result['request_id'],
-            success=service_result['success'],
-            message=service_result['message']
-        )
+        return make_service_response(service_result)
 
     def service_run_async(self, request, context):
         """
@@ -69,15 +108,10 @@ class AgentUniverseService(agentuniverse_service_pb2_grpc.AgentUniverseService):
         """
         service_result = service_run_async(
             saved=request.saved,
-            params=request.params,
+            params=request_params(request),
             service_id=request.service_id
         )
-        return agentuniverse_service_pb2.AgentServiceResponse(
-            result=service_result['result'],
-            request_id=service_result['request_id'],
-            success=service_result['success'],
-            message=service_result['message']
-        )
+        return make_service_response(service_result)
 
     def service_run_result(self, request, context):
         """
@@ -99,29 +133,119 @@ class AgentUniverseService(agentuniverse_service_pb2_grpc.AgentUniverseService):
         service_result = service_run_result(
             request_id=request.request_id
         )
-        return agentuniverse_service_pb2.AgentServiceResponse(
-            result=service_result['result'],
-            request_id=service_result['request_id'],
-            success=service_result['success'],
-            message=service_result['message']
+        return make_service_response(service_result)
+
+    def service_run_stream(self, request, context):
+        """
+        Invocation of an agent service, yield the outputs as they are produced.
+        Each stream holds a server worker thread until the service ends.
+
+        Request Args:
+            request(`agentuniverse_service_pb2.AgentServiceRequest`):
+                service_id(`str`): The id of the agent service.
+                params(`str`): A Json String contains agent params passed to service.
+                struct_params(`Struct`): Typed params used instead of params when set.
+                saved(`bool`): Save the request and result into database.
+            context: grpc context, needn't pass anything.
+
+        Return:
+            A stream of agentuniverse_service_pb2.AgentStreamResponse, token
+            or process responses while the service runs, then a result or an
+            error response.
+        """
+        request_id, outputs = service_run_stream(
+            saved=request.saved,
+            params=request_params(request),
+            service_id=request.service_id
+        )
+        for kind, value in outputs:
+            yield make_stream_response(request_id, kind, value)
+
+
+class AsyncAgentUniverseService(agentuniverse_service_pb2_grpc.AgentUniverseService):
+    """Implementation class of grpc.aio service, agents implementing the async
+    path run on the event loop of the server."""
+    async def service_run(self, request, context):
+        """The same as `AgentUniverseService.service_run`."""
+        service_result = await async_service_run(
+            saved=request.saved,
+            params=request_params(request),
+            service_id=request.service_id
         )
+        return make_service_response(service_result)
+
+    async def service_run_async(self, request, context):
+        """The same as `AgentUniverseService.service_run_async`."""
+        service_result = await asyncio.to_thread(
+            service_run_async,
+            saved=request.saved,
+            params=request_params(request),
+            service_id=request.service_id
+        )
+        return make_service_response(service_result)
+
+    async def service_run_result(self, request, context):
+        """The same as `AgentUniverseService.service_run_result`."""
+        service_result = await asyncio.to_thread(service_run_result, request_id=request.request_id)
+        return make_service_response(service_result)
+
+    async def service_run_stream(self, request, context):
+        """The same as `AgentUniverseService.service_run_stream`, without
+        holding a thread per stream."""
+        request_id, outputs = await async_service_run_stream(
+            saved=request.saved,
+            params=request_params(request),
+            service_id=request.service_id
+        )
+        async for kind, value in outputs:
+            yield make_stream_response(request_id, kind, value)
 
 
 def set_grpc_config(configer):
     GRPC_CONFIG["server_port"] = configer.value.get('GRPC', {}).get('server_port', 50051)
     GRPC_CONFIG["max_workers"] = configer.value.get('GRPC', {}).get('max_workers', 10)
+    GRPC_CONFIG["max_concurrent_rpcs"] = configer.value.get('GRPC', {}).get('max_concurrent_rpcs')
+    GRPC_CONFIG["server_mode"] = configer.value.get('GRPC', {}).get('server_mode', 'thread')
 
 
-def start_grpc_server():
-    """Used to start a grpc server, use configer to read grpc server config if
-    applied, or use default config of 10 workers and 50051 port."""
-    server_port = GRPC_CONFIG.get('server_port', 50051)
+def create_grpc_server(server_port: int | str = 0) -> tuple:
+    """Create the grpc server of the configured mode and bind the port.
+
+    Return:
+        The server and the bound port, a grpc.aio server in aio mode.
+    """
     max_workers = GRPC_CONFIG.get('max_workers', 10)
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    max_concurrent_rpcs = GRPC_CONFIG.get('max_concurrent_rpcs')
+    if GRPC_CONFIG.get('server_mode') == 'aio':
+        server = grpc.aio.server(maximum_concurrent_rpcs=max_concurrent_rpcs)
+        servicer = AsyncAgentUniverseService()
+    else:
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers),
+                             maximum_concurrent_rpcs=max_concurrent_rpcs)
+        servicer = AgentUniverseService()
     agentuniverse_service_pb2_grpc.add_AgentUniverseServiceServicer_to_server(
-        AgentUniverseService(), server
+        servicer, server
     )
-    server.add_insecure_port(f'[::]:{str(server_port)}')
+    port = server.add_insecure_port(f'[::]:{str(server_port)}')
+    return server, port
+
+
+async def serve_aio_grpc_server(server_port: int | str):
+    server, _ = create_grpc_server(server_port)
+    await server.start()
+    print(f"AgentUniverse grpc.aio server start at port {str(server_port)}.")
+    await server.wait_for_termination()
+
+
+def start_grpc_server():
+    """Used to start a grpc server, use configer to read grpc server config if
+    applied, or use default config of 10 workers and 50051 port. In aio mode
+    the server runs on an event loop of the calling thread."""
+    server_port = GRPC_CONFIG.get('server_port', 50051)
+    if GRPC_CONFIG.get('server_mode') == 'aio':
+        asyncio.run(serve_aio_grpc_server(server_port))
+        return
+    server, _ = create_grpc_server(server_port)
     server.start()
     print(f"AgentUniverse grpc server start at port {str(server_port)}.")
     server.wait_for_termination()
@@ -7,13 +7,23 @@
 # @FileName: rpc_server.py
 
 import json
+from typing import AsyncIterator, Iterator, Tuple
 
 from agentuniverse.agent_serve.service_instance import ServiceInstance
 from ..request_task import RequestTask
-from ..web_util import service_run_queue
+from ..web_util import async_service_run_queue, service_run_queue
 
 
-def service_run(saved: bool, params: str, service_id: str):
+def parse_params(params: str | dict | None) -> dict:
+    """Parse the service params, a Json String or an already typed dict."""
+    if isinstance(params, dict):
+        return dict(params)
+    if params and params.strip():
+        return json.loads(params)
+    return {}
+
+
+def service_run(saved: bool, params: str | dict, service_id: str):
     """Synchronous invocation of an agent service. Used in rpc implementation.
 
     Request Args:
@@ -28,10 +38,7 @@ def service_run(saved: bool, params: str, service_id: str):
         result: This key points to a nested dictionary that includes the
             result of the task.
     """
-    if params and params.strip():
-        params = json.loads(params)
-    else:
-        params = {}
+    params = parse_params(params)
     request_task = RequestTask(ServiceInstance(service_id).run, saved,
                                **params)
     result = request_task.run()
@@ -43,7 +50,7 @@ def service_run(saved: bool, params: str, service_id: str):
     }
 
 
-def service_run_async(saved: bool, params: str, service_id: str):
+def service_run_async(saved: bool, params: str | dict, service_id: str):
     """Async invocation of an agent service, return the request id used to
     get result later. Used in rpc implementation.
 
@@ -59,10 +66,7 @@ def service_run_async(saved: bool, params: str, service_id: str):
         request_id: Stand for a single request taski, can be used in
             service_run_result api to get the result of async task.
     """
-    if params and params.strip():
-        params = json.loads(params)
-    else:
-        params = {}
+    params = parse_params(params)
     params['service_id'] = service_id
     task = RequestTask(service_run_queue, saved, **params)
     task.async_run()
@@ -74,6 +78,53 @@ def service_run_async(saved: bool, params: str, service_id: str):
     }
 
 
+async def async_service_run(saved: bool, params: str | dict, service_id: str):
+    """Synchronous invocation of an agent service in an event loop, the
+    agent runs on the loop if it implements the async path. Used in rpc
+    implementation, returns the same dict as `service_run`."""
+    params = parse_params(params)
+    params['service_id'] = service_id
+    request_task = await RequestTask.async_create(async_service_run_queue, saved, **params)
+    result = await request_task.async_call()
+    return {
+        "success": True,
+        "result": result,
+        "message": None,
+        "request_id": request_task.request_id
+    }
+
+
+def service_run_stream(saved: bool, params: str | dict, service_id: str) \
+        -> Tuple[str, Iterator[Tuple[str, object]]]:
+    """Invocation of an agent service, return the outputs as they are
+    produced. Used in rpc implementation.
+
+    Request Args:
+        service_id(`str`): The id of the agent service.
+        params(`str | dict`): A Json String or a dict contains agent params
+            passed to service.
+        saved(`bool`): Save the request and result into database.
+
+    Return:
+        The request id and an iterator of (kind, value) pairs, kind is
+        process for the intermediate outputs, then result or error once the
+        service ends.
+    """
+    params = parse_params(params)
+    params['service_id'] = service_id
+    task = RequestTask(service_run_queue, saved, **params)
+    return task.request_id, task.stream_outputs()
+
+
+async def async_service_run_stream(saved: bool, params: str | dict, service_id: str) \
+        -> Tuple[str, AsyncIterator[Tuple[str, object]]]:
+    """The event loop version of `service_run_stream`."""
+    params = parse_params(params)
+    params['service_id'] = service_id
+    task = await RequestTask.async_create(async_service_run_queue, saved, **params)
+    return task.request_id, task.async_stream_outputs()
+
+
 def service_run_result(request_id: str):
     """Get the async service result.
 
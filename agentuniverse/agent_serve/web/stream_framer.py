@@ -0,0 +1,136 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: stream_framer.py
+import asyncio
+import json
+import threading
+import time
+from typing import Any, List, Optional
+
+DEFAULT_COALESCE_WINDOW = 0
+DEFAULT_COALESCE_MAX_BYTES = 4096
+
+
+def is_token_output(output: Any) -> bool:
+    """Whether the stream output is a token chunk of an llm answer."""
+    if not isinstance(output, dict) or output.get('type') != 'token':
+        return False
+    data = output.get('data')
+    return isinstance(data, dict) and isinstance(data.get('chunk'), str)
+
+
+def encode_frame(key: str, value: Any, tail: str = "\n\n") -> str:
+    """Encode one SSE `data:` frame."""
+    return "data:" + json.dumps({key: value}, ensure_ascii=False) + tail
+
+
+class StreamFramer:
+    """Turn the outputs of an agent stream into SSE frames.
+
+    Consecutive token outputs of the same agent are merged into one frame,
+    until the coalescing window since the first buffered token expires or
+    the buffered chunks reach the byte budget; with a zero window only the
+    tokens already queued are merged, so no latency is added. The
+    `agent_info` of token frames is only sent when it differs from the
+    previous token frame of the stream.
+
+    Attributes:
+        coalesce_window (float): Max seconds a token waits for later tokens.
+        coalesce_max_bytes (int): Utf-8 byte budget of the merged chunks.
+    """
+
+    def __init__(self, coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+                 coalesce_max_bytes: int = DEFAULT_COALESCE_MAX_BYTES):
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_bytes = coalesce_max_bytes
+        self._sent_agent_info = None
+        self._token_output: Optional[dict] = None
+        self._chunks: List[str] = []
+        self._bytes = 0
+        self._deadline = 0.0
+
+    def add(self, output: Any) -> bool:
+        """Buffer a token output.
+
+        Returns:
+            bool: False if the output is not a token or can not be merged into
+                the buffered tokens, flush them and add it again.
+        """
+        if not is_token_output(output):
+            return False
+        data = output['data']
+        if self._token_output is None:
+            self._token_output = output
+            self._deadline = time.monotonic() + self.coalesce_window
+        elif (self._bytes >= self.coalesce_max_bytes
+              or data.get('agent_info') != self._token_output['data'].get('agent_info')):
+            return False
+        chunk = data['chunk']
+        self._chunks.append(chunk)
+        self._bytes += len(chunk.encode('utf-8'))
+        return True
+
+    def has_pending(self) -> bool:
+        return self._token_output is not None
+
+    def is_full(self) -> bool:
+        return self._bytes >= self.coalesce_max_bytes
+
+    def remaining_window(self) -> float:
+        """Seconds the buffered tokens can still wait for later tokens."""
+        return max(0.0, self._deadline - time.monotonic())
+
+    def flush(self) -> str:
+        """Encode the buffered tokens as one frame."""
+        output = self._token_output
+        data = dict(output['data'])
+        data['chunk'] = ''.join(self._chunks)
+        agent_info = data.get('agent_info')
+        if agent_info is not None and agent_info == self._sent_agent_info:
+            del data['agent_info']
+        else:
+            self._sent_agent_info = agent_info
+        self._token_output = None
+        self._chunks = []
+        self._bytes = 0
+        return encode_frame("process", {**output, 'data': data})
+
+    @staticmethod
+    def frame(output: Any) -> str:
+        """Encode a non token output as one frame."""
+        return encode_frame("process", output)
+
+
+class AsyncOutputStream:
+    """The output stream of an async request task.
+
+    Producers running in worker threads put outputs through the event loop
+    of the consumer, which is woken up as soon as an output arrives instead
+    of polling the queue. The queue is unbounded like the `queue.Queue` of
+    sync streams: producers only have `put_nowait`, so a bounded queue could
+    only drop outputs, including the EOF that ends the stream.
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+
+    def put_nowait(self, item: Any):
+        if threading.get_ident() == self._loop_thread_id:
+            self.queue.put_nowait(item)
+        else:
+            self._loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+    def put(self, item: Any):
+        self.put_nowait(item)
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def get_nowait(self) -> Any:
+        return self.queue.get_nowait()
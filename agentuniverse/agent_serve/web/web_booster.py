@@ -9,18 +9,19 @@
 import sys
 import threading
 
-from .post_fork_queue import POST_FORK_QUEUE
+from .post_fork_queue import execute_post_fork_queue
 
 ACTIVATE_OPTIONS = {
     "gunicorn": False,
-    "grpc": False
+    "grpc": False,
+    "asgi": False
 }
 
 
 def start_web_server(**kwargs):
     """
     Start func of web server, include http server and grpc server. Use Flask
-    as default http server.
+    as default http server, or the ASGI server when it is activated.
     The gRPC server is not enabled by default; it needs
     to be configured in the configuration file.
     Accept input arguments to overwrite default config.
@@ -38,14 +39,26 @@ def start_web_server(**kwargs):
         from .gunicorn_server import GunicornApplication
         GunicornApplication().update_config(kwargs)
         GunicornApplication().run()
+    elif ACTIVATE_OPTIONS["asgi"]:
+        try:
+            import uvicorn
+        except ImportError as e:
+            raise ImportError(
+                "uvicorn is not installed. Please install it with 'pip install uvicorn'") from e
+        from .asgi_server import app
+        host, port = _parse_bind(kwargs)
+        execute_post_fork_queue()
+        uvicorn.run(app, host=host, port=port)
     else:
         from .flask_server import app
-        if 'bind' in kwargs:
-            host, port = kwargs['bind'].split(':')
-            port = int(port)
-        else:
-            port = 8888
-            host = '0.0.0.0'
-        for _func, args, kwargs in POST_FORK_QUEUE:
-            _func(*args, **kwargs)
+        host, port = _parse_bind(kwargs)
+        execute_post_fork_queue()
         app.run(port=port, host=host, debug=False)
+
+
+def _parse_bind(kwargs: dict) -> tuple:
+    """Get the host and port of the single process http server."""
+    if 'bind' in kwargs:
+        host, port = kwargs['bind'].split(':')
+        return host, int(port)
+    return '0.0.0.0', 8888
@@ -12,6 +12,7 @@ import json
 
 from flask import request, make_response, jsonify
 
+from .stream_framer import DEFAULT_COALESCE_MAX_BYTES, DEFAULT_COALESCE_WINDOW
 from ..service_instance import ServiceInstance
 from ...agent.agent import Agent
 from ...agent.agent_manager import AgentManager
@@ -22,6 +23,8 @@ from ...base.annotation.singleton import singleton
 @singleton
 class FlaskServerManager:
     _sync_service_timeout = 30
+    _stream_coalesce_window = DEFAULT_COALESCE_WINDOW
+    _stream_coalesce_max_bytes = DEFAULT_COALESCE_MAX_BYTES
 
     @property
     def sync_service_timeout(self):
@@ -31,6 +34,24 @@ class FlaskServerManager:
     def sync_service_timeout(self, timeout):
         self._sync_service_timeout = timeout
 
+    @property
+    def stream_coalesce_window(self):
+        """Max seconds a streamed token waits to be merged with later ones."""
+        return self._stream_coalesce_window
+
+    @stream_coalesce_window.setter
+    def stream_coalesce_window(self, window):
+        self._stream_coalesce_window = window
+
+    @property
+    def stream_coalesce_max_bytes(self):
+        """Byte budget of the tokens merged into one stream frame."""
+        return self._stream_coalesce_max_bytes
+
+    @stream_coalesce_max_bytes.setter
+    def stream_coalesce_max_bytes(self, max_bytes):
+        self._stream_coalesce_max_bytes = max_bytes
+
 
 def request_param(func):
     """An annotation used to parse the flask request params."""
@@ -83,6 +104,17 @@ def service_run_queue(service_id, **kwargs):
             stream.put_nowait('{"type": "EOF"}')
 
 
+async def async_service_run_queue(service_id, **kwargs):
+    """The coroutine used in an event loop to run an agent service. The
+    result will be saved in a queue if one is provided."""
+    stream = kwargs.get('output_stream')
+    try:
+        return await ServiceInstance(service_id).async_run(**kwargs)
+    finally:
+        if stream:
+            stream.put_nowait('{"type": "EOF"}')
+
+
 def agent_run_queue(agent_id, **kwargs):
     """The func used in a separate thread to run an agent, and the result will be saved in a queue if provided.
 
@@ -5,6 +5,7 @@
 # @Author  : jerry.zzw 
 # @Email   : jerry.zzw@antgroup.com
 # @FileName: agentuniverse.py
+import functools
 import importlib
 import sys
 from pathlib import Path
@@ -17,6 +18,7 @@ from agentuniverse.base.config.application_configer.app_configer import AppConfi
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.base.component.component_configer_util import ComponentConfigerUtil
+from agentuniverse.base.component.component_scanner import ComponentScanner
 from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
 from agentuniverse.base.config.configer import Configer
 from agentuniverse.base.config.custom_configer.default_llm_configer import DefaultLLMConfiger
@@ -29,9 +31,12 @@ from agentuniverse.base.util.logging.logging_util import init_loggers
 from agentuniverse.agent_serve.web.request_task import RequestLibrary
 from agentuniverse.agent_serve.web.rpc.grpc.grpc_server_booster import set_grpc_config
 from agentuniverse.agent_serve.web.web_booster import ACTIVATE_OPTIONS
-from agentuniverse.agent_serve.web.post_fork_queue import POST_FORK_QUEUE
+from agentuniverse.agent_serve.web.post_fork_queue import execute_post_fork_queue
 from agentuniverse.agent_serve.web.web_util import FlaskServerManager
 
+DEFAULT_LAZY_COMPONENT_TYPES = [ComponentEnum.AGENT.value, ComponentEnum.KNOWLEDGE.value,
+                                ComponentEnum.STORE.value, ComponentEnum.TOOL.value]
+
 
 @singleton
 class AgentUniverse(object):
@@ -56,6 +61,9 @@ class AgentUniverse(object):
         self.__system_default_memory_storage_package = ['agentuniverse.agent.memory.memory_storage']
         self.__system_default_work_pattern_package = ['agentuniverse.agent.work_pattern']
         self.__system_default_log_sink_package = ['agentuniverse.base.util.logging.log_sink.log_sink']
+        self.__component_scanner: ComponentScanner = ComponentScanner()
+        self.__lazy_component_types: set[str] = set()
+        self.__lazy_warm_up_names: set[str] = set()
 
     def start(self, config_path: str = None, core_mode: bool = False):
         """Start the agentUniverse framework.
@@ -81,6 +89,21 @@ class AgentUniverse(object):
             config_path)
         CustomKeyConfiger(custom_key_configer_path)
 
+        # init the component scanner with the optional manifest cache
+        component_manifest_path = self.__parse_sub_config_path(
+            configer.value.get('SUB_CONFIG_PATH', {}).get('component_manifest_path'),
+            config_path)
+        self.__component_scanner = ComponentScanner(manifest_path=component_manifest_path)
+
+        # init lazy registration of the components
+        lazy_registration_config = configer.value.get('LAZY_REGISTRATION', {})
+        lazy_activate = lazy_registration_config.get('activate')
+        if lazy_activate and str(lazy_activate).lower() == 'true':
+            self.__lazy_component_types = {component_type.upper() for component_type in
+                                           lazy_registration_config.get('component_types',
+                                                                        DEFAULT_LAZY_COMPONENT_TYPES)}
+            self.__lazy_warm_up_names = set(lazy_registration_config.get('warm_up', []))
+
         # init loguru loggers
         log_config_path = self.__parse_sub_config_path(
             configer.value.get('SUB_CONFIG_PATH', {}).get('log_config_path'),
@@ -100,6 +123,15 @@ class AgentUniverse(object):
         sync_service_timeout = configer.value.get('HTTP_SERVER', {}).get('sync_service_timeout')
         if sync_service_timeout:
             FlaskServerManager().sync_service_timeout = sync_service_timeout
+        stream_coalesce_window_ms = configer.value.get('HTTP_SERVER', {}).get('stream_coalesce_window_ms')
+        if stream_coalesce_window_ms is not None:
+            FlaskServerManager().stream_coalesce_window = stream_coalesce_window_ms / 1000
+        stream_coalesce_max_bytes = configer.value.get('HTTP_SERVER', {}).get('stream_coalesce_max_bytes')
+        if stream_coalesce_max_bytes:
+            FlaskServerManager().stream_coalesce_max_bytes = stream_coalesce_max_bytes
+        asgi_activate = configer.value.get('ASGI', {}).get('activate')
+        if asgi_activate and str(asgi_activate).lower() == 'true':
+            ACTIVATE_OPTIONS["asgi"] = True
         gunicorn_activate = configer.value.get('GUNICORN', {}).get('activate')
         if gunicorn_activate and gunicorn_activate.lower() == 'true':
             ACTIVATE_OPTIONS["gunicorn"] = True
@@ -126,8 +158,7 @@ class AgentUniverse(object):
         # scan and register the components
         self.__scan_and_register(self.__config_container.app_configer)
         if core_mode:
-            for _func, args, kwargs in POST_FORK_QUEUE:
-                _func(*args, **kwargs)
+            execute_post_fork_queue()
 
     def __scan_and_register(self, app_configer: AppConfiger):
         """Scan the component directory and register the components.
@@ -198,9 +229,11 @@ class AgentUniverse(object):
         for component_enum, package_list in component_package_map.items():
             if not package_list:
                 continue
-            component_configer_list = self.scan(package_list, ConfigTypeEnum.YAML, component_enum)
+            component_configer_list = self.__scan(package_list, ConfigTypeEnum.YAML, component_enum)
             component_configer_list_map[component_enum] = component_configer_list
 
+        self.__component_scanner.save_manifest()
+
         for component_enum, component_configer_list in component_configer_list_map.items():
             self.__register(component_enum, component_configer_list)
 
@@ -210,6 +243,9 @@ class AgentUniverse(object):
              component_enum: ComponentEnum) -> list:
         """Scan the component directory and return certain component configer list.
 
+        Scans made after the startup, e.g. of the product components, are
+        added to the component manifest.
+
         Args:
             package_list(list): the package list
             config_type_enum(ConfigTypeEnum): the configuration file type enumeration
@@ -218,6 +254,14 @@ class AgentUniverse(object):
         Returns:
             list: the component configer list
         """
+        component_configer_list = self.__scan(package_list, config_type_enum, component_enum)
+        self.__component_scanner.save_manifest()
+        return component_configer_list
+
+    def __scan(self,
+               package_list: [str],
+               config_type_enum: ConfigTypeEnum,
+               component_enum: ComponentEnum) -> list:
         component_configer_list = []
         if component_enum.value == ComponentEnum.LLM.value:
             # Find the default LLM configuration file path from the provided package list
@@ -231,17 +275,9 @@ class AgentUniverse(object):
                 if default_llm_configer and default_llm_configer.default_llm:
                     self.__config_container.app_configer.agent_llm_set.add(default_llm_configer.default_llm)
 
-        for package_name in package_list:
-            package_path = self.__package_name_to_path(package_name)
-            path = Path(package_path)
-            config_files = path.rglob(f'*.{config_type_enum.value}')
-            for config_file in config_files:
-                config_file_str = str(config_file)
-                configer = Configer(path=config_file_str).load()
-                component_configer = ComponentConfiger().load_by_configer(configer)
-                component_config_type = component_configer.get_component_config_type()
-                if component_config_type == component_enum.value:
-                    component_configer_list.append(component_configer)
+        package_path_list = [self.__package_name_to_path(package_name) for package_name in package_list]
+        component_configer_list.extend(
+            self.__component_scanner.scan(package_path_list, config_type_enum, component_enum))
         return component_configer_list
 
     def __register(self, component_enum: ComponentEnum, component_configer_list: list[ComponentConfiger]):
@@ -284,21 +320,67 @@ class AgentUniverse(object):
                         self.__config_container.app_configer.tool_configer_map[
                             configer_instance.name] = configer_instance
                         continue
-            component_clz = ComponentConfigerUtil.get_component_object_clz_by_component_configer(configer_instance)
-            component_instance: ComponentBase = component_clz().initialize_by_component_configer(configer_instance)
+            lazy_instance_code = self.__get_lazy_instance_code(component_enum, configer_instance)
+            if lazy_instance_code:
+                component_manager_clz().register_lazy(
+                    lazy_instance_code,
+                    functools.partial(self.__init_component, component_enum, configer_instance,
+                                      component_configer.configer.path),
+                    component_config_path=component_configer.configer.path)
+                continue
+            component_instance = self.__init_component(component_enum, configer_instance,
+                                                       component_configer.configer.path)
             if component_instance is None:
                 continue
-            component_instance.component_config_path = component_configer.configer.path
-            if component_enum.value == ComponentEnum.LLM.value:
-                if is_system_builtin(component_instance):
-                    if is_api_key_missing(component_instance, "api_key"):
-                        continue
-                else:
-                    if is_api_key_missing(component_instance, "api_key"):
-                        raise ValueError(
-                            f"Missing required API key for LLM component {component_instance.get_instance_code()}.")
             component_manager_clz().register(component_instance.get_instance_code(), component_instance)
 
+    def __init_component(self, component_enum: ComponentEnum, configer_instance: ComponentConfiger,
+                         component_config_path: str) -> ComponentBase | None:
+        """Build the component instance of the configer.
+
+        Args:
+            component_enum(ComponentEnum): the component enumeration
+            configer_instance(ComponentConfiger): the component configer
+            component_config_path(str): the path of the component configuration file
+
+        Returns:
+            ComponentBase | None: the component instance, None if it should not be registered
+        """
+        component_clz = ComponentConfigerUtil.get_component_object_clz_by_component_configer(configer_instance)
+        component_instance: ComponentBase = component_clz().initialize_by_component_configer(configer_instance)
+        if component_instance is None:
+            return None
+        component_instance.component_config_path = component_config_path
+        if component_enum.value == ComponentEnum.LLM.value:
+            if is_system_builtin(component_instance):
+                if is_api_key_missing(component_instance, "api_key"):
+                    return None
+            else:
+                if is_api_key_missing(component_instance, "api_key"):
+                    raise ValueError(
+                        f"Missing required API key for LLM component {component_instance.get_instance_code()}.")
+        return component_instance
+
+    def __get_lazy_instance_code(self, component_enum: ComponentEnum,
+                                 configer_instance: ComponentConfiger) -> str | None:
+        """Return the instance code to register the component lazily under.
+
+        Returns:
+            str | None: None when the component should be built at startup.
+        """
+        if component_enum.value not in self.__lazy_component_types:
+            return None
+        if getattr(configer_instance, 'default_symbol', False):
+            return None
+        if component_enum.value == ComponentEnum.AGENT.value:
+            name = (getattr(configer_instance, 'info', None) or {}).get('name')
+        else:
+            name = getattr(configer_instance, 'name', None)
+        if not name or name in self.__lazy_warm_up_names:
+            return None
+        appname = self.__config_container.app_configer.base_info_appname
+        return f'{appname}.{component_enum.value.lower()}.{name}'
+
     def __package_name_to_path(self, package_name: str) -> str:
         """Convert the package name to the package path.
 
@@ -8,8 +8,8 @@
 import asyncio
 import functools
 import inspect
+import random
 import time
-import uuid
 
 from functools import wraps
 
@@ -23,11 +23,12 @@ def trace_llm(func):
 
     Decorator to trace the LLM invocation, add llm input and output to the monitor.
     """
+    get_input = _InputBinder(func)
 
     @wraps(func)
     async def wrapper_async(*args, **kwargs):
         # get llm input from arguments
-        llm_input = _get_input(func, *args, **kwargs)
+        llm_input = get_input(args, kwargs)
 
         source = func.__qualname__
 
@@ -43,19 +44,26 @@ def trace_llm(func):
             if self.tracing is False:
                 return await func(*args, **kwargs)
 
+        sampled = _sample_trace()
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'llm'})
 
         start_time = time.time()
-        Monitor().trace_llm_input(source=source, llm_input=llm_input)
+        if sampled:
+            Monitor().trace_llm_input(source=source, llm_input=llm_input)
 
         # invoke function
-        result = await func(*args, **kwargs)
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException:
+            Monitor.pop_invocation_chain()
+            raise
         # not streaming
         if isinstance(result, LLMOutput):
             # add llm invocation info to monitor
-            Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input, llm_output=result.text,
-                                           cost_time=time.time() - start_time)
+            if sampled:
+                Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input, llm_output=result.text,
+                                               cost_time=time.time() - start_time)
 
             # add llm token usage to monitor
             Monitor().trace_llm_token_usage(self, llm_input, result.text)
@@ -65,23 +73,26 @@ def trace_llm(func):
             # streaming
             async def gen_iterator():
                 llm_output = []
-                async for chunk in result:
-                    llm_output.append(chunk.text)
-                    yield chunk
-                # add llm invocation info to monitor
-                output_str = "".join(llm_output)
-                Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
-                                               llm_output=output_str, cost_time=time.time() - start_time)
-                # add llm token usage to monitor
-                Monitor().trace_llm_token_usage(self, llm_input, output_str)
-                Monitor.pop_invocation_chain()
+                try:
+                    async for chunk in result:
+                        llm_output.append(chunk.text)
+                        yield chunk
+                    # add llm invocation info to monitor
+                    output_str = "".join(llm_output)
+                    if sampled:
+                        Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
+                                                       llm_output=output_str, cost_time=time.time() - start_time)
+                    # add llm token usage to monitor
+                    Monitor().trace_llm_token_usage(self, llm_input, output_str)
+                finally:
+                    Monitor.pop_invocation_chain()
 
             return gen_iterator()
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
         # get llm input from arguments
-        llm_input = _get_input(func, *args, **kwargs)
+        llm_input = get_input(args, kwargs)
 
         source = func.__qualname__
 
@@ -97,19 +108,26 @@ def trace_llm(func):
             if self.tracing is False:
                 return func(*args, **kwargs)
 
+        sampled = _sample_trace()
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'llm'})
 
         start_time = time.time()
-        Monitor().trace_llm_input(source=source, llm_input=llm_input)
+        if sampled:
+            Monitor().trace_llm_input(source=source, llm_input=llm_input)
 
         # invoke function
-        result = func(*args, **kwargs)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            Monitor.pop_invocation_chain()
+            raise
         # not streaming
         if isinstance(result, LLMOutput):
             # add llm invocation info to monitor
-            Monitor().trace_llm_invocation(source=source, llm_input=llm_input, llm_output=result.text,
-                                           cost_time=time.time() - start_time)
+            if sampled:
+                Monitor().trace_llm_invocation(source=source, llm_input=llm_input, llm_output=result.text,
+                                               cost_time=time.time() - start_time)
 
             # add llm token usage to monitor
             Monitor().trace_llm_token_usage(self, llm_input, result.text)
@@ -119,17 +137,20 @@ def trace_llm(func):
             # streaming
             def gen_iterator():
                 llm_output = []
-                for chunk in result:
-                    llm_output.append(chunk.text)
-                    yield chunk
-                # add llm invocation info to monitor
-                output_str = "".join(llm_output)
-                Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
-                                               llm_output=output_str, cost_time=time.time() - start_time)
-
-                # add llm token usage to monitor
-                Monitor().trace_llm_token_usage(self, llm_input, output_str)
-                Monitor.pop_invocation_chain()
+                try:
+                    for chunk in result:
+                        llm_output.append(chunk.text)
+                        yield chunk
+                    # add llm invocation info to monitor
+                    output_str = "".join(llm_output)
+                    if sampled:
+                        Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
+                                                       llm_output=output_str, cost_time=time.time() - start_time)
+
+                    # add llm token usage to monitor
+                    Monitor().trace_llm_token_usage(self, llm_input, output_str)
+                finally:
+                    Monitor.pop_invocation_chain()
 
             return gen_iterator()
 
@@ -155,32 +176,37 @@ def get_caller_info(instance: object = None):
         }
 
 
+def _get_agent_source_and_tracing(self, source: str):
+    """Get the agent name and its tracing switch from the agent model."""
+    tracing = None
+    if isinstance(self, object):
+        agent_model = getattr(self, 'agent_model', None)
+        if isinstance(agent_model, object):
+            info = getattr(agent_model, 'info', None)
+            profile = getattr(agent_model, 'profile', None)
+            if isinstance(info, dict):
+                source = info.get('name', None)
+            if isinstance(profile, dict):
+                tracing = profile.get('tracing', None)
+    return source, tracing
+
+
 def trace_agent(func):
     """Annotation: @trace_agent
 
     Decorator to trace the agent invocation, add agent input and output to the monitor.
     """
+    get_input = _InputBinder(func)
 
     @functools.wraps(func)
     async def wrapper_async(*args, **kwargs):
         # get agent input from arguments
-        agent_input = _get_input(func, *args, **kwargs)
+        agent_input = get_input(args, kwargs)
         # check whether the tracing switch is enabled
-        source = func.__qualname__
         self = agent_input.pop('self', None)
-
-        tracing = None
-        if isinstance(self, object):
-            agent_model = getattr(self, 'agent_model', None)
-            if isinstance(agent_model, object):
-                info = getattr(agent_model, 'info', None)
-                profile = getattr(agent_model, 'profile', None)
-                if isinstance(info, dict):
-                    source = info.get('name', None)
-                if isinstance(profile, dict):
-                    tracing = profile.get('tracing', None)
+        source, tracing = _get_agent_source_and_tracing(self, func.__qualname__)
         start_info = get_caller_info()
-        pair_id = f"agent_{uuid.uuid4().hex}"
+        pair_id = _new_pair_id('agent')
         kwargs['memory_source_info'] = start_info
         ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
         if tracing is False:
@@ -190,39 +216,33 @@ def trace_agent(func):
 
         # add invocation chain to the monitor module.
         Monitor.init_invocation_chain()
+        sampled = _sample_trace()
         Monitor.add_invocation_chain({'source': source, 'type': 'agent'})
 
         start_time = time.time()
-        Monitor().trace_agent_input(source=source, agent_input=agent_input)
+        if sampled:
+            Monitor().trace_agent_input(source=source, agent_input=agent_input)
 
         # invoke function
-        result = await func(*args, **kwargs)
-        # add agent invocation info to monitor
-        Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
-                                         cost_time=time.time() - start_time)
-        ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
-        Monitor.pop_invocation_chain()
+        try:
+            result = await func(*args, **kwargs)
+            # add agent invocation info to monitor
+            if sampled:
+                Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
+                                                 cost_time=time.time() - start_time)
+            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+        finally:
+            Monitor.pop_invocation_chain()
         return result
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
         # get agent input from arguments
-        agent_input = _get_input(func, *args, **kwargs)
+        agent_input = get_input(args, kwargs)
         # check whether the tracing switch is enabled
-        source = func.__qualname__
         self = agent_input.pop('self', None)
-
-        tracing = None
-        if isinstance(self, object):
-            agent_model = getattr(self, 'agent_model', None)
-            if isinstance(agent_model, object):
-                info = getattr(agent_model, 'info', None)
-                profile = getattr(agent_model, 'profile', None)
-                if isinstance(info, dict):
-                    source = info.get('name', None)
-                if isinstance(profile, dict):
-                    tracing = profile.get('tracing', None)
-        pair_id = f"agent_{uuid.uuid4().hex}"
+        source, tracing = _get_agent_source_and_tracing(self, func.__qualname__)
+        pair_id = _new_pair_id('agent')
         start_info = get_caller_info()
         kwargs['memory_source_info'] = start_info
         ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
@@ -233,18 +253,23 @@ def trace_agent(func):
 
         # add invocation chain to the monitor module.
         Monitor.init_invocation_chain()
+        sampled = _sample_trace()
         Monitor.add_invocation_chain({'source': source, 'type': 'agent'})
 
         start_time = time.time()
-        Monitor().trace_agent_input(source=source, agent_input=agent_input)
+        if sampled:
+            Monitor().trace_agent_input(source=source, agent_input=agent_input)
 
         # invoke function
-        result = func(*args, **kwargs)
-        # add agent invocation info to monitor
-        Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
-                                         cost_time=time.time() - start_time)
-        ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
-        Monitor.pop_invocation_chain()
+        try:
+            result = func(*args, **kwargs)
+            # add agent invocation info to monitor
+            if sampled:
+                Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
+                                                 cost_time=time.time() - start_time)
+            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+        finally:
+            Monitor.pop_invocation_chain()
         return result
 
     if asyncio.iscoroutinefunction(func):
@@ -260,16 +285,17 @@ def trace_tool(func):
 
     Decorator to trace the tool invocation.
     """
+    get_input = _InputBinder(func)
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
         # get tool input from arguments
-        tool_input = _get_input(func, *args, **kwargs)
+        tool_input = get_input(args, kwargs)
         start_time = time.time()
 
         source = func.__qualname__
         start_info = get_caller_info()
-        pair_id = f"tool_{uuid.uuid4().hex}"
+        pair_id = _new_pair_id('tool')
         ConversationMemoryModule().add_tool_input_info(start_info, source, tool_input, pair_id)
         self = tool_input.pop('self', None)
 
@@ -284,19 +310,24 @@ def trace_tool(func):
             if name is not None:
                 source = name
 
-        Monitor().trace_tool_input(source, tool_input)
+        sampled = _sample_trace()
+        if sampled:
+            Monitor().trace_tool_input(source, tool_input)
 
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'tool'})
 
         # invoke function
-        result = func(*args, **kwargs)
+        try:
+            result = func(*args, **kwargs)
 
-        # add tool invocation info to monitor
-        Monitor().trace_tool_invocation(source=source, tool_input=tool_input, tool_output=result,
-                                        cost_time=time.time() - start_time)
-        ConversationMemoryModule().add_tool_output_info(start_info, source, params=result, pair_id=pair_id)
-        Monitor.pop_invocation_chain()
+            # add tool invocation info to monitor
+            if sampled:
+                Monitor().trace_tool_invocation(source=source, tool_input=tool_input, tool_output=result,
+                                                cost_time=time.time() - start_time)
+            ConversationMemoryModule().add_tool_output_info(start_info, source, params=result, pair_id=pair_id)
+        finally:
+            Monitor.pop_invocation_chain()
 
         return result
 
@@ -309,16 +340,17 @@ def trace_knowledge(func):
 
     Decorator to trace the knowledge invocation.
     """
+    get_input = _InputBinder(func)
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
         # get knowledge input from arguments
-        knowledge_input = _get_input(func, *args, **kwargs)
+        knowledge_input = get_input(args, kwargs)
 
         source = func.__qualname__
         self = knowledge_input.pop('self', None)
         start = get_caller_info()
-        pair_id = f"knowledge_{uuid.uuid4().hex}"
+        pair_id = _new_pair_id('knowledge')
         ConversationMemoryModule().add_knowledge_input_info(start, source, knowledge_input, pair_id)
 
         if self and hasattr(self, 'tracing'):
@@ -336,10 +368,11 @@ def trace_knowledge(func):
         Monitor.add_invocation_chain({'source': source, 'type': 'knowledge'})
 
         # invoke function
-        result = func(*args, **kwargs)
-        ConversationMemoryModule().add_knowledge_output_info(start, source, params=result, pair_id=pair_id)
-
-        Monitor.pop_invocation_chain()
+        try:
+            result = func(*args, **kwargs)
+            ConversationMemoryModule().add_knowledge_output_info(start, source, params=result, pair_id=pair_id)
+        finally:
+            Monitor.pop_invocation_chain()
 
         return result
 
@@ -347,9 +380,105 @@ def trace_knowledge(func):
     return wrapper_sync
 
 
-def _get_input(func, *args, **kwargs) -> dict:
-    """Get the agent input from arguments."""
-    sig = inspect.signature(func)
-    bound_args = sig.bind(*args, **kwargs)
-    bound_args.apply_defaults()
-    return {k: v for k, v in bound_args.arguments.items()}
+def _new_pair_id(prefix: str) -> str:
+    """A random id pairing the input and output memory of an invocation,
+    without the syscall of `uuid.uuid4` on every traced call."""
+    return f"{prefix}_{random.getrandbits(128):032x}"
+
+
+def _sample_trace() -> bool:
+    """Whether the invocation is recorded by the monitor.
+
+    The decision is made once per root invocation by the sampling
+    configuration of the monitor, nested invocations follow their root so
+    a request is either traced as a whole or not at all.
+    """
+    if Monitor.get_invocation_chain():
+        sampled = Monitor.is_trace_sampled()
+        if sampled is not None:
+            return sampled
+    sampled = Monitor().sample_trace()
+    Monitor.set_trace_sampled(sampled)
+    return sampled
+
+
+class _InputBinder:
+    """Bind the call arguments of a traced function to its parameter names.
+
+    The signature is inspected once at decoration time and plain calls are
+    bound without `inspect`, giving the same dict as `Signature.bind`
+    followed by `apply_defaults`. Calls the fast path does not cover,
+    e.g. positional only parameters or invalid arguments, fall back to
+    `Signature.bind`, which raises the same errors as before.
+    """
+
+    def __init__(self, func):
+        self.signature = inspect.signature(func)
+        self.positional = []
+        self.keyword_only = []
+        self.var_positional = None
+        self.var_keyword = None
+        self.defaults = {}
+        self.fast = True
+        for param in self.signature.parameters.values():
+            if param.default is not inspect.Parameter.empty:
+                self.defaults[param.name] = param.default
+            if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                self.positional.append(param.name)
+            elif param.kind == inspect.Parameter.KEYWORD_ONLY:
+                self.keyword_only.append(param.name)
+            elif param.kind == inspect.Parameter.VAR_POSITIONAL:
+                self.var_positional = param.name
+            elif param.kind == inspect.Parameter.VAR_KEYWORD:
+                self.var_keyword = param.name
+            else:
+                self.fast = False
+        self.positional_index = {name: index for index, name in enumerate(self.positional)}
+        self.keyword_only_names = frozenset(self.keyword_only)
+
+    def __call__(self, args: tuple, kwargs: dict) -> dict:
+        if self.fast:
+            bound = self._fast_bind(args, kwargs)
+            if bound is not None:
+                return bound
+        bound_args = self.signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        return dict(bound_args.arguments)
+
+    def _fast_bind(self, args: tuple, kwargs: dict):
+        """Bind the arguments, None if the call is left to `Signature.bind`."""
+        args_count = len(args)
+        positional_count = len(self.positional)
+        if args_count > positional_count and self.var_positional is None:
+            return None
+        extra_kwargs = {}
+        for name, value in kwargs.items():
+            index = self.positional_index.get(name)
+            if index is not None:
+                if index < args_count:
+                    return None
+            elif name not in self.keyword_only_names:
+                extra_kwargs[name] = value
+        if extra_kwargs and self.var_keyword is None:
+            return None
+
+        bound = dict(zip(self.positional, args))
+        for name in self.positional[args_count:]:
+            if name in kwargs:
+                bound[name] = kwargs[name]
+            elif name in self.defaults:
+                bound[name] = self.defaults[name]
+            else:
+                return None
+        if self.var_positional is not None:
+            bound[self.var_positional] = args[positional_count:]
+        for name in self.keyword_only:
+            if name in kwargs:
+                bound[name] = kwargs[name]
+            elif name in self.defaults:
+                bound[name] = self.defaults[name]
+            else:
+                return None
+        if self.var_keyword is not None:
+            bound[self.var_keyword] = extra_kwargs
+        return bound
@@ -5,8 +5,9 @@
 # @Author  : jerry.zzw 
 # @Email   : jerry.zzw@antgroup.com
 # @FileName: component_manager_base.py
-import copy
-from typing import TypeVar, Generic
+import threading
+from types import SimpleNamespace
+from typing import Callable, Optional, TypeVar, Generic
 
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.component.component_base import ComponentBase
@@ -27,6 +28,18 @@ class ComponentManagerBase(Generic[ComponentTypeVar]):
         # _instance_obj_map - Format: {component_instance_name: component_instance_obj}.
         self._instance_obj_map: dict[str, ComponentTypeVar] = {}
         self._component_type: ComponentEnum = component_type
+        # Bumped on every registration change, lets caches built from the
+        # registered components detect that they are stale.
+        self._version: int = 0
+        # The lazy component factory map, filled in lazy registration mode.
+        # _lazy_factory_map - Format: {component_instance_name: factory returning the component instance}.
+        self._lazy_factory_map: dict[str, Callable[[], Optional[ComponentTypeVar]]] = {}
+        self._lazy_lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        """Return the registration version of the component manager."""
+        return self._version
 
     def register(self, component_instance_name: str, component_instance_obj: ComponentTypeVar):
         """Register the component instance."""
@@ -40,34 +53,92 @@ class ComponentManagerBase(Generic[ComponentTypeVar]):
         self._instance_obj_map[component_instance_name] = component_instance_obj
         if component_instance_obj.default_symbol:
             self._instance_obj_map["__default_instance__"] = component_instance_obj
+        self._version += 1
+
+    def register_lazy(self, component_instance_name: str,
+                      factory: Callable[[], Optional[ComponentTypeVar]],
+                      component_config_path: str = None):
+        """Register a component instance which is built on its first lookup.
+
+        Args:
+            component_instance_name(str): the full instance code of the component.
+            factory(Callable): builds the component instance, called at most once.
+            component_config_path(str): the config path of the component, used to
+                tell system built-in components apart.
+        """
+        if component_instance_name in self._instance_obj_map \
+                or component_instance_name in self._lazy_factory_map:
+            if is_system_builtin(SimpleNamespace(component_type=self._component_type,
+                                                 component_config_path=component_config_path)):
+                LOGGER.info(f"Component name '{component_instance_name}' is already registered. "
+                            f"Skipping system built-in component in favor of user-configured component.")
+                return
+            raise ValueError(f"{self._component_type.value} component object instance with name "
+                             f"'{component_instance_name}' already exists.")
+        self._lazy_factory_map[component_instance_name] = factory
+        self._version += 1
 
     def unregister(self, component_instance_name: str):
         """Unregister the component instance abstractmethod."""
-        self._instance_obj_map.pop(component_instance_name)
+        if component_instance_name in self._lazy_factory_map:
+            self._lazy_factory_map.pop(component_instance_name)
+        else:
+            self._instance_obj_map.pop(component_instance_name)
+        self._version += 1
+
+    def _get_instance(self, instance_code: str) -> Optional[ComponentTypeVar]:
+        """Return the registered instance, building it first if it is lazy."""
+        instance = self._instance_obj_map.get(instance_code)
+        if instance is not None:
+            return instance
+        if instance_code not in self._lazy_factory_map:
+            # the instance is registered before its factory is dropped.
+            return self._instance_obj_map.get(instance_code)
+        with self._lazy_lock:
+            factory = self._lazy_factory_map.get(instance_code)
+            if factory is None:
+                return self._instance_obj_map.get(instance_code)
+            instance = factory()
+            if instance is not None:
+                self.register(instance_code, instance)
+            self._lazy_factory_map.pop(instance_code)
+            self._version += 1
+            return instance
+
+    def initialize_lazy_instances(self):
+        """Build all lazily registered component instances."""
+        for instance_code in list(self._lazy_factory_map.keys()):
+            self._get_instance(instance_code)
 
     def get_instance_obj(self, component_instance_name: str,
                          appname: str = None, new_instance: bool = True) -> ComponentTypeVar:
-        """Return the component instance object."""
+        """Return the component instance object.
+
+        With `new_instance` the caller gets its own copy which it may change;
+        without it the shared registered instance is returned in O(1) and must
+        be treated as read-only.
+        """
         if component_instance_name == "__default_instance__":
             return self.get_default_instance(new_instance)
         appname = appname or ApplicationConfigManager().app_configer.base_info_appname
         instance_code = f'{appname}.{self._component_type.value.lower()}.{component_instance_name}'
-        if new_instance:
-            instance = self._instance_obj_map.get(instance_code)
-            if instance:
-                return instance.create_copy()
-        return self._instance_obj_map.get(instance_code)
+        instance = self._get_instance(instance_code)
+        if new_instance and instance:
+            return instance.create_copy()
+        return instance
 
     def get_default_instance(self, new_instance: bool = False) -> ComponentTypeVar:
         """Return the default instance of component."""
-        if new_instance:
-            return copy.deepcopy(self._instance_obj_map.get("__default_instance__"))
-        return self._instance_obj_map.get("__default_instance__")
+        instance = self._instance_obj_map.get("__default_instance__")
+        if new_instance and instance:
+            return instance.create_copy()
+        return instance
 
     def get_instance_name_list(self) -> list[str]:
         """Return the component instance list."""
-        return list(self._instance_obj_map.keys())
+        return list(self._instance_obj_map.keys()) + list(self._lazy_factory_map.keys())
 
     def get_instance_obj_list(self) -> list[ComponentTypeVar]:
         """Return the component instance object list."""
+        self.initialize_lazy_instances()
         return list(self._instance_obj_map.values())
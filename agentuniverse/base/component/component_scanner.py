@@ -0,0 +1,145 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 19:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: component_scanner.py
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
+from agentuniverse.base.config.configer import Configer, PlaceholderResolver
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+MANIFEST_VERSION = 2
+
+
+class ComponentScanner(object):
+    """Scan component configuration files once for all component types.
+
+    Every package directory is walked once and every configuration file is
+    parsed once, then configers are picked by component type, so startup
+    cost no longer grows with the number of component types.
+
+    With a manifest path, the raw yaml content of every scanned file is
+    persisted as json keyed by its mtime and size, and warm restarts only
+    parse the files changed since. Files whose content does not survive a
+    json round trip, e.g. with dates or non string keys, are parsed on every
+    start. Placeholders are resolved on every load, so environment values
+    are never written into the manifest.
+
+    Attributes:
+        manifest_path (Optional[str]): Path of the manifest cache file, None
+            to disable it.
+    """
+
+    def __init__(self, manifest_path: Optional[str] = None):
+        self.manifest_path = manifest_path
+        self.__package_configers: Dict[tuple, List[ComponentConfiger]] = {}
+        self.__file_configers: Dict[str, ComponentConfiger] = {}
+        self.__manifest: Dict[str, list] = self.__load_manifest()
+        self.__scanned_manifest: Dict[str, list] = {}
+        self.__manifest_changed = False
+
+    def scan(self, package_path_list: List[str], config_type_enum: ConfigTypeEnum,
+             component_enum: ComponentEnum) -> List[ComponentConfiger]:
+        """Return the configers of the component type under the package paths.
+
+        Args:
+            package_path_list(List[str]): the package directory list
+            config_type_enum(ConfigTypeEnum): the configuration file type enumeration
+            component_enum(ComponentEnum): the component enumeration
+
+        Returns:
+            List[ComponentConfiger]: the component configer list
+        """
+        component_configer_list = []
+        for package_path in package_path_list:
+            for component_configer in self.__scan_package(package_path, config_type_enum):
+                if component_configer.get_component_config_type() == component_enum.value:
+                    component_configer_list.append(component_configer)
+        return component_configer_list
+
+    def save_manifest(self):
+        """Persist the manifest if files were parsed since it was loaded.
+
+        Entries of files not scanned by this scanner, e.g. of components
+        scanned later by another process, are kept while the files exist.
+        """
+        if not self.manifest_path or not self.__manifest_changed:
+            return
+        manifest = {path: entry for path, entry in self.__manifest.items() if os.path.exists(path)}
+        manifest.update(self.__scanned_manifest)
+        tmp_path = f'{self.manifest_path}.{os.getpid()}.tmp'
+        try:
+            Path(self.manifest_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'files': manifest}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+            self.__manifest = manifest
+            self.__manifest_changed = False
+        except Exception as e:
+            LOGGER.warning(f"Failed to save the component manifest {self.manifest_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __scan_package(self, package_path: str, config_type_enum: ConfigTypeEnum) -> List[ComponentConfiger]:
+        key = (package_path, config_type_enum.value)
+        package_configers = self.__package_configers.get(key)
+        if package_configers is None:
+            package_configers = [self.__load_configer(str(config_file), config_type_enum)
+                                 for config_file in Path(package_path).rglob(f'*.{config_type_enum.value}')]
+            self.__package_configers[key] = package_configers
+        return package_configers
+
+    def __load_configer(self, path: str, config_type_enum: ConfigTypeEnum) -> ComponentConfiger:
+        component_configer = self.__file_configers.get(path)
+        if component_configer is None:
+            if config_type_enum == ConfigTypeEnum.YAML:
+                configer = Configer(path=path)
+                configer.value = PlaceholderResolver().resolve(self.__load_raw_yaml(path))
+            else:
+                configer = Configer(path=path).load()
+            component_configer = ComponentConfiger().load_by_configer(configer)
+            self.__file_configers[path] = component_configer
+        return component_configer
+
+    def __load_raw_yaml(self, path: str):
+        stat = os.stat(path)
+        entry = self.__manifest.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.__scanned_manifest[path] = entry
+            return entry[2]
+        with open(path, 'r', encoding='utf-8') as stream:
+            value = yaml.safe_load(stream)
+        if self.manifest_path and _survives_json(value):
+            self.__scanned_manifest[path] = [stat.st_mtime_ns, stat.st_size, value]
+            self.__manifest_changed = True
+        return value
+
+    def __load_manifest(self) -> Dict[str, list]:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and manifest.get('version') == MANIFEST_VERSION:
+                return manifest.get('files', {})
+        except Exception as e:
+            LOGGER.warning(f"Failed to load the component manifest {self.manifest_path}: {e}")
+        return {}
+
+
+def _survives_json(value) -> bool:
+    """Whether the yaml value loads back from json unchanged."""
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
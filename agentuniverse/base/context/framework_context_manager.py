@@ -43,11 +43,23 @@ class FrameworkContextManager:
             var_value (`Any`):
                 Value of the context variable.
         """
+        return self.get_context_var(var_name).set(var_value)
+
+    def get_context_var(self, var_name: str) -> ContextVar:
+        """Get the context variable of the name, created if absent.
+
+        Hot paths may keep the returned variable and call its get/set
+        directly, the value still travels with `get_all_contexts`.
+
+        Args:
+            var_name (`str`):
+                Name of the context variable.
+        """
         if var_name not in self.__context_dict:
             with self.__dict_edit_lock:
                 if var_name not in self.__context_dict:
                     self.__context_dict[var_name] = ContextVar(var_name)
-        return self.__context_dict[var_name].set(var_value)
+        return self.__context_dict[var_name]
 
     def get_context(self,
                     var_name: str,
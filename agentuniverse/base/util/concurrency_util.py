@@ -0,0 +1,48 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: concurrency_util.py
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+DEFAULT_SHARED_EXECUTOR_WORKERS = 32
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """A thread pool running every task in a copy of the submitter's context.
+
+    Worker threads of a long-lived pool outlive the request that created
+    them, so context variables (framework context, trace info) are copied
+    per task instead of per thread.
+    """
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+_shared_executors: Dict[str, ContextThreadPoolExecutor] = {}
+_shared_executors_lock = threading.Lock()
+
+
+def get_shared_executor(name: str,
+                        max_workers: int = DEFAULT_SHARED_EXECUTOR_WORKERS) \
+        -> ContextThreadPoolExecutor:
+    """Return the process wide bounded executor registered under the name.
+
+    The executor is created on first use; `max_workers` only takes effect
+    for that first call.
+    """
+    executor = _shared_executors.get(name)
+    if executor is not None:
+        return executor
+    with _shared_executors_lock:
+        if name not in _shared_executors:
+            _shared_executors[name] = ContextThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name)
+        return _shared_executors[name]
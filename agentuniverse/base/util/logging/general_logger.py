@@ -163,6 +163,13 @@ class GeneralLogger(Logger):
             context_prefix=get_context_prefix()
         ).warning(msg, *args, **kwargs)
 
+    def warning(self, msg, *args, **kwargs):
+        self._logger.opt(depth=self.get_inheritance_depth()).bind(
+            log_type=LogTypeEnum.default,
+            source=self.module_name,
+            context_prefix=get_context_prefix()
+        ).warning(msg, *args, **kwargs)
+
     def info(self, msg, *args, **kwargs):
         self._logger.opt(depth=self.get_inheritance_depth()).bind(
             log_type=LogTypeEnum.default,
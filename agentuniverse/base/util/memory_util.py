@@ -5,7 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: memory_util.py
-from typing import List
+from typing import List, Optional
 
 from langchain_core.chat_history import BaseChatMessageHistory
 
@@ -15,6 +15,8 @@ from agentuniverse.base.context.framework_context_manager import FrameworkContex
 from agentuniverse.llm.llm import LLM
 from agentuniverse.llm.llm_manager import LLMManager
 
+MEMORY_SEPARATOR = "\n\n"
+
 
 def generate_messages(memories: list) -> List[Message]:
     """ Generate a list of messages from the given memories
@@ -57,34 +59,39 @@ def get_memory_string(messages: List[Message], agent_id=None) -> str:
     current_trace_id = FrameworkContextManager().get_context("trace_id")
     string_messages = []
     for m in messages:
-        if m.type == ChatMessageEnum.SYSTEM.value:
-            role = 'System'
-        elif m.type == ChatMessageEnum.HUMAN.value:
-            role = 'Human'
-        elif m.type == ChatMessageEnum.AI.value:
-            role = "AI"
-        elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
-            if current_trace_id == m.trace_id:
-                continue
-            role: str = m.metadata.get('prefix', "")
-            if agent_id:
-                role = role.replace(f"智能体 {agent_id}", " 你")
-                role = role.replace(f"Agent {agent_id}", " You")
-            m_str = f"{m.metadata.get('timestamp')} {role}:{m.content}"
+        m_str = get_message_string(m, agent_id, current_trace_id)
+        if m_str is not None:
             string_messages.append(m_str)
-            continue
-        else:
-            role = ""
-        m_str = ""
-        if m.metadata and m.metadata.get('gmt_created'):
-            m_str += f"{m.metadata.get('gmt_created')} "
-        if m.source:
-            m_str += f" Message source: {m.source} "
-        if role:
-            m_str += f"Message role: {role} "
-        m_str += f" :{m.content} "
-        string_messages.append(m_str)
-    return "\n\n".join(string_messages)
+    return MEMORY_SEPARATOR.join(string_messages)
+
+
+def get_message_string(m: Message, agent_id=None, current_trace_id=None) -> Optional[str]:
+    """Convert one message to its part of the memory string, None if it is left out."""
+    if m.type == ChatMessageEnum.SYSTEM.value:
+        role = 'System'
+    elif m.type == ChatMessageEnum.HUMAN.value:
+        role = 'Human'
+    elif m.type == ChatMessageEnum.AI.value:
+        role = "AI"
+    elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
+        if current_trace_id == m.trace_id:
+            return None
+        role: str = m.metadata.get('prefix', "")
+        if agent_id:
+            role = role.replace(f"智能体 {agent_id}", " 你")
+            role = role.replace(f"Agent {agent_id}", " You")
+        return f"{m.metadata.get('timestamp')} {role}:{m.content}"
+    else:
+        role = ""
+    m_str = ""
+    if m.metadata and m.metadata.get('gmt_created'):
+        m_str += f"{m.metadata.get('gmt_created')} "
+    if m.source:
+        m_str += f" Message source: {m.source} "
+    if role:
+        m_str += f"Message role: {role} "
+    m_str += f" :{m.content} "
+    return m_str
 
 
 def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
@@ -100,3 +107,40 @@ def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
     memory_str = get_memory_string(memories)
     llm_instance: LLM = LLMManager().get_instance_obj(llm_name)
     return llm_instance.get_num_tokens(memory_str) if llm_instance else len(memory_str)
+
+
+def get_message_tokens(memories: List[Message], llm_name: str = None) -> List[Optional[int]]:
+    """Get the number of tokens of each of the given memories.
+
+    Counts are stored on the messages, so a message is only tokenized again
+    when its text changes.
+
+    Args:
+        memories(List[Message]): The list of messages.
+        llm_name(str): The name of the LLM to use for token counting.
+
+    Returns:
+        List[Optional[int]]: The tokens of each message, None for messages
+        left out of the memory string.
+    """
+    current_trace_id = FrameworkContextManager().get_context("trace_id")
+    llm_instance: LLM = LLMManager().get_instance_obj(llm_name, new_instance=False) if llm_name else None
+    tokenizer_key = llm_name if llm_instance else ''
+    counts = []
+    for m in memories:
+        m_str = get_message_string(m, current_trace_id=current_trace_id)
+        if m_str is None:
+            counts.append(None)
+            continue
+        tokens = m.get_cached_tokens(tokenizer_key, m_str)
+        if tokens is None:
+            tokens = llm_instance.get_num_tokens(m_str) if llm_instance else len(m_str)
+            m.set_cached_tokens(tokenizer_key, m_str, tokens)
+        counts.append(tokens)
+    return counts
+
+
+def get_separator_tokens(llm_name: str = None) -> int:
+    """Get the number of tokens of the separator between memories."""
+    llm_instance: LLM = LLMManager().get_instance_obj(llm_name, new_instance=False) if llm_name else None
+    return llm_instance.get_num_tokens(MEMORY_SEPARATOR) if llm_instance else len(MEMORY_SEPARATOR)
@@ -6,12 +6,16 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: monitor.py
 import datetime
-import json
+import functools
 import os
+import random
+import threading
+import time
+from contextvars import ContextVar
 from typing import Union, Optional
 from loguru import logger
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.output_object import OutputObject
@@ -20,10 +24,24 @@ from agentuniverse.base.config.configer import Configer
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.logging.general_logger import get_context_prefix
 from agentuniverse.base.util.logging.log_type_enum import LogTypeEnum
+from agentuniverse.base.util.monitor.trace_serializer import TRACE_SERIALIZER
+from agentuniverse.base.util.monitor.trace_writer import get_trace_writer, TraceFileWriter, \
+    DEFAULT_MAX_FILE_SIZE, DEFAULT_FLUSH_INTERVAL, DEFAULT_BUFFER_SIZE
 from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
 
 LLM_INVOCATION_SUBDIR = "llm_invocation"
 AGENT_INVOCATION_SUBDIR = "agent_invocation"
+INVOCATION_CHAIN_CONTEXT = "__au_invocation_chain__"
+INVOCATION_CHAIN_BAK_CONTEXT = "__au_invocation_chain_bak__"
+TRACE_SAMPLED_CONTEXT = "__au_trace_sampled__"
+
+TRACE_SERIALIZER.register(InputObject, lambda obj: obj.to_dict())
+TRACE_SERIALIZER.register(OutputObject, lambda obj: obj.to_dict())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_context_var(var_name: str) -> ContextVar:
+    return FrameworkContextManager().get_context_var(var_name)
 
 
 @singleton
@@ -31,6 +49,17 @@ class Monitor(BaseModel):
     dir: Optional[str] = './monitor'
     activate: Optional[bool] = False
     log_activate: Optional[bool] = True
+    sample_rate: Optional[float] = 1.0
+    max_traces_per_second: Optional[int] = None
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+    flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL
+    buffer_size: Optional[int] = DEFAULT_BUFFER_SIZE
+    _subdirs: dict = PrivateAttr(default_factory=dict)
+    _sample_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _sample_window: int = PrivateAttr(default=0)
+    _sample_count: int = PrivateAttr(default=0)
+    _llm_cache_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _llm_cache_stats: dict = PrivateAttr(default_factory=dict)
 
     def __init__(self, configer: Configer = None, **kwargs):
         super().__init__(**kwargs)
@@ -38,6 +67,11 @@ class Monitor(BaseModel):
             config: dict = configer.value.get('MONITOR', {})
             self.dir = config.get('dir', './monitor')
             self.activate = config.get('activate', False)
+            self.sample_rate = config.get('sample_rate', 1.0)
+            self.max_traces_per_second = config.get('max_traces_per_second', None)
+            self.max_file_size = config.get('max_file_size', DEFAULT_MAX_FILE_SIZE)
+            self.flush_interval = config.get('flush_interval', DEFAULT_FLUSH_INTERVAL)
+            self.buffer_size = config.get('buffer_size', DEFAULT_BUFFER_SIZE)
 
     def trace_llm_input(self, source: str, llm_input: Union[str, dict]) -> None:
         """Trace the llm input."""
@@ -52,12 +86,6 @@ class Monitor(BaseModel):
                              cost_time: float = None) -> None:
         """Trace the llm invocation and save it to the monitor jsonl file."""
         if self.activate:
-            try:
-                import jsonlines
-            except ImportError:
-                raise ImportError(
-                    "jsonlines is required to trace llm invocation: `pip install jsonlines`"
-                )
             # get the current time
             date = datetime.datetime.now()
             llm_invocation = {
@@ -68,12 +96,7 @@ class Monitor(BaseModel):
             }
             # files are stored in hours
             filename = f"llm_{date.strftime('%Y-%m-%d-%H')}.jsonl"
-            # file path to save
-            path_save = os.path.join(str(self._get_or_create_subdir(LLM_INVOCATION_SUBDIR)), filename)
-
-            # write to jsonl
-            with jsonlines.open(path_save, 'a') as writer:
-                writer.write(llm_invocation)
+            self._write_trace(LLM_INVOCATION_SUBDIR, filename, llm_invocation)
 
         if self.log_activate:
             logger.bind(
@@ -100,6 +123,40 @@ class Monitor(BaseModel):
                 if token_usage:
                     Monitor.add_token_usage(token_usage)
 
+    def trace_llm_cache(self, source: str, hit: bool, saved_tokens: int = 0, saved_latency: float = 0.0) -> None:
+        """Count a lookup in the llm response cache.
+
+        Args:
+            source(str): Name of the llm.
+            hit(bool): Whether the response was served from the cache.
+            saved_tokens(int): Total tokens of the llm call a hit saves.
+            saved_latency(float): Seconds of the llm call a hit saves.
+        """
+        with self._llm_cache_lock:
+            stats = self._llm_cache_stats.setdefault(
+                source, {'hits': 0, 'misses': 0, 'saved_tokens': 0, 'saved_latency': 0.0})
+            if hit:
+                stats['hits'] += 1
+                stats['saved_tokens'] += saved_tokens
+                stats['saved_latency'] += saved_latency
+            else:
+                stats['misses'] += 1
+
+    def get_llm_cache_stats(self) -> dict:
+        """Return the llm response cache stats per llm, with the hits, misses,
+        hit rate, tokens saved and seconds saved."""
+        with self._llm_cache_lock:
+            result = {}
+            for source, stats in self._llm_cache_stats.items():
+                lookups = stats['hits'] + stats['misses']
+                result[source] = {**stats, 'hit_rate': stats['hits'] / lookups if lookups else 0.0}
+            return result
+
+    def clear_llm_cache_stats(self) -> None:
+        """Reset the llm response cache stats."""
+        with self._llm_cache_lock:
+            self._llm_cache_stats.clear()
+
     def trace_agent_input(self, source: str, agent_input: Union[str, dict]) -> None:
         """Trace the agent input."""
         if self.log_activate:
@@ -113,28 +170,17 @@ class Monitor(BaseModel):
                                agent_output: OutputObject, cost_time: float = None) -> None:
         """Trace the agent invocation and save it to the monitor jsonl file."""
         if self.activate:
-            try:
-                import jsonlines
-            except ImportError:
-                raise ImportError(
-                    "jsonlines is required to trace llm invocation: `pip install jsonlines`"
-                )
             # get the current time
             date = datetime.datetime.now()
             agent_invocation = {
                 "source": source,
                 "date": date.strftime("%Y-%m-%d %H:%M:%S"),
-                "agent_input": self.serialize_obj(agent_input),
-                "agent_output": self.serialize_obj(agent_output),
+                "agent_input": agent_input,
+                "agent_output": agent_output,
             }
             # files are stored in hours
             filename = f"agent_{source}_{date.strftime('%Y-%m-%d-%H')}.jsonl"
-            # file path to save
-            path_save = os.path.join(str(self._get_or_create_subdir(AGENT_INVOCATION_SUBDIR)), filename)
-
-            # write to jsonl
-            with jsonlines.open(path_save, 'a') as writer:
-                writer.write(agent_invocation)
+            self._write_trace(AGENT_INVOCATION_SUBDIR, filename, agent_invocation)
 
         if self.log_activate:
             logger.bind(
@@ -167,49 +213,39 @@ class Monitor(BaseModel):
     @staticmethod
     def init_invocation_chain():
         """Initialize the invocation chain in the framework context."""
-        trace_id = AuTraceManager().get_trace_id()
-        if FrameworkContextManager().get_context(trace_id + '_invocation_chain') is None:
-            FrameworkContextManager().set_context(trace_id + '_invocation_chain', [])
+        invocation_chain_var = _get_context_var(INVOCATION_CHAIN_CONTEXT)
+        if invocation_chain_var.get(None) is None:
+            invocation_chain_var.set([])
 
     @staticmethod
     def init_invocation_chain_bak():
         """Initialize the invocation chain bak version in the framework context."""
-        trace_id = AuTraceManager().get_trace_id()
-        if FrameworkContextManager().get_context(trace_id + '_invocation_chain_bak') is None:
-            FrameworkContextManager().set_context(trace_id + '_invocation_chain_bak', [])
+        invocation_chain_bak_var = _get_context_var(INVOCATION_CHAIN_BAK_CONTEXT)
+        if invocation_chain_bak_var.get(None) is None:
+            invocation_chain_bak_var.set([])
 
     @staticmethod
     def pop_invocation_chain():
         """Pop the last chain node in invocation chain."""
-        trace_id = AuTraceManager().get_trace_id()
-        if trace_id is not None:
-            invocation_chain: list = FrameworkContextManager().get_context(
-                trace_id + '_invocation_chain')
-            if invocation_chain is not None:
-                invocation_chain.pop()
-                FrameworkContextManager().set_context(
-                    trace_id + '_invocation_chain', invocation_chain)
+        invocation_chain = _get_context_var(INVOCATION_CHAIN_CONTEXT).get(None)
+        if invocation_chain:
+            invocation_chain.pop()
 
     @staticmethod
     def clear_invocation_chain():
         """Clear the invocation chain in the framework context."""
-        trace_id = AuTraceManager().get_trace_id()
-        if trace_id is not None:
-            FrameworkContextManager().del_context(trace_id + '_invocation_chain')
-            FrameworkContextManager().del_context(trace_id + '_invocation_chain_bak')
+        _get_context_var(INVOCATION_CHAIN_CONTEXT).set(None)
+        _get_context_var(INVOCATION_CHAIN_BAK_CONTEXT).set(None)
 
     @staticmethod
     def add_invocation_chain(source: dict):
         """Add the source to the invocation chain"""
-        trace_id = AuTraceManager().get_trace_id()
-        if trace_id is not None:
-            invocation_chain = FrameworkContextManager().get_context(trace_id + '_invocation_chain')
-            if invocation_chain is not None:
-                invocation_chain.append(source)
-                FrameworkContextManager().set_context(trace_id + '_invocation_chain', invocation_chain)
-            invocation_chain_bak = FrameworkContextManager().get_context(trace_id + '_invocation_chain_bak')
-            if invocation_chain_bak is not None:
-                invocation_chain_bak.append(source)
+        invocation_chain = _get_context_var(INVOCATION_CHAIN_CONTEXT).get(None)
+        if invocation_chain is not None:
+            invocation_chain.append(source)
+        invocation_chain_bak = _get_context_var(INVOCATION_CHAIN_BAK_CONTEXT).get(None)
+        if invocation_chain_bak is not None:
+            invocation_chain_bak.append(source)
 
     @staticmethod
     def get_trace_id():
@@ -219,15 +255,45 @@ class Monitor(BaseModel):
     @staticmethod
     def get_invocation_chain():
         """Get the invocation chain in the framework context."""
-        trace_id = AuTraceManager().get_trace_id()
-        return FrameworkContextManager().get_context(trace_id + '_invocation_chain', []) if trace_id is not None else []
+        invocation_chain = _get_context_var(INVOCATION_CHAIN_CONTEXT).get(None)
+        return invocation_chain if invocation_chain is not None else []
 
     @staticmethod
     def get_invocation_chain_bak():
         """Get the invocation chain bak version in the framework context."""
-        trace_id = AuTraceManager().get_trace_id()
-        return FrameworkContextManager().get_context(trace_id + '_invocation_chain_bak',
-                                                     []) if trace_id is not None else []
+        invocation_chain_bak = _get_context_var(INVOCATION_CHAIN_BAK_CONTEXT).get(None)
+        return invocation_chain_bak if invocation_chain_bak is not None else []
+
+    @staticmethod
+    def set_trace_sampled(sampled: bool):
+        """Record whether the current root invocation is traced."""
+        _get_context_var(TRACE_SAMPLED_CONTEXT).set(sampled)
+
+    @staticmethod
+    def is_trace_sampled() -> Optional[bool]:
+        """Whether the current root invocation is traced, None if undecided."""
+        return _get_context_var(TRACE_SAMPLED_CONTEXT).get(None)
+
+    def sample_trace(self) -> bool:
+        """Decide whether a new root invocation is traced.
+
+        A root invocation is traced with the probability of `sample_rate`,
+        and at most `max_traces_per_second` root invocations are traced per
+        second when it is configured.
+        """
+        if self.sample_rate is not None and self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        if not self.max_traces_per_second:
+            return True
+        window = int(time.monotonic())
+        with self._sample_lock:
+            if window != self._sample_window:
+                self._sample_window = window
+                self._sample_count = 0
+            if self._sample_count >= self.max_traces_per_second:
+                return False
+            self._sample_count += 1
+            return True
 
     @staticmethod
     def init_token_usage():
@@ -323,10 +389,27 @@ class Monitor(BaseModel):
         except Exception as e:
             return {}
 
+    def get_trace_writer(self) -> TraceFileWriter:
+        """Get the buffered trace file writer of the current process."""
+        return get_trace_writer(max_file_size=self.max_file_size, flush_interval=self.flush_interval,
+                                buffer_size=self.buffer_size)
+
+    def flush_traces(self) -> None:
+        """Write the buffered traces to the monitor files."""
+        self.get_trace_writer().flush()
+
+    def _write_trace(self, subdir: str, filename: str, trace: dict) -> None:
+        """Serialize the trace and buffer it for the jsonl file in the monitor subdirectory."""
+        path = os.path.join(str(self._get_or_create_subdir(subdir)), filename)
+        self.get_trace_writer().write(path, TRACE_SERIALIZER.dumps(trace))
+
     def _get_or_create_subdir(self, subdir: str) -> str:
         """Get or create a subdirectory if it doesn't exist in the monitor directory."""
-        path = os.path.join(self.dir, subdir)
-        os.makedirs(path, exist_ok=True)
+        path = self._subdirs.get((self.dir, subdir))
+        if path is None:
+            path = os.path.join(self.dir, subdir)
+            os.makedirs(path, exist_ok=True)
+            self._subdirs[(self.dir, subdir)] = path
         return path
 
     @staticmethod
@@ -346,29 +429,8 @@ class Monitor(BaseModel):
 
     def serialize_obj(self, obj):
         """Serialize an object and filter out non-serializable values."""
-        filtered_obj = self.filter_and_serialize(obj)
-        return json.loads(json.dumps(filtered_obj, default=self.default_serializer))
+        return TRACE_SERIALIZER.to_jsonable(obj)
 
     def filter_and_serialize(self, obj):
         """Recursively filter out non-serializable values from an object."""
-
-        def is_json_serializable(value):
-            """Check if value is a JSON serializable object."""
-            try:
-                json.dumps(value, default=self.default_serializer)
-                return True
-            except (TypeError, OverflowError):
-                return False
-
-        def filter_dict(d):
-            return {k: v for k, v in d.items() if is_json_serializable(v)}
-
-        def recursive_filter(o):
-            if isinstance(o, dict):
-                return filter_dict({k: recursive_filter(v) for k, v in o.items()})
-            elif isinstance(o, list):
-                return [recursive_filter(i) for i in o if is_json_serializable(i)]
-            else:
-                return o
-
-        return recursive_filter(obj)
+        return TRACE_SERIALIZER.to_jsonable(obj)
@@ -0,0 +1,149 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 19:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: trace_serializer.py
+import datetime
+import enum
+import json
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+# Returned for values which can not be serialized, left out by their container.
+_SKIP = object()
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+class _Converted:
+    """Wraps an encoder result which is JSON compatible already and is not walked again."""
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class TraceSerializer:
+    """Convert trace payloads to JSON compatible values in a single pass.
+
+    Objects are converted by the encoder registered for the closest class in
+    their MRO. Values without an encoder, whose encoder fails, or which refer
+    back to an enclosing value are left out of their dict or list, so a trace
+    never fails on a single odd value.
+    """
+
+    def __init__(self):
+        self._encoders: Dict[type, Callable[[Any], Any]] = {}
+        # encoder per concrete class, None when there is none
+        self._resolved: Dict[type, Optional[Callable[[Any], Any]]] = {}
+
+    def register(self, cls: type, encoder: Callable[[Any], Any]) -> None:
+        """Register the encoder of the class and its subclasses, it returns
+        any value this serializer can convert further."""
+        self._encoders[cls] = encoder
+        self._resolved.clear()
+
+    def to_jsonable(self, obj: Any) -> Any:
+        """Return the JSON compatible value of the object, None if it has none."""
+        value = self._convert(obj, set())
+        return None if value is _SKIP else value
+
+    def dumps(self, obj: Any) -> str:
+        """Return the JSON string of the object."""
+        return json.dumps(self.to_jsonable(obj), ensure_ascii=False)
+
+    def _encoder_for(self, cls: type) -> Optional[Callable[[Any], Any]]:
+        try:
+            return self._resolved[cls]
+        except KeyError:
+            pass
+        encoder = None
+        for base in cls.__mro__:
+            encoder = self._encoders.get(base)
+            if encoder is not None:
+                break
+        self._resolved[cls] = encoder
+        return encoder
+
+    def _convert(self, obj: Any, parents: set) -> Any:
+        # exact types, subclasses such as enums with a str value go to their encoder
+        if type(obj) in _PRIMITIVE_TYPES:
+            return obj
+        obj_id = id(obj)
+        if obj_id in parents:
+            return _SKIP
+        if isinstance(obj, dict):
+            parents.add(obj_id)
+            result = {}
+            for key, value in obj.items():
+                if not isinstance(key, _KEY_TYPES):
+                    continue
+                value = self._convert(value, parents)
+                if value is not _SKIP:
+                    result[key] = value
+            parents.discard(obj_id)
+            return result
+        if isinstance(obj, (list, tuple)):
+            parents.add(obj_id)
+            result = []
+            for item in obj:
+                item = self._convert(item, parents)
+                if item is not _SKIP:
+                    result.append(item)
+            parents.discard(obj_id)
+            return result
+        encoder = self._encoder_for(type(obj))
+        if encoder is None:
+            return obj if isinstance(obj, _KEY_TYPES) else _SKIP
+        try:
+            value = encoder(obj)
+        except Exception:
+            return _SKIP
+        if type(value) is _Converted:
+            return value.value
+        parents.add(obj_id)
+        value = self._convert(value, parents)
+        parents.discard(obj_id)
+        return value
+
+
+def _dump_model(model: BaseModel) -> Any:
+    if not hasattr(model, 'model_dump'):
+        return model.dict()
+    try:
+        # pydantic converts the whole model in its core, far faster than walking its fields
+        return _Converted(model.model_dump(mode='json'))
+    except Exception:
+        # fields of arbitrary types, walked by the registered encoders instead
+        return model.model_dump()
+
+
+TRACE_SERIALIZER = TraceSerializer()
+TRACE_SERIALIZER.register(BaseModel, _dump_model)
+TRACE_SERIALIZER.register(enum.Enum, lambda member: member.value)
+TRACE_SERIALIZER.register(datetime.date, lambda value: value.isoformat())
+TRACE_SERIALIZER.register(datetime.datetime, lambda value: value.strftime("%Y-%m-%d %H:%M:%S"))
+TRACE_SERIALIZER.register(set, list)
+TRACE_SERIALIZER.register(frozenset, list)
+
+try:
+    from pydantic import v1 as pydantic_v1
+
+    TRACE_SERIALIZER.register(pydantic_v1.BaseModel, lambda model: model.dict())
+except ImportError:
+    pass
+
+try:
+    from langchain_core.messages import BaseMessage
+
+    TRACE_SERIALIZER.register(BaseMessage, lambda message: {'type': message.type, 'content': message.content})
+except ImportError:
+    pass
+
+
+def register_trace_encoder(cls: type, encoder: Callable[[Any], Any]) -> None:
+    """Register how the monitor serializes objects of the class, see `TraceSerializer.register`."""
+    TRACE_SERIALIZER.register(cls, encoder)
@@ -0,0 +1,140 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 19:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: trace_writer.py
+import atexit
+import os
+import threading
+import time
+from typing import Dict, IO, List, Optional
+
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_MAX_FILE_SIZE = 100 * 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BUFFER_SIZE = 1000
+# Seconds a file is kept open without writes, e.g. the file of the last hour.
+IDLE_FILE_TIMEOUT = 60
+
+
+class TraceFileWriter:
+    """A buffered writer of jsonl trace files, shared by the whole process.
+
+    `write` only appends the line to an in-memory buffer. A background thread
+    appends the buffered lines to their files every `flush_interval` seconds,
+    or as soon as `buffer_size` lines are waiting, through file handles kept
+    open between flushes. Files are named per hour by the caller; a file
+    growing over `max_file_size` bytes is rotated to `<name>.<n>.jsonl`.
+
+    Attributes:
+        max_file_size (Optional[int]): Bytes after which a file is rotated, None to never rotate.
+        flush_interval (float): Max seconds a line waits in the buffer.
+        buffer_size (int): Buffered lines which trigger a flush right away.
+    """
+
+    def __init__(self, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.max_file_size = max_file_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.pid = os.getpid()
+        self._buffer: Dict[str, List[str]] = {}
+        self._buffered = 0
+        self._lock = threading.Lock()
+        # serializes flushes of the background thread and the callers of `flush`
+        self._flush_lock = threading.Lock()
+        self._files: Dict[str, IO] = {}
+        self._last_used: Dict[str, float] = {}
+        self._wakeup = threading.Event()
+        self._closed = False
+        threading.Thread(target=self._run, name='monitor_trace_writer', daemon=True).start()
+        atexit.register(self.close)
+
+    def write(self, path: str, line: str) -> None:
+        """Buffer one line, without its line break, for the file at the path."""
+        with self._lock:
+            self._buffer.setdefault(path, []).append(line)
+            self._buffered += 1
+            if self._buffered >= self.buffer_size:
+                self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write the buffered lines to their files."""
+        with self._flush_lock:
+            with self._lock:
+                buffer, self._buffer, self._buffered = self._buffer, {}, 0
+            now = time.monotonic()
+            for path, lines in buffer.items():
+                try:
+                    self._append(path, lines)
+                    self._last_used[path] = now
+                except Exception as e:
+                    LOGGER.error(f"Failed to write monitor traces to {path}: {e}")
+            for path, last_used in list(self._last_used.items()):
+                if now - last_used > IDLE_FILE_TIMEOUT:
+                    self._close_file(path)
+
+    def close(self) -> None:
+        """Flush and close all files."""
+        self._closed = True
+        self.flush()
+        with self._flush_lock:
+            for path in list(self._files):
+                self._close_file(path)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _append(self, path: str, lines: List[str]) -> None:
+        file = self._files.get(path)
+        if file is None:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            file = open(path, 'a', encoding='utf-8')
+            self._files[path] = file
+        file.write('\n'.join(lines) + '\n')
+        file.flush()
+        if self.max_file_size and file.tell() >= self.max_file_size:
+            self._rotate(path)
+
+    def _rotate(self, path: str) -> None:
+        self._close_file(path)
+        root, ext = os.path.splitext(path)
+        index = 1
+        while os.path.exists(f'{root}.{index}{ext}'):
+            index += 1
+        os.replace(path, f'{root}.{index}{ext}')
+
+    def _close_file(self, path: str) -> None:
+        self._last_used.pop(path, None)
+        file = self._files.pop(path, None)
+        if file is not None:
+            file.close()
+
+
+_writer: Optional[TraceFileWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_trace_writer(max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                     flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                     buffer_size: int = DEFAULT_BUFFER_SIZE) -> TraceFileWriter:
+    """Return the trace writer of the current process.
+
+    A forked worker gets its own writer, the one inherited from the parent has
+    no flush thread in the child.
+    """
+    global _writer
+    writer = _writer
+    if writer is not None and writer.pid == os.getpid():
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = TraceFileWriter(max_file_size=max_file_size, flush_interval=flush_interval,
+                                      buffer_size=buffer_size)
+        return _writer
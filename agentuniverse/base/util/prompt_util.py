@@ -81,11 +81,16 @@ def split_texts(texts: list[str], llm: LLM, chunk_size=800, chunk_overlap=100, r
         raise ValueError("split text failed, exception=" + str(e))
 
 
-def truncate_content(content: str, token_length: int, llm: LLM) -> str:
+def truncate_content(content: str, token_length: int, llm: LLM, text_token: int = None) -> str:
     """
-    truncate the content based on the llm token limit
+    truncate the content based on the llm token limit, `text_token` is the number of tokens
+    of the content if the caller has already counted them
     """
-    return str(split_texts(texts=[content], chunk_size=token_length, llm=llm)[0])
+    if text_token is None:
+        return str(split_texts(texts=[content], chunk_size=token_length, llm=llm)[0])
+    if text_token <= 0:
+        return content
+    return str(split_text_on_tokens(text=content, text_token=text_token, chunk_size=token_length)[0])
 
 
 def generate_template(agent_prompt_model: AgentPromptModel, prompt_assemble_order: list[str]) -> str:
@@ -160,9 +165,17 @@ def process_llm_token(agent_llm: LLM, lc_prompt_template, profile: dict, planner
     if prompt_llm is None:
         prompt_llm = agent_llm
 
-    prompt = lc_prompt_template.format(**prompt_input_dict)
-    # get the number of tokens in the prompt
-    prompt_tokens: int = agent_llm.get_num_tokens(prompt)
+    # get the number of tokens in the prompt, the variable to process is counted on its own
+    # so that it is not tokenized again when truncated
+    content = planner_input.get(var_to_process)
+    content_tokens = None
+    if isinstance(content, str) and content and var_to_process in prompt_input_dict:
+        content_tokens = agent_llm.get_num_tokens(content)
+        prompt = lc_prompt_template.format(**{**prompt_input_dict, var_to_process: ''})
+        prompt_tokens: int = agent_llm.get_num_tokens(prompt) + content_tokens
+    else:
+        prompt = lc_prompt_template.format(**prompt_input_dict)
+        prompt_tokens: int = agent_llm.get_num_tokens(prompt)
 
     input_tokens = agent_llm.max_context_length() - llm_model.get('max_tokens', agent_llm.max_tokens)
     if input_tokens <= 0:
@@ -175,11 +188,9 @@ def process_llm_token(agent_llm: LLM, lc_prompt_template, profile: dict, planner
     process_prompt_type_enum = PromptProcessEnum.from_value(prompt_processor_type)
 
     # process the specific variable in the prompt
-    content = planner_input.get(var_to_process)
-
     if content:
         if process_prompt_type_enum == PromptProcessEnum.TRUNCATE:
-            planner_input[var_to_process] = truncate_content(content, input_tokens, agent_llm)
+            planner_input[var_to_process] = truncate_content(content, input_tokens, agent_llm, content_tokens)
         elif process_prompt_type_enum == PromptProcessEnum.STUFF:
             planner_input[var_to_process] = summarize_by_stuff(texts=[content], llm=prompt_llm,
                                                                summary_prompt=PromptManager().get_instance_obj(
@@ -0,0 +1,287 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 14:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: single_flight.py
+import asyncio
+import threading
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SharedIterator:
+    """Fan one iterator out to any number of subscribers.
+
+    Every subscriber sees all items from the first one. Whichever subscriber
+    runs out of buffered items pulls the next one from the source while the
+    others wait for it, so the stream goes on even if the first consumer
+    stops early. An error of the source is raised to every subscriber.
+    """
+
+    def __init__(self, source: Iterator, on_close: Callable[[], None]):
+        self._source = source
+        self._on_close = on_close
+        self._items = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._subscribers = 0
+        self._closed = False
+        # Reentrant, a subscription may be collected while the lock is held.
+        self._lock = threading.RLock()
+
+    def subscribe(self) -> Iterator:
+        with self._lock:
+            self._subscribers += 1
+        return _Subscription(self)
+
+    def _get(self, index: int) -> Any:
+        if index < len(self._items):
+            return self._items[index]
+        with self._lock:
+            if index < len(self._items):
+                return self._items[index]
+            if self._error is not None:
+                raise self._error
+            if self._done:
+                raise StopIteration
+            try:
+                item = next(self._source)
+            except BaseException as e:
+                self._done = True
+                if not isinstance(e, StopIteration):
+                    self._error = e
+                self._close()
+                raise
+            self._items.append(item)
+            return item
+
+    def _unsubscribe(self):
+        with self._lock:
+            self._subscribers -= 1
+            if self._subscribers == 0:
+                # Nobody is left to drive the source, later calls start a new one.
+                self._close()
+
+    def _close(self):
+        if not self._closed:
+            self._closed = True
+            self._on_close()
+
+
+class _Subscription(Iterator):
+    """The iterator of one subscriber of a `SharedIterator`."""
+
+    def __init__(self, shared: SharedIterator):
+        self._shared = shared
+        self._index = 0
+        self._closed = False
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+        try:
+            item = self._shared._get(self._index)
+        except BaseException:
+            self.close()
+            raise
+        self._index += 1
+        return item
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._shared._unsubscribe()
+
+    def __del__(self):
+        self.close()
+
+
+class AsyncSharedIterator:
+    """Fan one async iterator out to any number of subscribers, see
+    `SharedIterator`."""
+
+    def __init__(self, source: AsyncIterator, on_close: Callable[[], None]):
+        self._source = source
+        self._on_close = on_close
+        self._items = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._subscribers = 0
+        self._closed = False
+        self._lock = asyncio.Lock()
+
+    def subscribe(self) -> AsyncIterator:
+        self._subscribers += 1
+        return _AsyncSubscription(self)
+
+    async def _get(self, index: int) -> Any:
+        if index < len(self._items):
+            return self._items[index]
+        async with self._lock:
+            if index < len(self._items):
+                return self._items[index]
+            if self._error is not None:
+                raise self._error
+            if self._done:
+                raise StopAsyncIteration
+            try:
+                item = await self._source.__anext__()
+            except BaseException as e:
+                self._done = True
+                if not isinstance(e, StopAsyncIteration):
+                    self._error = e
+                self._close()
+                raise
+            self._items.append(item)
+            return item
+
+    def _unsubscribe(self):
+        self._subscribers -= 1
+        if self._subscribers == 0:
+            self._close()
+
+    def _close(self):
+        if not self._closed:
+            self._closed = True
+            self._on_close()
+
+
+class _AsyncSubscription(AsyncIterator):
+    """The async iterator of one subscriber of an `AsyncSharedIterator`."""
+
+    def __init__(self, shared: AsyncSharedIterator):
+        self._shared = shared
+        self._index = 0
+        self._closed = False
+
+    async def __anext__(self) -> Any:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            item = await self._shared._get(self._index)
+        except BaseException:
+            self.close()
+            raise
+        self._index += 1
+        return item
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._shared._unsubscribe()
+
+    async def aclose(self):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def _identity(result: Any) -> Any:
+    return result
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one upstream call.
+
+    The first caller of a key runs the call; callers arriving while it is in
+    flight wait for it and get its result, or its error. A streaming result
+    (an iterator) is fanned out to all callers, including the ones arriving
+    while it is still being streamed.
+
+    Sync calls are coalesced across threads, async calls across the tasks of
+    one event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._async_calls: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]' = \
+            weakref.WeakKeyDictionary()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None,
+           copy_result: Callable[[Any], Any] = _identity) -> Any:
+        """Run `fn`, or wait for the call of the same key in flight.
+
+        Args:
+            key: The key of the call.
+            fn: The upstream call.
+            timeout: Max seconds to wait for a call in flight, None to wait
+                as long as it runs. `concurrent.futures.TimeoutError` is raised
+                on timeout.
+            copy_result: Copy of a plain result handed to the waiters, so
+                that callers do not share mutable results.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            result = future.result(timeout=timeout)
+            if isinstance(result, SharedIterator):
+                return result.subscribe()
+            return copy_result(result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._forget(key, future)
+            future.set_exception(e)
+            raise
+        if isinstance(result, Iterator):
+            shared = SharedIterator(result, lambda: self._forget(key, future))
+            iterator = shared.subscribe()
+            future.set_result(shared)
+            return iterator
+        self._forget(key, future)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    async def async_do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: Optional[float] = None,
+                       copy_result: Callable[[Any], Any] = _identity) -> Any:
+        """Await `fn`, or the call of the same key in flight, see `do`.
+
+        The upstream call runs in its own task, so a waiter cancelled or timed
+        out does not cancel it for the others. `asyncio.TimeoutError` is
+        raised on timeout.
+        """
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(self._async_run(calls, key, fn))
+            # The error is raised to the waiters, if they all gave up it is dropped.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            calls[key] = task
+        result = await asyncio.wait_for(asyncio.shield(task), None if leader else timeout)
+        if isinstance(result, AsyncSharedIterator):
+            return result.subscribe()
+        return result if leader else copy_result(result)
+
+    async def _async_run(self, calls: dict, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+
+        def forget():
+            if calls.get(key) is task:
+                del calls[key]
+
+        try:
+            result = await fn()
+        except BaseException:
+            forget()
+            raise
+        if isinstance(result, AsyncIterator):
+            return AsyncSharedIterator(result, forget)
+        forget()
+        return result
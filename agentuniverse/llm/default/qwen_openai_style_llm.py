@@ -5,6 +5,7 @@
 # @Author  : weizjajj
 # @Email   : weizhongjie.wzj@antgroup.com
 # @FileName: qwen_openai_style_llm.py
+import functools
 from typing import Optional, Any, Union, Iterator, AsyncIterator
 
 from dashscope import get_tokenizer
@@ -15,6 +16,9 @@ from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.llm.llm_output import LLMOutput
 from agentuniverse.llm.openai_style_llm import OpenAIStyleLLM
 
+# Loading the qwen vocabulary is slow, the tokenizer is built once per model.
+_get_tokenizer = functools.lru_cache(maxsize=None)(get_tokenizer)
+
 QWen_Max_CONTEXT_LENGTH = {
     "qwen-turbo": 131072,
     "qwen-plus": 131072,
@@ -68,5 +72,5 @@ class QWenOpenAIStyleLLM(OpenAIStyleLLM):
         return QWen_Max_CONTEXT_LENGTH.get(self.model_name, 8000)
 
     def get_num_tokens(self, text: str) -> int:
-        tokenizer = get_tokenizer(self.model_name)
+        tokenizer = _get_tokenizer(self.model_name)
         return len(tokenizer.encode(text))
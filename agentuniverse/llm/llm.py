@@ -8,6 +8,7 @@
 
 from abc import abstractmethod
 from copy import deepcopy
+from functools import partial
 from typing import Optional, Any, AsyncIterator, Iterator, Union
 from langchain_core.language_models.base import BaseLanguageModel
 from langchain_core.runnables import Runnable
@@ -18,8 +19,14 @@ from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.llm_configer import LLMConfiger
 from agentuniverse.base.util.logging.logging_util import LOGGER
+from agentuniverse.base.util.single_flight import SingleFlight
+from agentuniverse.llm.llm_cache import LLMCache, get_llm_cache, cached_call, async_cached_call, \
+    make_cache_key, DEFAULT_CACHE_MAX_SIZE, KEY_MODE_EXACT, KEY_MODE_NORMALIZED
 from agentuniverse.llm.llm_output import LLMOutput
 
+# Identical llm calls in flight at the same time, across all llms of the process.
+LLM_SINGLE_FLIGHT = SingleFlight()
+
 
 class LLM(ComponentBase):
     """The basic class for llm model.
@@ -36,6 +43,11 @@ class LLM(ComponentBase):
         max_tokens (Optional[int]): The maximum number of [tokens](/tokenizer) that can be generated in the completion.
         streaming (Optional[bool]): Whether to stream the results or not.
         ext_info (Optional[dict]): The extended information of the llm model.
+        rate_limit (Optional[dict]): The client side rate limit of the llm, see `LLMRateLimiter`.
+        llm_cache (Optional[dict]): The response cache config, with keys `activate`, `max_size`,
+        `persist_path`, `ttl` and `key_mode`, see `LLMCache`.
+        single_flight (Optional[dict]): The request coalescing config, with keys `activate` and
+        `timeout`, see `SingleFlight`.
     """
 
     class Config:
@@ -53,6 +65,9 @@ class LLM(ComponentBase):
     streaming: Optional[bool] = False
     ext_info: Optional[dict] = None
     tracing: Optional[bool] = None
+    rate_limit: Optional[dict] = None
+    llm_cache: Optional[dict] = None
+    single_flight: Optional[dict] = None
     _max_context_length: Optional[int] = None
     langchain_instance: Optional[BaseLanguageModel] = None
 
@@ -115,6 +130,12 @@ class LLM(ComponentBase):
         self.tracing = component_configer.tracing
         if 'max_context_length' in component_configer.configer.value:
             self._max_context_length = component_configer.configer.value['max_context_length']
+        if 'rate_limit' in component_configer.configer.value:
+            self.rate_limit = component_configer.configer.value['rate_limit']
+        if 'llm_cache' in component_configer.configer.value:
+            self.llm_cache = component_configer.configer.value['llm_cache']
+        if 'single_flight' in component_configer.configer.value:
+            self.single_flight = component_configer.configer.value['single_flight']
         return self
 
     def set_by_agent_model(self, **kwargs):
@@ -135,8 +156,25 @@ class LLM(ComponentBase):
             copied_obj.streaming = kwargs['streaming']
         if 'max_context_length' in kwargs and kwargs['max_context_length']:
             copied_obj._max_context_length = kwargs['max_context_length']
+        if 'llm_cache' in kwargs and kwargs['llm_cache'] is not None:
+            copied_obj.llm_cache = self.merge_llm_cache(kwargs['llm_cache'])
         return copied_obj
 
+    def merge_llm_cache(self, llm_cache: Union[bool, dict]) -> dict:
+        """Apply the `llm_cache` of an agent, a bool switching the cache of the
+        llm on or off, or a dict overriding its cache config."""
+        if isinstance(llm_cache, bool):
+            llm_cache = {'activate': llm_cache}
+        return {**(self.llm_cache or {}), **llm_cache}
+
+    def get_llm_cache(self) -> Optional[LLMCache]:
+        """Return the shared response cache, or None if caching is off."""
+        if not self.llm_cache or not self.llm_cache.get('activate', True):
+            return None
+        return get_llm_cache(max_size=self.llm_cache.get('max_size', DEFAULT_CACHE_MAX_SIZE),
+                             persist_path=self.llm_cache.get('persist_path'),
+                             ttl=self.llm_cache.get('ttl'))
+
     def max_context_length(self) -> int:
         """Max context length.
 
@@ -163,11 +201,36 @@ class LLM(ComponentBase):
             params = {}
         return self.as_langchain().bind(**params)
 
+    def is_single_flight(self) -> bool:
+        """Whether identical calls in flight at the same time share one upstream call."""
+        return bool(self.single_flight) and self.single_flight.get('activate', True)
+
+    def _upstream_call(self, *args: Any, **kwargs: Any):
+        """Run `_call`, through the response cache when it is on."""
+        cache = self.get_llm_cache()
+        if cache is not None:
+            return cached_call(self, cache, self.llm_cache.get('key_mode', KEY_MODE_NORMALIZED),
+                               self._call, args, kwargs)
+        return self._call(*args, **kwargs)
+
+    async def _upstream_acall(self, *args: Any, **kwargs: Any):
+        """Run `_acall`, through the response cache when it is on."""
+        cache = self.get_llm_cache()
+        if cache is not None:
+            return await async_cached_call(self, cache, self.llm_cache.get('key_mode', KEY_MODE_NORMALIZED),
+                                           self._acall, args, kwargs)
+        return await self._acall(*args, **kwargs)
+
     @trace_llm
     def call(self, *args: Any, **kwargs: Any):
         """Run the LLM."""
         try:
-            return self._call(*args, **kwargs)
+            if self.is_single_flight():
+                return LLM_SINGLE_FLIGHT.do((self.name, make_cache_key(self, args, kwargs, KEY_MODE_EXACT)),
+                                            partial(self._upstream_call, *args, **kwargs),
+                                            timeout=self.single_flight.get('timeout'),
+                                            copy_result=_copy_llm_output)
+            return self._upstream_call(*args, **kwargs)
         except Exception as e:
             LOGGER.error(f'Error in LLM call: {e}')
             raise e
@@ -176,7 +239,12 @@ class LLM(ComponentBase):
     async def acall(self, *args: Any, **kwargs: Any):
         """Asynchronously run the LLM."""
         try:
-            return await self._acall(*args, **kwargs)
+            if self.is_single_flight():
+                return await LLM_SINGLE_FLIGHT.async_do((self.name, make_cache_key(self, args, kwargs, KEY_MODE_EXACT)),
+                                                        partial(self._upstream_acall, *args, **kwargs),
+                                                        timeout=self.single_flight.get('timeout'),
+                                                        copy_result=_copy_llm_output)
+            return await self._upstream_acall(*args, **kwargs)
         except Exception as e:
             LOGGER.error(f'Error in LLM acall: {e}')
             raise e
@@ -185,8 +253,14 @@ class LLM(ComponentBase):
         copied = self.model_copy()
         if self.ext_info is not None:
             copied.ext_info = deepcopy(self.ext_info)
+        if self.llm_cache is not None:
+            copied.llm_cache = dict(self.llm_cache)
         # Shared reference
         copied.client = self.client
         copied.async_client = self.async_client
         copied.langchain_instance = self.langchain_instance
         return copied
+
+
+def _copy_llm_output(output: Any) -> Any:
+    return output.model_copy(deep=True) if isinstance(output, LLMOutput) else output
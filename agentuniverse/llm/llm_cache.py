@@ -0,0 +1,283 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 13:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: llm_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.llm.llm_output import LLMOutput
+
+DEFAULT_CACHE_MAX_SIZE = 1000
+KEY_MODE_EXACT = 'exact'
+KEY_MODE_NORMALIZED = 'normalized'
+# Call options which only decide how the result is delivered.
+_DELIVERY_KWARGS = ('stream', 'streaming')
+
+
+class LLMCache:
+    """A cache of llm responses.
+
+    Responses are keyed by the llm model, the sampling params, the streaming
+    mode and the sha256 of the messages. The first tier is an in-process LRU,
+    the optional second tier is a SQLite file, which survives restarts and can
+    be shared by processes on the same host.
+
+    An entry holds the outputs of the call, one for a plain call and one per
+    chunk for a streaming call, with the total tokens and the latency of the
+    llm call it saves.
+
+    Attributes:
+        max_size (int): Max number of responses kept in the LRU tier.
+        persist_path (Optional[str]): Path of the SQLite file of the
+            persistent tier, None to disable it.
+        ttl (Optional[float]): Seconds a response is served for, None to
+            serve it until evicted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE,
+                 persist_path: Optional[str] = None, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.persist_path = persist_path
+        self.ttl = ttl
+        self._lru: OrderedDict[str, Tuple[Optional[float], dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if persist_path:
+            self._conn = sqlite3.connect(persist_path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute('''
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        entry TEXT,
+                        expires_at REAL
+                    ) WITHOUT ROWID
+                ''')
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached entry of the key, None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            item = self._lru.get(key)
+            if item is not None:
+                expires_at, entry = item
+                if expires_at is None or expires_at > now:
+                    self._lru.move_to_end(key)
+                    return entry
+                del self._lru[key]
+            if self._conn is None:
+                return None
+            row = self._conn.execute('SELECT entry, expires_at FROM llm_cache WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                with self._conn:
+                    self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                return None
+            entry = json.loads(row[0])
+            self._put_lru(key, row[1], entry)
+            return entry
+
+    def put(self, key: str, entry: dict):
+        """Cache the entry in both tiers, unless it can not be serialized."""
+        try:
+            data = json.dumps(entry, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._put_lru(key, expires_at, entry)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO llm_cache (key, entry, expires_at) VALUES (?, ?, ?)',
+                        (key, data, expires_at))
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('DELETE FROM llm_cache')
+
+    def _put_lru(self, key: str, expires_at: Optional[float], entry: dict):
+        self._lru[key] = (expires_at, entry)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+
+_cache_registry: Dict[tuple, LLMCache] = {}
+_cache_registry_lock = threading.Lock()
+
+
+def get_llm_cache(max_size: int = DEFAULT_CACHE_MAX_SIZE, persist_path: Optional[str] = None,
+                  ttl: Optional[float] = None) -> LLMCache:
+    """Return the process wide cache for the given configuration.
+
+    LLM components are copied on every lookup from the manager, so the cache
+    lives here instead of on the component.
+    """
+    cache_key = (max_size, persist_path, ttl)
+    with _cache_registry_lock:
+        cache = _cache_registry.get(cache_key)
+        if cache is None:
+            cache = LLMCache(max_size=max_size, persist_path=persist_path, ttl=ttl)
+            _cache_registry[cache_key] = cache
+        return cache
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse the whitespace of all strings, which rarely changes the
+    answer of the llm but often differs between rendered prompts."""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _json_default(obj: Any) -> Any:
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    if hasattr(obj, 'dict'):
+        return obj.dict()
+    return str(obj)
+
+
+def is_streaming(llm, kwargs: dict) -> bool:
+    """Whether the call streams its result, the way `OpenAIStyleLLM` decides."""
+    if 'stream' in kwargs:
+        return bool(kwargs['stream'])
+    return bool(kwargs.get('streaming', llm.streaming))
+
+
+def make_cache_key(llm, args: tuple, kwargs: dict, key_mode: str = KEY_MODE_NORMALIZED) -> str:
+    """Return the cache key of an llm call.
+
+    Args:
+        llm: The llm called.
+        args: Positional arguments of the call, e.g. the messages.
+        kwargs: Keyword arguments of the call, overriding the sampling params
+            of the llm.
+        key_mode: `exact` hashes the messages as they are, `normalized`
+            collapses their whitespace first.
+    """
+    options = {key: value for key, value in kwargs.items() if key not in _DELIVERY_KWARGS}
+    model = options.pop('model', llm.model_name)
+    options.setdefault('temperature', llm.temperature)
+    options.setdefault('max_tokens', llm.max_tokens)
+    payload = {'args': list(args), 'options': options}
+    if key_mode != KEY_MODE_EXACT:
+        payload = _normalize(json.loads(json.dumps(payload, default=_json_default)))
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False,
+                                       default=_json_default).encode('utf-8')).hexdigest()
+    streaming = 'stream' if is_streaming(llm, kwargs) else 'call'
+    return f'{llm.__class__.__name__}:{model}:{streaming}:{digest}'
+
+
+def _count_tokens(llm, args: tuple, kwargs: dict, outputs: list) -> int:
+    """The tokens a cached response saves, as reported by the provider if it
+    is in the raw output, otherwise as counted by the llm."""
+    for output in outputs:
+        raw = output.get('raw')
+        if isinstance(raw, dict) and isinstance(raw.get('usage'), dict):
+            total_tokens = raw['usage'].get('total_tokens')
+            if total_tokens:
+                return total_tokens
+    messages = kwargs.get('messages', args[0] if args else None)
+    usage = Monitor.get_llm_token_usage(llm, {'kwargs': {'messages': messages}},
+                                        ''.join(output['text'] for output in outputs))
+    return usage.get('total_tokens', 0)
+
+
+def _make_entry(llm, args: tuple, kwargs: dict, outputs: list, latency: float) -> dict:
+    return {'outputs': outputs, 'tokens': _count_tokens(llm, args, kwargs, outputs), 'latency': latency}
+
+
+def _trace_cache(llm, hit: bool, entry: Optional[dict] = None, lookup_time: float = 0.0):
+    if hit:
+        Monitor().trace_llm_cache(source=llm.name or llm.model_name, hit=True, saved_tokens=entry['tokens'],
+                                  saved_latency=max(0.0, entry['latency'] - lookup_time))
+    else:
+        Monitor().trace_llm_cache(source=llm.name or llm.model_name, hit=False)
+
+
+def _replay(entry: dict, streaming: bool):
+    outputs = [LLMOutput(text=output['text'], raw=output['raw']) for output in entry['outputs']]
+    if not streaming:
+        return outputs[0]
+    return iter(outputs)
+
+
+async def _areplay(outputs: list) -> AsyncIterator[LLMOutput]:
+    for output in outputs:
+        yield output
+
+
+def cached_call(llm, cache: LLMCache, key_mode: str, call, args: tuple, kwargs: dict):
+    """Serve the `LLM.call` from the cache, or run it and cache its result.
+
+    A streaming result is cached once it has been consumed to the end, and
+    is replayed chunk by chunk.
+    """
+    start = time.perf_counter()
+    key = make_cache_key(llm, args, kwargs, key_mode)
+    streaming = is_streaming(llm, kwargs)
+    entry = cache.get(key)
+    if entry is not None:
+        _trace_cache(llm, True, entry, time.perf_counter() - start)
+        return _replay(entry, streaming)
+    _trace_cache(llm, False)
+    result = call(*args, **kwargs)
+    if isinstance(result, LLMOutput):
+        cache.put(key, _make_entry(llm, args, kwargs, [result.model_dump()], time.perf_counter() - start))
+        return result
+    return _record_stream(llm, cache, key, args, kwargs, result, start)
+
+
+def _record_stream(llm, cache: LLMCache, key: str, args: tuple, kwargs: dict,
+                   stream: Iterator[LLMOutput], start: float) -> Iterator[LLMOutput]:
+    outputs = []
+    for output in stream:
+        outputs.append(output.model_dump())
+        yield output
+    cache.put(key, _make_entry(llm, args, kwargs, outputs, time.perf_counter() - start))
+
+
+async def async_cached_call(llm, cache: LLMCache, key_mode: str, acall, args: tuple, kwargs: dict):
+    """Serve the `LLM.acall` from the cache, or run it and cache its result."""
+    start = time.perf_counter()
+    key = make_cache_key(llm, args, kwargs, key_mode)
+    streaming = is_streaming(llm, kwargs)
+    entry = cache.get(key)
+    if entry is not None:
+        _trace_cache(llm, True, entry, time.perf_counter() - start)
+        result = _replay(entry, streaming)
+        return _areplay(list(result)) if streaming else result
+    _trace_cache(llm, False)
+    result = await acall(*args, **kwargs)
+    if isinstance(result, LLMOutput):
+        cache.put(key, _make_entry(llm, args, kwargs, [result.model_dump()], time.perf_counter() - start))
+        return result
+    return _arecord_stream(llm, cache, key, args, kwargs, result, start)
+
+
+async def _arecord_stream(llm, cache: LLMCache, key: str, args: tuple, kwargs: dict,
+                          stream: AsyncIterator[LLMOutput], start: float) -> AsyncIterator[LLMOutput]:
+    outputs = []
+    async for output in stream:
+        outputs.append(output.model_dump())
+        yield output
+    cache.put(key, _make_entry(llm, args, kwargs, outputs, time.perf_counter() - start))
@@ -0,0 +1,189 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: llm_rate_limiter.py
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+
+class TokenBucket:
+    """A thread safe token bucket with additive increase, multiplicative
+    decrease of its refill rate.
+
+    Attributes:
+        max_rate (float): The configured refill rate, in requests per second.
+        rate (float): The current refill rate, halved on every rate limit
+            error and recovered step by step on success.
+        capacity (float): Max number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting until one is available.
+
+        Returns:
+            bool: False if no token could be taken within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """Slow down after the provider rejected a request."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until,
+                                          time.monotonic() + retry_after)
+
+    def on_success(self):
+        """Recover the refill rate step by step."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+# exception types providers raise for rate limited requests, e.g.
+# openai.RateLimitError, anthropic.RateLimitError.
+RATE_LIMIT_ERROR_NAMES = ('RateLimitError', 'RateLimitExceeded', 'TooManyRequests')
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether the error is a provider rate limit (HTTP 429) rejection.
+
+    The HTTP status of the error or its response is checked first, then the
+    exception types providers raise for rate limits, matched by class name
+    so provider sdks need not be imported.
+    """
+    for source in (error, getattr(error, 'response', None)):
+        for attr in ('status_code', 'status', 'http_status'):
+            if getattr(source, attr, None) == 429:
+                return True
+    return any(cls.__name__ in RATE_LIMIT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMRateLimiter:
+    """Rate limit and back off the calls made to one llm.
+
+    Calls first take a token from the bucket of the llm when a rate limit is
+    configured, then run; rate limit errors slow the bucket down and are
+    retried after an exponential backoff with jitter, honoring Retry-After.
+
+    The limiter is configured by the `rate_limit` section of the llm yaml:
+
+        rate_limit:
+          qps: 5
+          burst: 10
+          max_retries: 3
+    """
+
+    def __init__(self, name: str, rate_limit: Optional[dict] = None):
+        rate_limit = rate_limit or {}
+        self.name = name
+        qps = rate_limit.get('qps')
+        self.bucket: Optional[TokenBucket] = TokenBucket(
+            rate=qps, capacity=rate_limit.get('burst')) if qps else None
+        self.max_retries = rate_limit.get('max_retries', DEFAULT_MAX_RETRIES)
+        self.base_backoff = rate_limit.get('base_backoff', DEFAULT_BASE_BACKOFF)
+        self.max_backoff = rate_limit.get('max_backoff', DEFAULT_MAX_BACKOFF)
+
+    def call(self, func: Callable, *args: Any, can_retry: Optional[Callable[[], bool]] = None,
+             **kwargs: Any) -> Any:
+        """Call the function under the rate limit of the llm.
+
+        Args:
+            func (Callable): The function calling the llm.
+            can_retry (Optional[Callable[[], bool]]): Checked before every
+                retry, e.g. to stop retrying once a streamed call has sent
+                its first chunk.
+        """
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                if can_retry is not None and not can_retry():
+                    raise
+                retry_after = _get_retry_after(e)
+                if self.bucket is not None:
+                    self.bucket.on_rate_limited(retry_after)
+                backoff = retry_after or min(
+                    self.max_backoff, self.base_backoff * (2 ** attempt))
+                backoff *= random.uniform(1, 1.5)
+                attempt += 1
+                LOGGER.warning(f"LLM {self.name} is rate limited, retry {attempt} "
+                               f"after {backoff:.2f}s: {e}")
+                time.sleep(backoff)
+                continue
+            if self.bucket is not None:
+                self.bucket.on_success()
+            return result
+
+
+_rate_limiters: Dict[str, LLMRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_llm_rate_limiter(llm) -> LLMRateLimiter:
+    """Return the process wide rate limiter shared by llms of the same name."""
+    name = llm.name or llm.model_name or llm.__class__.__name__
+    limiter = _rate_limiters.get(name)
+    if limiter is not None:
+        return limiter
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = LLMRateLimiter(name, llm.rate_limit)
+        return _rate_limiters[name]
@@ -0,0 +1,27 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 15:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: llm_tokenizer.py
+import functools
+from typing import Optional
+
+import tiktoken
+
+DEFAULT_TIKTOKEN_ENCODING = 'cl100k_base'
+
+
+@functools.lru_cache(maxsize=None)
+def get_tiktoken_encoding(model_name: Optional[str]) -> tiktoken.Encoding:
+    """Return the tiktoken encoding of the model, resolved once per model.
+
+    Models unknown to tiktoken fall back to `cl100k_base`.
+    """
+    if model_name:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            pass
+    return tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
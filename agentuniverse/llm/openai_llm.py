@@ -11,10 +11,10 @@ import httpx
 from langchain_core.language_models.base import BaseLanguageModel
 from openai import OpenAI, AsyncOpenAI
 from pydantic import Field
-import tiktoken
 
 from agentuniverse.llm.langchain_instance import LangchainOpenAI
 from agentuniverse.llm.llm import LLM, LLMOutput
+from agentuniverse.llm.llm_tokenizer import get_tiktoken_encoding
 from agentuniverse.base.util.env_util import get_from_env
 
 OPENAI_MAX_CONTEXT_LENGTH = {
@@ -164,11 +164,7 @@ class OpenAILLM(LLM):
         Returns:
             The integer number of tokens in the text.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(self.model_name)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return len(get_tiktoken_encoding(self.model_name).encode(text))
 
     @staticmethod
     def parse_result(chunk):
@@ -10,7 +10,6 @@ from typing import Any, Optional, AsyncIterator, Iterator, Union
 
 import httpx
 import openai
-import tiktoken
 from langchain_core.language_models.base import BaseLanguageModel
 from openai import OpenAI, AsyncOpenAI
 
@@ -18,6 +17,7 @@ from agentuniverse.base.config.component_configer.configers.llm_configer import
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.base.util.system_util import process_yaml_func
 from agentuniverse.llm.llm import LLM, LLMOutput
+from agentuniverse.llm.llm_tokenizer import get_tiktoken_encoding
 from agentuniverse.llm.openai_style_langchain_instance import LangchainOpenAIStyleInstance
 
 
@@ -198,11 +198,7 @@ class OpenAIStyleLLM(LLM):
         Returns:
             The integer number of tokens in the text.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(self.model_name)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return len(get_tiktoken_encoding(self.model_name).encode(text))
 
     def max_context_length(self) -> int:
         """Return the maximum length of the context."""
@@ -5,16 +5,25 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: graph.py
-from typing import Optional, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Optional, Dict, List, Tuple
 
 import networkx as nx
 
+from agentuniverse.base.util.concurrency_util import get_shared_executor, ContextThreadPoolExecutor
+
 from agentuniverse.workflow.node.enum import NodeEnum, NodeStatusEnum
 from agentuniverse.workflow.node.node import Node
 from agentuniverse.workflow.node.node_constant import NODE_CLS_MAPPING
 from agentuniverse.workflow.node.node_output import NodeOutput
 from agentuniverse.workflow.workflow_output import WorkflowOutput
 
+DEFAULT_MAX_PARALLELISM = 8
+GRAPH_EXECUTOR_NAME = 'workflow_graph'
+
 
 class Graph(nx.DiGraph):
     """The basic class of the graph."""
@@ -33,6 +42,8 @@ class Graph(nx.DiGraph):
             self._add_graph_edge(edge_config)
         if not nx.is_directed_acyclic_graph(self):
             raise ValueError("The provided configuration does not form a DAG.")
+        self.graph['max_parallelism'] = config.get('max_parallelism', DEFAULT_MAX_PARALLELISM)
+        self.graph['node_timeout'] = config.get('node_timeout')
         return self
 
     def _add_graph_node(self, workflow_id: str, node_config: dict) -> None:
@@ -66,54 +77,147 @@ class Graph(nx.DiGraph):
     def run(self, workflow_output: WorkflowOutput) -> None:
         """Run the graph.
 
+        Nodes run as soon as all their predecessors are done, independent
+        branches concurrently, at most `max_parallelism` nodes at a time. A
+        node runs when at least one of its incoming edges is taken: edges of a
+        node with an `edge_source_handler` (a condition node) are only taken
+        if their `source_handler` matches it. Nodes without a taken incoming
+        edge are skipped, as are their successors that have no other. The run
+        ends with the first end node or the first failure: nodes not started
+        yet are cancelled and the running ones are waited for, up to their
+        deadline if they have a timeout. After a failure, running nodes
+        without a timeout are not waited for. A graph run by a node of
+        another graph, like a workflow agent, runs its nodes in its own pool.
+
         Args:
             workflow_output: The workflow output.
         """
-        sorted_nodes = list(nx.topological_sort(self))
-        predecessor_node: Node | None = None
-        while True:
-            next_node = self._get_next_node(workflow_output, sorted_nodes, predecessor_node)
-            if not next_node:
-                break
-            if self._has_node_been_executed(workflow_output, next_node.id):
-                predecessor_node = next_node
+        start_node = self._get_start_node()
+        if start_node is None:
+            return
+        max_parallelism = self.graph.get('max_parallelism') or DEFAULT_MAX_PARALLELISM
+        # predecessors not done or skipped yet, and whether an incoming edge was taken
+        pending_predecessors = {node_id: self.in_degree(node_id) for node_id in self.nodes}
+        reached = {start_node.id}
+        ready: deque = deque([start_node])
+        running: Dict[Future, Tuple[Node, Optional[float]]] = {}
+        nested = threading.current_thread().name.startswith(GRAPH_EXECUTOR_NAME)
+        if nested:
+            # a nested graph must not wait on the pool its own node is running in.
+            executor = ContextThreadPoolExecutor(max_workers=max_parallelism, thread_name_prefix=GRAPH_EXECUTOR_NAME)
+        else:
+            executor = get_shared_executor(GRAPH_EXECUTOR_NAME)
+        failed = False
+        try:
+            while ready or running:
+                while ready and len(running) < max_parallelism:
+                    node = ready.popleft()
+                    if self._has_node_been_executed(workflow_output, node.id):
+                        if node.type == NodeEnum.END:
+                            return
+                        ready.extend(self._complete_node(node, workflow_output.workflow_node_results[node.id],
+                                                         pending_predecessors, reached))
+                        continue
+                    timeout = self._get_node_timeout(node)
+                    running[executor.submit(node.run, workflow_output)] = (
+                        node, time.monotonic() + timeout if timeout else None)
+                if not running:
+                    continue
+
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                wait_timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, _ = running.pop(future)
+                    node_output = self._get_node_output(node, future, workflow_output)
+                    workflow_output.workflow_node_results[node.id] = node_output
+                    if node.type == NodeEnum.END:
+                        return
+                    ready.extend(self._complete_node(node, node_output, pending_predecessors, reached))
+                now = time.monotonic()
+                for future, (node, deadline) in running.items():
+                    if deadline is not None and deadline <= now and not future.done():
+                        error = f"The node {node.id} timed out after {self._get_node_timeout(node)}s."
+                        workflow_output.workflow_node_results[node.id] = NodeOutput(
+                            node_id=node.id, status=NodeStatusEnum.FAILED, error=error)
+                        raise TimeoutError(error)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._finish_outstanding(running, failed)
+            if nested:
+                executor.shutdown(wait=False)
+
+    def _get_start_node(self) -> Optional[Node]:
+        """Get the start node of the graph."""
+        for node_id in nx.topological_sort(self):
+            if self.nodes[node_id]['type'] == NodeEnum.START.value:
+                return self.nodes[node_id]['instance']
+        return None
+
+    def _get_node_timeout(self, node: Node) -> Optional[float]:
+        """Get the timeout of the node in seconds, the graph `node_timeout` by default."""
+        return node.timeout or self.graph.get('node_timeout')
+
+    @staticmethod
+    def _finish_outstanding(running: Dict[Future, Tuple[Node, Optional[float]]], failed: bool) -> None:
+        """Cancel the nodes not started yet and wait for the running ones.
+
+        A node with a timeout is waited for until its deadline, never past it.
+        A node without one is only waited for when the run did not fail.
+        """
+        for future, (_, deadline) in running.items():
+            if future.cancel():
+                continue
+            if deadline is None:
+                if not failed:
+                    wait([future])
                 continue
-            self._run_node(cur_node=next_node, workflow_output=workflow_output)
-            if next_node.type == NodeEnum.END:
-                break
-            predecessor_node = next_node
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                wait([future], timeout=remaining)
 
-    def _get_next_node(self, workflow_output: WorkflowOutput, nodes: Any,
-                       predecessor_node: Optional[Node] = None) -> Optional[Node]:
-        """Get the next node in the graph.
+    @staticmethod
+    def _get_node_output(node: Node, future: Future, workflow_output: WorkflowOutput) -> NodeOutput:
+        """Get the output of the finished node, record the failure and raise its error if it failed."""
+        try:
+            return future.result()
+        except Exception as e:
+            workflow_output.workflow_node_results[node.id] = NodeOutput(
+                node_id=node.id, status=NodeStatusEnum.FAILED, error=str(e))
+            raise
+
+    def _complete_node(self, node: Node, node_output: Optional[NodeOutput], pending_predecessors: Dict[str, int],
+                       reached: set) -> List[Node]:
+        """Mark the node done and return its successors which are ready to run.
 
         Args:
-            workflow_output: The workflow output.
-            nodes: The nodes in the graph.
-            predecessor_node: The predecessor node.
+            node: The node done.
+            node_output: The output of the node.
+            pending_predecessors: The predecessors each node still waits for.
+            reached: The nodes with a taken incoming edge.
         Returns:
-            The next node in the graph.
+            The successors ready to run.
         """
-        if not predecessor_node:
-            for node_id in nodes:
-                if self.nodes[node_id]['type'] == NodeEnum.START.value:
-                    return self.nodes[node_id]['instance']
-        else:
-            predecessor_node_output: NodeOutput = workflow_output.workflow_node_results.get(
-                predecessor_node.id,
-                None
-            )
-            source_handler = predecessor_node_output.edge_source_handler if predecessor_node_output else None
-            successors = self.successors(predecessor_node.id)
-            if not successors:
-                return None
-            successors = list(successors)
-            if source_handler:
-                for s in successors:
-                    if self.get_edge_data(predecessor_node.id, s).get('source_handler') == source_handler:
-                        return self.nodes[s]['instance']
-            else:
-                return self.nodes[successors[0]]['instance']
+        source_handler = node_output.edge_source_handler if node_output else None
+        ready = []
+        # nodes done or skipped, whose successors are updated
+        settled = [(node.id, source_handler, True)]
+        while settled:
+            node_id, source_handler, executed = settled.pop()
+            for successor_id in self.successors(node_id):
+                if executed and (not source_handler or self.get_edge_data(node_id, successor_id).get(
+                        'source_handler') == source_handler):
+                    reached.add(successor_id)
+                pending_predecessors[successor_id] -= 1
+                if pending_predecessors[successor_id] > 0:
+                    continue
+                if successor_id in reached:
+                    ready.append(self.nodes[successor_id]['instance'])
+                else:
+                    settled.append((successor_id, None, False))
+        return ready
 
     @staticmethod
     def _has_node_been_executed(workflow_output: WorkflowOutput, node_id: str) -> bool:
@@ -126,15 +230,3 @@ class Graph(nx.DiGraph):
             True if the node has been executed, False otherwise.
         """
         return node_id in workflow_output.workflow_node_results
-
-    @staticmethod
-    def _run_node(cur_node: Node = None,
-                  workflow_output: WorkflowOutput = None) -> None:
-        """Run the node in the graph.
-
-        Args:
-            cur_node: The current node in the graph.
-            workflow_output: The workflow output.
-        """
-        node_output = cur_node.run(workflow_output)
-        workflow_output.workflow_node_results[cur_node.id] = node_output
@@ -59,5 +59,5 @@ class AgentNode(Node):
 
         for output_param in output_params:
             output_param.value = agent_output_dict.get(output_param.name, None)
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
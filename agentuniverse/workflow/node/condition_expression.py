@@ -0,0 +1,315 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 21:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: condition_expression.py
+import functools
+import operator
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from agentuniverse.workflow.node.enum import ConditionComparisonEnum, ConditionLogicalOperatorEnum
+from agentuniverse.workflow.node.node_config import ConditionBranchParams, ConditionParams, NodeInputParams
+from agentuniverse.workflow.workflow_output import WorkflowOutput
+
+# conditions are compiled once into closures reading the referenced node outputs
+Predicate = Callable[[WorkflowOutput], bool]
+
+
+class _Operand(NamedTuple):
+    """A compiled operand, `value` holds the value of a constant."""
+    get: Callable[[WorkflowOutput], Any]
+    constant: bool
+    value: Any = None
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _number_comparator(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Compare the values as numbers, numeric strings included; False if either is not a number."""
+
+    def comparator(left: Any, right: Any) -> bool:
+        left, right = _to_number(left), _to_number(right)
+        return left is not None and right is not None and compare(left, right)
+
+    return comparator
+
+
+def _contains(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    if isinstance(left, str):
+        return str(right) in left
+    try:
+        return right in left
+    except TypeError:
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _matches(left: Any, pattern: Any) -> bool:
+    if left is None or pattern is None:
+        return False
+    if not isinstance(pattern, re.Pattern):
+        try:
+            pattern = _compile_pattern(str(pattern))
+        except re.error:
+            return False
+    return pattern.search(str(left)) is not None
+
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ConditionComparisonEnum.EQUAL.value: operator.eq,
+    ConditionComparisonEnum.NOT_EQUAL.value: operator.ne,
+    ConditionComparisonEnum.BLANK.value: lambda left, right: left is None,
+    ConditionComparisonEnum.NOT_BLANK.value: lambda left, right: left is not None,
+    ConditionComparisonEnum.GREATER_THAN.value: _number_comparator(operator.gt),
+    ConditionComparisonEnum.GREATER_THAN_OR_EQUAL.value: _number_comparator(operator.ge),
+    ConditionComparisonEnum.LESS_THAN.value: _number_comparator(operator.lt),
+    ConditionComparisonEnum.LESS_THAN_OR_EQUAL.value: _number_comparator(operator.le),
+    ConditionComparisonEnum.CONTAINS.value: _contains,
+    ConditionComparisonEnum.NOT_CONTAINS.value: lambda left, right: not _contains(left, right),
+    ConditionComparisonEnum.STARTS_WITH.value:
+        lambda left, right: isinstance(left, str) and right is not None and left.startswith(str(right)),
+    ConditionComparisonEnum.ENDS_WITH.value:
+        lambda left, right: isinstance(left, str) and right is not None and left.endswith(str(right)),
+    ConditionComparisonEnum.REGEX.value: _matches,
+}
+
+
+def _constant(value: Any) -> _Operand:
+    return _Operand(lambda workflow_output: value, True, value)
+
+
+def _reference(node_id: str, name: str) -> _Operand:
+    return _Operand(lambda workflow_output: workflow_output.get_parameter_value(node_id, name), False)
+
+
+def _compile_comparison(compare: str, left: _Operand, right: _Operand) -> Predicate:
+    comparator = _COMPARATORS.get(compare)
+    if comparator is None:
+        raise ValueError(f"Unsupported condition comparison: {compare}")
+    if compare == ConditionComparisonEnum.REGEX.value and right.constant and right.value is not None:
+        try:
+            right = _constant(re.compile(str(right.value)))
+        except re.error as e:
+            raise ValueError(f"Invalid condition regex {right.value!r}: {e}")
+    get_left = left.get
+    if right.constant:
+        right_value = right.value
+        return lambda workflow_output: comparator(get_left(workflow_output), right_value)
+    get_right = right.get
+    return lambda workflow_output: comparator(get_left(workflow_output), get_right(workflow_output))
+
+
+def _all(predicates: List[Predicate]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    first, rest = predicates[0], _all(predicates[1:])
+    return lambda workflow_output: first(workflow_output) and rest(workflow_output)
+
+
+def _any(predicates: List[Predicate]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    first, rest = predicates[0], _any(predicates[1:])
+    return lambda workflow_output: first(workflow_output) or rest(workflow_output)
+
+
+def _compile_operand(node_input: Optional[NodeInputParams]) -> _Operand:
+    if node_input is None or node_input.value is None:
+        return _constant(None)
+    value = node_input.value
+    if value.type == 'reference':
+        if not isinstance(value.content, list) or len(value.content) < 2:
+            raise ValueError(f"Invalid condition reference: {value.content}")
+        return _reference(value.content[0], value.content[1])
+    return _constant(value.content)
+
+
+def compile_condition(condition: ConditionParams) -> Predicate:
+    """Compile a condition comparing two node inputs."""
+    return _compile_comparison(condition.compare, _compile_operand(condition.left), _compile_operand(condition.right))
+
+
+def compile_branch(branch: ConditionBranchParams) -> Predicate:
+    """Compile the expression of the branch, or its conditions combined by its logical operator.
+
+    A branch without conditions never matches.
+    """
+    if branch.expression:
+        return compile_expression(branch.expression)
+    predicates = [compile_condition(condition) for condition in branch.conditions or []]
+    if not predicates:
+        return lambda workflow_output: False
+    logical_operator = (branch.logical_operator or ConditionLogicalOperatorEnum.AND.value).lower()
+    if logical_operator == ConditionLogicalOperatorEnum.AND.value:
+        return _all(predicates)
+    if logical_operator == ConditionLogicalOperatorEnum.OR.value:
+        return _any(predicates)
+    raise ValueError(f"Unsupported condition logical operator: {branch.logical_operator}")
+
+
+def compile_expression(expression: str) -> Predicate:
+    """Compile a condition expression, e.g. `{{3.score}} >= 0.5 and not ({{1.input}} contains 'test')`.
+
+    Nothing is `eval`-ed, an expression can only reference node outputs, use
+    literals and the operators of its grammar:
+
+        expression := and_expr ('or' and_expr)*
+        and_expr   := not_expr ('and' not_expr)*
+        not_expr   := 'not' not_expr | '(' expression ')' | comparison
+        comparison := operand [comparator operand | 'is' ['not'] 'blank']
+        comparator := '==' | '!=' | '>' | '>=' | '<' | '<=' | 'contains' | 'not' 'contains'
+                      | 'starts_with' | 'ends_with' | 'matches'
+        operand    := '{{' node_id '.' param_name '}}' | number | string | 'true' | 'false' | 'null'
+
+    An operand without a comparator is tested for truthiness. Numeric
+    comparisons are False unless both sides are numbers or numeric strings.
+    """
+    return _ExpressionParser(expression).parse()
+
+
+_TOKEN_PATTERN = re.compile(r"""\s*(?:
+    (?P<reference>\{\{[^{}]*\}\})
+  | (?P<number>-?(?:\d+(?:\.\d*)?|\.\d+))
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<symbol>==|!=|>=|<=|>|<|\(|\))
+  | (?P<word>[A-Za-z_]\w*)
+)""", re.VERBOSE)
+
+_SYMBOL_COMPARISONS = {
+    '==': ConditionComparisonEnum.EQUAL.value,
+    '!=': ConditionComparisonEnum.NOT_EQUAL.value,
+    '>': ConditionComparisonEnum.GREATER_THAN.value,
+    '>=': ConditionComparisonEnum.GREATER_THAN_OR_EQUAL.value,
+    '<': ConditionComparisonEnum.LESS_THAN.value,
+    '<=': ConditionComparisonEnum.LESS_THAN_OR_EQUAL.value,
+}
+_WORD_COMPARISONS = {
+    'contains': ConditionComparisonEnum.CONTAINS.value,
+    'starts_with': ConditionComparisonEnum.STARTS_WITH.value,
+    'ends_with': ConditionComparisonEnum.ENDS_WITH.value,
+    'matches': ConditionComparisonEnum.REGEX.value,
+}
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_STRING_ESCAPE = re.compile(r"\\(['\"\\])")
+
+
+class _ExpressionParser:
+    """A recursive descent parser building the predicate of an expression."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = self._tokenize(expression)
+        self.pos = 0
+
+    def parse(self) -> Predicate:
+        predicate = self._parse_or()
+        if self.pos < len(self.tokens):
+            self._error(f"unexpected {self.tokens[self.pos][1]!r}")
+        return predicate
+
+    def _tokenize(self, expression: str) -> List[Tuple[str, str]]:
+        tokens = []
+        pos, end = 0, len(expression.rstrip())
+        while pos < end:
+            match = _TOKEN_PATTERN.match(expression, pos)
+            if match is None or match.end() == pos:
+                self._error(f"unexpected {expression[pos:].strip()[:1]!r}")
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            pos = match.end()
+        return tokens
+
+    def _error(self, message: str):
+        raise ValueError(f"Invalid condition expression {self.expression!r}: {message}")
+
+    def _peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        if self.pos + offset < len(self.tokens):
+            return self.tokens[self.pos + offset]
+        return None, None
+
+    def _accept(self, kind: str, text: str) -> bool:
+        if self._peek() == (kind, text):
+            self.pos += 1
+            return True
+        return False
+
+    def _parse_or(self) -> Predicate:
+        predicates = [self._parse_and()]
+        while self._accept('word', 'or'):
+            predicates.append(self._parse_and())
+        return _any(predicates)
+
+    def _parse_and(self) -> Predicate:
+        predicates = [self._parse_not()]
+        while self._accept('word', 'and'):
+            predicates.append(self._parse_not())
+        return _all(predicates)
+
+    def _parse_not(self) -> Predicate:
+        if self._accept('word', 'not'):
+            predicate = self._parse_not()
+            return lambda workflow_output: not predicate(workflow_output)
+        if self._accept('symbol', '('):
+            predicate = self._parse_or()
+            if not self._accept('symbol', ')'):
+                self._error("missing ')'")
+            return predicate
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> Predicate:
+        left = self._parse_operand()
+        kind, text = self._peek()
+        if (kind, text) == ('word', 'is'):
+            self.pos += 1
+            negated = self._accept('word', 'not')
+            if not self._accept('word', 'blank'):
+                self._error("expected 'blank' after 'is'")
+            compare = ConditionComparisonEnum.NOT_BLANK if negated else ConditionComparisonEnum.BLANK
+            return _compile_comparison(compare.value, left, _constant(None))
+        if (kind, text) == ('word', 'not') and self._peek(1) == ('word', 'contains'):
+            self.pos += 2
+            return _compile_comparison(ConditionComparisonEnum.NOT_CONTAINS.value, left, self._parse_operand())
+        compare = _SYMBOL_COMPARISONS.get(text) if kind == 'symbol' else _WORD_COMPARISONS.get(text)
+        if compare is None:
+            get_left = left.get
+            return lambda workflow_output: bool(get_left(workflow_output))
+        self.pos += 1
+        return _compile_comparison(compare, left, self._parse_operand())
+
+    def _parse_operand(self) -> _Operand:
+        kind, text = self._peek()
+        if kind is None:
+            self._error("unexpected end")
+        self.pos += 1
+        if kind == 'reference':
+            node_id, _, name = text[2:-2].strip().rpartition('.')
+            if not node_id or not name:
+                self._error(f"expected {{{{node_id.param_name}}}}, got {text!r}")
+            return _reference(node_id, name)
+        if kind == 'number':
+            return _constant(float(text) if '.' in text else int(text))
+        if kind == 'string':
+            # only quotes and backslashes are escaped, so regex escapes are kept as they are
+            return _constant(_STRING_ESCAPE.sub(r'\1', text[1:-1]))
+        if kind == 'word' and text in _LITERALS:
+            return _constant(_LITERALS[text])
+        self._error(f"unexpected {text!r}")
@@ -54,6 +54,6 @@ class EndNode(Node):
         output_param: NodeOutputParams = output_params[0]
         output_param.value = prompt_val
 
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
         workflow_output.workflow_end_params = {output_param.name: output_param.value}
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
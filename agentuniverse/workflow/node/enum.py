@@ -43,3 +43,18 @@ class ConditionComparisonEnum(Enum):
     EQUAL = 'equal'
     NOT_EQUAL = 'not_equal'
     BLANK = 'blank'
+    NOT_BLANK = 'not_blank'
+    GREATER_THAN = 'greater_than'
+    GREATER_THAN_OR_EQUAL = 'greater_than_or_equal'
+    LESS_THAN = 'less_than'
+    LESS_THAN_OR_EQUAL = 'less_than_or_equal'
+    CONTAINS = 'contains'
+    NOT_CONTAINS = 'not_contains'
+    STARTS_WITH = 'starts_with'
+    ENDS_WITH = 'ends_with'
+    REGEX = 'regex'
+
+
+class ConditionLogicalOperatorEnum(Enum):
+    AND = 'and'
+    OR = 'or'
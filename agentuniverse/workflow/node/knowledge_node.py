@@ -67,5 +67,5 @@ class KnowledgeNode(Node):
         output_params: List[NodeOutputParams] = self._data.outputs
         output_params[0].value = knowledge_res
 
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
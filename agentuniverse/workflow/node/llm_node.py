@@ -72,6 +72,6 @@ class LLMNode(Node):
         # handle output parameters
         output_params: List[NodeOutputParams] = self._data.outputs
         output_params[0].value = llm_output.text
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
 
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
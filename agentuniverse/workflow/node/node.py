@@ -29,6 +29,7 @@ class Node(BaseModel):
     type: NodeEnum = None
     workflow_id: Optional[str] = None
     position: Optional[dict] = None
+    timeout: Optional[float] = None
     _data: Optional[NodeData] = None
     _data_cls = NodeData
 
@@ -56,11 +57,8 @@ class Node(BaseModel):
         for input_param in input_params:
             val = input_param.value
             if val.type == 'reference':
-                reference_node_id = val.content[0]
-                reference_output_params: List[NodeOutputParams] = workflow_output.workflow_parameters.get(
-                    reference_node_id, [])
-                node_input_params[input_param.name] = next(
-                    (param.value for param in reference_output_params if param.name == val.content[1]), None)
+                node_input_params[input_param.name] = workflow_output.get_parameter_value(val.content[0],
+                                                                                          val.content[1])
             else:
                 node_input_params[input_param.name] = val.content
         return node_input_params
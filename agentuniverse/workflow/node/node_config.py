@@ -67,6 +67,10 @@ class ConditionParams(BaseModel):
 class ConditionBranchParams(BaseModel):
     name: Optional[str] = None
     conditions: Optional[List[ConditionParams]] = list()
+    # how the conditions combine, `and` or `or`
+    logical_operator: Optional[str] = 'and'
+    # a condition expression, used instead of the conditions when set
+    expression: Optional[str] = None
 
 
 class ConditionNodeInputParams(BaseModel):
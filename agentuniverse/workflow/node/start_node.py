@@ -26,5 +26,5 @@ class StartNode(Node):
         start_val = start_params.get('input', '')
         output_params: List[NodeOutputParams] = self._data.outputs
         output_params[0].value = start_val
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
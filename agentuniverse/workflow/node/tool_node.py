@@ -53,5 +53,5 @@ class ToolNode(Node):
                 output_param.value = tool_output.get(output_param.name, None)
         else:
             raise TypeError(f"The type of tool_output is not supported.")
-        workflow_output.workflow_parameters[self.id] = output_params
+        workflow_output.set_node_parameters(self.id, output_params)
         return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
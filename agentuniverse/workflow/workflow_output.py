@@ -5,9 +5,9 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: workflow_output.py
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from agentuniverse.workflow.node.node_config import NodeOutputParams
 from agentuniverse.workflow.node.node_output import NodeOutput
@@ -22,3 +22,22 @@ class WorkflowOutput(BaseModel):
     workflow_node_results: Optional[Dict[str, NodeOutput]] = dict()
     workflow_start_params: Optional[Dict[str, Any]] = dict()
     workflow_end_params: Optional[Dict[str, Any]] = dict()
+    # output params by (node id, param name), a field rather than a private attribute for fast lookups
+    workflow_parameter_index: Dict[Tuple[str, str], NodeOutputParams] = Field(default_factory=dict, exclude=True,
+                                                                                repr=False)
+
+    def set_node_parameters(self, node_id: str, output_params: List[NodeOutputParams]) -> None:
+        """Save the output params of the node."""
+        self.workflow_parameters[node_id] = output_params
+        # the first param of a name wins, as in a scan of the list
+        for param in reversed(output_params or []):
+            self.workflow_parameter_index[(node_id, param.name)] = param
+
+    def get_parameter_value(self, node_id: str, name: str) -> Any:
+        """Return the value of the output param of the node, None if there is none."""
+        param = self.workflow_parameter_index.get((node_id, name))
+        if param is not None:
+            return param.value
+        # params put in `workflow_parameters` directly are not indexed
+        return next((param.value for param in self.workflow_parameters.get(node_id, []) if param.name == name),
+                    None)
@@ -159,15 +159,22 @@ class AgentService:
                            **agent_input_dict)
 
         # generate iterator
+        token_agent_id = ''
         for chunk in task.stream_run():
             chunk_dict = json.loads(chunk.replace("data:", "", 1))
             if "process" in chunk_dict:
                 data = chunk_dict['process'].get('data')
                 if data:
                     yield_type = 'token' if 'chunk' in data else 'intermediate_steps'
+                    agent_id = data.get('agent_info', {}).get('name', '')
+                    if yield_type == 'token':
+                        # token frames only carry the agent info when the agent changes
+                        if 'agent_info' in data:
+                            token_agent_id = agent_id
+                        agent_id = token_agent_id
                     yield {'output': data.get('chunk' if yield_type == 'token' else 'output'),
                            'type': yield_type,
-                           'agent_id': data.get('agent_info', {}).get('name', '')}
+                           'agent_id': agent_id}
             elif "result" in chunk_dict or "error" in chunk_dict:
                 end_time = time.time()
                 # calculate response time
@@ -224,15 +231,22 @@ class AgentService:
         task = RequestTask(async_agent_run_queue, False, **agent_input_dict)
 
         # generate async iterator
+        token_agent_id = ''
         async for chunk in task.async_stream_run():
             chunk_dict = json.loads(chunk.replace("data:", "", 1))
             if "process" in chunk_dict:
                 data = chunk_dict['process'].get('data')
                 if data:
                     yield_type = 'token' if 'chunk' in data else 'intermediate_steps'
+                    agent_id = data.get('agent_info', {}).get('name', '')
+                    if yield_type == 'token':
+                        # token frames only carry the agent info when the agent changes
+                        if 'agent_info' in data:
+                            token_agent_id = agent_id
+                        agent_id = token_agent_id
                     yield {'output': data.get('chunk' if yield_type == 'token' else 'output'),
                            'type': yield_type,
-                           'agent_id': data.get('agent_info', {}).get('name', '')}
+                           'agent_id': agent_id}
             elif "result" in chunk_dict or "error" in chunk_dict:
                 end_time = time.time()
                 # calculate response time
@@ -12,7 +12,7 @@ from typing import Dict
 from agentuniverse.agent.action.knowledge.knowledge import Knowledge
 from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
 from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
-from agentuniverse.agent_serve.web.post_fork_queue import POST_FORK_QUEUE
+from agentuniverse.agent_serve.web.post_fork_queue import POST_FORK_QUEUE, is_post_fork_queue_executed
 from agentuniverse.base.component.component_configer_util import ComponentConfigerUtil
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.base.config.component_configer.configers.knowledge_configer import KnowledgeConfiger
@@ -114,5 +114,7 @@ def register_store(file_path: str):
     component_instance = component_clz().initialize_by_component_configer(component_configer)
     component_instance.component_config_path = component_configer.configer.path
     StoreManager().register(component_instance.get_instance_code(), component_instance)
-    for _func, args, kwargs in POST_FORK_QUEUE[-2:]:
-        _func(*args, **kwargs)
+    # post fork funcs added after the queue has been executed already ran.
+    if not is_post_fork_queue_executed():
+        for _func, args, kwargs in POST_FORK_QUEUE[-2:]:
+            _func(*args, **kwargs)
@@ -0,0 +1,92 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 11:20
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_embedding_batcher.py
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+from agentuniverse.agent.action.knowledge.embedding.embedding_batcher import EmbeddingBatcher
+from agentuniverse.agent.action.knowledge.store.chroma_store import ChromaStore
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+
+class FakeEmbedding:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        with self.lock:
+            self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class EmbeddingBatcherTest(unittest.TestCase):
+    """
+    Test cases for EmbeddingBatcher class
+    """
+
+    def setUp(self) -> None:
+        self.embedding = FakeEmbedding()
+        self.patcher = mock.patch(
+            'agentuniverse.agent.action.knowledge.embedding.embedding_batcher.EmbeddingManager')
+        self.patcher.start().return_value.get_instance_obj.return_value = self.embedding
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+
+    def test_split_by_count_and_tokens(self) -> None:
+        documents = [Document(text='a' * 40) for _ in range(5)]
+        batcher = EmbeddingBatcher(batch_size=2)
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batcher.split(documents)])
+        batcher = EmbeddingBatcher(batch_size=10, batch_token_limit=25)
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batcher.split(documents)])
+        batcher = EmbeddingBatcher(batch_size=10, batch_token_limit=5)
+        self.assertEqual([1] * 5, [len(batch) for batch in batcher.split(documents)])
+
+    def test_run_embeds_once_per_batch(self) -> None:
+        documents = [Document(text='x' * i) for i in range(1, 11)]
+        documents[3].embedding = [-1.0]
+        written = {}
+
+        def write_batch(batch, embeddings):
+            for document, embedding in zip(batch, embeddings):
+                written[document.id] = embedding
+
+        EmbeddingBatcher(embedding_model='fake', batch_size=3,
+                         max_workers=3).run(documents, write_batch)
+        self.assertEqual(4, len(self.embedding.calls))
+        self.assertEqual(9, sum(len(call) for call in self.embedding.calls))
+        for document in documents:
+            expected = document.embedding or [float(len(document.text))]
+            self.assertEqual(expected, written[document.id])
+
+    def test_run_propagates_errors(self) -> None:
+        documents = [Document(text=str(i)) for i in range(6)]
+
+        def write_batch(batch, embeddings):
+            raise ValueError('write failed')
+
+        with self.assertRaises(ValueError):
+            EmbeddingBatcher(embedding_model='fake', batch_size=2,
+                             max_workers=2).run(documents, write_batch)
+
+    def test_chroma_store_writes_one_call_per_batch(self) -> None:
+        store = ChromaStore(embedding_model='fake', embedding_batch_size=4)
+        store.collection = mock.MagicMock()
+        documents = [Document(text=f'document {i}') for i in range(10)]
+        store.insert_document(documents)
+        self.assertEqual(3, store.collection.add.call_count)
+        self.assertEqual(3, len(self.embedding.calls))
+        ids = [doc_id for call in store.collection.add.call_args_list
+               for doc_id in call.kwargs['ids']]
+        self.assertEqual(sorted(document.id for document in documents), sorted(ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
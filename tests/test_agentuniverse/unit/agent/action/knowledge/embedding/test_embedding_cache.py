@@ -0,0 +1,89 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_embedding_cache.py
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import \
+    cached_embeddings, EmbeddingCache
+
+
+class CountingEmbedding(Embedding):
+    calls: List[List[str]] = []
+
+    @cached_embeddings
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    @cached_embeddings
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.get_embeddings.__wrapped__(self, texts, **kwargs)
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    """
+    Test cases for the embedding cache
+    """
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.persist_path = os.path.join(self.tmp_dir.name, 'embedding_cache.db')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_cache_disabled_by_default(self) -> None:
+        embedding = CountingEmbedding(embedding_model_name='model', calls=[])
+        embedding.get_embeddings(['a'])
+        embedding.get_embeddings(['a'])
+        self.assertEqual([['a'], ['a']], embedding.calls)
+
+    def test_only_missing_texts_are_embedded(self) -> None:
+        embedding = CountingEmbedding(embedding_model_name='model_1', calls=[],
+                                      embedding_cache={'max_size': 100})
+        self.assertEqual([[1.0, 0.5], [2.0, 0.5]], embedding.get_embeddings(['a', 'bb']))
+        res = embedding.get_embeddings(['ccc', 'a', 'ccc', 'bb'])
+        self.assertEqual([[3.0, 0.5], [1.0, 0.5], [3.0, 0.5], [2.0, 0.5]], res)
+        self.assertEqual([['a', 'bb'], ['ccc']], embedding.calls)
+
+        res = asyncio.run(embedding.async_get_embeddings(texts=['a', 'dddd']))
+        self.assertEqual([[1.0, 0.5], [4.0, 0.5]], res)
+        self.assertEqual(['dddd'], embedding.calls[-1])
+
+        # Request options and model identity are part of the key.
+        embedding.get_embeddings(['a'], text_type='query')
+        other = CountingEmbedding(embedding_model_name='model_2', calls=[],
+                                  embedding_cache={'max_size': 100})
+        other.get_embeddings(['a'])
+        self.assertEqual(['a'], embedding.calls[-1])
+        self.assertEqual([['a']], other.calls)
+
+    def test_persistent_tier(self) -> None:
+        config = {'max_size': 100, 'persist_path': self.persist_path}
+        embedding = CountingEmbedding(embedding_model_name='model', calls=[],
+                                      embedding_cache=config)
+        embedding.get_embeddings(['hello', 'world'])
+        embedding.get_embedding_cache()._lru.clear()
+
+        fresh_cache = EmbeddingCache(max_size=1, persist_path=self.persist_path)
+        namespace = embedding.get_cache_namespace()
+        keys = [EmbeddingCache.make_key(namespace, text) for text in ['hello', 'world']]
+        self.assertEqual({keys[0]: [5.0, 0.5], keys[1]: [5.0, 0.5]},
+                         fresh_cache.get_many(keys))
+        self.assertEqual(1, len(fresh_cache._lru))
+
+        embedding.get_embeddings(['world'])
+        self.assertEqual([['hello', 'world']], embedding.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
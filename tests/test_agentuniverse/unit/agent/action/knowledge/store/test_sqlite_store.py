@@ -0,0 +1,139 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 10:05
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: test_sqlite_store.py
+import math
+import os
+import sqlite3
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import jieba
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.sqlite_store import SQLiteStore
+
+
+def extract_keywords(document: Document):
+    document.keywords.update(word for word in jieba.lcut(document.text)
+                             if word.strip())
+    return document.keywords
+
+
+def reference_bm25(query_text, doc_text, inverted_index, total_doc_count,
+                   total_word_count, k1=1.5, b=0.75):
+    """The per document BM25 the store computed before the postings."""
+    doc_words = jieba.lcut(doc_text)
+    avg_doc_length = total_word_count / total_doc_count
+    doc_counter = Counter(doc_words)
+    bm25_score = 0
+    for term in jieba.lcut(query_text):
+        if term in inverted_index:
+            term_freq = doc_counter[term]
+            num_docs_with_term = len(inverted_index[term])
+            idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (
+                    num_docs_with_term + 0.5) + 1)
+            bm25_score += idf * (term_freq * (k1 + 1)) / (
+                    term_freq + k1 * (1 - b + b * (len(doc_words) / avg_doc_length)))
+    return bm25_score
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    """
+    Test cases for the inverted index of SQLiteStore
+    """
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SQLiteStore(
+            db_path=os.path.join(self.tmp_dir.name, 'test.db'),
+            keyword_extractor='test_keyword_extractor')
+        self.patcher = mock.patch.object(SQLiteStore, '_get_document_keyword',
+                                         side_effect=extract_keywords)
+        self.patcher.start()
+        self.store._new_client()
+        self.documents = [Document(text='apple banana apple'),
+                          Document(text='banana cherry'),
+                          Document(text='cherry durian durian durian'),
+                          Document(text='elderberry fig')]
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.store.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_query_matches_reference_bm25(self) -> None:
+        self.store.insert_document(self.documents)
+        query = Query(query_str='apple cherry', similarity_top_k=10)
+        results = self.store.query(query)
+
+        total_doc_count = self.store._get_all_docs_count()
+        total_word_count = self.store._get_all_docs_words_count()
+        inverted_index = {}
+        for term in query.keywords:
+            inverted_index[term] = [document.id for document in self.documents
+                                    if term in jieba.lcut(document.text)]
+        expected = sorted(
+            [(document.id, reference_bm25(
+                query.query_str, document.text, inverted_index,
+                total_doc_count, total_word_count, self.store.k1, self.store.b))
+             for document in self.documents[:3]],
+            key=lambda x: x[1], reverse=True)
+        self.assertEqual([doc_id for doc_id, _ in expected],
+                         [document.id for document in results])
+
+        query = Query(query_str='apple cherry', similarity_top_k=1)
+        self.assertEqual([expected[0][0]],
+                         [document.id for document in self.store.query(query)])
+
+    def test_corpus_stats_follow_writes(self) -> None:
+        self.store.insert_document(self.documents)
+        word_count = sum(len(jieba.lcut(document.text))
+                         for document in self.documents)
+        self.assertEqual(4, self.store._get_all_docs_count())
+        self.assertEqual(word_count, self.store._get_all_docs_words_count())
+
+        self.store.upsert_document(self.documents[:1])
+        self.assertEqual(4, self.store._get_all_docs_count())
+        self.assertEqual(word_count, self.store._get_all_docs_words_count())
+
+        self.store.delete_document(self.documents[2].id)
+        self.assertEqual(3, self.store._get_all_docs_count())
+        self.assertEqual(
+            word_count - len(jieba.lcut(self.documents[2].text)),
+            self.store._get_all_docs_words_count())
+        self.assertEqual([], self.store.query(Query(query_str='durian')))
+
+    def test_migrate_legacy_index(self) -> None:
+        self.store.conn.close()
+        db_path = os.path.join(self.tmp_dir.name, 'legacy.db')
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute('CREATE TABLE documents (id TEXT PRIMARY KEY, '
+                         'text TEXT, word_count INT, metadata TEXT)')
+            conn.execute('CREATE TABLE inverted_index (term TEXT, doc_id TEXT)')
+            for document in self.documents:
+                conn.execute('INSERT INTO documents VALUES (?, ?, ?, ?)',
+                             (document.id, document.text,
+                              len(jieba.lcut(document.text)), None))
+                for term in extract_keywords(document):
+                    conn.execute('INSERT INTO inverted_index VALUES (?, ?)',
+                                 (term, document.id))
+        conn.close()
+
+        self.store.db_path = db_path
+        self.store._new_client()
+        self.assertEqual(4, self.store._get_all_docs_count())
+        results = self.store.query(Query(query_str='durian'))
+        self.assertEqual([self.documents[2].id],
+                         [document.id for document in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
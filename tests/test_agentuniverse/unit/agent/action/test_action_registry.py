@@ -0,0 +1,115 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 18:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_action_registry.py
+import unittest
+from unittest import mock
+
+from langchain.tools import Tool as LangchainTool
+
+from agentuniverse.agent.action.action_registry import clear_compiled_actions, get_compiled_actions, \
+    _rendered_actions
+
+
+class MockTool:
+    def __init__(self, name: str, convert_count: list = None):
+        self.name = name
+        # shared by the copies of the tool.
+        self.convert_count = convert_count if convert_count is not None else [0]
+
+    def as_langchain(self) -> LangchainTool:
+        self.convert_count[0] += 1
+        return LangchainTool(name=self.name, func=lambda x: x, description=f'{self.name} description')
+
+    as_langchain_tool = as_langchain
+
+    def create_copy(self) -> 'MockTool':
+        return MockTool(self.name, self.convert_count)
+
+
+class MockManager:
+    def __init__(self, instances: dict):
+        self.instances = instances
+        self.version = 0
+        self.lookup_count = 0
+        self.copy_count = 0
+
+    def get_instance_obj(self, name: str, new_instance: bool = True):
+        self.lookup_count += 1
+        instance = self.instances.get(name)
+        if new_instance and instance:
+            self.copy_count += 1
+            return instance.create_copy()
+        return instance
+
+
+class ActionRegistryTest(unittest.TestCase):
+    """
+    Test cases for the compiled agent action registry
+    """
+
+    def setUp(self) -> None:
+        self.tool_manager = MockManager({'tool_a': MockTool('tool_a'), 'tool_b': MockTool('tool_b')})
+        self.knowledge_manager = MockManager({'knowledge_a': MockTool('knowledge_a')})
+        self.agent_manager = MockManager({'agent_a': MockTool('agent_a')})
+        for name, manager in (('ToolManager', self.tool_manager),
+                              ('KnowledgeManager', self.knowledge_manager),
+                              ('AgentManager', self.agent_manager)):
+            mock.patch(f'agentuniverse.agent.action.action_registry.{name}', return_value=manager).start()
+        self.addCleanup(mock.patch.stopall)
+        clear_compiled_actions()
+
+    def compile(self):
+        return get_compiled_actions(tool_names=['tool_a', 'missing_tool', 'tool_b'],
+                                    knowledge_names=['knowledge_a'],
+                                    agent_names=['agent_a'])
+
+    def test_compile(self) -> None:
+        compiled = self.compile()
+        self.assertEqual(['tool_a', 'tool_b'], list(compiled.tools.keys()))
+        self.assertEqual(['tool_a', 'tool_b', 'knowledge_a', 'agent_a'],
+                         [lc_tool.name for lc_tool in compiled.lc_tools])
+        self.assertEqual('tool_a|tool_b|knowledge_a|agent_a', compiled.tool_names)
+        self.assertEqual('tool_a: tool_a description\ntool_b: tool_b description\n'
+                         'knowledge_a: knowledge_a description\nagent_a: agent_a description\n',
+                         compiled.tools_description("{name}: {description}\n"))
+
+    def test_rendered_once(self) -> None:
+        for _ in range(10):
+            compiled = self.compile()
+            self.assertEqual('tool_a|tool_b|knowledge_a|agent_a', compiled.tool_names)
+            self.assertEqual(4, len(compiled.tools_description("{name}: {description}\n").splitlines()))
+        # rendered from the registered instances once, without copying them.
+        self.assertEqual(3, self.tool_manager.lookup_count)
+        self.assertEqual(0, self.tool_manager.copy_count)
+        self.assertEqual(1, self.tool_manager.instances['tool_a'].convert_count[0])
+
+    def test_components_are_copied_per_request(self) -> None:
+        first, second = self.compile(), self.compile()
+        self.assertIsNot(first.agents['agent_a'], second.agents['agent_a'])
+        self.assertIsNot(self.agent_manager.instances['agent_a'], first.agents['agent_a'])
+        self.assertIsNot(first.tools['tool_a'], second.tools['tool_a'])
+        self.assertIs(first.tools['tool_a'], first.tools['tool_a'])
+        self.assertEqual(['tool_a', 'tool_b', 'knowledge_a', 'agent_a'], [lc_tool.name for lc_tool in second.lc_tools])
+
+    def test_invalidated_on_registration(self) -> None:
+        self.assertEqual('tool_a|tool_b|knowledge_a|agent_a', self.compile().tool_names)
+        self.knowledge_manager.instances['knowledge_b'] = MockTool('knowledge_b')
+        self.knowledge_manager.version += 1
+        compiled = get_compiled_actions(tool_names=['tool_a', 'missing_tool', 'tool_b'],
+                                        knowledge_names=['knowledge_a', 'knowledge_b'], agent_names=['agent_a'])
+        self.assertEqual('tool_a|tool_b|knowledge_a|knowledge_b|agent_a', compiled.tool_names)
+        self.assertEqual(2, self.tool_manager.instances['tool_a'].convert_count[0])
+
+    def test_registry_is_bounded(self) -> None:
+        with mock.patch('agentuniverse.agent.action.action_registry.MAX_RENDERED_ACTIONS', 2):
+            for name in ('tool_a', 'tool_b', 'tool_a', 'missing_tool'):
+                get_compiled_actions(tool_names=[name]).tool_names
+            self.assertEqual([(('tool_a',), (), ()), (('missing_tool',), (), ())], list(_rendered_actions))
+
+
+if __name__ == '__main__':
+    unittest.main()
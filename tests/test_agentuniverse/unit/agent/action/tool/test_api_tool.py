@@ -0,0 +1,123 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 12:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_api_tool.py
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agentuniverse.agent.action.tool.api_tool import APITool
+from agentuniverse.agent.action.tool.tool import ToolInput
+from agentuniverse.agent.action.tool.utils import ssrf_proxy
+
+REQUEST_COUNT = 100
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echoes the request back and counts the connections it was sent on."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = set()
+
+    def do_POST(self):
+        EchoHandler.connections.add(self.client_address)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        data = json.dumps({'path': self.path, 'body': json.loads(body or b'{}'),
+                           'token': self.headers.get('X-Token')}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def openapi_spec(url: str) -> dict:
+    return {
+        'url': url + '/items/{item_id}',
+        'method': 'post',
+        'operation': {
+            'operationId': 'create_item',
+            'parameters': [
+                {'name': 'item_id', 'in': 'path', 'required': True, 'schema': {'type': 'string'}},
+                {'name': 'verbose', 'in': 'query', 'schema': {'type': 'boolean'}},
+                {'name': 'X-Token', 'in': 'header', 'schema': {'type': 'string'}},
+            ]
+        },
+        'requestBody': {
+            'content': {
+                'application/json': {
+                    'schema': {
+                        'required': ['name'],
+                        'properties': {
+                            'name': {'type': 'string'},
+                            'count': {'type': 'integer', 'default': 1},
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+class APIToolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.tool = APITool(name='create_item', description='create an item',
+                            openapi_spec=openapi_spec(self.url))
+        EchoHandler.connections = set()
+
+    def test_execute(self):
+        result = json.loads(self.tool.execute(ToolInput({'item_id': 'a1', 'verbose': True,
+                                                         'X-Token': 'secret', 'name': 'apple'})))
+        self.assertEqual('/items/a1?verbose=true', result['path'])
+        self.assertEqual({'name': 'apple', 'count': 1}, result['body'])
+        self.assertEqual('secret', result['token'])
+
+        with self.assertRaisesRegex(Exception, 'Missing required parameter name in operation create_item'):
+            self.tool.execute(ToolInput({'item_id': 'a1'}))
+        with self.assertRaises(ValueError):
+            self.tool.do_http_request(self.url, 'options', {}, {})
+
+    def test_headers_are_not_shared(self):
+        headers = {}
+        self.tool.do_http_request(self.tool.openapi_spec['url'], 'post', headers,
+                                  {'item_id': 'a1', 'X-Token': 'secret', 'name': 'apple'})
+        self.assertEqual({}, headers)
+
+    def test_operation_compiled_once(self):
+        compiled = self.tool.compiled_operation()
+        self.tool.execute(ToolInput({'item_id': 'a1', 'name': 'apple'}))
+        self.assertIs(compiled, self.tool.compiled_operation())
+        self.assertIs(compiled, self.tool.create_copy().compiled_operation())
+
+        self.tool.openapi_spec = openapi_spec(self.url)
+        self.assertIsNot(compiled, self.tool.compiled_operation())
+
+    def test_calls_reuse_pooled_connections(self):
+        tool_input = ToolInput({'item_id': 'a1', 'name': 'apple'})
+        for _ in range(REQUEST_COUNT):
+            self.tool.execute(tool_input)
+        self.assertEqual(1, len(EchoHandler.connections))
+        self.assertIs(ssrf_proxy.get_client(), ssrf_proxy.get_client())
+
+
+if __name__ == '__main__':
+    unittest.main()
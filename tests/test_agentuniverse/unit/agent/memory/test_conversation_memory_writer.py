@@ -0,0 +1,152 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 18:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_conversation_memory_writer.py
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_module import ConversationMemoryModule
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_writer import ConversationMemoryWriter
+
+MODULE = 'agentuniverse.agent.memory.conversation_memory.conversation_memory_module'
+
+
+class RecordingWrite:
+    """Records the groups written, optionally held until released."""
+
+    def __init__(self, hold: bool = False):
+        self.groups = []
+        self.released = threading.Event()
+        if not hold:
+            self.released.set()
+
+    def __call__(self, memory_name: str, session_id: str, messages: list):
+        self.released.wait()
+        self.groups.append((memory_name, session_id, list(messages)))
+
+
+def event(*writes):
+    return lambda: list(writes)
+
+
+class ConversationMemoryWriterTest(unittest.TestCase):
+
+    def test_events_are_written_in_groups(self):
+        write = RecordingWrite()
+        writer = ConversationMemoryWriter(write, batch_size=100, flush_interval=0.05)
+        for i in range(10):
+            writer.submit(event(('global_memory', 's1', f'm{i}'), ('agent_memory', 's1', f'm{i}')))
+        writer.submit(event(('global_memory', 's2', 'other session')))
+        writer.submit(lambda: 1 / 0)
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual([('global_memory', 's1', [f'm{i}' for i in range(10)]),
+                          ('agent_memory', 's1', [f'm{i}' for i in range(10)]),
+                          ('global_memory', 's2', ['other session'])], sorted(write.groups, key=lambda g: g[1]))
+        metrics = writer.get_metrics()
+        self.assertEqual(21, metrics['written'])
+        self.assertEqual(1, metrics['batches'])
+        self.assertEqual(0, metrics['queue_depth'])
+        self.assertGreater(metrics['last_flush_latency'], 0)
+
+    def test_drop_oldest(self):
+        write = RecordingWrite(hold=True)
+        writer = ConversationMemoryWriter(write, max_queue_size=5, batch_size=1, flush_interval=0)
+        writer.submit(event(('memory', 's1', 'in flight')))
+        self.assertTrue(wait_until(lambda: writer.get_metrics()['queue_depth'] == 0))
+        for i in range(8):
+            self.assertTrue(writer.submit(event(('memory', 's1', i))))
+        self.assertEqual(5, writer.get_metrics()['queue_depth'])
+        self.assertEqual(3, writer.get_metrics()['dropped'])
+
+        write.released.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(['in flight', 3, 4, 5, 6, 7], [group[2][0] for group in write.groups])
+
+    def test_block_with_timeout(self):
+        write = RecordingWrite(hold=True)
+        writer = ConversationMemoryWriter(write, max_queue_size=2, batch_size=1, flush_interval=0,
+                                          backpressure='block', block_timeout=0.05)
+        for i in range(3):
+            writer.submit(event(('memory', 's1', i)))
+        self.assertFalse(writer.submit(event(('memory', 's1', 'late'))))
+        self.assertEqual(2, writer.get_metrics()['queue_depth'])
+
+        # A producer blocked on a full queue gets in once the writer catches up.
+        threading.Timer(0.05, write.released.set).start()
+        writer.block_timeout = 5
+        self.assertTrue(writer.submit(event(('memory', 's1', 'waited'))))
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual([0, 1, 2, 'waited'], [group[2][0] for group in write.groups])
+
+    def test_sample(self):
+        write = RecordingWrite(hold=True)
+        writer = ConversationMemoryWriter(write, max_queue_size=10, batch_size=1, flush_interval=0,
+                                          backpressure='sample', sample_rate=0)
+        writer.submit(event(('memory', 's1', 'in flight')))
+        self.assertTrue(wait_until(lambda: writer.get_metrics()['queue_depth'] == 0))
+        accepted = [writer.submit(event(('memory', 's1', i))) for i in range(10)]
+        self.assertEqual([True] * 5 + [False] * 5, accepted)
+        write.released.set()
+        self.assertTrue(writer.flush(timeout=5))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            ConversationMemoryWriter(RecordingWrite(), backpressure='drop_newest')
+
+    def test_capture_does_not_wait_for_writes(self):
+        write = RecordingWrite(hold=True)
+        writer = ConversationMemoryWriter(write, max_queue_size=1000, batch_size=50, flush_interval=0)
+        # every event is accepted while the first write is still held.
+        self.assertTrue(all(writer.submit(event(('memory', f's{i % 5}', i))) for i in range(500)))
+        self.assertEqual([], write.groups)
+
+        write.released.set()
+        self.assertTrue(writer.flush(timeout=10))
+        metrics = writer.get_metrics()
+        self.assertEqual(500, metrics['written'])
+        self.assertEqual(0, metrics['dropped'])
+        self.assertLess(metrics['batches'], 500)
+
+
+class ConversationMemoryModuleTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app_config_manager = mock.patch(f'{MODULE}.ApplicationConfigManager').start()
+        app_config_manager.return_value.app_configer.conversation_memory_configer = {
+            'activate': True, 'instance_name': 'global_memory', 'collection_types': ['tool'],
+            'flush_interval': 0}
+        agent_manager = mock.patch(f'{MODULE}.AgentManager').start()
+        agent_manager.return_value.get_instance_obj.return_value = None
+        self.memory = mock.Mock()
+        memory_manager = mock.patch(f'{MODULE}.MemoryManager').start()
+        memory_manager.return_value.get_instance_obj.return_value = self.memory
+        self.addCleanup(mock.patch.stopall)
+
+    def test_tool_trace_is_written(self):
+        module = ConversationMemoryModule.__wrapped__()
+        module.add_tool_input_info({'source': 'demo_agent', 'type': 'agent'}, 'search_tool',
+                                   {'input': 'weather'}, 'pair', auto=False)
+        self.assertTrue(module.flush(timeout=5))
+        messages = self.memory.add.call_args.args[0]
+        self.assertEqual(['weather'], [message.content for message in messages])
+        self.assertEqual('search_tool', messages[0].target)
+        self.assertEqual(1, module.get_writer_metrics()['written'])
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+if __name__ == '__main__':
+    unittest.main()
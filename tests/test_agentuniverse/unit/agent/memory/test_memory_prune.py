@@ -0,0 +1,103 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 15:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_memory_prune.py
+import unittest
+from unittest import mock
+
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.util.memory_util import get_memory_tokens
+from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_manager import LLMManager
+
+
+APPNAME = 'test_app'
+# Calls of the tokenizer, shared by the copies the llm manager hands out.
+TOKENIZER_CALLS = []
+
+
+class CountingLLM(LLM):
+    """Counts words, and how often it is asked to."""
+
+    def _call(self, *args, **kwargs):
+        pass
+
+    async def _acall(self, *args, **kwargs):
+        pass
+
+    def get_num_tokens(self, text: str) -> int:
+        TOKENIZER_CALLS.append(text)
+        return len(text.split())
+
+
+def history(size: int) -> list:
+    return [Message(type='human' if i % 2 == 0 else 'ai', source='chat',
+                    content=f'message {i} ' + 'lorem ipsum ' * (i % 7)) for i in range(size)]
+
+
+def quadratic_prune(memories: list, max_tokens: int, llm_name: str = None) -> list:
+    """The prune before per message token counts, which tokenizes the whole rest of
+    the history again for every message it drops."""
+    new_memories = memories[:]
+    tokens = get_memory_tokens(new_memories, llm_name)
+    while tokens > max_tokens:
+        new_memories.pop(0)
+        tokens = get_memory_tokens(new_memories, llm_name)
+    return new_memories
+
+
+class MemoryPruneTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.memory = Memory(name='test_memory')
+        for module in ('agentuniverse.base.component.component_manager_base', 'agentuniverse.llm.llm_manager'):
+            app_config_manager = mock.patch(f'{module}.ApplicationConfigManager').start()
+            app_config_manager.return_value.app_configer.base_info_appname = APPNAME
+        self.addCleanup(mock.patch.stopall)
+        LLMManager().register(f'{APPNAME}.llm.counting_llm', CountingLLM(name='counting_llm'))
+        self.addCleanup(LLMManager().unregister, f'{APPNAME}.llm.counting_llm')
+        TOKENIZER_CALLS.clear()
+
+    def test_prune_matches_quadratic_prune(self):
+        messages = history(60)
+        for max_tokens in (0, 10, 500, 1000, 3000, 100000):
+            self.memory.max_tokens = max_tokens
+            self.assertEqual(quadratic_prune(messages, max_tokens), self.memory.prune(messages))
+
+    def test_message_tokens_are_counted_once(self):
+        self.memory.agent_llm_name = 'counting_llm'
+        self.memory.max_tokens = 200
+        messages = history(100)
+        pruned = self.memory.prune(messages)
+        self.assertLessEqual(get_memory_tokens(pruned, 'counting_llm'), 200)
+        TOKENIZER_CALLS.clear()
+        self.memory.prune(messages)
+        # Only the separator is tokenized again.
+        self.assertEqual(1, len(TOKENIZER_CALLS))
+
+        # A message whose content changed is counted again.
+        messages[-1].content = 'changed'
+        TOKENIZER_CALLS.clear()
+        self.memory.prune(messages)
+        self.assertEqual(2, len(TOKENIZER_CALLS))
+
+    def test_long_history_is_tokenized_once(self):
+        self.memory.agent_llm_name = 'counting_llm'
+        self.memory.max_tokens = 200
+        messages = history(1000)
+        expected = quadratic_prune(messages, 200, 'counting_llm')
+        quadratic_chars = sum(len(text) for text in TOKENIZER_CALLS)
+
+        TOKENIZER_CALLS.clear()
+        self.assertEqual(expected, self.memory.prune(messages))
+        linear_chars = sum(len(text) for text in TOKENIZER_CALLS)
+        self.assertEqual(len(messages) + 1, len(TOKENIZER_CALLS))
+        self.assertLess(linear_chars * 100, quadratic_chars)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 17:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_ram_memory_storage.py
+import datetime
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from agentuniverse.agent.memory.memory_storage.ram_memory_storage import RamMemoryStorage
+from agentuniverse.agent.memory.message import Message
+
+
+def contents(messages: list) -> list:
+    return [message.content for message in messages]
+
+
+class RamMemoryStorageTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_unbounded_by_default(self):
+        storage = RamMemoryStorage(name='ram_memory_storage')
+        storage.add([Message(content=str(i)) for i in range(50)], session_id='s1', agent_id='agent')
+        self.assertEqual([str(i) for i in range(40, 50)], contents(storage.get(session_id='s1', agent_id='agent')))
+        self.assertEqual(50, len(storage.get(session_id='s1', agent_id='agent', top_k=0)))
+        self.assertEqual([], storage.get(session_id='unknown', agent_id='agent'))
+        # Instances do not share their messages.
+        self.assertEqual([], RamMemoryStorage(name='other').get(session_id='s1', agent_id='agent'))
+
+        storage.delete(session_id='s1', agent_id='agent')
+        self.assertEqual([], storage.get(session_id='s1', agent_id='agent'))
+
+    def test_message_cap(self):
+        storage = RamMemoryStorage(name='ram_memory_storage', max_messages_per_session=5)
+        storage.add([Message(content=str(i)) for i in range(8)], session_id='s1', agent_id='agent')
+        storage.add([Message(content='8')], session_id='s1', agent_id='agent')
+        self.assertEqual(['4', '5', '6', '7', '8'], contents(storage.get(session_id='s1', agent_id='agent', top_k=0)))
+        self.assertEqual(['7', '8'], contents(storage.get(session_id='s1', agent_id='agent', top_k=2)))
+
+    def test_lru_eviction_and_spill(self):
+        storage = RamMemoryStorage(name='ram_memory_storage', max_sessions=2,
+                                   spill_path=str(Path(self.tmp_dir.name) / 'spill.db'))
+        for session_id in ('s1', 's2'):
+            storage.add([Message(content=session_id, source='chat')], session_id=session_id, agent_id='agent')
+        # s1 is used again, so s2 is the least recently used one when s3 comes in.
+        storage.get(session_id='s1', agent_id='agent')
+        storage.add([Message(content='s3')], session_id='s3', agent_id='agent')
+        self.assertEqual(['s1', 's3'], list(storage.messages.keys()))
+
+        # An evicted session comes back from the spill file.
+        restored = storage.get(session_id='s2', agent_id='agent')
+        self.assertEqual(['s2'], contents(restored))
+        self.assertEqual('chat', restored[0].source)
+        self.assertEqual(['s3', 's2'], list(storage.messages.keys()))
+
+        # A deleted session is gone from the spill file too.
+        storage.delete(session_id='s3')
+        storage.add([Message(content='s4')], session_id='s4', agent_id='agent')
+        storage.delete(session_id='s2')
+        self.assertEqual([], storage.get(session_id='s2', agent_id='agent'))
+
+        storage = RamMemoryStorage(name='ram_memory_storage', max_sessions=1)
+        storage.add([Message(content='s1')], session_id='s1', agent_id='agent')
+        storage.add([Message(content='s2')], session_id='s2', agent_id='agent')
+        self.assertEqual([], storage.get(session_id='s1', agent_id='agent'))
+
+    def test_idle_sessions_expire(self):
+        storage = RamMemoryStorage(name='ram_memory_storage', session_ttl=0.05)
+        storage.add([Message(content='s1')], session_id='s1', agent_id='agent')
+        time.sleep(0.1)
+        storage.add([Message(content='s2')], session_id='s2', agent_id='agent')
+        self.assertEqual(['s2'], list(storage.messages.keys()))
+        self.assertEqual([], storage.get(session_id='s1', agent_id='agent'))
+
+    def test_given_messages_keep_lru_order(self):
+        storage = RamMemoryStorage(name='ram_memory_storage', max_sessions=2, max_messages_per_session=2,
+                                   messages={'s1': {'agent': [Message(content=str(i)) for i in range(3)]},
+                                             's2': {'agent': [Message(content='s2')]}})
+        self.assertEqual(['1', '2'], contents(storage.get(session_id='s1', agent_id='agent')))
+        storage.add([Message(content='s3')], session_id='s3', agent_id='agent')
+        self.assertEqual(['s1', 's3'], list(storage.messages.keys()))
+
+    def test_recent_reads_of_a_large_session(self):
+        storage = RamMemoryStorage(name='ram_memory_storage')
+        storage.add([Message(content=str(i)) for i in range(100000)], session_id='large', agent_id='agent')
+        self.assertEqual([str(i) for i in range(99990, 100000)],
+                         contents(storage.get(session_id='large', agent_id='agent', top_k=10)))
+
+    def test_spill_agent_messages(self):
+        storage = RamMemoryStorage(name='ram_memory_storage', max_sessions=1,
+                                   spill_path=str(Path(self.tmp_dir.name) / 'spill.db'))
+        now = datetime.datetime(2026, 10, 18, 12, 30)
+        for session_id in ('s1', 's2'):
+            # the metadata `Agent.add_memory` writes.
+            storage.add([Message(content=session_id, source='agent', type='Q&A',
+                                 metadata={'agent_id': 'agent', 'session_id': session_id, 'type': 'Q&A',
+                                           'timestamp': now, 'gmt_created': now.isoformat()})],
+                        session_id=session_id, agent_id='agent')
+        self.assertEqual(['s2'], list(storage.messages.keys()))
+        self.assertEqual(['s2'], contents(storage.get(session_id='s2', agent_id='agent')))
+        restored = storage.get(session_id='s1', agent_id='agent')
+        self.assertEqual(['s1'], contents(restored))
+        self.assertEqual({'agent_id': 'agent', 'session_id': 's1', 'type': 'Q&A',
+                          'timestamp': '2026-10-18T12:30:00', 'gmt_created': '2026-10-18T12:30:00'},
+                         restored[0].metadata)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 16:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_sql_alchemy_memory_storage.py
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import inspect
+
+from agentuniverse.agent.memory.memory_storage.sql_alchemy_memory_storage import SqlAlchemyMemoryStorage, \
+    DefaultMemoryConverter
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.config.component_configer.configers.sqldb_wrapper_config import SQLDBWrapperConfiger
+from agentuniverse.database.sqldb_wrapper import SQLDBWrapper
+
+
+def create_storage(db_path: str, converter: DefaultMemoryConverter = None) -> SqlAlchemyMemoryStorage:
+    configer = SQLDBWrapperConfiger()
+    configer.db_uri = f'sqlite:///{db_path}'
+    storage = SqlAlchemyMemoryStorage(name='sql_memory_storage',
+                                      memory_converter=converter or DefaultMemoryConverter('memory'))
+    storage._sqldb_wrapper = SQLDBWrapper(name='memory_db', db_wrapper_configer=configer)
+    storage._create_table_if_not_exists()
+    return storage
+
+
+class SqlAlchemyMemoryStorageTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_path = str(Path(self.tmp_dir.name) / 'memory.db')
+        self.storage = create_storage(self.db_path)
+
+    def test_get_latest_messages_in_order(self):
+        self.storage.add([Message(content=f'message {i}', source='chat') for i in range(20)], session_id='s1',
+                         agent_id='agent')
+        self.storage.add([Message(content='other session')], session_id='s2', agent_id='agent')
+
+        messages = self.storage.get(session_id='s1', agent_id='agent', top_k=5)
+        self.assertEqual([f'message {i}' for i in range(15, 20)], [message.content for message in messages])
+        self.assertEqual(20, len(self.storage.get(session_id='s1', top_k=0)))
+        self.assertEqual(['other session'], [message.content for message in self.storage.get(session_id='s2')])
+        self.assertEqual([], self.storage.get(session_id='s1', source='other'))
+
+    def test_indexes_are_added_to_existing_tables(self):
+        index_name = 'idx_memory_session_agent_created'
+        with self.storage._sqldb_wrapper.sql_database._engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP INDEX {index_name}')
+        storage = create_storage(self.db_path)
+        with storage._sqldb_wrapper.sql_database._engine.connect() as conn:
+            self.assertIn(index_name, {index['name'] for index in inspect(conn).get_indexes('memory')})
+
+
+if __name__ == '__main__':
+    unittest.main()
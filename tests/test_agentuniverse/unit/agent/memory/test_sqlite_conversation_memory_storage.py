@@ -0,0 +1,75 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 17:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_sqlite_conversation_memory_storage.py
+import datetime
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
+from agentuniverse.agent.memory.conversation_memory.memory_storage.sqlite_conversation_memory_storage import \
+    SqliteMemoryStorage, DefaultMemoryConverter
+
+
+def create_storage(db_path: str) -> SqliteMemoryStorage:
+    storage = SqliteMemoryStorage(name='sqlite_memory_storage', sqldb_path=f'sqlite:///{db_path}',
+                                  memory_converter=DefaultMemoryConverter('memory'))
+    storage._new_client()
+    return storage
+
+
+def conversation(size: int, start: datetime.datetime) -> list:
+    messages = []
+    for i in range(size):
+        messages.append(ConversationMessage(
+            id=uuid.uuid4().hex, content=f'message {i} ' + 'lorem ipsum ' * 20, type='input', trace_id='trace',
+            source='user', source_type='user', target='demo_agent', target_type='agent',
+            metadata={'prefix': '', 'params': '{}', 'timestamp': start + datetime.timedelta(seconds=i)}))
+    return messages
+
+
+class SqliteMemoryStorageTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.storage = create_storage(str(Path(self.tmp_dir.name) / 'memory.db'))
+        self.start = datetime.datetime(2026, 1, 1)
+
+    def test_add_skips_stored_messages(self):
+        messages = conversation(5, self.start)
+        self.storage.add(messages, session_id='s1')
+        # Messages stored before, and repeated ones in the batch, are written once.
+        self.storage.add(messages[3:] + conversation(1, self.start + datetime.timedelta(hours=1)) * 2,
+                         session_id='s1')
+        stored = self.storage.get(session_id='s1', top_k=100)
+        self.assertEqual(6, len(stored))
+        self.assertEqual([message.id for message in messages], [message.id for message in stored[:5]])
+        self.storage.add([], session_id='s1')
+
+    def test_get_latest_messages_in_order(self):
+        self.storage.add(conversation(20, self.start), session_id='s1')
+        self.storage.add(conversation(3, self.start), session_id='s2')
+        latest = self.storage.get(session_id='s1', agent_id='demo_agent', top_k=5)
+        self.assertEqual([str(i) for i in range(15, 20)], [message.content.split()[1] for message in latest])
+        self.assertEqual(3, len(self.storage.get(session_id='s2', top_k=0)))
+        self.assertEqual([], self.storage.get(session_id='s1', agent_id='other_agent'))
+
+    def test_add_skips_stored_messages_on_other_databases(self):
+        messages = conversation(3, self.start)
+        self.storage.add(messages[:1], session_id='s1')
+        # without a conflict clause the stored ids are looked up and repeated ones dropped.
+        with mock.patch.object(self.storage.engine.dialect, 'name', 'generic'):
+            self.storage.add(messages + messages[1:], session_id='s1')
+        stored = self.storage.get(session_id='s1', top_k=100)
+        self.assertEqual([message.id for message in messages], [message.id for message in stored])
+
+
+if __name__ == '__main__':
+    unittest.main()
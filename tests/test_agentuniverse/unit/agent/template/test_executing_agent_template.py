@@ -0,0 +1,143 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_executing_agent_template.py
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.agent.input_object import InputObject
+from agentuniverse.agent.template.executing_agent_template import ExecutingAgentTemplate
+from agentuniverse.llm.llm_rate_limiter import get_llm_rate_limiter
+
+LLM_LATENCY = 0.05
+
+
+class FakeClock:
+    """Stands for the time module of the rate limiter, sleeping moves the clock on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        # a real sleep takes some time, however short the wait.
+        with self._lock:
+            self.now += max(seconds, 1e-6)
+
+
+class MockLLM:
+    def __init__(self, name: str, rate_limit: dict = None):
+        self.name = name
+        self.model_name = name
+        self.rate_limit = rate_limit
+
+
+class MockTool:
+    """Records the input of every call."""
+
+    def __init__(self):
+        self.input_keys = ['query']
+        self.queries = []
+
+    def run(self, query: str) -> str:
+        self.queries.append(query)
+        return f'tool result of {query}'
+
+
+def mock_execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs):
+    get_llm_rate_limiter(llm).call(lambda: None)
+    return {'index': index, 'input': subtask, 'output': subtask}
+
+
+class ExecutingAgentTemplateTest(unittest.TestCase):
+    """
+    Test cases for the executing agent subtask fan-out
+    """
+
+    def run_tasks(self, llm: MockLLM, subtask_count: int, execute_subtask=mock_execute_subtask) -> None:
+        agent = ExecutingAgentTemplate()
+        framework = [f'subtask {i}' for i in range(subtask_count)]
+        with mock.patch.object(ExecutingAgentTemplate, '_execute_subtask', execute_subtask):
+            result = agent._execute_tasks(InputObject({}), {'framework': framework}, None, llm, None)
+        self.assertEqual(framework, [res['input'] for res in result['executing_result']])
+
+    def test_subtasks_run_concurrently(self) -> None:
+        for subtask_count in (1, 2, 5, 10, 20):
+            # every subtask waits for all the others, without a per-subtask stagger.
+            barrier = threading.Barrier(subtask_count)
+
+            def execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs):
+                barrier.wait(timeout=5)
+                return {'index': index, 'input': subtask, 'output': subtask}
+
+            self.run_tasks(MockLLM('unlimited_llm'), subtask_count, execute_subtask)
+
+    def test_fan_out_is_rate_limited(self) -> None:
+        clock = FakeClock()
+        with mock.patch('agentuniverse.llm.llm_rate_limiter.time', clock):
+            self.run_tasks(MockLLM('limited_llm', rate_limit={'qps': 20, 'burst': 1}), 10)
+        # one burst token, then the other 9 calls at 20 per second.
+        self.assertGreaterEqual(clock.now, 9 / 20 - 1e-9)
+
+    def test_subtask_callback_receives_results_as_they_finish(self) -> None:
+        finished = []
+
+        def execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs):
+            time.sleep(LLM_LATENCY * (3 - index))
+            return {'index': index, 'input': subtask, 'output': subtask}
+
+        agent = ExecutingAgentTemplate()
+        framework = [f'subtask {i}' for i in range(3)]
+        with mock.patch.object(ExecutingAgentTemplate, '_execute_subtask', execute_subtask):
+            result = agent._execute_tasks(InputObject({'subtask_callback': finished.append}),
+                                          {'framework': framework}, None, None, None)
+        self.assertEqual([2, 1, 0], [res['index'] for res in finished])
+        self.assertEqual(framework, [res['input'] for res in result['executing_result']])
+
+
+    def test_every_subtask_calls_tools_with_its_own_input(self) -> None:
+        subtask_count = 5
+        tool = MockTool()
+        agent = ExecutingAgentTemplate()
+        agent.agent_model = AgentModel(info={'name': 'executing_agent'}, profile={'llm_model': {'name': 'mock_llm'}},
+                                       action={'tool': ['mock_tool']})
+        agent.tool_names = ['mock_tool']
+        # every subtask has set its tool input before any of them calls the tool.
+        barrier = threading.Barrier(subtask_count)
+        chain_inputs = []
+
+        def invoke_knowledge(query_str, input_object, **kwargs):
+            barrier.wait(timeout=5)
+            return ''
+
+        def invoke_chain(chain, agent_input, input_object, **kwargs):
+            chain_inputs.append(agent_input['background'])
+            return 'answer'
+
+        framework = [f'subtask {i}' for i in range(subtask_count)]
+        actions = mock.Mock(tools={'mock_tool': tool})
+        with mock.patch('agentuniverse.agent.template.executing_agent_template.get_compiled_actions',
+                        return_value=actions), \
+                mock.patch('agentuniverse.agent.agent.get_compiled_actions', return_value=actions), \
+                mock.patch('agentuniverse.agent.template.executing_agent_template.ConversationMemoryModule'), \
+                mock.patch('agentuniverse.agent.template.executing_agent_template.process_llm_token'), \
+                mock.patch.object(ExecutingAgentTemplate, 'invoke_knowledge', side_effect=invoke_knowledge), \
+                mock.patch.object(ExecutingAgentTemplate, 'invoke_chain', side_effect=invoke_chain):
+            agent._execute_tasks(InputObject({'input': 'question'}), {'framework': framework}, None,
+                                 mock.MagicMock(rate_limit=None), mock.MagicMock())
+        self.assertEqual(framework, sorted(tool.queries))
+        self.assertEqual(sorted(f'knowledge result:  \n\n tools result: tool result of {subtask}'
+                                for subtask in framework), sorted(chain_inputs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 17:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_agent_action.py
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from agentuniverse.agent.action.action_registry import clear_compiled_actions
+from agentuniverse.agent.agent import Agent
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.agent.input_object import InputObject
+from agentuniverse.base.util.concurrency_util import ContextThreadPoolExecutor
+
+ACTION_TIMEOUT = 0.3
+
+
+class MockAgent(Agent):
+    def input_keys(self) -> list[str]:
+        return ['input']
+
+    def output_keys(self) -> list[str]:
+        return ['output']
+
+    def parse_input(self, input_object: InputObject, agent_input: dict) -> dict:
+        return agent_input
+
+    def parse_result(self, agent_result: dict) -> dict:
+        return agent_result
+
+
+class MockTool:
+    """Waits until the gate opens, the gate being a barrier of the calls expected to run at once."""
+    input_keys = ['input']
+
+    def __init__(self, name: str, gate, error: bool = False):
+        self.name = name
+        self.gate = gate
+        self.error = error
+
+    def run(self, **kwargs):
+        self.gate.wait(timeout=5)
+        if self.error:
+            raise Exception(f'{self.name} failed')
+        return f"{self.name}: {kwargs['input']}"
+
+
+class MockKnowledge:
+    def __init__(self, name: str, gate):
+        self.name = name
+        self.gate = gate
+
+    def query_knowledge(self, query_str: str, **kwargs):
+        self.gate.wait(timeout=5)
+        return [f'{self.name}: {query_str}']
+
+    def to_llm(self, retrieved_docs):
+        return '\n'.join(retrieved_docs)
+
+
+class AgentActionTest(unittest.TestCase):
+    """
+    Test cases for the concurrent tool and knowledge invocation of agents
+    """
+
+    def setUp(self) -> None:
+        self.agent = MockAgent()
+        self.agent.agent_model = AgentModel(action={
+            'tool': ['tool_a', 'slow_tool', 'tool_b', 'broken_tool', 'missing_tool'],
+            'knowledge': ['knowledge_a', 'knowledge_b', 'knowledge_c'],
+            'timeout': ACTION_TIMEOUT
+        })
+        # the calls only end if they all run at once, the slow tool is released after the test.
+        tool_gate = threading.Barrier(3)
+        slow_tool_gate = threading.Event()
+        self.addCleanup(slow_tool_gate.set)
+        knowledge_gate = threading.Barrier(3)
+        self.tools = tools = {
+            'tool_a': MockTool('tool_a', tool_gate),
+            'tool_b': MockTool('tool_b', tool_gate),
+            'slow_tool': MockTool('slow_tool', slow_tool_gate),
+            'broken_tool': MockTool('broken_tool', tool_gate, error=True)
+        }
+        knowledge = {name: MockKnowledge(name, knowledge_gate)
+                     for name in ('knowledge_a', 'knowledge_b', 'knowledge_c')}
+        tool_manager = mock.patch('agentuniverse.agent.action.action_registry.ToolManager')
+        knowledge_manager = mock.patch('agentuniverse.agent.action.action_registry.KnowledgeManager')
+        tool_manager.start().return_value.get_instance_obj.side_effect = lambda name, **kwargs: tools.get(name)
+        knowledge_manager.start().return_value.get_instance_obj.side_effect = \
+            lambda name, **kwargs: knowledge.get(name)
+        self.addCleanup(mock.patch.stopall)
+        clear_compiled_actions()
+
+    def test_invoke_tools(self) -> None:
+        res = self.agent.invoke_tools(InputObject({'input': 'q'}))
+        # results keep the configured order, the failed, timed out and missing tools are skipped.
+        self.assertEqual('tool_a: q\n\ntool_b: q', res)
+
+    def test_invoke_knowledge(self) -> None:
+        res = self.agent.invoke_knowledge('q', InputObject({}))
+        self.assertEqual('knowledge_a: q\n\nknowledge_b: q\n\nknowledge_c: q', res)
+
+    def test_async_invoke(self) -> None:
+        async def invoke():
+            return await asyncio.gather(self.agent.async_invoke_tools(InputObject({'input': 'q'})),
+                                        self.agent.async_invoke_knowledge('q', InputObject({})))
+
+        tool_res, knowledge_res = asyncio.run(invoke())
+        self.assertEqual('tool_a: q\n\ntool_b: q', tool_res)
+        self.assertEqual('knowledge_a: q\n\nknowledge_b: q\n\nknowledge_c: q', knowledge_res)
+
+    def saturate_pool(self) -> None:
+        """Run the actions in a pool of one worker, held by `held_tool` for 1.5 timeouts."""
+        held = threading.Event()
+        self.addCleanup(held.set)
+        threading.Timer(ACTION_TIMEOUT * 1.5, held.set).start()
+        released = threading.Event()
+        released.set()
+        self.tools['held_tool'] = MockTool('held_tool', held)
+        self.tools['queued_tool'] = MockTool('queued_tool', released)
+        pool = ContextThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown, wait=False)
+        executor = mock.patch('agentuniverse.agent.agent.get_shared_executor', return_value=pool)
+        executor.start()
+
+    def test_timeout_counts_from_the_start_of_a_call(self) -> None:
+        self.saturate_pool()
+        res = self.agent.invoke_tools(InputObject({'input': 'q'}), tool_names=['held_tool', 'queued_tool'])
+        # the held tool times out, the tool queued behind it is not charged for the wait.
+        self.assertEqual('queued_tool: q', res)
+
+    def test_async_timeout_counts_from_the_start_of_a_call(self) -> None:
+        self.saturate_pool()
+        res = asyncio.run(self.agent.async_invoke_tools(InputObject({'input': 'q'}),
+                                                        tool_names=['held_tool', 'queued_tool']))
+        self.assertEqual('queued_tool: q', res)
+
+    def test_empty_action(self) -> None:
+        self.assertEqual('', self.agent.invoke_knowledge('', InputObject({})))
+        self.assertEqual('', self.agent.invoke_tools(InputObject({}), tool_names=['missing_tool']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 20:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_agent_copy.py
+import unittest
+from unittest import mock
+
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.agent.template.rag_agent_template import RagAgentTemplate
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.component.component_manager_base import ComponentManagerBase
+
+APPNAME = 'test_app'
+
+
+class AgentCopyTest(unittest.TestCase):
+    """
+    Test cases of the agent copies handed out by the manager
+    """
+
+    def setUp(self) -> None:
+        app_config_manager = mock.patch(
+            'agentuniverse.base.component.component_manager_base.ApplicationConfigManager').start()
+        app_config_manager.return_value.app_configer.base_info_appname = APPNAME
+        self.addCleanup(mock.patch.stopall)
+        self.agent = RagAgentTemplate()
+        self.agent.agent_model = AgentModel(
+            info={'name': 'demo_agent', 'description': 'demo agent'},
+            profile={'introduction': 'introduction ' * 20, 'target': 'target ' * 20,
+                     'instruction': 'instruction ' * 80,
+                     'llm_model': {'name': 'demo_llm', 'temperature': 0.1, 'stop': ['Observation']}},
+            plan={'planner': {'name': 'rag_planner'}},
+            memory={'name': 'demo_memory'},
+            action={'tool': ['tool_a', 'tool_b'], 'knowledge': ['knowledge_a']})
+        self.agent.tool_names = ['tool_a', 'tool_b']
+        self.agent.knowledge_names = ['knowledge_a']
+        self.manager = ComponentManagerBase(ComponentEnum.AGENT)
+        self.manager.register(f'{APPNAME}.agent.demo_agent', self.agent)
+
+    def test_copy_is_isolated(self) -> None:
+        copied = self.manager.get_instance_obj('demo_agent')
+        copied.agent_model.profile['llm_model']['name'] = 'other_llm'
+        copied.agent_model.profile['llm_model']['stop'].append('Final Answer')
+        copied.agent_model.action['tool'].append('tool_c')
+        copied.tool_names.append('tool_c')
+        self.assertEqual({'name': 'demo_llm', 'temperature': 0.1, 'stop': ['Observation']},
+                         self.agent.agent_model.profile['llm_model'])
+        self.assertEqual(['tool_a', 'tool_b'], self.agent.agent_model.action['tool'])
+        self.assertEqual(['tool_a', 'tool_b'], self.agent.tool_names)
+        self.assertEqual(self.agent.agent_model.info, copied.agent_model.info)
+        self.assertIs(self.agent, self.manager.get_instance_obj('demo_agent', new_instance=False))
+
+    def test_copy_shares_only_the_leaves(self) -> None:
+        copied = self.manager.get_instance_obj('demo_agent')
+        for name in ('info', 'profile', 'plan', 'memory', 'action'):
+            self.assertEqual(getattr(self.agent.agent_model, name), getattr(copied.agent_model, name))
+            self.assertIsNot(getattr(self.agent.agent_model, name), getattr(copied.agent_model, name))
+        self.assertIsNot(self.agent.agent_model.profile['llm_model'], copied.agent_model.profile['llm_model'])
+        # the values are not copied, only the containers holding them.
+        self.assertIs(self.agent.agent_model.profile['instruction'], copied.agent_model.profile['instruction'])
+        self.assertIsNot(self.agent, copied)
+
+
+if __name__ == '__main__':
+    unittest.main()
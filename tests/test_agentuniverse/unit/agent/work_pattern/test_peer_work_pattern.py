@@ -0,0 +1,265 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 22:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_peer_work_pattern.py
+import asyncio
+import queue
+import threading
+import time
+import unittest
+from typing import Any, Callable, Optional
+from unittest import mock
+
+from agentuniverse.agent.input_object import InputObject
+from agentuniverse.agent.output_object import OutputObject
+from agentuniverse.agent.template.executing_agent_template import ExecutingAgentTemplate
+from agentuniverse.agent.template.expressing_agent_template import ExpressingAgentTemplate
+from agentuniverse.agent.template.planning_agent_template import PlanningAgentTemplate
+from agentuniverse.agent.template.reviewing_agent_template import ReviewingAgentTemplate
+from agentuniverse.agent.work_pattern.peer_work_pattern import PeerWorkPattern
+from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.concurrency_util import ContextThreadPoolExecutor
+
+LLM_LATENCY = 0.02
+
+
+class MockPlanningAgent(PlanningAgentTemplate):
+    calls: int = 0
+    subtask_count: int = 4
+
+    def run(self, **kwargs) -> OutputObject:
+        self.calls += 1
+        time.sleep(LLM_LATENCY)
+        return OutputObject({'framework': [f'subtask {i}' for i in range(self.subtask_count)]})
+
+    async def async_run(self, **kwargs) -> OutputObject:
+        return await asyncio.to_thread(self.run, **kwargs)
+
+
+class MockExecutingAgent(ExecutingAgentTemplate):
+    """Runs the real subtask fan-out, every subtask sleeps like a llm call.
+
+    The last subtask waits for the `slow_subtask` event when it is given.
+    """
+    calls: int = 0
+    subtask_latency: list = []
+    slow_subtask: Optional[Any] = None
+    finished: list = []
+    stage_done: Optional[Any] = None
+
+    def run(self, **kwargs) -> OutputObject:
+        self.calls += 1
+        input_object = InputObject(kwargs)
+        framework = input_object.get_data('planning_result').get_data('framework')
+        result = self._execute_tasks(input_object, {'framework': framework}, None, None, None)
+        # streams the result like `parse_result` of the template.
+        stream_output(result.pop('output_stream'), {'data': {'output': result['executing_result']},
+                                                    'type': 'executing'})
+        self.stage_done.set()
+        return OutputObject(result)
+
+    async def async_run(self, **kwargs) -> OutputObject:
+        return await asyncio.to_thread(self.run, **kwargs)
+
+    def _execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs) -> dict:
+        if self.slow_subtask is not None and index == len(self.subtask_latency) - 1:
+            self.slow_subtask.wait(5)
+        else:
+            time.sleep(self.subtask_latency[index] if index < len(self.subtask_latency) else LLM_LATENCY)
+        self.finished.append(index)
+        return {'index': index, 'input': subtask, 'output': f'answer of {subtask}'}
+
+
+class MockExpressingAgent(ExpressingAgentTemplate):
+    calls: int = 0
+
+    def run(self, **kwargs) -> OutputObject:
+        self.calls += 1
+        time.sleep(LLM_LATENCY)
+        subtasks = len(kwargs['executing_result'].get_data('executing_result'))
+        return OutputObject({'output': f'answer from {subtasks} subtasks', 'subtasks': subtasks})
+
+    async def async_run(self, **kwargs) -> OutputObject:
+        return await asyncio.to_thread(self.run, **kwargs)
+
+
+class MockReviewingAgent(ReviewingAgentTemplate):
+    """`verdict(call, subtasks)` returns the score and the retry stage of the review."""
+    calls: int = 0
+    verdict: Optional[Callable] = None
+
+    def run(self, **kwargs) -> OutputObject:
+        self.calls += 1
+        time.sleep(LLM_LATENCY)
+        score, retry_stage = self.verdict(self.calls, kwargs['expressing_result'].get_data('subtasks'))
+        return OutputObject({'output': {}, 'score': score, 'suggestion': '', 'retry_stage': retry_stage})
+
+    async def async_run(self, **kwargs) -> OutputObject:
+        return await asyncio.to_thread(self.run, **kwargs)
+
+
+def peer_work_pattern(verdict: Callable, subtask_latency: list = None,
+                      slow_subtask: threading.Event = None) -> PeerWorkPattern:
+    executing = MockExecutingAgent()
+    executing.subtask_latency = subtask_latency or []
+    executing.slow_subtask = slow_subtask
+    executing.stage_done = threading.Event()
+    reviewing = MockReviewingAgent()
+    reviewing.verdict = verdict
+    return PeerWorkPattern().set_by_agent_model(planning=MockPlanningAgent(), executing=executing,
+                                                expressing=MockExpressingAgent(), reviewing=reviewing)
+
+
+def work_pattern_input(**kwargs) -> dict:
+    return {'input': 'question', 'eval_threshold': 60, 'retry_count': 3, 'jump_step': 'expressing', **kwargs}
+
+
+def streamed_types(output_stream: queue.Queue) -> list:
+    types = []
+    while not output_stream.empty():
+        types.append(output_stream.get_nowait()['type'])
+    return types
+
+
+def stage_calls(pattern: PeerWorkPattern) -> dict:
+    return {stage: getattr(pattern, stage).calls for stage in ['planning', 'executing', 'expressing', 'reviewing']}
+
+
+class PeerWorkPatternRetryTest(unittest.TestCase):
+
+    def run_pattern(self, pattern: PeerWorkPattern, **kwargs) -> list:
+        return pattern.invoke(InputObject({'input': 'question'}), work_pattern_input(**kwargs))['result']
+
+    def test_retry_targets_the_stage_suggested_by_review(self):
+        # the first answer is poorly expressed, the second one passes.
+        def suggest_expressing(call, subtasks):
+            return (0, 'expressing') if call == 1 else (80, None)
+
+        def no_suggestion(call, subtasks):
+            return (0, None) if call == 1 else (80, None)
+
+        targeted = peer_work_pattern(suggest_expressing)
+        targeted_rounds = self.run_pattern(targeted, jump_step='planning')
+        legacy = peer_work_pattern(no_suggestion)
+        self.run_pattern(legacy, jump_step='planning')
+
+        self.assertEqual(2, len(targeted_rounds))
+        self.assertEqual({'planning': 1, 'executing': 1, 'expressing': 2, 'reviewing': 2}, stage_calls(targeted))
+        self.assertEqual(['expressing', 'reviewing'], list(targeted_rounds[1]['stage_latency']))
+        self.assertEqual({'planning': 2, 'executing': 2, 'expressing': 2, 'reviewing': 2}, stage_calls(legacy))
+
+    def test_review_can_ask_for_an_earlier_stage(self):
+        pattern = peer_work_pattern(lambda call, subtasks: (0, 'executing') if call == 1 else (80, None))
+        rounds = self.run_pattern(pattern)
+        self.assertEqual({'planning': 1, 'executing': 2, 'expressing': 2, 'reviewing': 2}, stage_calls(pattern))
+        self.assertEqual(['executing', 'expressing', 'reviewing'], list(rounds[1]['stage_latency']))
+
+    def test_invalid_retry_stage_falls_back_to_jump_step(self):
+        pattern = peer_work_pattern(lambda call, subtasks: (0, 'summarizing') if call == 1 else (80, None))
+        self.run_pattern(pattern)
+        self.assertEqual({'planning': 1, 'executing': 1, 'expressing': 2, 'reviewing': 2}, stage_calls(pattern))
+
+
+class PeerWorkPatternPipelineTest(unittest.TestCase):
+    # one slow subtask holds back the whole executing stage.
+    SUBTASK_LATENCY = [0.01, 0.02, 0.03, 0.3]
+
+    @staticmethod
+    def pass_with(subtasks_needed: int) -> Callable:
+        return lambda call, subtasks: (80, None) if subtasks >= subtasks_needed else (0, 'executing')
+
+    def slow_subtask(self) -> threading.Event:
+        event = threading.Event()
+        self.addCleanup(event.set)
+        return event
+
+    def test_round_exits_early_on_a_passing_draft(self):
+        serial = peer_work_pattern(self.pass_with(2), self.SUBTASK_LATENCY)
+        serial_rounds = serial.invoke(InputObject({'input': 'question'}), work_pattern_input())['result']
+
+        pipelined = peer_work_pattern(self.pass_with(2), self.SUBTASK_LATENCY, self.slow_subtask())
+        input_object = InputObject({'input': 'question'})
+        rounds = pipelined.invoke(input_object, work_pattern_input(pipeline=True))['result']
+
+        self.assertEqual(1, len(rounds))
+        self.assertTrue(rounds[0]['pipeline_early_exit'])
+        self.assertEqual('answer from 2 subtasks', rounds[0]['expressing_result']['output'])
+        self.assertEqual([0, 1], [res['index'] for res in rounds[0]['executing_result']['executing_result']])
+        self.assertEqual('answer from 2 subtasks', input_object.get_data('expressing_result').get_data('output'))
+        self.assertEqual('answer from 4 subtasks', serial_rounds[0]['expressing_result']['output'])
+        # the round is answered while the slow subtask is still running.
+        self.assertNotIn(3, pipelined.executing.finished)
+
+    def test_subtasks_left_after_an_early_exit_are_stopped(self):
+        # one worker, the held subtask 2 keeps subtask 3 waiting until the draft is accepted.
+        pool = ContextThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown, wait=False)
+        slow_subtask = self.slow_subtask()
+        pattern = peer_work_pattern(self.pass_with(2), self.SUBTASK_LATENCY[:2] + [0], slow_subtask)
+        output_stream = queue.Queue()
+        with mock.patch('agentuniverse.agent.template.executing_agent_template.get_shared_executor',
+                        return_value=pool):
+            rounds = pattern.invoke(InputObject({'input': 'question', 'output_stream': output_stream}),
+                                    work_pattern_input(pipeline=True))['result']
+            slow_subtask.set()
+            self.assertTrue(pattern.executing.stage_done.wait(5))
+        self.assertTrue(rounds[0]['pipeline_early_exit'])
+        self.assertEqual([0, 1, 2], sorted(pattern.executing.finished))
+        # the executing stage left running streams nothing to the request.
+        self.assertEqual([], streamed_types(output_stream))
+
+    def test_rejected_draft_waits_for_all_subtasks(self):
+        pattern = peer_work_pattern(self.pass_with(4), self.SUBTASK_LATENCY)
+        output_stream = queue.Queue()
+        rounds = pattern.invoke(InputObject({'input': 'question', 'output_stream': output_stream}),
+                                work_pattern_input(pipeline=True))['result']
+        self.assertEqual(['executing'], streamed_types(output_stream))
+        self.assertEqual(1, len(rounds))
+        self.assertNotIn('pipeline_early_exit', rounds[0])
+        self.assertEqual(0, rounds[0]['draft_reviewing_result']['score'])
+        self.assertEqual('answer from 4 subtasks', rounds[0]['expressing_result']['output'])
+        self.assertEqual({'planning': 1, 'executing': 1, 'expressing': 2, 'reviewing': 2}, stage_calls(pattern))
+        self.assertEqual({'planning', 'executing', 'draft_expressing', 'draft_reviewing', 'expressing', 'reviewing'},
+                         set(rounds[0]['stage_latency']))
+
+    def test_pipeline_is_skipped_when_every_subtask_is_required(self):
+        pattern = peer_work_pattern(self.pass_with(2), self.SUBTASK_LATENCY[:3])
+        rounds = pattern.invoke(InputObject({'input': 'question'}),
+                                work_pattern_input(pipeline=True, pipeline_subtask_ratio=1))['result']
+        self.assertNotIn('draft_reviewing_result', rounds[0])
+        self.assertEqual('answer from 4 subtasks', rounds[0]['expressing_result']['output'])
+
+    def test_async_round_exits_early_on_a_passing_draft(self):
+        slow_subtask = self.slow_subtask()
+        pattern = peer_work_pattern(self.pass_with(2), self.SUBTASK_LATENCY, slow_subtask)
+
+        async def invoke():
+            result = await pattern.async_invoke(InputObject({'input': 'question'}),
+                                                work_pattern_input(pipeline=True))
+            # the loop shutdown waits for the slow subtask, check it before.
+            finished = list(pattern.executing.finished)
+            slow_subtask.set()
+            return result['result'], finished
+
+        rounds, finished = asyncio.run(invoke())
+        self.assertTrue(rounds[0]['pipeline_early_exit'])
+        self.assertEqual('answer from 2 subtasks', rounds[0]['expressing_result']['output'])
+        self.assertNotIn(3, finished)
+
+
+class ReviewingRetryStageTest(unittest.TestCase):
+
+    def test_retry_stage_is_parsed_from_the_review(self):
+        agent = ReviewingAgentTemplate()
+        result = agent.parse_result({'output': '```json\n{"suggestion": "too short", "is_useful": false, '
+                                               '"retry_stage": "expressing"}\n```'})
+        self.assertEqual((0, 'expressing'), (result['score'], result['retry_stage']))
+        result = agent.parse_result({'output': '{"suggestion": "good", "is_useful": true, "retry_stage": "none"}'})
+        self.assertEqual((80, None), (result['score'], result['retry_stage']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_asgi_server.py
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+import httpx
+from starlette.testclient import TestClient
+
+from agentuniverse.agent.agent import Agent, _has_native_async
+from agentuniverse.agent.template.agent_template import AgentTemplate
+from agentuniverse.agent_serve.service_instance import ServiceNotFoundError
+from agentuniverse.agent_serve.web.asgi_server import app
+from agentuniverse.agent_serve.web.web_util import FlaskServerManager
+
+STREAM_COUNT = 1000
+TOKENS_PER_STREAM = 5
+
+
+class MockServiceInstance:
+    """Stands for a service whose agent runs natively async."""
+    loop_threads = set()
+    running = 0
+    max_running = 0
+
+    def __init__(self, service_id: str):
+        if service_id == 'missing_service':
+            raise ServiceNotFoundError(service_id)
+        self.service_id = service_id
+
+    async def async_run(self, output_stream=None, **kwargs):
+        MockServiceInstance.loop_threads.add(threading.get_ident())
+        MockServiceInstance.running += 1
+        MockServiceInstance.max_running = max(MockServiceInstance.max_running, MockServiceInstance.running)
+        try:
+            return await self.__run(output_stream, **kwargs)
+        finally:
+            MockServiceInstance.running -= 1
+
+    async def __run(self, output_stream=None, **kwargs):
+        for i in range(TOKENS_PER_STREAM):
+            await asyncio.sleep(kwargs.get('delay', 0))
+            if output_stream is not None:
+                output_stream.put_nowait({'type': 'token', 'data': {'chunk': f'{i} ', 'agent_info': {}}})
+        if kwargs.get('delay', 0) > FlaskServerManager().sync_service_timeout:
+            await asyncio.sleep(kwargs['delay'])
+        return json.dumps({'output': kwargs.get('input')})
+
+
+class SyncAgent(Agent):
+    def run(self, **kwargs):
+        pass
+
+
+class AsyncAgent(Agent):
+    async def async_run(self, **kwargs):
+        pass
+
+
+class SyncTemplateAgent(AgentTemplate):
+    def customized_execute(self, *args, **kwargs):
+        pass
+
+
+class AsyncTemplateAgent(SyncTemplateAgent):
+    async def customized_async_execute(self, *args, **kwargs):
+        pass
+
+
+class AsgiServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        patcher = mock.patch('agentuniverse.agent_serve.web.web_util.ServiceInstance', MockServiceInstance)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        FlaskServerManager().sync_service_timeout = 30
+
+    def test_has_native_async(self):
+        self.assertFalse(_has_native_async(Agent))
+        self.assertFalse(_has_native_async(SyncAgent))
+        self.assertTrue(_has_native_async(AsyncAgent))
+        self.assertTrue(_has_native_async(AgentTemplate))
+        self.assertFalse(_has_native_async(SyncTemplateAgent))
+        self.assertTrue(_has_native_async(AsyncTemplateAgent))
+
+    def test_service_run(self):
+        response = self.client.post('/service_run', json={'service_id': 'demo_service',
+                                                          'params': {'input': 'hello'}})
+        self.assertEqual(200, response.status_code)
+        body = response.json()
+        self.assertTrue(body['success'])
+        self.assertEqual({'output': 'hello'}, json.loads(body['result']))
+        self.assertIsNotNone(body['request_id'])
+
+        response = self.client.post('/service_run', json={'service_id': 'missing_service', 'params': {}})
+        self.assertEqual(404, response.status_code)
+        self.assertFalse(response.json()['success'])
+
+        FlaskServerManager().sync_service_timeout = 0.1
+        response = self.client.post('/service_run', json={'service_id': 'demo_service',
+                                                          'params': {'delay': 0.2}})
+        self.assertEqual(504, response.status_code)
+        self.assertEqual('AU sync service timeout', response.json()['message'])
+
+    def test_service_run_stream(self):
+        response = self.client.post('/service_run_stream', json={'service_id': 'demo_service',
+                                                                 'params': {'input': 'hello'}})
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers['content-type'].startswith('text/event-stream'))
+        self.assertIn('x-request-id', response.headers)
+        frames = [json.loads(frame.replace('data:', '', 1)) for frame in response.text.split('\n\n')
+                  if frame.strip()]
+        self.assertEqual(''.join(f'{i} ' for i in range(TOKENS_PER_STREAM)),
+                         ''.join(frame['process']['data']['chunk'] for frame in frames if 'process' in frame))
+        self.assertEqual({'output': 'hello'}, json.loads(frames[-1]['result']))
+
+    def test_liveness_and_echo(self):
+        self.assertTrue(self.client.get('/liveness').json()['success'])
+        self.assertEqual('Welcome to agentUniverse!!!', self.client.get('/echo').text)
+
+    def test_concurrent_streams(self):
+        MockServiceInstance.loop_threads = set()
+        MockServiceInstance.max_running = 0
+
+        async def run_streams():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+                async def stream(i: int) -> str:
+                    response = await client.post('/service_run_stream', json={
+                        'service_id': 'demo_service', 'params': {'input': str(i), 'delay': 0.05}})
+                    return response.text
+
+                return await asyncio.gather(*[stream(i) for i in range(STREAM_COUNT)])
+
+        texts = asyncio.run(run_streams())
+        self.assertTrue(all('"result"' in text for text in texts))
+        self.assertEqual(1, len(MockServiceInstance.loop_threads))
+        # A box of 5 gthread workers with 4 threads serves 20 streams at once.
+        self.assertGreater(MockServiceInstance.max_running, 20)
+
+    def test_saved_request_is_written_off_the_event_loop(self):
+        MockServiceInstance.loop_threads = set()
+        db_threads = []
+        request_library = mock.MagicMock()
+        request_library.add_request.side_effect = lambda request_do: db_threads.append(threading.get_ident())
+        request_library.update_request.side_effect = lambda request_do: db_threads.append(threading.get_ident())
+        with mock.patch('agentuniverse.agent_serve.web.request_task.RequestLibrary',
+                        return_value=request_library):
+            response = self.client.post('/service_run', json={'service_id': 'demo_service', 'saved': True,
+                                                              'params': {'input': 'hello'}})
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(1, request_library.add_request.call_count)
+        self.assertEqual('finished', request_library.update_request.call_args.args[0].state)
+        self.assertEqual(2, len(db_threads))
+        self.assertFalse(MockServiceInstance.loop_threads & set(db_threads))
+
+
+if __name__ == '__main__':
+    unittest.main()
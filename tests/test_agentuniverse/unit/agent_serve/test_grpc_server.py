@@ -0,0 +1,157 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 11:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_grpc_server.py
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+
+import grpc
+from google.protobuf import struct_pb2
+
+from agentuniverse.agent_serve.web.rpc.grpc import agentuniverse_service_pb2, agentuniverse_service_pb2_grpc
+from agentuniverse.agent_serve.web.rpc.grpc.grpc_server_booster import GRPC_CONFIG, create_grpc_server
+
+TOKEN_COUNT = 5
+TOKEN_DELAY = 0.1
+
+
+def token(i: int) -> dict:
+    return {'type': 'token', 'data': {'chunk': f'{i} ', 'agent_info': {'name': 'demo_agent'}}}
+
+
+class MockServiceInstance:
+    """Stands for a service streaming tokens before its result."""
+    # Service and consumer events of the stream, in order.
+    events = []
+    running = 0
+    max_running = 0
+
+    def __init__(self, service_id: str):
+        self.service_id = service_id
+
+    def run(self, output_stream=None, **kwargs):
+        for i in range(TOKEN_COUNT):
+            time.sleep(TOKEN_DELAY)
+            if output_stream is not None:
+                output_stream.put_nowait(token(i))
+        if output_stream is not None:
+            output_stream.put_nowait({'type': 'intermediate_steps', 'data': {'output': 'step'}})
+        if kwargs.get('fail'):
+            raise ValueError('service failed')
+        MockServiceInstance.events.append('service finished')
+        return json.dumps({'output': kwargs.get('input'), 'top_k': kwargs.get('top_k')})
+
+    async def async_run(self, output_stream=None, **kwargs):
+        MockServiceInstance.running += 1
+        MockServiceInstance.max_running = max(MockServiceInstance.max_running, MockServiceInstance.running)
+        try:
+            for i in range(TOKEN_COUNT):
+                await asyncio.sleep(TOKEN_DELAY)
+                if output_stream is not None:
+                    output_stream.put_nowait(token(i))
+            if kwargs.get('fail'):
+                raise ValueError('service failed')
+            MockServiceInstance.events.append('service finished')
+            return json.dumps({'output': kwargs.get('input'), 'top_k': kwargs.get('top_k')})
+        finally:
+            MockServiceInstance.running -= 1
+
+
+def stream_request(**params) -> agentuniverse_service_pb2.AgentServiceRequest:
+    struct_params = struct_pb2.Struct()
+    struct_params.update(params)
+    return agentuniverse_service_pb2.AgentServiceRequest(service_id='demo_service', saved=False,
+                                                         struct_params=struct_params)
+
+
+class GrpcServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        patcher = mock.patch('agentuniverse.agent_serve.web.web_util.ServiceInstance', MockServiceInstance)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rpc_patcher = mock.patch('agentuniverse.agent_serve.web.rpc.rpc_server.ServiceInstance',
+                                 MockServiceInstance)
+        rpc_patcher.start()
+        self.addCleanup(rpc_patcher.stop)
+        self.addCleanup(GRPC_CONFIG.clear)
+        MockServiceInstance.events = []
+
+    def check_stream(self, responses: list):
+        kinds = [response.WhichOneof('payload') for response in responses]
+        self.assertEqual(['token'] * TOKEN_COUNT, kinds[:TOKEN_COUNT])
+        self.assertEqual('result', kinds[-1])
+        self.assertEqual(''.join(f'{i} ' for i in range(TOKEN_COUNT)),
+                         ''.join(response.token.chunk for response in responses[:TOKEN_COUNT]))
+        self.assertEqual('demo_agent', responses[0].token.agent_name)
+        self.assertEqual({'output': 'hello', 'top_k': 3}, json.loads(responses[-1].result))
+        self.assertEqual(1, len({response.request_id for response in responses}))
+        # The first token arrives as soon as it is produced, not with the result.
+        self.assertEqual(['token received', 'service finished'], MockServiceInstance.events[:2])
+
+    def test_thread_server_stream(self):
+        GRPC_CONFIG['max_workers'] = 4
+        server, port = create_grpc_server()
+        server.start()
+        self.addCleanup(server.stop, None)
+        with grpc.insecure_channel(f'localhost:{port}') as channel:
+            stub = agentuniverse_service_pb2_grpc.AgentUniverseServiceStub(channel)
+            responses = []
+            for response in stub.service_run_stream(stream_request(input='hello', top_k=3)):
+                if not responses:
+                    MockServiceInstance.events.append('token received')
+                responses.append(response)
+            self.check_stream(responses)
+            self.assertEqual('process', responses[-2].WhichOneof('payload'))
+            self.assertEqual('step', responses[-2].process.struct_value['data']['output'])
+
+            failed = list(stub.service_run_stream(stream_request(input='hello', fail=True)))
+            self.assertEqual('service failed', failed[-1].error)
+
+            response = stub.service_run(agentuniverse_service_pb2.AgentServiceRequest(
+                service_id='demo_service', params=json.dumps({'input': 'hello', 'top_k': 3})))
+            self.assertTrue(response.success)
+            self.assertEqual({'output': 'hello', 'top_k': 3}, json.loads(response.result))
+
+    def test_aio_server_stream(self):
+        GRPC_CONFIG['server_mode'] = 'aio'
+
+        async def run():
+            server, port = create_grpc_server()
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f'localhost:{port}') as channel:
+                    stub = agentuniverse_service_pb2_grpc.AgentUniverseServiceStub(channel)
+                    responses = []
+                    async for response in stub.service_run_stream(stream_request(input='hello', top_k=3)):
+                        if not responses:
+                            MockServiceInstance.events.append('token received')
+                        responses.append(response)
+                    self.check_stream(responses)
+
+                    # Streams do not hold threads, far more than max_workers run at once.
+                    async def consume():
+                        return [response async for response in
+                                stub.service_run_stream(stream_request(input='hello', top_k=3))]
+
+                    MockServiceInstance.max_running = 0
+                    streams = await asyncio.gather(*[consume() for _ in range(50)])
+                    self.assertTrue(all(stream[-1].WhichOneof('payload') == 'result' for stream in streams))
+                    self.assertGreater(MockServiceInstance.max_running, GRPC_CONFIG.get('max_workers', 10))
+
+                    response = await stub.service_run(stream_request(input='hello', top_k=3))
+                    self.assertEqual({'output': 'hello', 'top_k': 3}, json.loads(response.result))
+            finally:
+                await server.stop(None)
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 10:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_request_library.py
+import datetime
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine, inspect as sql_inspect
+
+from agentuniverse.agent_serve.web.dal.entity.request_do import RequestDO
+from agentuniverse.agent_serve.web.dal.request_library import RequestLibrary, RequestORM, REQUEST_TABLE_NAME
+from agentuniverse.base.config.configer import Configer
+from tests.test_agentuniverse.mock.agent_serve.mock_application_config_manager import MockApplicationConfigManager
+
+STEP_COUNT = 300
+
+
+def new_request_do(request_id: str, gmt_modified: datetime.datetime = None) -> RequestDO:
+    return RequestDO(request_id=request_id, session_id='', query='query', state='running',
+                     result={}, steps=[], additional_args={}, gmt_create=datetime.datetime.now(),
+                     gmt_modified=gmt_modified or datetime.datetime.now())
+
+
+class RequestLibraryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_uri = f"sqlite:///{Path(self.tmp_dir.name) / 'request.db'}"
+        configer = Configer()
+        configer.value = {'DB': {'system_db_uri': self.db_uri,
+                                 'request_flush_interval': 0.05,
+                                 'request_flush_max_pending': 10}}
+        # A fresh library instead of the process wide singleton.
+        with mock.patch('agentuniverse.database.sqldb_wrapper.ApplicationConfigManager',
+                        new=MockApplicationConfigManager), \
+                mock.patch('agentuniverse.agent_serve.web.dal.request_library.SQLDBWrapperManager'):
+            self.library = RequestLibrary.__wrapped__(configer=configer)
+
+    def stored_steps(self, request_id: str) -> list:
+        """The steps written in database, ignoring the buffered ones."""
+        session = self.library.get_session()
+        try:
+            return session.query(RequestORM).filter(RequestORM.request_id == request_id).first().steps
+        finally:
+            session.close()
+
+    def test_request_id_index(self):
+        self.library.add_request(new_request_do('request_a'))
+        indexes = sql_inspect(create_engine(self.db_uri)).get_indexes(REQUEST_TABLE_NAME)
+        self.assertIn(['request_id'], [index['column_names'] for index in indexes])
+
+    def test_buffered_updates_are_merged(self):
+        request_do = new_request_do('request_a')
+        self.library.add_request(request_do)
+        for i in range(5):
+            request_do.steps.append(f'step{i}')
+            self.library.update_request_buffered(request_do)
+        # Reads see the buffered state before it is written.
+        self.assertEqual(5, len(self.library.query_request_by_request_id('request_a').steps))
+        # The flush thread writes it within the flush interval.
+        deadline = time.monotonic() + 5
+        while len(self.stored_steps('request_a')) < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(5, len(self.stored_steps('request_a')))
+
+        request_do.steps.append('step5')
+        self.library.update_request_buffered(request_do)
+        request_do.state = 'finished'
+        self.library.update_request(request_do)
+        self.library.flush()
+        stored = self.library.query_request_by_request_id('request_a')
+        self.assertEqual('finished', stored.state)
+        self.assertEqual(6, len(stored.steps))
+
+    def test_purge_requests(self):
+        old = datetime.datetime.now() - datetime.timedelta(days=10)
+        for i in range(5):
+            self.library.add_request(new_request_do(f'old_{i}', old))
+        self.library.add_request(new_request_do('new'))
+        deleted = self.library.purge_requests(datetime.datetime.now() - datetime.timedelta(days=7))
+        self.assertEqual(5, deleted)
+        self.assertIsNone(self.library.query_request_by_request_id('old_0'))
+        self.assertIsNotNone(self.library.query_request_by_request_id('new'))
+
+    def test_streamed_steps_are_written_behind(self):
+        request_do = new_request_do('request_a')
+        self.library.add_request(request_do)
+        self.library.flush_interval = 60
+        with mock.patch.object(self.library, '_RequestLibrary__write_requests',
+                               wraps=self.library._RequestLibrary__write_requests) as write_requests:
+            for i in range(STEP_COUNT):
+                request_do.steps.append(f'step{i}')
+                self.library.update_request_buffered(request_do)
+            request_do.state = 'finished'
+            self.library.update_request(request_do)
+        # the final state is written at once, at most one flush ran meanwhile.
+        self.assertLessEqual(write_requests.call_count, 2)
+        self.assertEqual(STEP_COUNT, len(self.stored_steps('request_a')))
+        self.assertEqual('finished', self.library.query_request_by_request_id('request_a').state)
+
+
+if __name__ == '__main__':
+    unittest.main()
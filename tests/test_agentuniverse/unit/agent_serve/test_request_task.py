@@ -0,0 +1,150 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_request_task.py
+import asyncio
+import json
+import queue
+import threading
+import time
+import unittest
+
+from agentuniverse.agent_serve.web.request_task import EOF_SIGNAL, RequestTask
+from agentuniverse.agent_serve.web.stream_framer import StreamFramer
+from agentuniverse.agent_serve.web.web_util import FlaskServerManager
+
+AGENT_INFO = {'name': 'demo_agent', 'description': 'demo agent'}
+TOKEN_COUNT = 20000
+
+
+def token(chunk: str, agent_info: dict = None) -> dict:
+    return {'type': 'token', 'data': {'chunk': chunk, 'agent_info': agent_info or AGENT_INFO}}
+
+
+def decode(frame: str) -> dict:
+    return json.loads(frame.replace("data:", "", 1))
+
+
+def stream_service(output_stream, tokens: list, delay: float = 0, **kwargs):
+    for item in tokens:
+        if delay:
+            time.sleep(delay)
+        output_stream.put_nowait(item)
+    return {'output': 'done'}
+
+
+async def async_stream_service(output_stream, tokens: list, delay: float = 0, **kwargs):
+    return await asyncio.to_thread(stream_service, output_stream, tokens, delay)
+
+
+class RequestTaskTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        FlaskServerManager().stream_coalesce_window = 0
+        FlaskServerManager().stream_coalesce_max_bytes = 4096
+
+    def test_framer_merges_tokens_of_one_agent(self):
+        framer = StreamFramer(coalesce_max_bytes=8)
+        other_agent = {'name': 'other_agent'}
+        frames = []
+        for output in [token('ab'), token('cd'), token('efgh'), token('ij'),
+                       token('kl', other_agent), {'type': 'intermediate_steps', 'data': {'output': 'step'}},
+                       token('mn')]:
+            frames.extend(RequestTask.frame_output(framer, output))
+        if framer.has_pending():
+            frames.append(framer.flush())
+        processes = [decode(frame)['process'] for frame in frames]
+        self.assertEqual(['abcdefgh', 'ij', 'kl', None, 'mn'],
+                         [process['data'].get('chunk') for process in processes])
+        self.assertEqual([AGENT_INFO, None, other_agent, None, AGENT_INFO],
+                         [process['data'].get('agent_info') for process in processes])
+        self.assertEqual('step', processes[3]['data']['output'])
+
+    def test_stream_run(self):
+        chunks = [f'token{i} ' for i in range(200)]
+        task = RequestTask(stream_service, False, tokens=[token(chunk) for chunk in chunks] + ['plain text'],
+                           delay=0.0005)
+        frames = [decode(frame) for frame in task.stream_run()]
+        processes = [frame['process'] for frame in frames if 'process' in frame]
+        self.assertEqual(''.join(chunks), ''.join(process['data']['chunk'] for process in processes[:-1]))
+        self.assertEqual(1, sum('agent_info' in process['data'] for process in processes[:-1]))
+        self.assertEqual('plain text', processes[-1])
+        self.assertEqual({'output': 'done'}, frames[-1]['result'])
+
+    def test_stream_coalescing_window(self):
+        FlaskServerManager().stream_coalesce_window = 0.5
+        chunks = [f'token{i} ' for i in range(50)]
+        task = RequestTask(stream_service, False, tokens=[token(chunk) for chunk in chunks], delay=0.001)
+        frames = [decode(frame) for frame in task.stream_run()]
+        self.assertEqual(2, len(frames))
+        self.assertEqual(''.join(chunks), frames[0]['process']['data']['chunk'])
+
+    def test_async_stream_run_is_push_based(self):
+        first_frame_received = threading.Event()
+
+        def wait_for_consumer(output_stream, **kwargs):
+            output_stream.put_nowait(token('first '))
+            # the service only goes on once the consumer got the first frame.
+            if not first_frame_received.wait(timeout=5):
+                raise TimeoutError('the first frame was not pushed')
+            output_stream.put_nowait(token('second'))
+            return {'output': 'done'}
+
+        async def consume():
+            task = RequestTask(lambda **kwargs: asyncio.to_thread(wait_for_consumer, **kwargs), False)
+            frames = []
+            async for frame in task.async_stream_run():
+                first_frame_received.set()
+                frames.append(decode(frame))
+            return frames
+
+        frames = asyncio.run(consume())
+        self.assertEqual('first second', ''.join(frame['process']['data']['chunk']
+                                                 for frame in frames if 'process' in frame))
+        self.assertEqual({'output': 'done'}, frames[-1]['result'])
+
+    def test_async_stream_keeps_every_output(self):
+        chunks = [f'token{i} ' for i in range(TOKEN_COUNT)]
+
+        async def consume():
+            task = RequestTask(async_stream_service, False, tokens=[token(chunk) for chunk in chunks])
+            return [decode(frame) async for frame in task.async_stream_run()]
+
+        frames = asyncio.run(consume())
+        self.assertEqual(''.join(chunks), ''.join(frame['process']['data']['chunk']
+                                                 for frame in frames if 'process' in frame))
+        self.assertEqual({'output': 'done'}, frames[-1]['result'])
+
+    def test_async_stream_outputs_keeps_every_output(self):
+        tokens = [token(f'token{i} ') for i in range(TOKEN_COUNT)]
+
+        async def consume():
+            task = RequestTask(async_stream_service, False, tokens=tokens)
+            return [output async for output in task.async_stream_outputs()]
+
+        outputs = asyncio.run(consume())
+        self.assertEqual([('process', output) for output in tokens], outputs[:-1])
+        self.assertEqual(('result', {'output': 'done'}), outputs[-1])
+
+    def test_queued_tokens_are_coalesced(self):
+        tokens = [token(f'token{i} ') for i in range(TOKEN_COUNT)]
+        output_queue = queue.Queue()
+        for output in tokens:
+            output_queue.put_nowait(output)
+        output_queue.put_nowait(EOF_SIGNAL)
+        task = RequestTask(lambda output_stream: None, False)
+        task.queue = output_queue
+        task.thread = threading.Thread()
+        task.thread.result = lambda: {'output': 'done'}
+        frames = [decode(frame) for frame in task.receive_steps()]
+        self.assertLess(len(frames), len(tokens) / 10)
+        self.assertEqual(''.join(output['data']['chunk'] for output in tokens),
+                         ''.join(frame['process']['data']['chunk'] for frame in frames if 'process' in frame))
+        self.assertEqual({'output': 'done'}, frames[-1]['result'])
+
+
+if __name__ == '__main__':
+    unittest.main()
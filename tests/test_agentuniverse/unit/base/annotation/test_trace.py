@@ -0,0 +1,162 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_trace.py
+import contextvars
+import inspect
+import unittest
+from unittest import mock
+
+from agentuniverse.base.annotation.trace import _InputBinder, trace_agent, trace_tool
+from agentuniverse.base.util.monitor.monitor import Monitor
+
+
+def inspect_input(func, *args, **kwargs) -> dict:
+    """The argument capture every traced call used to make."""
+    bound_args = inspect.signature(func).bind(*args, **kwargs)
+    bound_args.apply_defaults()
+    return {k: v for k, v in bound_args.arguments.items()}
+
+
+def noop(*args, **kwargs):
+    pass
+
+
+class NoopConversationMemoryModule:
+    """Stands for a conversation memory module that collects nothing."""
+
+    def __getattr__(self, name):
+        return noop
+
+
+class MockTool:
+    name = 'mock_tool'
+
+    @trace_tool
+    def run(self, **kwargs):
+        chain = Monitor.get_invocation_chain()
+        return chain[-1]['source'] if chain else None
+
+    def raw_run(self, **kwargs):
+        return kwargs
+
+
+class MockAgent:
+    agent_model = None
+
+    def __init__(self, name: str, tool: MockTool, fail: bool = False):
+        self.agent_model = mock.Mock(info={'name': name}, profile={})
+        self.tool = tool
+        self.fail = fail
+
+    @trace_agent
+    def run(self, **kwargs):
+        if self.fail:
+            raise ValueError('failed')
+        chain = [node['source'] for node in Monitor.get_invocation_chain()]
+        return chain, self.tool.run(input=kwargs.get('input'))
+
+
+class TraceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.monitor = Monitor()
+        self.monitor.sample_rate = 1.0
+        self.monitor.max_traces_per_second = None
+        Monitor.clear_invocation_chain()
+        patcher = mock.patch('agentuniverse.base.annotation.trace.ConversationMemoryModule',
+                             NoopConversationMemoryModule)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.monitor.sample_rate = 1.0
+        self.monitor.max_traces_per_second = None
+
+    def test_input_binder_matches_signature_bind(self):
+        def func_a(self, a, b=2, *args, c, d=4, **kwargs):
+            pass
+
+        def func_b(self, **kwargs):
+            pass
+
+        def func_c(self, *args, **kwargs):
+            pass
+
+        cases = [
+            (func_a, (1, 'a'), {'c': 3}),
+            (func_a, (1, 'a', 'b', 'x', 'y'), {'c': 3, 'e': 5}),
+            (func_a, (1,), {'a': 'a', 'c': 3, 'd': 5}),
+            (func_b, (1,), {'input': 'query', 'memory_source_info': {}}),
+            (func_c, (1, 'x'), {'messages': []}),
+            (func_c, (1,), {}),
+        ]
+        for func, args, kwargs in cases:
+            bound = _InputBinder(func)(args, kwargs)
+            expected = inspect_input(func, *args, **kwargs)
+            self.assertEqual(expected, bound)
+            self.assertEqual(list(expected.keys()), list(bound.keys()))
+
+    def test_input_binder_falls_back_on_invalid_calls(self):
+        def func(self, a, *, c):
+            pass
+
+        def positional_only(self, a, /, b=1):
+            pass
+
+        binder = _InputBinder(func)
+        with self.assertRaises(TypeError):
+            binder((1,), {'c': 3})
+        with self.assertRaises(TypeError):
+            binder((1, 2), {'a': 2, 'c': 3})
+        with self.assertRaises(TypeError):
+            binder((1, 2), {'c': 3, 'd': 4})
+        self.assertEqual(inspect_input(positional_only, 1, 2),
+                         _InputBinder(positional_only)((1, 2), {}))
+
+    def test_invocation_chain(self):
+        agent = MockAgent('mock_agent', MockTool())
+        chain, tool_source = agent.run(input='query')
+        self.assertEqual(['mock_agent'], chain)
+        self.assertEqual('mock_tool', tool_source)
+        self.assertEqual([], Monitor.get_invocation_chain())
+
+        with self.assertRaises(ValueError):
+            MockAgent('failed_agent', MockTool(), fail=True).run(input='query')
+        self.assertEqual([], Monitor.get_invocation_chain())
+
+    def test_sampling_follows_root_invocation(self):
+        agent = MockAgent('mock_agent', MockTool())
+        with mock.patch.object(type(self.monitor), 'trace_tool_input') as trace_tool_input, \
+                mock.patch.object(type(self.monitor), 'trace_agent_input') as trace_agent_input:
+            self.monitor.sample_rate = 0
+            chain, _ = contextvars.copy_context().run(agent.run, input='query')
+            self.assertEqual(['mock_agent'], chain)
+            trace_agent_input.assert_not_called()
+            trace_tool_input.assert_not_called()
+
+            self.monitor.sample_rate = 1.0
+            self.monitor.max_traces_per_second = 1
+            with mock.patch('agentuniverse.base.util.monitor.monitor.time.monotonic', return_value=100.0):
+                contextvars.copy_context().run(agent.run, input='query')
+                contextvars.copy_context().run(agent.run, input='query')
+            self.assertEqual(1, trace_agent_input.call_count)
+            self.assertEqual(1, trace_tool_input.call_count)
+
+    def test_calls_do_not_inspect_the_signature(self):
+        tool = MockTool()
+        with mock.patch.object(type(self.monitor), 'trace_tool_input') as trace_tool_input, \
+                mock.patch.object(type(self.monitor), 'trace_tool_invocation'), \
+                mock.patch.object(inspect, 'signature', wraps=inspect.signature) as signature:
+            for _ in range(3):
+                contextvars.copy_context().run(tool.run, input='query')
+        # the signature is only inspected when the function is decorated.
+        signature.assert_not_called()
+        self.assertEqual(3, trace_tool_input.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
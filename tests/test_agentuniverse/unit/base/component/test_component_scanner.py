@@ -0,0 +1,115 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 19:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_component_scanner.py
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.component.component_scanner import ComponentScanner
+from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
+
+
+class ComponentScannerTest(unittest.TestCase):
+    """
+    Test cases for the single pass component scanner
+    """
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name)
+        self.write('agent/agent_a.yaml', "name: agent_a\nmetadata:\n  type: 'AGENT'\n")
+        self.write('agent/agent_b.yaml', "name: agent_b\nmetadata:\n  type: 'AGENT'\n")
+        self.write('tool/tool_a.yaml', "name: tool_a\ndescription: '${SCANNER_TEST_ENV}'\n"
+                                       "metadata:\n  type: 'TOOL'\n")
+        self.write('prompt/prompt_a.yaml', "introduction: hello\n")
+        self.manifest_path = str(self.root / 'cache' / 'manifest.json')
+
+    def write(self, relative_path: str, content: str):
+        path = self.root / 'package' / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+
+    def scan_all(self, scanner: ComponentScanner) -> dict:
+        package_path_list = [str(self.root / 'package')]
+        return {component_enum: scanner.scan(package_path_list, ConfigTypeEnum.YAML, component_enum)
+                for component_enum in ComponentEnum}
+
+    def test_each_file_parsed_once(self) -> None:
+        with mock.patch('agentuniverse.base.component.component_scanner.yaml.safe_load',
+                        side_effect=yaml.safe_load) as safe_load:
+            result = self.scan_all(ComponentScanner())
+        self.assertEqual(4, safe_load.call_count)
+        self.assertEqual(['agent_a', 'agent_b'],
+                         sorted(configer.name for configer in result[ComponentEnum.AGENT]))
+        self.assertEqual(['tool_a'], [configer.name for configer in result[ComponentEnum.TOOL]])
+        self.assertEqual(1, len(result[ComponentEnum.PROMPT]))
+        self.assertEqual([], result[ComponentEnum.LLM])
+
+    def test_manifest(self) -> None:
+        with mock.patch.dict(os.environ, {'SCANNER_TEST_ENV': 'first'}):
+            scanner = ComponentScanner(manifest_path=self.manifest_path)
+            self.scan_all(scanner)
+            scanner.save_manifest()
+        with open(self.manifest_path, encoding='utf-8') as f:
+            self.assertEqual(4, len(json.load(f)['files']))
+
+        # a warm restart parses no file, and still resolves the placeholders.
+        with mock.patch.dict(os.environ, {'SCANNER_TEST_ENV': 'second'}), \
+                mock.patch('agentuniverse.base.component.component_scanner.yaml.safe_load',
+                           side_effect=yaml.safe_load) as safe_load:
+            result = self.scan_all(ComponentScanner(manifest_path=self.manifest_path))
+        self.assertEqual(0, safe_load.call_count)
+        self.assertEqual('second', result[ComponentEnum.TOOL][0].description)
+        self.assertEqual(2, len(result[ComponentEnum.AGENT]))
+
+        # only the changed file is parsed again.
+        self.write('agent/agent_b.yaml', "name: agent_b_changed\nmetadata:\n  type: 'AGENT'\n")
+        with mock.patch('agentuniverse.base.component.component_scanner.yaml.safe_load',
+                        side_effect=yaml.safe_load) as safe_load:
+            result = self.scan_all(ComponentScanner(manifest_path=self.manifest_path))
+        self.assertEqual(1, safe_load.call_count)
+        self.assertEqual(['agent_a', 'agent_b_changed'],
+                         sorted(configer.name for configer in result[ComponentEnum.AGENT]))
+
+    def test_manifest_keeps_later_scans(self) -> None:
+        scanner = ComponentScanner(manifest_path=self.manifest_path)
+        scanner.scan([str(self.root / 'package' / 'agent')], ConfigTypeEnum.YAML, ComponentEnum.AGENT)
+        scanner.save_manifest()
+        # e.g. the product components, scanned after the startup.
+        scanner.scan([str(self.root / 'package' / 'tool')], ConfigTypeEnum.YAML, ComponentEnum.TOOL)
+        scanner.save_manifest()
+
+        # a restart scanning only the agents keeps the entries of the tools.
+        self.write('agent/agent_c.yaml', "name: agent_c\nmetadata:\n  type: 'AGENT'\n")
+        scanner = ComponentScanner(manifest_path=self.manifest_path)
+        scanner.scan([str(self.root / 'package' / 'agent')], ConfigTypeEnum.YAML, ComponentEnum.AGENT)
+        scanner.save_manifest()
+        with open(self.manifest_path, encoding='utf-8') as f:
+            self.assertEqual(['agent_a.yaml', 'agent_b.yaml', 'agent_c.yaml', 'tool_a.yaml'],
+                             sorted(Path(path).name for path in json.load(f)['files']))
+
+    def test_values_json_can_not_hold_are_parsed_again(self) -> None:
+        self.write('tool/tool_b.yaml', "name: tool_b\ncreated: 2026-01-01\nmetadata:\n  type: 'TOOL'\n")
+        scanner = ComponentScanner(manifest_path=self.manifest_path)
+        self.scan_all(scanner)
+        scanner.save_manifest()
+        with mock.patch('agentuniverse.base.component.component_scanner.yaml.safe_load',
+                        side_effect=yaml.safe_load) as safe_load:
+            result = self.scan_all(ComponentScanner(manifest_path=self.manifest_path))
+        self.assertEqual(1, safe_load.call_count)
+        self.assertEqual(['tool_a', 'tool_b'], sorted(configer.name for configer in result[ComponentEnum.TOOL]))
+
+
+if __name__ == '__main__':
+    unittest.main()
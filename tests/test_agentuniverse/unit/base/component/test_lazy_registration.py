@@ -0,0 +1,95 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 20:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_lazy_registration.py
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agentuniverse.agent_serve.web import post_fork_queue
+from agentuniverse.base.component.component_base import ComponentBase
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.component.component_manager_base import ComponentManagerBase
+
+APPNAME = 'test_app'
+
+
+class MockComponent(ComponentBase):
+    name: str = ''
+
+    def create_copy(self):
+        return self.model_copy()
+
+
+class LazyRegistrationTest(unittest.TestCase):
+    """
+    Test cases for the lazy component registration
+    """
+
+    def setUp(self) -> None:
+        app_config_manager = mock.patch(
+            'agentuniverse.base.component.component_manager_base.ApplicationConfigManager').start()
+        app_config_manager.return_value.app_configer.base_info_appname = APPNAME
+        self.addCleanup(mock.patch.stopall)
+        self.manager = ComponentManagerBase(ComponentEnum.TOOL)
+        self.build_count = 0
+
+    def factory(self, name: str):
+        def build():
+            self.build_count += 1
+            time.sleep(0.05)
+            return MockComponent(name=name, component_type=ComponentEnum.TOOL)
+
+        return build
+
+    def test_built_once_on_first_lookup(self) -> None:
+        self.manager.register_lazy(f'{APPNAME}.tool.tool_a', self.factory('tool_a'))
+        self.assertEqual(0, self.build_count)
+        self.assertEqual([f'{APPNAME}.tool.tool_a'], self.manager.get_instance_name_list())
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.manager.get_instance_obj('tool_a')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, self.build_count)
+        self.assertEqual(['tool_a'] * 8, [result.name for result in results])
+        self.assertIs(self.manager.get_instance_obj('tool_a', new_instance=False),
+                      self.manager.get_instance_obj('tool_a', new_instance=False))
+        self.assertEqual([f'{APPNAME}.tool.tool_a'], self.manager.get_instance_name_list())
+
+    def test_instance_list_builds_all(self) -> None:
+        self.manager.register_lazy(f'{APPNAME}.tool.tool_a', self.factory('tool_a'))
+        self.manager.register_lazy(f'{APPNAME}.tool.tool_b', self.factory('tool_b'))
+        self.assertEqual(['tool_a', 'tool_b'],
+                         sorted(instance.name for instance in self.manager.get_instance_obj_list()))
+        self.assertEqual(2, self.build_count)
+
+    def test_register_conflict_and_unregister(self) -> None:
+        self.manager.register_lazy(f'{APPNAME}.tool.tool_a', self.factory('tool_a'))
+        with self.assertRaises(ValueError):
+            self.manager.register_lazy(f'{APPNAME}.tool.tool_a', self.factory('tool_a'))
+        self.manager.unregister(f'{APPNAME}.tool.tool_a')
+        self.assertIsNone(self.manager.get_instance_obj('tool_a'))
+        self.assertEqual(0, self.build_count)
+
+    def test_post_fork_after_execution(self) -> None:
+        calls = []
+        with mock.patch.object(post_fork_queue, 'POST_FORK_QUEUE', []), \
+                mock.patch.object(post_fork_queue, '_POST_FORK_EXECUTED', False):
+            post_fork_queue.add_post_fork(calls.append, 'before')
+            self.assertEqual([], calls)
+            post_fork_queue.execute_post_fork_queue()
+            self.assertEqual(['before'], calls)
+            post_fork_queue.add_post_fork(calls.append, 'after')
+            self.assertEqual(['before', 'after'], calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 19:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_monitor_trace.py
+import datetime
+import enum
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from langchain_core.messages import HumanMessage, AIMessage
+from pydantic import BaseModel
+
+from agentuniverse.agent.output_object import OutputObject
+from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.base.util.monitor.trace_serializer import TraceSerializer, TRACE_SERIALIZER
+from agentuniverse.base.util.monitor.trace_writer import TraceFileWriter
+
+
+class Color(str, enum.Enum):
+    RED = 'red'
+
+
+class Document(BaseModel):
+    text: str
+    color: Color = Color.RED
+
+
+class Unserializable:
+    pass
+
+
+def agent_output(size: int) -> OutputObject:
+    return OutputObject({
+        'output': 'answer ' * 50,
+        'documents': [Document(text=f'document {i} ' * 20) for i in range(size)],
+        'chat_history': [HumanMessage(content='question'), AIMessage(content='answer')],
+        'client': Unserializable(),
+    })
+
+
+class TraceSerializerTest(unittest.TestCase):
+
+    def test_converts_known_objects(self):
+        now = datetime.datetime(2026, 1, 1, 12, 30)
+        value = TRACE_SERIALIZER.to_jsonable({
+            'document': Document(text='hello'),
+            'messages': [HumanMessage(content='hi'), AIMessage(content='hello')],
+            'output': OutputObject({'output': 'done'}),
+            'time': now,
+            'day': now.date(),
+            'tags': ('a', 'b'),
+            1: 'int key',
+        })
+        self.assertEqual({
+            'document': {'text': 'hello', 'color': 'red'},
+            'messages': [{'type': 'human', 'content': 'hi'}, {'type': 'ai', 'content': 'hello'}],
+            'output': {'output': 'done'},
+            'time': '2026-01-01 12:30:00',
+            'day': '2026-01-01',
+            'tags': ['a', 'b'],
+            1: 'int key',
+        }, value)
+
+    def test_leaves_out_what_can_not_be_serialized(self):
+        cyclic = {'name': 'cyclic'}
+        cyclic['self'] = cyclic
+        value = TRACE_SERIALIZER.to_jsonable({
+            'client': Unserializable(),
+            'items': [1, Unserializable(), 'two'],
+            'cyclic': cyclic,
+            ('tuple', 'key'): 'dropped',
+        })
+        self.assertEqual({'items': [1, 'two'], 'cyclic': {'name': 'cyclic'}}, value)
+        self.assertIsNone(TRACE_SERIALIZER.to_jsonable(Unserializable()))
+
+    def test_registered_encoder_applies_to_subclasses(self):
+        serializer = TraceSerializer()
+
+        class Special(Unserializable):
+            pass
+
+        self.assertIsNone(serializer.to_jsonable(Special()))
+        serializer.register(Unserializable, lambda obj: type(obj).__name__)
+        self.assertEqual(['Special'], serializer.to_jsonable([Special()]))
+        serializer.register(Special, lambda obj: 1 / 0)
+        self.assertEqual([], serializer.to_jsonable([Special()]))
+
+
+class TraceFileWriterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_lines_are_flushed_in_the_background(self):
+        writer = TraceFileWriter(flush_interval=0.05)
+        self.addCleanup(writer.close)
+        path = os.path.join(self.tmp_dir.name, 'traces', 'llm.jsonl')
+        for i in range(3):
+            writer.write(path, json.dumps({'index': i}))
+        deadline = time.monotonic() + 5
+        while not os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual([{'index': i} for i in range(3)], [json.loads(line) for line in file])
+
+    def test_files_rotate_by_size(self):
+        writer = TraceFileWriter(max_file_size=100, flush_interval=60)
+        self.addCleanup(writer.close)
+        path = os.path.join(self.tmp_dir.name, 'llm.jsonl')
+        for i in range(3):
+            writer.write(path, 'x' * 60)
+            writer.write(path, 'y' * 60)
+            writer.flush()
+        writer.write(path, 'last')
+        writer.close()
+        self.assertEqual(['llm.1.jsonl', 'llm.2.jsonl', 'llm.3.jsonl', 'llm.jsonl'],
+                         sorted(os.listdir(self.tmp_dir.name)))
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual('last\n', file.read())
+
+
+class MonitorTraceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.monitor = Monitor.__wrapped__(dir=self.tmp_dir.name, activate=True, log_activate=False)
+
+    def read_traces(self, subdir: str) -> list:
+        self.monitor.flush_traces()
+        traces = []
+        for filename in sorted(os.listdir(os.path.join(self.tmp_dir.name, subdir))):
+            with open(os.path.join(self.tmp_dir.name, subdir, filename), encoding='utf-8') as file:
+                traces.extend(json.loads(line) for line in file)
+        return traces
+
+    def test_trace_agent_invocation(self):
+        self.monitor.trace_agent_invocation('demo_agent', {'input': 'question', 'client': Unserializable()},
+                                            agent_output(2))
+        trace = self.read_traces('agent_invocation')[0]
+        self.assertEqual('demo_agent', trace['source'])
+        self.assertEqual({'input': 'question'}, trace['agent_input'])
+        self.assertEqual(['output', 'documents', 'chat_history'], list(trace['agent_output']))
+        self.assertEqual({'type': 'human', 'content': 'question'}, trace['agent_output']['chat_history'][0])
+
+    def test_trace_llm_invocation(self):
+        self.monitor.trace_llm_invocation('demo_llm', {'messages': [HumanMessage(content='hi')]}, 'hello')
+        trace = self.read_traces('llm_invocation')[0]
+        self.assertEqual([{'type': 'human', 'content': 'hi'}], trace['llm_input']['messages'])
+        self.assertEqual('hello', trace['llm_output'])
+
+    def test_events_are_appended_to_one_open_file(self):
+        events = 200
+        output = agent_output(100)
+        with mock.patch('agentuniverse.base.util.monitor.trace_writer.open', create=True, wraps=open) as opened:
+            for _ in range(events):
+                self.monitor.trace_agent_invocation('demo_agent', {'input': 'question'}, output)
+            traces = self.read_traces('agent_invocation')
+        self.assertEqual(1, opened.call_count)
+        self.assertEqual(events, len(traces))
+        self.assertEqual(100, len(traces[-1]['agent_output']['documents']))
+
+
+if __name__ == '__main__':
+    unittest.main()
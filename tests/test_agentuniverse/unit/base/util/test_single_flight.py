@@ -0,0 +1,216 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 14:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_single_flight.py
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import cached_embeddings
+from agentuniverse.base.util.single_flight import SingleFlight
+from tests.test_agentuniverse.unit.llm.test_llm_cache import MockLLM, messages
+
+CONCURRENCY = 20
+UPSTREAM_LATENCY = 0.1
+
+
+class SlowEmbedding(Embedding):
+    calls: int = 0
+
+    @cached_embeddings
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(UPSTREAM_LATENCY)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    @cached_embeddings
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.calls += 1
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+def run_concurrently(fn, count: int = CONCURRENCY) -> list:
+    barrier = threading.Barrier(count)
+
+    def task():
+        barrier.wait()
+        return fn()
+
+    with concurrent.futures.ThreadPoolExecutor(count) as executor:
+        futures = [executor.submit(task) for _ in range(count)]
+        return [future.result() for future in futures]
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_results_and_errors_are_shared(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def upstream():
+            calls.append(1)
+            time.sleep(UPSTREAM_LATENCY)
+            return {'answer': 42}
+
+        results = run_concurrently(lambda: single_flight.do('key', upstream, copy_result=dict))
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(result == {'answer': 42} for result in results))
+        # Waiters get their own copy.
+        self.assertEqual(CONCURRENCY, len({id(result) for result in results}))
+
+        def failing():
+            calls.append(1)
+            time.sleep(UPSTREAM_LATENCY)
+            raise ValueError('upstream failed')
+
+        def call_failing():
+            try:
+                single_flight.do('key', failing)
+            except ValueError as e:
+                return str(e)
+
+        calls.clear()
+        self.assertEqual(['upstream failed'] * CONCURRENCY, run_concurrently(call_failing))
+        self.assertEqual(1, len(calls))
+        # Nothing stays in flight, the next call runs again.
+        self.assertEqual({'answer': 42}, single_flight.do('key', upstream))
+        self.assertEqual(2, len(calls))
+
+    def test_waiter_timeout(self):
+        single_flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def lead():
+            started.set()
+            release.wait(timeout=5)
+
+        leader = threading.Thread(target=single_flight.do, args=('key', lead))
+        leader.start()
+        started.wait(timeout=5)
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            single_flight.do('key', lambda: None, timeout=0.05)
+        release.set()
+        leader.join()
+
+    def test_stream_fan_out(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def upstream():
+            calls.append(1)
+
+            def stream():
+                for i in range(5):
+                    time.sleep(0.02)
+                    yield i
+
+            return stream()
+
+        results = run_concurrently(lambda: list(single_flight.do('key', upstream)))
+        self.assertEqual(1, len(calls))
+        self.assertEqual([[0, 1, 2, 3, 4]] * CONCURRENCY, results)
+
+        # The stream goes on when the first consumer stops early.
+        first = single_flight.do('key', upstream)
+        second = single_flight.do('key', upstream)
+        self.assertEqual(0, next(first))
+        first.close()
+        self.assertEqual([0, 1, 2, 3, 4], list(second))
+        self.assertEqual(2, len(calls))
+
+        def broken():
+            yield 0
+            raise ValueError('stream broken')
+
+        first = single_flight.do('broken', broken)
+        second = single_flight.do('broken', broken)
+        self.assertEqual(0, next(first))
+        with self.assertRaises(ValueError):
+            list(first)
+        self.assertEqual(0, next(second))
+        with self.assertRaises(ValueError):
+            next(second)
+
+    def test_async(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(UPSTREAM_LATENCY)
+            return 'answer'
+
+        async def upstream_stream():
+            calls.append(1)
+
+            async def stream():
+                for i in range(3):
+                    await asyncio.sleep(0.02)
+                    yield i
+
+            return stream()
+
+        async def consume():
+            return [i async for i in await single_flight.async_do('stream', upstream_stream)]
+
+        async def run():
+            results = await asyncio.gather(*[single_flight.async_do('key', upstream) for _ in range(CONCURRENCY)])
+            streams = await asyncio.gather(*[consume() for _ in range(CONCURRENCY)])
+            leader = asyncio.ensure_future(single_flight.async_do('slow', lambda: asyncio.sleep(0.3)))
+            await asyncio.sleep(0)
+            with self.assertRaises(asyncio.TimeoutError):
+                await single_flight.async_do('slow', upstream, timeout=0.05)
+            await leader
+            return results, streams
+
+        results, streams = asyncio.run(run())
+        self.assertEqual(['answer'] * CONCURRENCY, results)
+        self.assertEqual([[0, 1, 2]] * CONCURRENCY, streams)
+        self.assertEqual(2, len(calls))
+
+    def test_llm_single_flight(self):
+        llm = MockLLM(name='mock_llm', model_name='mock-model', single_flight={'timeout': 5})
+        outputs = run_concurrently(lambda: llm.call(messages=messages('morning report')))
+        self.assertEqual(1, llm.calls)
+        self.assertTrue(all(output.text == 'echo morning report' for output in outputs))
+
+        streams = run_concurrently(lambda: [chunk.text for chunk in
+                                            llm.call(messages=messages('a b'), streaming=True)])
+        self.assertEqual([['echo', 'a', 'b']] * CONCURRENCY, streams)
+        self.assertEqual(2, llm.calls)
+
+        async def run():
+            return await asyncio.gather(*[llm.acall(messages=messages('hello')) for _ in range(CONCURRENCY)])
+
+        self.assertTrue(all(output.text == 'echo hello' for output in asyncio.run(run())))
+        self.assertEqual(3, llm.calls)
+
+        plain_llm = MockLLM(name='plain_llm', model_name='mock-model')
+        run_concurrently(lambda: plain_llm.call(messages=messages('morning report')))
+        self.assertEqual(CONCURRENCY, plain_llm.calls)
+
+    def test_embedding_single_flight(self):
+        embedding = SlowEmbedding(name='slow_embedding', single_flight={'activate': True})
+        results = run_concurrently(lambda: embedding.get_embeddings(['hello', 'world!']))
+        self.assertEqual(1, embedding.calls)
+        self.assertEqual([[[5.0, 0.5], [6.0, 0.5]]] * CONCURRENCY, results)
+        self.assertEqual(CONCURRENCY, len({id(result) for result in results}))
+
+        async def run():
+            return await asyncio.gather(*[embedding.async_get_embeddings(['hello'])
+                                          for _ in range(CONCURRENCY)])
+
+        self.assertEqual([[[5.0, 0.5]]] * CONCURRENCY, asyncio.run(run()))
+        self.assertEqual(2, embedding.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 13:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_llm_cache.py
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Any
+
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_cache import LLMCache, make_cache_key
+from agentuniverse.llm.llm_output import LLMOutput
+
+LLM_LATENCY = 0.05
+
+
+class MockLLM(LLM):
+    """Answers with the last message, in chunks of one word when streaming."""
+    calls: int = 0
+
+    def _answer(self, messages: list, **kwargs: Any):
+        self.calls += 1
+        text = f"echo {messages[-1]['content']}"
+        if not kwargs.get('streaming', self.streaming):
+            return LLMOutput(text=text, raw={'text': text, 'usage': {'total_tokens': 10}})
+        return [LLMOutput(text=word, raw={'delta': word}) for word in text.split()]
+
+    def _call(self, messages: list, **kwargs: Any):
+        time.sleep(LLM_LATENCY)
+        result = self._answer(messages, **kwargs)
+        return result if isinstance(result, LLMOutput) else iter(result)
+
+    async def _acall(self, messages: list, **kwargs: Any):
+        await asyncio.sleep(LLM_LATENCY)
+        result = self._answer(messages, **kwargs)
+        if isinstance(result, LLMOutput):
+            return result
+
+        async def stream():
+            for chunk in result:
+                yield chunk
+
+        return stream()
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+def messages(content: str) -> list:
+    return [{'role': 'system', 'content': 'You are a router.'}, {'role': 'user', 'content': content}]
+
+
+class LLMCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.persist_path = str(Path(self.tmp_dir.name) / 'llm_cache.db')
+        self.llm = MockLLM(name='mock_llm', model_name='mock-model',
+                           llm_cache={'max_size': 100, 'persist_path': self.persist_path})
+        Monitor().clear_llm_cache_stats()
+
+    def test_call_is_cached(self):
+        first = self.llm.call(messages=messages('hello'))
+        second = self.llm.call(messages=messages('hello'))
+        self.assertEqual(1, self.llm.calls)
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(first.raw, second.raw)
+
+        # Other sampling params are other keys.
+        self.llm.call(messages=messages('hello'), temperature=0.9)
+        self.assertEqual(2, self.llm.calls)
+
+        stats = Monitor().get_llm_cache_stats()['mock_llm']
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(10, stats['saved_tokens'])
+        self.assertGreater(stats['saved_latency'], LLM_LATENCY / 2)
+        self.assertAlmostEqual(1 / 3, stats['hit_rate'])
+
+    def test_key_modes(self):
+        normalized = make_cache_key(self.llm, (), {'messages': messages('hello   world ')})
+        self.assertEqual(normalized, make_cache_key(self.llm, (), {'messages': messages('hello world')}))
+        exact = make_cache_key(self.llm, (), {'messages': messages('hello   world ')}, 'exact')
+        self.assertNotEqual(exact, make_cache_key(self.llm, (), {'messages': messages('hello world')}, 'exact'))
+        self.assertNotEqual(normalized, make_cache_key(self.llm, (), {'messages': messages('hello world'),
+                                                                      'streaming': True}))
+
+    def test_stream_replay(self):
+        chunks = [chunk.text for chunk in self.llm.call(messages=messages('a b c'), streaming=True)]
+        replayed = list(self.llm.call(messages=messages('a b c'), streaming=True))
+        self.assertEqual(1, self.llm.calls)
+        self.assertEqual(chunks, [chunk.text for chunk in replayed])
+        self.assertEqual({'delta': 'echo'}, replayed[0].raw)
+
+        # A stream consumed only in part is not cached.
+        next(iter(self.llm.call(messages=messages('d e'), streaming=True)))
+        list(self.llm.call(messages=messages('d e'), streaming=True))
+        self.assertEqual(3, self.llm.calls)
+
+    def test_async_call_and_stream(self):
+        async def run():
+            await self.llm.acall(messages=messages('hello'))
+            cached = await self.llm.acall(messages=messages('hello'))
+            streamed = [chunk.text async for chunk in await self.llm.acall(messages=messages('a b'), streaming=True)]
+            replayed = [chunk.text async for chunk in await self.llm.acall(messages=messages('a b'), streaming=True)]
+            return cached, streamed, replayed
+
+        cached, streamed, replayed = asyncio.run(run())
+        self.assertEqual('echo hello', cached.text)
+        self.assertEqual(streamed, replayed)
+        self.assertEqual(2, self.llm.calls)
+
+    def test_persistent_tier_and_ttl(self):
+        self.llm.call(messages=messages('hello'))
+        # A new process only sees the SQLite tier.
+        cache = LLMCache(max_size=100, persist_path=self.persist_path)
+        key = make_cache_key(self.llm, (), {'messages': messages('hello')})
+        self.assertEqual('echo hello', cache.get(key)['outputs'][0]['text'])
+
+        cache = LLMCache(max_size=100, ttl=0.05)
+        cache.put('key', {'outputs': []})
+        self.assertIsNotNone(cache.get('key'))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('key'))
+
+    def test_agent_switch(self):
+        agent_llm = self.llm.set_by_agent_model(llm_cache=False)
+        self.assertIsNone(agent_llm.get_llm_cache())
+        agent_llm.call(messages=messages('hello'))
+        agent_llm.call(messages=messages('hello'))
+        self.assertEqual(2, agent_llm.calls)
+        self.assertIsNotNone(MockLLM(name='plain_llm').set_by_agent_model(llm_cache=True).get_llm_cache())
+
+        agent_model = AgentModel(profile={'llm_model': {'name': 'mock_llm', 'llm_cache': False, 'temperature': 0.1}})
+        self.assertEqual({'temperature': 0.1}, agent_model.llm_params())
+
+    def test_repeated_prompts(self):
+        prompts = [messages(f'question {i % 10}') for i in range(50)]
+        plain_llm = MockLLM(name='plain_llm', model_name='mock-model')
+        for prompt in prompts:
+            plain_llm.call(messages=prompt)
+            self.llm.call(messages=prompt)
+
+        stats = Monitor().get_llm_cache_stats()['mock_llm']
+        self.assertEqual(50, plain_llm.calls)
+        self.assertEqual(10, self.llm.calls)
+        self.assertEqual(0.8, stats['hit_rate'])
+        self.assertEqual(400, stats['saved_tokens'])
+
+
+if __name__ == '__main__':
+    unittest.main()
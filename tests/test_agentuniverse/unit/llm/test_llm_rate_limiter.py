@@ -0,0 +1,98 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_llm_rate_limiter.py
+import threading
+import unittest
+from unittest import mock
+
+from agentuniverse.llm.llm_rate_limiter import LLMRateLimiter, TokenBucket, is_rate_limit_error
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeClock:
+    """Stands for the time module of the limiter, sleeping moves the clock on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        # a real sleep takes some time, however short the wait.
+        with self._lock:
+            self.now += max(seconds, 1e-6)
+
+
+class LLMRateLimiterTest(unittest.TestCase):
+    """
+    Test cases for LLMRateLimiter and TokenBucket
+    """
+
+    def test_token_bucket(self) -> None:
+        clock = FakeClock()
+        with mock.patch('agentuniverse.llm.llm_rate_limiter.time', clock):
+            bucket = TokenBucket(rate=50, capacity=5)
+            for _ in range(10):
+                self.assertTrue(bucket.acquire())
+            # 5 burst tokens, then 5 more at 50 per second.
+            self.assertAlmostEqual(0.1, clock.now, places=4)
+            self.assertFalse(bucket.acquire(timeout=0))
+
+        bucket.on_rate_limited()
+        self.assertEqual(25, bucket.rate)
+        bucket.on_success()
+        self.assertEqual(27.5, bucket.rate)
+
+    def test_retry_on_rate_limit(self) -> None:
+        limiter = LLMRateLimiter('test_llm', {'qps': 100, 'max_retries': 2})
+        func = mock.Mock(side_effect=[RateLimitError('too many requests'), 'ok'])
+        with mock.patch('agentuniverse.llm.llm_rate_limiter.time.sleep') as sleep:
+            self.assertEqual('ok', limiter.call(func, 'prompt'))
+        self.assertEqual(2, func.call_count)
+        # Exponential backoff with jitter, on top of waiting for the bucket.
+        self.assertTrue(any(0.5 <= call.args[0] <= 0.75 for call in sleep.call_args_list))
+        self.assertLess(limiter.bucket.rate, 100)
+
+        func = mock.Mock(side_effect=RateLimitError('too many requests'))
+        with mock.patch('agentuniverse.llm.llm_rate_limiter.time.sleep'):
+            with self.assertRaises(RateLimitError):
+                limiter.call(func)
+        self.assertEqual(3, func.call_count)
+
+        func = mock.Mock(side_effect=ValueError('bad request'))
+        with self.assertRaises(ValueError):
+            limiter.call(func)
+        self.assertEqual(1, func.call_count)
+
+    def test_no_retry_once_output_started(self) -> None:
+        limiter = LLMRateLimiter('test_llm', {'max_retries': 2})
+        func = mock.Mock(side_effect=[RateLimitError('too many requests'), 'ok'])
+        with self.assertRaises(RateLimitError):
+            limiter.call(func, can_retry=lambda: False)
+        self.assertEqual(1, func.call_count)
+
+    def test_is_rate_limit_error(self) -> None:
+        class ProviderRateLimitError(Exception):
+            pass
+
+        ProviderRateLimitError.__name__ = 'RateLimitError'
+        response = mock.Mock(status_code=429)
+        self.assertTrue(is_rate_limit_error(RateLimitError()))
+        self.assertTrue(is_rate_limit_error(ProviderRateLimitError('slow down')))
+        self.assertTrue(is_rate_limit_error(mock.Mock(spec=Exception, response=response)))
+        self.assertFalse(is_rate_limit_error(Exception('Error code: 500')))
+        # the message is not parsed: prompts and ids may contain anything.
+        self.assertFalse(is_rate_limit_error(Exception('prompt of 429 tokens hit the rate limit topic')))
+
+
+if __name__ == '__main__':
+    unittest.main()
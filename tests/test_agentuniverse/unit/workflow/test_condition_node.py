@@ -0,0 +1,129 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 21:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_condition_node.py
+import unittest
+from unittest import mock
+
+from agentuniverse.workflow.node import condition_expression
+from agentuniverse.workflow.node.condition_expression import compile_expression
+from agentuniverse.workflow.node.condition_node import ConditionNode
+from agentuniverse.workflow.node.node_config import NodeOutputParams
+from agentuniverse.workflow.workflow_output import WorkflowOutput
+
+
+def workflow_output(**outputs) -> WorkflowOutput:
+    """The workflow output with `{node_id}_{name}` params of node outputs."""
+    result = WorkflowOutput(workflow_id='demo_workflow')
+    params = {}
+    for key, value in outputs.items():
+        node_id, name = key.split('_', 1)
+        params.setdefault(node_id, []).append(NodeOutputParams(name=name, value=value))
+    for node_id, output_params in params.items():
+        result.set_node_parameters(node_id, output_params)
+    return result
+
+
+def reference(node_id: str, name: str) -> dict:
+    return {'value': {'type': 'reference', 'content': [node_id, name]}}
+
+
+def value(content) -> dict:
+    return {'value': {'type': 'value', 'content': content}}
+
+
+def condition_node(*branches: dict) -> ConditionNode:
+    return ConditionNode(id='2', data={'inputs': {'branches': list(branches)}})
+
+
+class ConditionExpressionTest(unittest.TestCase):
+
+    def assert_expression(self, expected: bool, expression: str, output: WorkflowOutput):
+        self.assertEqual(expected, compile_expression(expression)(output), expression)
+
+    def test_comparisons(self):
+        output = workflow_output(**{'1_input': 'what is the weather in Hangzhou', '3_score': '0.75',
+                                    '3_count': 3, '3_tags': ['weather', 'city'], '3_empty': None})
+        for expected, expression in [
+            (True, "{{3.score}} >= 0.5"),
+            (False, "{{3.score}} > 0.75"),
+            (True, "{{3.count}} == 3 and {{3.count}} != 4 and {{3.count}} != 5"),
+            (True, "{{3.count}} < 10.5"),
+            (False, "{{1.input}} > 1"),
+            (True, "{{1.input}} contains 'weather'"),
+            (True, "{{3.tags}} contains \"city\""),
+            (True, "{{1.input}} not contains 'stock'"),
+            (True, "{{1.input}} starts_with 'what' and {{1.input}} ends_with 'Hangzhou'"),
+            (True, r"{{1.input}} matches '\bHang\w+'"),
+            (True, "{{3.empty}} is blank and {{3.missing}} is blank and {{1.input}} is not blank"),
+            (True, "{{3.empty}} == null"),
+            (True, "{{3.count}}"),
+            (False, "{{3.empty}}"),
+        ]:
+            self.assert_expression(expected, expression, output)
+
+    def test_logical_operators(self):
+        output = workflow_output(**{'1_a': 1, '1_b': 2})
+        self.assert_expression(True, "{{1.a}} == 1 or {{1.a}} == 2 and {{1.b}} == 3", output)
+        self.assert_expression(False, "({{1.a}} == 1 or {{1.a}} == 2) and {{1.b}} == 3", output)
+        self.assert_expression(True, "not {{1.a}} == 2 and not not true", output)
+
+    def test_invalid_expressions(self):
+        for expression in ["{{1.a}} ==", "{{1.a}} == 1 and", "({{1.a}} == 1", "{{a}} == 1",
+                           "__import__('os').system('ls')", "{{1.a}} + 1", "{{1.a}} matches '('",
+                           "{{1.a}} is empty", "1 == 1 1"]:
+            with self.assertRaises(ValueError, msg=expression):
+                compile_expression(expression)
+
+
+class ConditionNodeTest(unittest.TestCase):
+
+    def test_first_matching_branch_is_taken(self):
+        node = condition_node(
+            {'name': 'branch-high', 'expression': "{{3.score}} >= 0.8"},
+            {'name': 'branch-medium', 'logical_operator': 'and', 'conditions': [
+                {'compare': 'greater_than_or_equal', 'left': reference('3', 'score'), 'right': value('0.5')},
+                {'compare': 'not_blank', 'left': reference('1', 'input')}]},
+            {'name': 'branch-question', 'logical_operator': 'or', 'conditions': [
+                {'compare': 'ends_with', 'left': reference('1', 'input'), 'right': value('?')},
+                {'compare': 'regex', 'left': reference('1', 'input'), 'right': value('^(what|how) ')}]},
+        )
+        for score, query, branch in [(0.9, 'hello', 'branch-high'), (0.6, 'hello', 'branch-medium'),
+                                     (0.6, None, 'branch-default'), (0.1, 'how are you', 'branch-question'),
+                                     (0.1, 'hello', 'branch-default')]:
+            output = workflow_output(**{'1_input': query, '3_score': score})
+            self.assertEqual(branch, node.run(output).edge_source_handler)
+
+    def test_legacy_condition(self):
+        node = condition_node({'name': 'branch-1', 'conditions': [
+            {'compare': 'equal', 'left': reference('1', 'input'), 'right': reference('1', 'input')}]})
+        self.assertEqual('branch-1', node.run(workflow_output(**{'1_input': 'hello'})).edge_source_handler)
+        self.assertEqual('branch-default', condition_node().run(workflow_output()).edge_source_handler)
+
+    def test_errors_are_raised_when_built(self):
+        with self.assertRaises(ValueError):
+            condition_node({'name': 'branch-1', 'conditions': [{'compare': 'between', 'left': value(1)}]})
+        with self.assertRaises(ValueError):
+            condition_node({'name': 'branch-1', 'logical_operator': 'xor',
+                            'conditions': [{'compare': 'blank', 'left': value(1)}]})
+
+    def test_branches_are_not_compiled_again_when_run(self):
+        node = condition_node(
+            {'name': 'branch-high', 'expression': "{{3.score}} >= 0.8 and {{1.input}} contains 'weather'"},
+            {'name': 'branch-weather', 'expression': r"{{3.score}} >= 0.5 and {{1.input}} matches 'weather|rain'"})
+        with mock.patch.object(condition_expression, '_ExpressionParser') as parser, \
+                mock.patch.object(condition_expression, '_compile_pattern') as compile_pattern:
+            for score, query, branch in [(0.9, 'the weather in Hangzhou', 'branch-high'),
+                                         (0.6, 'will it rain', 'branch-weather'),
+                                         (0.6, 'hello', 'branch-default')] * 100:
+                output = workflow_output(**{'1_input': query, '3_score': score})
+                self.assertEqual(branch, node.run(output).edge_source_handler)
+        parser.assert_not_called()
+        compile_pattern.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
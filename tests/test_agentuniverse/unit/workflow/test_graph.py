@@ -0,0 +1,209 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 20:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_graph.py
+import threading
+import time
+import unittest
+from typing import List
+from unittest import mock
+
+from agentuniverse.base.util.concurrency_util import ContextThreadPoolExecutor
+from agentuniverse.workflow.graph.graph import GRAPH_EXECUTOR_NAME, Graph
+from agentuniverse.workflow.node.enum import NodeEnum, NodeStatusEnum
+from agentuniverse.workflow.node.node import Node
+from agentuniverse.workflow.node.node_config import NodeOutputParams
+from agentuniverse.workflow.node.node_output import NodeOutput
+from agentuniverse.workflow.workflow_output import WorkflowOutput
+
+RUNS: List[str] = []
+RUNS_LOCK = threading.Lock()
+# Nodes running at once and the threads they ran in.
+CONCURRENCY = {'running': 0, 'max_running': 0, 'threads': set()}
+# Releases the nodes which are `blocked`.
+RELEASE = threading.Event()
+
+
+class SleepNode(Node):
+    """Sleeps like a knowledge or tool call, then outputs the input of the start node with its id."""
+    sleep: float = 0.1
+    blocked: bool = False
+
+    def _run(self, workflow_output: WorkflowOutput) -> NodeOutput:
+        with RUNS_LOCK:
+            CONCURRENCY['running'] += 1
+            CONCURRENCY['max_running'] = max(CONCURRENCY['max_running'], CONCURRENCY['running'])
+            CONCURRENCY['threads'].add(threading.current_thread().name)
+        if self.blocked:
+            RELEASE.wait(5)
+        else:
+            time.sleep(self.sleep)
+        with RUNS_LOCK:
+            CONCURRENCY['running'] -= 1
+            RUNS.append(self.id)
+        output_params = [NodeOutputParams(name='output',
+                                          value=f"{self.id}:{workflow_output.get_parameter_value('1', 'input')}")]
+        workflow_output.set_node_parameters(self.id, output_params)
+        return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
+
+
+class NestedGraphNode(Node):
+    """Runs a graph of its own, like an agent node of a workflow agent."""
+
+    def _run(self, workflow_output: WorkflowOutput) -> NodeOutput:
+        nested_graph = build_graph([start_node(), end_node('9', '2')], [edge('1', '2'), edge('2', '9')],
+                                   {'2': 0.01})
+        nested_output = run(nested_graph, f'nested {self.id}')
+        output_params = [NodeOutputParams(name='output', value=nested_output.workflow_end_params['output'])]
+        workflow_output.set_node_parameters(self.id, output_params)
+        return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, result=output_params)
+
+
+def reference(node_id: str, name: str = 'output') -> dict:
+    return {'type': 'reference', 'content': [node_id, name]}
+
+
+def start_node() -> dict:
+    return {'id': '1', 'type': 'start', 'data': {'outputs': [{'name': 'input', 'type': 'string'}]}}
+
+
+def end_node(node_id: str, *references: str) -> dict:
+    prompt = ' '.join(f'{{{{input_{ref}}}}}' for ref in references)
+    return {'id': node_id, 'type': 'end', 'data': {
+        'inputs': {'input_param': [{'name': f'input_{ref}', 'value': reference(ref)} for ref in references],
+                   'prompt': {'name': 'input', 'value': {'type': 'value', 'content': prompt}}},
+        'outputs': [{'name': 'output', 'type': 'string'}]}}
+
+
+def condition_node(node_id: str, expected: str) -> dict:
+    return {'id': node_id, 'type': 'ifelse', 'data': {'inputs': {'branches': [{
+        'name': 'branch-1', 'conditions': [{'compare': 'equal', 'left': {'value': reference('1', 'input')},
+                                            'right': {'value': {'type': 'value', 'content': expected}}}]}]}}}
+
+
+def edge(source: str, target: str, source_handler: str = None) -> dict:
+    return {'source_node_id': source, 'target_node_id': target, 'source_handler': source_handler}
+
+
+def build_graph(nodes: list, edges: list, sleep_nodes: dict, **config) -> Graph:
+    """Build the graph of the config, with a sleep node for each id of `sleep_nodes`."""
+    graph = Graph()
+    for node_id, sleep in sleep_nodes.items():
+        graph.add_node(node_id, instance=SleepNode(id=node_id, type=NodeEnum.TOOL, sleep=sleep,
+                                                   **config.pop(f'node_{node_id}', {})), type='tool')
+    return graph.build('demo_workflow', {'nodes': nodes, 'edges': edges, **config})
+
+
+def run(graph: Graph, query: str = 'query') -> WorkflowOutput:
+    workflow_output = WorkflowOutput(workflow_id='demo_workflow', workflow_start_params={'input': query})
+    graph.run(workflow_output)
+    return workflow_output
+
+
+class GraphTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        RUNS.clear()
+        CONCURRENCY.update(running=0, max_running=0, threads=set())
+        RELEASE.clear()
+        self.addCleanup(RELEASE.set)
+
+    def fan_in_graph(self, **config) -> Graph:
+        # two knowledge nodes and a tool node feeding one llm node
+        return build_graph([start_node(), end_node('9', '5')],
+                           [edge('1', '2'), edge('1', '3'), edge('1', '4'), edge('2', '5'), edge('3', '5'),
+                            edge('4', '5'), edge('5', '9')],
+                           {'2': 0.2, '3': 0.2, '4': 0.2, '5': 0.01}, **config)
+
+    def test_independent_branches_run_concurrently(self):
+        workflow_output = run(self.fan_in_graph())
+        self.assertEqual(3, CONCURRENCY['max_running'])
+        self.assertTrue(all(name.startswith(GRAPH_EXECUTOR_NAME) for name in CONCURRENCY['threads']))
+        self.assertEqual(['2', '3', '4'], sorted(RUNS[:3]))
+        self.assertEqual('5', RUNS[3])
+        self.assertEqual({'output': '5:query'}, workflow_output.workflow_end_params)
+        self.assertEqual({'1', '2', '3', '4', '5', '9'}, set(workflow_output.workflow_node_results))
+
+    def test_max_parallelism(self):
+        workflow_output = run(self.fan_in_graph(max_parallelism=1))
+        self.assertEqual(1, CONCURRENCY['max_running'])
+        self.assertEqual({'output': '5:query'}, workflow_output.workflow_end_params)
+
+    def test_condition_selects_branch(self):
+        graph = build_graph([start_node(), condition_node('2', 'yes'), end_node('9', '3', '6')],
+                            [edge('1', '2'), edge('2', '3', 'branch-1'), edge('2', '4', 'branch-default'),
+                             edge('3', '9'), edge('4', '5'), edge('5', '6'), edge('6', '9')],
+                            {'3': 0.01, '4': 0.01, '5': 0.01, '6': 0.01})
+        workflow_output = run(graph, 'yes')
+        self.assertEqual(['3'], RUNS)
+        self.assertEqual({'output': '3:yes '}, workflow_output.workflow_end_params)
+
+        RUNS.clear()
+        workflow_output = run(graph, 'no')
+        self.assertEqual(['4', '5', '6'], RUNS)
+        self.assertEqual({'output': ' 6:no'}, workflow_output.workflow_end_params)
+
+    def test_end_node_stops_the_run(self):
+        graph = build_graph([start_node(), end_node('9', '2')],
+                            [edge('1', '2'), edge('1', '3'), edge('2', '9'), edge('3', '4')],
+                            {'2': 0.01, '3': 0.3, '4': 0.01})
+        workflow_output = run(graph)
+        self.assertEqual({'output': '2:query'}, workflow_output.workflow_end_params)
+        # the running sibling is waited for, its successor never starts.
+        self.assertEqual(['2', '3'], RUNS)
+        self.assertNotIn('4', workflow_output.workflow_node_results)
+
+    def test_node_timeout(self):
+        graph = self.fan_in_graph(**{f'node_{node_id}': {'blocked': True} for node_id in '24'},
+                                  node_3={'timeout': 0.05, 'blocked': True})
+        with self.assertRaises(TimeoutError):
+            run(graph)
+        # neither the timed out node nor its siblings without a timeout are waited for.
+        self.assertEqual([], RUNS)
+        RELEASE.set()
+        while len(RUNS) < 3:
+            time.sleep(0.01)
+        self.assertEqual({'2', '3', '4'}, set(RUNS))
+        RUNS.clear()
+
+        graph = self.fan_in_graph(node_timeout=0.05)
+        workflow_output = WorkflowOutput(workflow_id='demo_workflow', workflow_start_params={'input': 'query'})
+        with self.assertRaises(TimeoutError):
+            graph.run(workflow_output)
+        self.assertEqual(NodeStatusEnum.FAILED, workflow_output.workflow_node_results['2'].status)
+        # the timed out nodes can not be stopped, let them end before checking no successor started.
+        while len(RUNS) < 3:
+            time.sleep(0.01)
+        self.assertEqual({'2', '3', '4'}, set(RUNS))
+
+    def test_nested_graphs_do_not_wait_on_their_own_pool(self):
+        graph = Graph()
+        for node_id in ('2', '3'):
+            graph.add_node(node_id, instance=NestedGraphNode(id=node_id, type=NodeEnum.AGENT), type='agent')
+        graph.build('demo_workflow', {'nodes': [start_node(), end_node('9', '2', '3')],
+                                      'edges': [edge('1', '2'), edge('1', '3'), edge('2', '9'), edge('3', '9')]})
+        pool = ContextThreadPoolExecutor(max_workers=4, thread_name_prefix=GRAPH_EXECUTOR_NAME)
+        self.addCleanup(pool.shutdown)
+        shared_pool = mock.Mock(wraps=pool)
+        with mock.patch('agentuniverse.workflow.graph.graph.get_shared_executor', return_value=shared_pool):
+            workflow_output = run(graph)
+        self.assertEqual({'output': '2:nested 2 2:nested 3'}, workflow_output.workflow_end_params)
+        # only the 4 outer nodes take workers of the shared pool, the nested
+        # graphs can not be starved by the nodes waiting for them.
+        self.assertEqual(4, shared_pool.submit.call_count)
+
+    def test_parameter_lookup(self):
+        workflow_output = WorkflowOutput()
+        workflow_output.set_node_parameters('1', [NodeOutputParams(name='input', value='first'),
+                                                  NodeOutputParams(name='input', value='second')])
+        workflow_output.workflow_parameters['2'] = [NodeOutputParams(name='output', value='direct')]
+        self.assertEqual('first', workflow_output.get_parameter_value('1', 'input'))
+        self.assertEqual('direct', workflow_output.get_parameter_value('2', 'output'))
+        self.assertIsNone(workflow_output.get_parameter_value('1', 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()